@@ -314,7 +314,11 @@ It also performs various checks, such as ensuring the existence of required dire
 
         # Retrieval
         resultaten = self.vector_store.zoek(expanded_query)
+        return self._beantwoord(vraag, resultaten, filter_tags, toon_bronnen)
 
+    def _beantwoord(self, vraag: str, resultaten: list,
+                    filter_tags: list, toon_bronnen: bool) -> str:
+        """Filter, genereer en registreer een antwoord op opgehaalde chunks."""
         # Filter op tags indien gewenst
         if filter_tags and resultaten:
             gefilterd = []
@@ -404,10 +408,14 @@ It also performs various checks, such as ensuring the existence of required dire
         """Beantwoord meerdere vragen in batch."""
         print(kleur(f"\n[BATCH] {len(vragen)} vragen verwerken...", Kleur.CYAAN))
 
+        # Retrieval in één batch: één embed call + één matrix-matrix product
+        expanded = [self._expand_query(v) for v in vragen]
+        alle_resultaten = self.vector_store.zoek_batch(expanded)
+
         antwoorden = []
-        for i, vraag in enumerate(vragen, 1):
+        for i, (vraag, resultaten) in enumerate(zip(vragen, alle_resultaten), 1):
             print(kleur(f"\n--- Vraag {i}/{len(vragen)} ---", Kleur.GEEL))
-            antwoord = self.vraag(vraag, toon_bronnen=False)
+            antwoord = self._beantwoord(vraag, resultaten, None, False)
             antwoorden.append({
                 "vraag": vraag,
                 "antwoord": antwoord,
@@ -1141,10 +1141,8 @@ No parameters or return values are used."""
             if idx < 0 or idx >= len(stores):
                 return
 
-            with open(stores[idx], "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            docs = data.get("documenten", {})
+            from danny_toolkit.core.vector_store import laad_documenten
+            docs = laad_documenten(stores[idx])
             vectors = []
 
             for doc_id, doc_data in docs.items():
@@ -333,7 +333,7 @@ class BlackBox:
             results = self._store.zoek(
                 query=current_prompt,
                 top_k=1,
-                filter_fn=lambda d: d.get("metadata", {}).get("type") == "failure_lesson",
+                where={"type": "failure_lesson"},
                 min_score=min_score,
             )
             if results:
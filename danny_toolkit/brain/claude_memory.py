@@ -182,16 +182,14 @@ class ClaudeMemory:
         if not self._store or not self._store.documenten:
             return []
 
-        filter_fn = None
-        if categorie:
-            filter_fn = lambda d: d.get("metadata", {}).get("categorie") == categorie
+        where = {"categorie": categorie} if categorie else None
 
         try:
             results = self._store.zoek(
                 query=vraag,
                 top_k=top_k,
-                filter_fn=filter_fn,
                 min_score=min_score,
+                where=where,
             )
             return results
         except Exception as e:
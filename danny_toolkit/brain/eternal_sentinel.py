@@ -223,8 +223,11 @@ class EternalSentinel:
         try:
             pass  # import moved to top-level
             bus = get_bus()
-            bus.subscribe(EventTypes.MISSION_STARTED, self._on_mission_start)
-            bus.subscribe(EventTypes.REQUEST_TRACE_COMPLETE, self._on_mission_end)
+            # Pool lane: nvidia-smi clock calls horen niet op de publish path
+            bus.subscribe(EventTypes.MISSION_STARTED, self._on_mission_start,
+                          modus="pool")
+            bus.subscribe(EventTypes.REQUEST_TRACE_COMPLETE, self._on_mission_end,
+                          modus="pool")
             logger.info("[SENTINEL] GPU P-State subscribed op NeuralBus")
         except Exception as e:
             logger.debug("[SENTINEL] NeuralBus subscribe fout: %s", e)
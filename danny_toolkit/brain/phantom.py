@@ -44,6 +44,8 @@ try:
 except ImportError:
     HAS_BUS = False
 
+from danny_toolkit.core.storage_writer import writer_voor
+
 
 class ThePhantom:
     """Anticipatory intelligence — Invention #20.
@@ -100,6 +102,8 @@ method is called to initialize the database schema."""
         )
         Config.apply_sqlite_perf(self._conn)
         self._create_tables()
+        # Write-behind: predictions/patronen via de gedeelde writer van dit bestand
+        self._writer = writer_voor(self._db_path, verbinding=self._conn)
 
         # Pop-once pre-warmed context cache
         self._cache_lock = threading.Lock()
@@ -138,8 +142,13 @@ method is called to initialize the database schema."""
         """)
         self._conn.commit()
 
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wacht tot alle predictions/patronen in de wachtrij gecommit zijn."""
+        return self._writer.flush(timeout)
+
     def close(self) -> None:
-        """Sluit de SQLite connectie."""
+        """Sluit de SQLite connectie (na flush van de wachtrij)."""
+        self.flush()
         try:
             self._conn.close()
         except Exception as e:
@@ -153,6 +162,8 @@ method is called to initialize the database schema."""
         """
         logger.info("Phantom: rebuilding temporal patterns...")
 
+        self._writer.flush()  # traces van TheSynapse (zelfde bestand)
+
         # Guard: interaction_trace may not exist yet (created by TheSynapse)
         try:
             rows = self._conn.execute(
@@ -250,6 +261,7 @@ method is called to initialize the database schema."""
         now = datetime.now()
         current_hour = str(now.hour)
         current_weekday = str(now.weekday())
+        self._writer.flush()
 
         # Get the most recent category for sequential prediction
         last_row = self._conn.execute(
@@ -344,15 +356,13 @@ method is called to initialize the database schema."""
                     "basis": basis_parts_str,
                 })
 
-        # Record predictions
-        for pred in predictions[:3]:  # Top 3
-            self._conn.execute(
-                """INSERT INTO phantom_predictions
-                   (predicted_category, confidence, basis)
-                   VALUES (?, ?, ?)""",
-                (pred["category"], pred["confidence"], pred["basis"]),
-            )
-        self._conn.commit()
+        # Record predictions (write-behind)
+        self._writer.schrijf_veel(
+            """INSERT INTO phantom_predictions
+               (predicted_category, confidence, basis)
+               VALUES (?, ?, ?)""",
+            [(p["category"], p["confidence"], p["basis"]) for p in predictions[:3]],
+        )
 
         # Publish event
         if HAS_BUS and predictions:
@@ -388,7 +398,7 @@ method is called to initialize the database schema."""
 
         pattern = pattern.strip()[:200]
         try:
-            self._conn.execute(
+            self._writer.schrijf(
                 """INSERT INTO temporal_patterns
                    (pattern_type, time_slot, category, frequency, sample_count)
                    VALUES ('extern', ?, ?, 0.6, 1)
@@ -398,7 +408,6 @@ method is called to initialize the database schema."""
                                 updated_at = datetime('now')""",
                 (bron, pattern),
             )
-            self._conn.commit()
             logger.debug("Phantom: extern patroon geregistreerd: '%s' (bron=%s)", pattern[:40], bron)
         except Exception as e:
             logger.debug("Phantom registreer_patroon failed: %s", e)
@@ -416,6 +425,7 @@ method is called to initialize the database schema."""
             List of prediction dicts with category, confidence, basis.
         """
         try:
+            self._writer.flush()
             rows = self._conn.execute(
                 """SELECT predicted_category, confidence, basis, timestamp
                    FROM phantom_predictions
@@ -494,14 +504,13 @@ method is called to initialize the database schema."""
 
                 # Mark prediction as pre-warmed
                 try:
-                    self._conn.execute(
+                    self._writer.schrijf(
                         """UPDATE phantom_predictions
                            SET pre_warmed = 1
                            WHERE resolved = 0
                            AND predicted_category = ?""",
                         (category,),
                     )
-                    self._conn.commit()
                 except Exception as e:
                     logger.debug("Phantom pre-warm DB update: %s", e)
 
@@ -538,27 +547,21 @@ method is called to initialize the database schema."""
     def resolve_predictions(self, actual_category: str) -> None:
         """Resolve unresolved predictions — mark as hit or miss.
 
-        Called post-routing with the actual category.
+        Called post-routing with the actual category. One set-based
+        UPDATE, queued on the StorageWriter (no read on the hot path).
         """
-        unresolved = self._conn.execute(
-            """SELECT id, predicted_category
-               FROM phantom_predictions
-               WHERE resolved = 0"""
-        ).fetchall()
-
-        for pred_id, predicted in unresolved:
-            hit = 1 if predicted == actual_category else 0
-            self._conn.execute(
-                """UPDATE phantom_predictions
-                   SET actual_category = ?, hit = ?, resolved = 1
-                   WHERE id = ?""",
-                (actual_category, hit, pred_id),
-            )
-
-        self._conn.commit()
+        self._writer.schrijf(
+            """UPDATE phantom_predictions
+               SET actual_category = ?,
+                   hit = CASE WHEN predicted_category = ? THEN 1 ELSE 0 END,
+                   resolved = 1
+               WHERE resolved = 0""",
+            (actual_category, actual_category),
+        )
 
     def get_accuracy(self) -> Dict:
         """Self-measurement: prediction accuracy stats (single query)."""
+        self._writer.flush()
         row = self._conn.execute(
             """SELECT
                 COUNT(*) as total,
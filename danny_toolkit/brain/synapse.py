@@ -32,13 +32,11 @@ Gebruik:
 from __future__ import annotations
 
 import hashlib
-import io as _io
 import json
 import logging
 import math
 import os
 import sqlite3
-import sys
 import threading
 import time
 import pathlib
@@ -58,6 +56,9 @@ try:
 except ImportError:
     HAS_BUS = False
 
+from danny_toolkit.core.embedding_memo import memo_embed, model_sleutel
+from danny_toolkit.core.storage_writer import writer_voor
+
 # Module-level export pool — 1 daemon thread, reused across all phoenix boosts
 from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 _PHOENIX_EXPORT_POOL = _ThreadPoolExecutor(max_workers=1, thread_name_prefix="phoenix-export")
@@ -128,10 +129,13 @@ class TheSynapse:
         Config.apply_sqlite_perf(self._conn)
         self._create_tables()
         self._ensure_weights_file()
+        # Write-behind: interaction traces via de gedeelde writer van dit bestand
+        self._writer = writer_voor(self._db_path, verbinding=self._conn)
 
         # Cache: embed function from AdaptiveRouter
         self._embed_fn = None
         self._profiel_embeddings = None
+        self._profiel_matrix = None
 
     def _create_tables(self) -> None:
         """Create synaptic_pathways and interaction_trace tables."""
@@ -247,28 +251,36 @@ class TheSynapse:
         return False
 
     def _get_embed_fn(self) -> None:
-        """Reuse AdaptiveRouter's embedding function (zero extra load)."""
+        """Reuse het gedeelde CPU model van AdaptiveRouter (zero extra load)."""
         if self._embed_fn is not None:
             return self._embed_fn
         try:
-            from sentence_transformers import SentenceTransformer
-            _old_out, _old_err = sys.stdout, sys.stderr
-            sys.stdout = _io.StringIO()
-            sys.stderr = _io.StringIO()
-            try:
-                model = SentenceTransformer(
-                    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-                    device="cpu",
-                )
-            finally:
-                sys.stdout = _old_out
-                sys.stderr = _old_err
-            self._embed_fn = model.encode
+            from danny_toolkit.core.embeddings import get_shared_model
+            self._embed_fn = get_shared_model(device="cpu").encode
             return self._embed_fn
         except Exception as e:
             logger.debug("SentenceTransformer laden mislukt: %s", e)
             return None
 
+    def _get_profiel_matrix(self) -> object:
+        """Lazy-load de gestapelde profielmatrix (gedeeld met AdaptiveRouter)."""
+        if self._profiel_matrix is not None:
+            return self._profiel_matrix
+        embed = self._get_embed_fn()
+        if not embed:
+            return None
+        try:
+            from swarm_engine import AdaptiveRouter
+            gedeeld = AdaptiveRouter._profiel_matrix
+            if gedeeld is not None and gedeeld.model == model_sleutel(embed):
+                self._profiel_matrix = gedeeld
+            else:
+                self._profiel_matrix = AdaptiveRouter._laad_profiel_matrix(embed)
+            return self._profiel_matrix
+        except Exception as e:
+            logger.debug("Profielmatrix laden mislukt: %s", e)
+            return None
+
     def _get_profiel_embeddings(self) -> None:
         """Lazy-load agent profile embeddings."""
         if self._profiel_embeddings is not None:
@@ -278,11 +290,23 @@ class TheSynapse:
             return None
         try:
             from swarm_engine import AdaptiveRouter
-            self._profiel_embeddings = {}
-            for agent, subs in AdaptiveRouter.AGENT_PROFIELEN.items():
-                self._profiel_embeddings[agent] = [
-                    embed(tekst) for tekst in subs
-                ]
+            # Zelfde profielvectoren als de router: hergebruik indien al berekend
+            if AdaptiveRouter._profiel_embeddings is not None:
+                self._profiel_embeddings = AdaptiveRouter._profiel_embeddings
+                return self._profiel_embeddings
+            matrix = self._get_profiel_matrix()
+            if matrix is not None:
+                self._profiel_embeddings = matrix.als_dict()
+                return self._profiel_embeddings
+            teksten = [
+                tekst for subs in AdaptiveRouter.AGENT_PROFIELEN.values()
+                for tekst in subs
+            ]
+            vectoren = iter(embed(teksten))
+            self._profiel_embeddings = {
+                agent: [next(vectoren) for _ in subs]
+                for agent, subs in AdaptiveRouter.AGENT_PROFIELEN.items()
+            }
             return self._profiel_embeddings
         except Exception as e:
             logger.debug("Profiel embeddings laden mislukt: %s", e)
@@ -305,21 +329,27 @@ class TheSynapse:
         Returns a stable category string like "CIPHER+ORACLE".
         """
         embed = self._get_embed_fn()
-        profielen = self._get_profiel_embeddings()
-        if not embed or not profielen:
+        matrix = self._get_profiel_matrix()
+        profielen = None if matrix is not None else self._get_profiel_embeddings()
+        if not embed or (matrix is None and not profielen):
             return "UNKNOWN"
 
         # Truncate to 500 chars (same as AdaptiveRouter)
         user_input = user_input[:500]
-        input_vec = embed(user_input)
+        # Request-scoped memo: router + get_routing_bias embedden dezelfde input
+        input_vec = memo_embed(user_input, embed)
 
-        scores = []
-        for agent, sub_vecs in profielen.items():
-            best = max(
-                self._cosine_sim(input_vec, sv)
-                for sv in sub_vecs
-            )
-            scores.append((agent, best))
+        if matrix is not None:
+            # Zelfde matrix als de router: één matvec + gesegmenteerde max
+            scores = list(zip(matrix.agenten, matrix.scores(input_vec).tolist()))
+        else:
+            scores = []
+            for agent, sub_vecs in profielen.items():
+                best = max(
+                    self._cosine_sim(input_vec, sv)
+                    for sv in sub_vecs
+                )
+                scores.append((agent, best))
 
         scores.sort(key=lambda x: x[1], reverse=True)
         top2 = [s[0] for s in scores[:2]]
@@ -351,8 +381,29 @@ class TheSynapse:
         query_hash = self._hash_query(user_input)
         agents_str = ",".join(sorted(agents_routed))
 
+        # Write-behind: trace + feedback draaien op de writer-thread
+        self._writer.taak(lambda conn: self._schrijf_interactie(
+            conn, session_id, query_hash, category, agents_str,
+            response_length, execution_ms,
+        ))
+
+    def _schrijf_interactie(
+        self,
+        conn: sqlite3.Connection,
+        session_id: Optional[str],
+        query_hash: str,
+        category: str,
+        agents_str: str,
+        response_length: int,
+        execution_ms: float,
+    ) -> None:
+        """Writer-taak: trace invoegen en de vorige trace resolven.
+
+        Draait binnen de batch-transactie van de StorageWriter; de
+        writer commit (en herhaalt bij een database lock).
+        """
         # Insert current trace
-        self._conn.execute(
+        conn.execute(
             """INSERT INTO interaction_trace
                (session_id, query_hash, category, agents_routed,
                 response_length, execution_ms)
@@ -362,7 +413,7 @@ class TheSynapse:
         )
 
         # Resolve PREVIOUS unresolved interaction
-        prev = self._conn.execute(
+        prev = conn.execute(
             """SELECT id, query_hash, category, agents_routed, timestamp
                FROM interaction_trace
                WHERE resolved = 0 AND id < last_insert_rowid()
@@ -374,7 +425,7 @@ class TheSynapse:
             signal, source = self._compute_feedback(
                 prev_hash, prev_cat, query_hash, category, prev_ts,
             )
-            self._conn.execute(
+            conn.execute(
                 """UPDATE interaction_trace
                    SET feedback_signal = ?, feedback_source = ?, resolved = 1
                    WHERE id = ?""",
@@ -386,9 +437,13 @@ class TheSynapse:
                 for agent in prev_agents.split(","):
                     agent = agent.strip()
                     if agent:
-                        self._apply_plasticity(prev_cat, agent, signal)
+                        self._apply_plasticity_inner(
+                            prev_cat, agent, signal, conn=conn,
+                        )
 
-        self._safe_commit()
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wacht tot alle interaction traces in de wachtrij gecommit zijn."""
+        return self._writer.flush(timeout)
 
     def _compute_feedback(
         self,
@@ -453,11 +508,13 @@ class TheSynapse:
 
     def _apply_plasticity_inner(
         self, category: str, agent: str, signal: float,
+        conn: Optional[sqlite3.Connection] = None,
     ) -> None:
         """Inner plasticity — single attempt, may raise.
 
         Uses upsert (INSERT ON CONFLICT UPDATE) to atomically
-        apply Hebbian plasticity in one SQL statement.
+        apply Hebbian plasticity in one SQL statement. conn is the
+        StorageWriter connection when called from a writer task.
         """
         if signal > 0:
             delta = self.STRENGTHEN_RATE * signal
@@ -466,7 +523,7 @@ class TheSynapse:
             delta = self.WEAKEN_RATE * signal
             succ_inc, fail_inc = 0, 1
 
-        self._conn.execute(
+        (conn or self._conn).execute(
             """INSERT INTO synaptic_pathways
                    (query_category, agent_key, strength,
                     fire_count, success_count, fail_count)
@@ -556,6 +613,7 @@ class TheSynapse:
         category = self.categorize_query(user_input)
         if category == "UNKNOWN":
             return {}
+        self._writer.flush()  # plasticity uit eerdere interacties meetellen
 
         # Try exact category match first
         rows = self._conn.execute(
@@ -1017,6 +1075,7 @@ class TheSynapse:
                 "stats": { ... }
             }
         """
+        self._writer.flush()
         rows = self._conn.execute(
             """SELECT query_category, agent_key, strength,
                       fire_count, success_count, fail_count,
@@ -1058,6 +1117,7 @@ class TheSynapse:
 
     def get_stats(self) -> Dict:
         """Dashboard statistics."""
+        self._writer.flush()
         row = self._conn.execute(
             "SELECT COUNT(*) FROM synaptic_pathways"
         ).fetchone()
@@ -1095,6 +1155,7 @@ class TheSynapse:
 
     def get_top_pathways(self, limit: int = 20) -> List[Dict]:
         """Get strongest pathways for debugging."""
+        self._writer.flush()
         rows = self._conn.execute(
             """SELECT query_category, agent_key, strength,
                       fire_count, success_count, fail_count,
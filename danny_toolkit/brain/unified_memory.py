@@ -205,16 +205,14 @@ class UnifiedMemory:
         Returns:
             Lijst van relevante events/documenten
         """
-        # Filter functie voor apps
-        filter_fn = None
-        if apps:
-            filter_fn = lambda doc: doc.get("metadata", {}).get("app") in apps
+        # Metadata filter voor apps (inverted index in VectorStore)
+        where = {"app": {"$in": list(apps)}} if apps else None
 
         results = self.vector_store.zoek(
             query,
             top_k=top_k,
-            filter_fn=filter_fn,
-            min_score=min_score
+            min_score=min_score,
+            where=where,
         )
 
         return results
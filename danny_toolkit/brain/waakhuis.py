@@ -36,6 +36,12 @@ try:
 except ImportError:
     HAS_CONFIG = False
 
+try:
+    from danny_toolkit.core.storage_writer import writer_voor
+    HAS_WRITER = True
+except ImportError:
+    HAS_WRITER = False
+
 try:
     from danny_toolkit.core.neural_bus import get_bus, EventTypes
     HAS_BUS = True
@@ -122,6 +128,7 @@ class WaakhuisMonitor:
             )
 
         self._conn: Optional[sqlite3.Connection] = None
+        self._writer = None
         self._init_db()
 
     def _init_db(self) -> None:
@@ -155,10 +162,20 @@ class WaakhuisMonitor:
                 ON waakhuis_metrics(agent, timestamp)
             """)
             self._conn.commit()
+            if HAS_WRITER:
+                self._writer = writer_voor(self._db_path, verbinding=self._conn)
         except Exception as e:
             logger.debug("WaakhuisMonitor DB init fout: %s", e)
             self._conn = None
 
+    def _persist(self, sql: str, params: tuple) -> None:
+        """Schrijf een metric rij: write-behind via de StorageWriter, anders direct."""
+        if self._writer is not None:
+            self._writer.schrijf(sql, params)
+        else:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
     def registreer_dispatch(self, agent_naam: str, latency_ms: float) -> None:
         """Registreer een succesvolle agent dispatch.
 
@@ -178,12 +195,11 @@ class WaakhuisMonitor:
         # Persist naar SQLite
         if self._conn:
             try:
-                self._conn.execute(
+                self._persist(
                     "INSERT INTO waakhuis_metrics (timestamp, agent, metric_type, latency_ms) "
                     "VALUES (?, ?, 'dispatch', ?)",
                     (time.time(), agent_naam, latency_ms),
                 )
-                self._conn.commit()
             except Exception as e:
                 logger.debug("WaakhuisMonitor persist dispatch fout: %s", e)
 
@@ -205,13 +221,12 @@ class WaakhuisMonitor:
         # Persist naar SQLite
         if self._conn:
             try:
-                self._conn.execute(
+                self._persist(
                     "INSERT INTO waakhuis_metrics "
                     "(timestamp, agent, metric_type, error_type, error_ernst, details) "
                     "VALUES (?, ?, 'error', ?, ?, ?)",
                     (time.time(), agent_naam, fout_type, ernst, beschrijving[:500]),
                 )
-                self._conn.commit()
             except Exception as e:
                 logger.debug("WaakhuisMonitor persist fout: %s", e)
 
@@ -473,6 +488,8 @@ class WaakhuisMonitor:
             return
 
         cutoff = time.time() - (dagen * 86400)
+        if self._writer is not None:
+            self._writer.flush()
         try:
             cursor = self._conn.execute(
                 "DELETE FROM waakhuis_metrics WHERE timestamp < ?",
@@ -515,8 +532,15 @@ class WaakhuisMonitor:
                 "alerts_verstuurd": 0,
             }
 
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wacht tot alle metric rijen in de wachtrij gecommit zijn."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
     def close(self) -> None:
-        """Sluit SQLite connectie."""
+        """Sluit SQLite connectie (na flush van de wachtrij)."""
+        self.flush()
         if self._conn:
             try:
                 self._conn.close()
@@ -283,7 +283,8 @@ class NeuralStreamPanel(RichLog):
         bus = _get_singleton("danny_toolkit.core.neural_bus", "get_bus")
         if bus:
             try:
-                bus.subscribe("*", self._on_bus_event)
+                # Pool lane: UI rendering vertraagt de publishers niet
+                bus.subscribe("*", self._on_bus_event, modus="pool")
                 self._subscribed = True
                 self.write("[green]Connected to NeuralBus[/]")
             except Exception as e:
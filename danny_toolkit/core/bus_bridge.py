@@ -0,0 +1,497 @@
+"""
+BusBridge — NeuralBus events delen tussen processen op één host.
+
+Elk proces (FastAPI server, daemon heartbeat, telegram bot, Streamlit UIs)
+heeft zijn eigen get_bus() singleton. De bridge verbindt ze via een lokale
+socket in een hub-spoke opzet: het eerste proces bindt het adres en wordt
+hub, de rest verbindt als peer. De hub levert frames van een peer af op
+zijn eigen bus en stuurt ze ongewijzigd door naar de andere peers. Valt de
+hub weg, dan neemt een peer het adres over.
+
+    adres   Unix domain socket (data/.neuralbus.sock) waar het platform
+            AF_UNIX heeft, anders loopback TCP (127.0.0.1:47654).
+            Config.NEURALBUS_BRIDGE_ADRES overschrijft ("pad" of "host:poort").
+
+Events reizen als (canonical, omega_seal) — de gesignde bytes van
+BusEvent.zegel() — zodat OmegaSeal handtekeningen behouden blijven; de
+ontvanger verifieert een heel frame met één verify_batch() via
+NeuralBus.ontvang_batch(): een replay-ledger per bus weigert herhaalde
+nonces, de procesbrede nonce blijft over voor @verified_callback
+subscribers. Events die van een peer kwamen (BusEvent.herkomst) worden
+niet terug de bridge op gestuurd.
+Zonder OmegaSeal key start de bridge niet: ongesigneerde frames zijn niet
+van een willekeurig lokaal proces te onderscheiden.
+
+Frames: 4-byte big-endian lengte + JSON
+    {"t": "hallo", "naam": ..., "pid": ...}
+    {"t": "events", "van": ..., "ts": ..., "events": [[canonical, seal], ...]}
+
+Gebruik:
+    from danny_toolkit.core.bus_bridge import start_bridge
+
+    bridge = start_bridge()        # of Config.NEURALBUS_BRIDGE=1 -> get_bus()
+    bridge.stats()["peers"]        # per peer: frames, events, lag_ms_gem/max
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_KOP = struct.Struct(">I")
+_MAX_FRAME = 16 * 1024 * 1024
+_STANDAARD_TCP = "127.0.0.1:47654"
+
+
+def _standaard_adres() -> str:
+    """Config adres, anders een Unix socket in data/ of loopback TCP."""
+    try:
+        from danny_toolkit.core.config import Config
+        if Config.NEURALBUS_BRIDGE_ADRES:
+            return Config.NEURALBUS_BRIDGE_ADRES
+        data_dir = str(Config.DATA_DIR)
+    except ImportError:
+        data_dir = "data"
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(data_dir, ".neuralbus.sock")
+    return _STANDAARD_TCP
+
+
+def _is_tcp(adres: str) -> bool:
+    """'host:poort' (zonder pad-scheidingstekens) is TCP, de rest een socketpad."""
+    host, _, poort = adres.rpartition(":")
+    return bool(host) and poort.isdigit() and "/" not in adres and "\\" not in adres
+
+
+class _Verbinding:
+    """Eén socket naar een peer (of naar de hub) met lengte-geprefixte frames."""
+
+    def __init__(self, sock: socket.socket, naam: str = "?") -> None:
+        self.sock = sock
+        self.naam = naam
+        self._schrijf_lock = threading.Lock()
+        self.open = True
+
+    def stuur(self, frame: bytes) -> bool:
+        """Schrijf een compleet frame (kop + body); False bij een fout."""
+        try:
+            with self._schrijf_lock:
+                self.sock.sendall(frame)
+            return True
+        except OSError as e:
+            logger.debug("BusBridge: schrijven naar %s mislukt: %s", self.naam, e)
+            self.sluit()
+            return False
+
+    def lees(self) -> Optional[bytes]:
+        """Lees één frame-body; None bij EOF of fout."""
+        kop = self._lees_precies(_KOP.size)
+        if kop is None:
+            return None
+        (lengte,) = _KOP.unpack(kop)
+        if lengte > _MAX_FRAME:
+            logger.warning("BusBridge: frame van %s te groot (%d)", self.naam, lengte)
+            self.sluit()
+            return None
+        return self._lees_precies(lengte)
+
+    def _lees_precies(self, n: int) -> Optional[bytes]:
+        buf = bytearray()
+        while len(buf) < n:
+            try:
+                deel = self.sock.recv(n - len(buf))
+            except OSError:
+                deel = b""
+            if not deel:
+                self.sluit()
+                return None
+            buf.extend(deel)
+        return bytes(buf)
+
+    def sluit(self) -> None:
+        if not self.open:
+            return
+        self.open = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def _frame(body: Dict[str, Any]) -> bytes:
+    """JSON body met lengte-kop."""
+    data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return _KOP.pack(len(data)) + data
+
+
+class BusBridge:
+    """Koppelt een NeuralBus aan de bussen van andere lokale processen."""
+
+    def __init__(
+        self,
+        bus: Any,
+        adres: Optional[str] = None,
+        naam: Optional[str] = None,
+        batch_max: int = 256,
+        flush_ms: float = 5.0,
+        max_wachtrij: int = 10000,
+    ) -> None:
+        """
+        Args:
+            bus: De lokale NeuralBus.
+            adres: Socketpad of "host:poort" (default: _standaard_adres()).
+            naam: Naam van dit proces in peer-metrics (default: script:pid).
+            batch_max: Max events per frame.
+            flush_ms: Hoe lang de zender wacht om een frame te vullen.
+            max_wachtrij: Max uitgaande events; daarboven valt de oudste af.
+        """
+        self.bus = bus
+        self.adres = adres or _standaard_adres()
+        script = os.path.basename(sys.argv[0] or "python") or "python"
+        self.naam = naam or f"{script}:{os.getpid()}"
+        self.batch_max = max(int(batch_max), 1)
+        self.flush_s = max(flush_ms, 0.0) / 1000
+        self.rol = "uit"
+        self._uit: Deque[Any] = deque()
+        self._max_wachtrij = max(int(max_wachtrij), 1)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._server: Optional[socket.socket] = None
+        self._hub: Optional[_Verbinding] = None
+        self._peers: List[_Verbinding] = []
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        # Metrics
+        self._peer_stats: Dict[str, Dict[str, Any]] = {}
+        self.frames_verzonden = 0
+        self.events_verzonden = 0
+        self.gedropt = 0
+
+    # ── levenscyclus ──
+
+    def start(self) -> str:
+        """Word hub of verbind als peer; abonneer op de lokale bus.
+
+        Returns:
+            De rol: "hub" of "peer"; "uit" als OmegaSeal geen key heeft.
+        """
+        from danny_toolkit.core.neural_bus import OmegaSeal
+        if not OmegaSeal.is_armed():
+            logger.warning(
+                "BusBridge %s niet gestart: OmegaSeal niet armed "
+                "(zet OMEGA_BUS_SIGNING_KEY); ongesigneerde frames worden "
+                "niet geaccepteerd", self.naam,
+            )
+            self.rol = "uit"
+            return self.rol
+        if not self._word_hub():
+            self._verbind_met_hub()
+        self.bus.subscribe("*", self._op_lokaal_event)
+        self.bus._bridge = self
+        self._draad(self._zender, "busbridge-zender")
+        if self.rol == "peer" or self.rol == "uit":
+            self._draad(self._bewaker, "busbridge-bewaker")
+        logger.info("BusBridge %s actief als %s op %s", self.naam, self.rol, self.adres)
+        return self.rol
+
+    def stop(self) -> None:
+        """Stop alle threads en sockets; de bus blijft lokaal werken."""
+        self._stop.set()
+        self.bus.unsubscribe("*", self._op_lokaal_event)
+        if self.bus._bridge is self:
+            self.bus._bridge = None
+        with self._cond:
+            self._cond.notify_all()
+        with self._lock:
+            verbindingen = list(self._peers) + ([self._hub] if self._hub else [])
+            self._peers.clear()
+            self._hub = None
+        for v in verbindingen:
+            v.sluit()
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)  # wekt accept()
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+            if not _is_tcp(self.adres):
+                try:
+                    os.unlink(self.adres)
+                except OSError:
+                    pass
+        for t in self._threads:
+            t.join(timeout=2)
+        self.rol = "uit"
+
+    def _draad(self, doel, naam: str, *args) -> None:
+        t = threading.Thread(target=doel, args=args, name=naam, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    # ── sockets ──
+
+    def _nieuwe_socket(self) -> socket.socket:
+        if _is_tcp(self.adres):
+            return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def _sock_adres(self):
+        if _is_tcp(self.adres):
+            host, _, poort = self.adres.rpartition(":")
+            return host, int(poort)
+        return self.adres
+
+    def _word_hub(self) -> bool:
+        """Bind het adres; False als er al een (levende) hub is."""
+        sock = self._nieuwe_socket()
+        try:
+            if _is_tcp(self.adres):
+                if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                else:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            elif os.path.exists(self.adres):
+                # Achtergebleven socketbestand van een gecrashte hub?
+                if self._hub_leeft():
+                    sock.close()
+                    return False
+                os.unlink(self.adres)
+            sock.bind(self._sock_adres())
+            if not _is_tcp(self.adres):
+                os.chmod(self.adres, 0o600)
+            sock.listen(16)
+        except OSError:
+            sock.close()
+            return False
+        self._server = sock
+        self.rol = "hub"
+        self._draad(self._accepteer, "busbridge-hub")
+        return True
+
+    def _hub_leeft(self) -> bool:
+        probe = self._nieuwe_socket()
+        probe.settimeout(0.5)
+        try:
+            probe.connect(self._sock_adres())
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _verbind_met_hub(self) -> bool:
+        sock = self._nieuwe_socket()
+        sock.settimeout(2.0)
+        try:
+            sock.connect(self._sock_adres())
+        except OSError:
+            sock.close()
+            return False
+        sock.settimeout(None)
+        hub = _Verbinding(sock, "hub")
+        if not hub.stuur(_frame({"t": "hallo", "naam": self.naam, "pid": os.getpid()})):
+            return False
+        with self._lock:
+            self._hub = hub
+        self.rol = "peer"
+        self._draad(self._lezer, "busbridge-lezer", hub)
+        with self._cond:
+            self._cond.notify_all()  # gebufferde events kunnen weg
+        return True
+
+    def _accepteer(self) -> None:
+        """Hub: accepteer peers, elk met een eigen lezer-thread."""
+        server = self._server
+        while not self._stop.is_set() and server is not None:
+            try:
+                sock, _ = server.accept()
+            except OSError:
+                return
+            peer = _Verbinding(sock)
+            with self._lock:
+                self._peers.append(peer)
+            self._draad(self._lezer, "busbridge-lezer", peer)
+
+    def _bewaker(self) -> None:
+        """Peer: bij verlies van de hub opnieuw verbinden of zelf hub worden."""
+        # Spreiding per pid: niet alle peers tegelijk naar de hub-rol
+        wacht = 0.2 + (os.getpid() % 10) / 50
+        while not self._stop.wait(wacht):
+            with self._lock:
+                verbonden = self._hub is not None and self._hub.open
+            if verbonden or self.rol == "hub":
+                wacht = 0.2
+                continue
+            if self._verbind_met_hub() or self._word_hub():
+                logger.info("BusBridge %s opnieuw actief als %s", self.naam, self.rol)
+                wacht = 0.2
+            else:
+                wacht = min(wacht * 2, 5.0)
+
+    # ── ontvangen ──
+
+    def _lezer(self, verbinding: _Verbinding) -> None:
+        """Lees frames: lokaal afleveren en (als hub) doorsturen."""
+        while not self._stop.is_set():
+            body = verbinding.lees()
+            if body is None:
+                break
+            try:
+                frame = json.loads(body)
+            except ValueError:
+                logger.debug("BusBridge: onleesbaar frame van %s", verbinding.naam)
+                continue
+            if frame.get("t") == "hallo":
+                verbinding.naam = str(frame.get("naam", "?"))
+                continue
+            if frame.get("t") != "events":
+                continue
+            self._ontvang(frame, len(body))
+            if self.rol == "hub":
+                # Ongewijzigd door naar de andere peers
+                ruw = _KOP.pack(len(body)) + body
+                with self._lock:
+                    anderen = [p for p in self._peers if p is not verbinding]
+                for peer in anderen:
+                    peer.stuur(ruw)
+        with self._lock:
+            if verbinding in self._peers:
+                self._peers.remove(verbinding)
+            if verbinding is self._hub:
+                self._hub = None
+        verbinding.sluit()
+
+    def _ontvang(self, frame: Dict[str, Any], grootte: int) -> None:
+        """Lever een events-frame af op de lokale bus en meet de lag."""
+        van = str(frame.get("van", "?"))
+        zegels = [(c.encode("utf-8"), s) for c, s in frame.get("events", [])]
+        lag_ms = max((time.time() - float(frame.get("ts", 0.0))) * 1000, 0.0)
+        geaccepteerd = self.bus.ontvang_batch(zegels, herkomst=van) if zegels else 0
+        with self._lock:
+            s = self._peer_stats.setdefault(van, {
+                "frames": 0, "events": 0, "afgewezen": 0, "bytes": 0,
+                "lag_ms_totaal": 0.0, "lag_ms_max": 0.0, "laatste": 0.0,
+            })
+            s["frames"] += 1
+            s["events"] += geaccepteerd
+            s["afgewezen"] += len(zegels) - geaccepteerd
+            s["bytes"] += grootte
+            s["lag_ms_totaal"] += lag_ms
+            s["lag_ms_max"] = max(s["lag_ms_max"], lag_ms)
+            s["laatste"] = time.time()
+
+    # ── verzenden ──
+
+    def _op_lokaal_event(self, event: Any) -> None:
+        """Inline bus subscriber: alleen in de uitgaande wachtrij zetten."""
+        if getattr(event, "herkomst", ""):
+            return  # kwam zelf van een peer — niet terugsturen
+        with self._cond:
+            if len(self._uit) >= self._max_wachtrij:
+                self._uit.popleft()
+                self.gedropt += 1
+            self._uit.append(event)
+            if len(self._uit) == 1 or len(self._uit) >= self.batch_max:
+                self._cond.notify()
+
+    def _ontvangers(self) -> List[_Verbinding]:
+        with self._lock:
+            if self.rol == "hub":
+                return list(self._peers)
+            return [self._hub] if self._hub is not None and self._hub.open else []
+
+    def _zender(self) -> None:
+        """Bundel uitgaande events in frames (max batch_max, na flush_ms)."""
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._stop.is_set() and not (self._uit and self._ontvangers()):
+                    if self._uit and self.rol == "hub":
+                        self._uit.clear()  # hub zonder peers: niemand luistert
+                    self._cond.wait(0.5)
+                if self._stop.is_set():
+                    return
+                if len(self._uit) < self.batch_max and self.flush_s:
+                    self._cond.wait(self.flush_s)
+                batch = [self._uit.popleft()
+                         for _ in range(min(len(self._uit), self.batch_max))]
+            if not batch:
+                continue
+            events = []
+            for event in batch:
+                canonical, seal = event.zegel()
+                events.append([canonical.decode("utf-8"), seal])
+            frame = _frame({"t": "events", "van": self.naam,
+                            "ts": time.time(), "events": events})
+            verzonden = [v.stuur(frame) for v in self._ontvangers()]
+            if any(verzonden):
+                self.frames_verzonden += 1
+                self.events_verzonden += len(batch)
+
+    # ── status ──
+
+    def stats(self) -> Dict[str, Any]:
+        """Rol, wachtrij en per-peer frames/events/lag."""
+        nu = time.time()
+        with self._lock:
+            peers = {
+                naam: {
+                    "frames": s["frames"],
+                    "events": s["events"],
+                    "afgewezen": s["afgewezen"],
+                    "bytes": s["bytes"],
+                    "lag_ms_gem": round(s["lag_ms_totaal"] / max(s["frames"], 1), 2),
+                    "lag_ms_max": round(s["lag_ms_max"], 2),
+                    "sinds_laatste_s": round(nu - s["laatste"], 1),
+                }
+                for naam, s in self._peer_stats.items()
+            }
+            verbonden = ([p.naam for p in self._peers] if self.rol == "hub"
+                         else (["hub"] if self._hub is not None and self._hub.open else []))
+        with self._cond:
+            wachtrij = len(self._uit)
+        return {
+            "naam": self.naam,
+            "rol": self.rol,
+            "adres": self.adres,
+            "verbonden": verbonden,
+            "wachtrij": wachtrij,
+            "gedropt": self.gedropt,
+            "frames_verzonden": self.frames_verzonden,
+            "events_verzonden": self.events_verzonden,
+            "peers": peers,
+        }
+
+
+_bridge: Optional[BusBridge] = None
+_bridge_lock = threading.Lock()
+
+
+def start_bridge(bus: Any = None, adres: Optional[str] = None) -> BusBridge:
+    """Start (eenmalig) de procesbrede bridge voor de singleton bus."""
+    global _bridge
+    if bus is None:
+        # Buiten de lock: get_bus() start zelf de bridge als Config dat vraagt
+        from danny_toolkit.core.neural_bus import get_bus
+        bus = get_bus()
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = BusBridge(bus, adres=adres)
+            _bridge.start()
+        return _bridge
+
+
+def get_bridge() -> Optional[BusBridge]:
+    """De actieve bridge, of None als hij niet gestart is."""
+    return _bridge
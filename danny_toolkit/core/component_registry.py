@@ -0,0 +1,110 @@
+"""
+ComponentRegistry — Eenmalig opgeloste componenten voor de hot path.
+
+Een component is een naam plus een fabriek zonder argumenten (typisch een
+lazy import die een singleton accessor, klasse of instantie teruggeeft).
+De fabriek draait bij het eerste gebruik — of vooraf via warm() — en het
+resultaat wordt bewaard. Een mislukte fabriek (ImportError, init fout)
+wordt als None onthouden: de hot path probeert de import niet elke request
+opnieuw.
+
+Gebruik:
+    from danny_toolkit.core.component_registry import ComponentRegistry
+
+    reg = ComponentRegistry()
+    reg.registreer("bus", lambda: __import__(
+        "danny_toolkit.core.neural_bus", fromlist=["get_bus"]).get_bus)
+    get_bus = reg.get("bus")          # None als de import faalde
+    timings = reg.warm()              # {naam: ms} voor alles wat nog open stond
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_OPEN = object()  # sentinel: fabriek nog niet gedraaid
+
+
+class ComponentRegistry:
+    """Naam -> fabriek, opgelost bij eerste gebruik en daarna gecachet."""
+
+    def __init__(self) -> None:
+        # RLock: een fabriek mag zelf andere componenten ophalen
+        self._lock = threading.RLock()
+        self._fabrieken: Dict[str, Callable[[], Any]] = {}
+        self._waarden: Dict[str, Any] = {}
+        self._timings: Dict[str, float] = {}
+        self._fouten: Dict[str, str] = {}
+
+    def registreer(self, naam: str, fabriek: Callable[[], Any]) -> None:
+        """Registreer (of vervang) een component; een oude waarde vervalt."""
+        with self._lock:
+            self._fabrieken[naam] = fabriek
+            self._waarden.pop(naam, None)
+            self._timings.pop(naam, None)
+            self._fouten.pop(naam, None)
+
+    def get(self, naam: str) -> Any:
+        """Opgeloste waarde van een component (None bij onbekend of fout)."""
+        waarde = self._waarden.get(naam, _OPEN)
+        if waarde is not _OPEN:
+            return waarde
+        return self._los_op(naam)
+
+    def _los_op(self, naam: str) -> Any:
+        """Draai de fabriek één keer (double-checked onder de lock)."""
+        with self._lock:
+            waarde = self._waarden.get(naam, _OPEN)
+            if waarde is not _OPEN:
+                return waarde
+            fabriek = self._fabrieken.get(naam)
+            if fabriek is None:
+                return None
+            t0 = time.perf_counter()
+            try:
+                waarde = fabriek()
+            except Exception as e:
+                logger.debug("Component %s laden mislukt: %s", naam, e)
+                self._fouten[naam] = str(e)[:200]
+                waarde = None
+            self._timings[naam] = round((time.perf_counter() - t0) * 1000, 2)
+            self._waarden[naam] = waarde
+            return waarde
+
+    def warm(self, namen: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Los componenten vooraf op.
+
+        Args:
+            namen: Subset om op te lossen (default: alle geregistreerde).
+
+        Returns:
+            {naam: laadtijd ms} van de componenten die nu pas opgelost zijn.
+        """
+        with self._lock:
+            open_ = [n for n in (namen if namen is not None else self._fabrieken)
+                     if n in self._fabrieken and n not in self._waarden]
+        for naam in open_:
+            self._los_op(naam)
+        return {n: self._timings[n] for n in open_ if n in self._timings}
+
+    def vergeet(self, naam: str) -> None:
+        """Laat de gecachte waarde los; het volgende get() lost opnieuw op."""
+        with self._lock:
+            self._waarden.pop(naam, None)
+            self._timings.pop(naam, None)
+            self._fouten.pop(naam, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Welke componenten opgelost zijn, hun laadtijden en fouten."""
+        with self._lock:
+            return {
+                "geregistreerd": len(self._fabrieken),
+                "opgelost": sorted(self._waarden),
+                "laadtijd_ms": dict(self._timings),
+                "fouten": dict(self._fouten),
+            }
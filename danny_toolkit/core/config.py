@@ -301,6 +301,15 @@ class Config:
     VOYAGE_MODEL = "voyage-4-large"
     VOYAGE_NATIVE_DIM = 1024              # voyage-4-large native output
     EMBEDDING_DIM = int(os.environ.get("EMBEDDING_DIM", "256"))
+    # EmbeddingCache BLOB formaat: float32 of float16 (halve schijf/geheugen)
+    EMBEDDING_CACHE_DTYPE = os.environ.get("EMBEDDING_CACHE_DTYPE", "float32")
+    # Host-brede embedding cache: API server, daemon en CLI delen één bestand
+    # (write-through per batch + point lookups bij een geheugen-miss).
+    # Opt-in: elke batch met missers kost dan een commit op het gedeelde bestand
+    EMBEDDING_CACHE_SHARED = os.environ.get(
+        "EMBEDDING_CACHE_SHARED", "0"
+    ).lower() in ("1", "true", "yes")
+    EMBEDDING_CACHE_PATH = os.environ.get("EMBEDDING_CACHE_PATH", "")
 
     # SQLite Performance Tuning (hardware-optimized for 32 GB RAM + SATA SSD)
     SQLITE_CACHE_SIZE = int(os.environ.get("SQLITE_CACHE_SIZE", "-64000"))  # 64 MB (negative = KB)
@@ -322,12 +331,41 @@ class Config:
     DEFAULT_AGENT_TIMEOUT = int(os.environ.get("AGENT_TIMEOUT", "20"))
     CIRCUIT_BREAKER_THRESHOLD = int(os.environ.get("CB_THRESHOLD", "3"))
     CIRCUIT_BREAKER_COOLDOWN = int(os.environ.get("CB_COOLDOWN", "12"))
+    # Single-flight: identieke queries delen één run; resultaat TTL (0 = uit)
+    SWARM_RESULT_TTL_S = float(os.environ.get("SWARM_RESULT_TTL_S", "60"))
+    # fastapi_server: SwarmEngine.warm() bij startup, vóór de eerste request
+    SWARM_WARM_ON_STARTUP = os.environ.get("SWARM_WARM_ON_STARTUP", "1").lower() not in ("0", "false", "no")
+    # Workload pools (core.workload_pools): threads per klasse, 0 = automatisch
+    SWARM_IO_WORKERS = int(os.environ.get("SWARM_IO_WORKERS", "0"))
+    SWARM_CPU_WORKERS = int(os.environ.get("SWARM_CPU_WORKERS", "0"))
+    SWARM_STORAGE_WORKERS = int(os.environ.get("SWARM_STORAGE_WORKERS", "0"))
+    NEURALBUS_LANE_WORKERS = int(os.environ.get("NEURALBUS_LANE_WORKERS", "0"))
+    # Bus bridge (core.bus_bridge): events delen tussen processen op deze host
+    NEURALBUS_BRIDGE = os.environ.get("NEURALBUS_BRIDGE", "0").lower() in ("1", "true", "yes")
+    # "" = data/.neuralbus.sock (Unix socket), of host:poort voor loopback TCP
+    NEURALBUS_BRIDGE_ADRES = os.environ.get("NEURALBUS_BRIDGE_ADRES", "")
+    # Write-behind SQLite (core.storage_writer): rijen per transactie,
+    # max wachttijd van de oudste rij, en wachtrij-grens (backpressure)
+    STORAGE_WRITER_BATCH = int(os.environ.get("STORAGE_WRITER_BATCH", "200"))
+    STORAGE_WRITER_INTERVAL_MS = int(os.environ.get("STORAGE_WRITER_INTERVAL_MS", "250"))
+    STORAGE_WRITER_MAX_WACHTRIJ = int(os.environ.get("STORAGE_WRITER_MAX_WACHTRIJ", "10000"))
 
     # RAG Settings
     CHUNK_SIZE = 350
     CHUNK_OVERLAP = 50
     TOP_K = 5
     SHARD_ENABLED = os.environ.get("SHARD_ENABLED", "").lower() in ("1", "true", "yes")
+    SHARD_MAX_WORKERS = int(os.environ.get("SHARD_MAX_WORKERS", "4"))
+    SHARD_DEADLINE_S = float(os.environ.get("SHARD_DEADLINE_S", "2.0"))  # per fan-out
+    SHARD_CENTROIDS = int(os.environ.get("SHARD_CENTROIDS", "8"))  # per shard
+    SHARD_ROUTE_MARGIN = float(os.environ.get("SHARD_ROUTE_MARGIN", "0.05"))  # cosine
+
+    # IndexStore (FAISS): index familie + standaard operating point
+    INDEX_TYPE = os.environ.get("INDEX_TYPE", "ivf_flat")  # flat | ivf_flat | ivf_pq | ivf_sq8 | hnsw
+    INDEX_NPROBE = int(os.environ.get("INDEX_NPROBE", "10"))
+    INDEX_EF_SEARCH = int(os.environ.get("INDEX_EF_SEARCH", "64"))
+    INDEX_HNSW_M = int(os.environ.get("INDEX_HNSW_M", "32"))
+    INDEX_PQ_M = int(os.environ.get("INDEX_PQ_M", "0"))  # 0 = automatisch (dim / 4)
     TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "1").lower() not in ("0", "false", "no")
 
     # SelfPruning — Vector Store Maintenance
@@ -0,0 +1,164 @@
+"""
+EmbeddingMemo — Request-scoped memo voor query embeddings.
+
+Tijdens één SwarmEngine.run wordt dezelfde gebruikersinput door meerdere
+fases ge-embed (AdaptiveRouter, TheSynapse, Memex ChromaDB, ShardRouter,
+SemanticCache). De memo zorgt dat elke (model, genormaliseerde tekst)
+combinatie per request precies één keer ge-embed wordt.
+
+De actieve memo leeft in een ContextVar: asyncio tasks en asyncio.to_thread
+erven hem automatisch. Buiten een request (geen memo) wordt gewoon direct
+ge-embed.
+
+Gebruik:
+    from danny_toolkit.core.embedding_memo import memo_embed, request_memo
+
+    @request_memo
+    async def run(self, user_input): ...
+
+    vec = memo_embed(user_input, model.encode)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import threading
+import unicodedata
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ─── ContextVar voor de actieve memo ─────────────────
+
+_huidige_memo: contextvars.ContextVar[Optional["EmbeddingMemo"]] = (
+    contextvars.ContextVar("embedding_memo", default=None)
+)
+
+
+def normaliseer_tekst(tekst: str) -> str:
+    """Memo-sleutel tekst: NFC, whitespace samengevouwen en gestript."""
+    return " ".join(unicodedata.normalize("NFC", str(tekst)).split())
+
+
+def model_sleutel(fn: Callable) -> str:
+    """Stabiele model-identiteit voor een embed functie.
+
+    Gedeelde registry modellen (SharedEmbeddingModel) krijgen hun
+    (model, device) naam, zodat router en Synapse dezelfde sleutel delen;
+    andere functies worden per instantie onderscheiden.
+    """
+    eigenaar = getattr(fn, "__self__", fn)
+    naam = getattr(eigenaar, "model_name", None)
+    device = getattr(eigenaar, "device", None)
+    if isinstance(naam, str) and device is not None:
+        return f"{naam}@{device}"
+    return f"{type(eigenaar).__qualname__}#{id(eigenaar):x}"
+
+
+class EmbeddingMemo:
+    """Thread-safe embedding memo voor één request.
+
+    Gelijktijdige misses op dezelfde sleutel wachten op de eerste
+    berekening (single-flight), zodat parallelle agents niet dubbel embedden.
+    """
+
+    def __init__(self, trace_id: str = "") -> None:
+        self.trace_id = trace_id
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._waarden: Dict[Tuple[str, str], Future] = {}
+
+    def get_or_compute(self, model: str, tekst: str,
+                       compute: Callable[[str], Any]) -> Any:
+        """Geef de gememoiseerde embedding of bereken hem één keer."""
+        sleutel = (model, normaliseer_tekst(tekst))
+        eigenaar = False
+        with self._lock:
+            fut = self._waarden.get(sleutel)
+            if fut is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                fut = self._waarden[sleutel] = Future()
+                eigenaar = True
+        if not eigenaar:
+            return fut.result()
+        try:
+            waarde = compute(tekst)
+        except BaseException as e:
+            # Fout niet memoïseren: volgende aanroep probeert opnieuw
+            with self._lock:
+                self._waarden.pop(sleutel, None)
+            fut.set_exception(e)
+            raise
+        fut.set_result(waarde)
+        return waarde
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss tellers van deze memo."""
+        with self._lock:
+            return {
+                "trace_id": self.trace_id,
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._waarden),
+            }
+
+
+def huidige_memo() -> Optional[EmbeddingMemo]:
+    """De memo van het lopende request, of None."""
+    return _huidige_memo.get()
+
+
+def bind_trace(trace_id: str) -> None:
+    """Koppel het trace_id van het request aan de actieve memo."""
+    memo = _huidige_memo.get()
+    if memo is not None:
+        memo.trace_id = trace_id
+
+
+def memo_embed(tekst: str, compute: Callable[[str], Any],
+               model: Optional[str] = None) -> Any:
+    """Embed `tekst` via `compute`, gememoiseerd binnen het lopende request.
+
+    Args:
+        tekst: Te embedden tekst.
+        compute: Functie tekst -> één vector.
+        model: Model sleutel (default: afgeleid van compute).
+
+    Returns:
+        De embedding zoals compute hem teruggeeft.
+    """
+    memo = _huidige_memo.get()
+    if memo is None:
+        return compute(tekst)
+    return memo.get_or_compute(model or model_sleutel(compute), tekst, compute)
+
+
+def request_memo(fn: Callable) -> Callable:
+    """Decorator: geef een async functie een eigen EmbeddingMemo.
+
+    De memo wordt na afloop weer losgekoppeld, ook bij vroege returns
+    of exceptions. Een geneste aanroep hergebruikt de buitenste memo.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _huidige_memo.get() is not None:
+            return await fn(*args, **kwargs)
+        memo = EmbeddingMemo()
+        token = _huidige_memo.set(memo)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _huidige_memo.reset(token)
+            if memo.hits or memo.misses:
+                logger.debug(
+                    "EmbeddingMemo trace=%s: %d hits, %d misses",
+                    memo.trace_id, memo.hits, memo.misses,
+                )
+    return wrapper
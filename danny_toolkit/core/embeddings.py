@@ -4,13 +4,18 @@ Versie 2.0 - Met TF-IDF, caching en benchmarking.
 """
 from __future__ import annotations
 
+import atexit
 import logging
 import math
 import hashlib
 import json
 import os
+import sqlite3
+import struct
+import sys
 import threading
 import time
+from array import array
 from collections import Counter, OrderedDict
 from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
@@ -131,6 +136,14 @@ class EmbeddingProvider:
         """Embed een enkele query."""
         return self.embed([query])[0]
 
+    def embed_queries(self, queries: list) -> list:
+        """Embed meerdere queries in één provider call.
+
+        Providers waarvan embed_query afwijkt van embed (bv. Voyage
+        input_type="query") overschrijven deze methode.
+        """
+        return self.embed(queries)
+
 
 class VoyageEmbeddings(EmbeddingProvider):
     """Productie embeddings met Voyage AI."""
@@ -186,6 +199,16 @@ The `dimensions` attribute is compared to the native dimension of the Voyage AI
         )
         return mrl_truncate(result.embeddings, self.dimensies)[0]
 
+    def embed_queries(self, queries: list) -> list:
+        """Embed meerdere queries in één Voyage call (input_type=query)."""
+        queries = self._validate_input(queries)
+        result = self.client.embed(
+            texts=queries,
+            model=self.model,
+            input_type="query"
+        )
+        return mrl_truncate(result.embeddings, self.dimensies)
+
 
 class HashEmbeddings(EmbeddingProvider):
     """
@@ -359,105 +382,396 @@ class TFIDFEmbeddings(EmbeddingProvider):
 # CACHING
 # =============================================================================
 
+# Vector BLOB formaten: dtype -> bytes per element
+_VECTOR_DTYPES = {"float32": 4, "float16": 2}
+
+
+def _codeer_vector(vec, dtype: str = "float32") -> bytes:
+    """Vector -> compacte little-endian BLOB (float32 of float16)."""
+    if dtype == "float16":
+        return struct.pack(f"<{len(vec)}e", *vec)
+    arr = array("f", vec)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _decodeer_vector(blob: bytes, dim: int) -> Optional[array]:
+    """BLOB -> float32 array; het formaat volgt uit de lengte (dim * 4 of 2)."""
+    if len(blob) == dim * 2:
+        return array("f", struct.unpack(f"<{dim}e", blob))
+    if len(blob) != dim * 4:
+        return None
+    arr = array("f")
+    arr.frombytes(blob)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
 class EmbeddingCache:
     """
     Cache voor embeddings om herberekeningen te voorkomen.
+
+    In-memory LRU (compacte float32 arrays) boven een SQLite bestand met
+    één BLOB per vector (float32 of float16, Config.EMBEDDING_CACHE_DTYPE).
+    Alleen nieuwe entries en LRU-evicties worden periodiek weggeschreven;
+    het bestand wordt op de achtergrond gecompacteerd. Dankzij WAL kunnen
+    andere processen hetzelfde bestand (ook read-only) delen: in gedeelde
+    modus (Config.EMBEDDING_CACHE_SHARED) valt een geheugen-miss terug op
+    een point lookup in SQLite en maakt publiceer() nieuwe entries direct
+    zichtbaar. Sleutels bevatten provider, dimensie en tekst-hash.
+
+    Een legacy embedding_cache.json wordt bij het aanmaken van de database
+    eenmalig ingelezen.
     """
 
-    _SAVE_INTERVAL = 50  # auto-save every N writes
+    _SAVE_INTERVAL = 50  # flush nieuwe entries elke N writes
+    _COMPACT_FRACTIE = 0.10  # compacteer na evictie van 10% van max_grootte
 
-    def __init__(self, cache_bestand: Path = None, max_grootte: int = 10000) -> None:
+    def __init__(self, cache_bestand: Path = None, max_grootte: int = 10000,
+                 alleen_lezen: bool = False, dtype: str = None,
+                 gedeeld: bool = None) -> None:
         """
         Initialiseer cache.
 
         Args:
-            cache_bestand: Pad naar cache bestand
+            cache_bestand: Pad naar cache bestand (.db; een .json pad wordt
+                als legacy bron gebruikt naast een .db met dezelfde naam)
             max_grootte: Maximum aantal gecachte embeddings
+            alleen_lezen: Open het bestand read-only (gedeeld met een
+                schrijvend proces); set() cachet dan alleen in memory
+            dtype: "float32" of "float16" (default Config.EMBEDDING_CACHE_DTYPE)
+            gedeeld: Deel entries met andere processen
+                (default Config.EMBEDDING_CACHE_SHARED)
         """
-        self.cache_bestand = cache_bestand or (
-            Config.RAG_DATA_DIR / "embedding_cache.json"
+        pad = Path(
+            cache_bestand
+            or getattr(Config, "EMBEDDING_CACHE_PATH", "")
+            or (Config.RAG_DATA_DIR / "embedding_cache.db")
         )
+        self._legacy_json = pad.with_suffix(".json")
+        self.cache_bestand = pad.with_suffix(".db") if pad.suffix == ".json" else pad
         self.max_grootte = max_grootte
-        self.cache: OrderedDict[str, list] = OrderedDict()
+        self.alleen_lezen = alleen_lezen
+        self.gedeeld = (
+            getattr(Config, "EMBEDDING_CACHE_SHARED", False)
+            if gedeeld is None else gedeeld
+        ) or alleen_lezen
+        self.dtype = dtype or getattr(Config, "EMBEDDING_CACHE_DTYPE", "float32")
+        if self.dtype not in _VECTOR_DTYPES:
+            raise ValueError(f"Onbekend embedding cache dtype: {self.dtype}")
+        self.cache: OrderedDict[str, array] = OrderedDict()
         self.hits = 0
         self.misses = 0
         self._writes_since_save = 0
+        self._lock = threading.RLock()
+        # Serialiseert flushes (vóór _lock nemen); SQLite I/O buiten _lock
+        self._io_lock = threading.Lock()
+        # Write-behind: nieuwe entries, geraakte keys en evicties tot de flush
+        self._nieuw: Dict[str, array] = {}
+        self._geraakt: Dict[str, float] = {}
+        self._verwijderd: set = set()
+        self._evicties_sinds_compactie = 0
+        self._compactie_thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
 
         self._laad()
 
-    def _hash_tekst(self, tekst: str, provider: str) -> str:
-        """Genereer hash voor tekst + provider."""
-        content = f"{provider}:{Config.EMBEDDING_DIM}:{tekst}"
+    def _hash_tekst(self, tekst: str, provider: str, dim: int = None) -> str:
+        """Genereer hash voor tekst + provider + dimensie (default EMBEDDING_DIM)."""
+        content = f"{provider}:{dim or Config.EMBEDDING_DIM}:{tekst}"
         return hashlib.sha256(content.encode()).hexdigest()
 
+    # ─── SQLite ──────────────────────────────────────
+
+    def _verbind(self) -> Optional[sqlite3.Connection]:
+        """Open een connectie (read-only via URI indien gevraagd)."""
+        if self.alleen_lezen:
+            if not self.cache_bestand.exists():
+                return None
+            conn = sqlite3.connect(
+                f"file:{self.cache_bestand.as_posix()}?mode=ro", uri=True,
+                timeout=Config.SQLITE_CONNECT_TIMEOUT, check_same_thread=False,
+            )
+            conn.execute(f"PRAGMA busy_timeout = {Config.SQLITE_BUSY_TIMEOUT}")
+            return conn
+        self.cache_bestand.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self.cache_bestand), timeout=Config.SQLITE_CONNECT_TIMEOUT,
+            check_same_thread=False,
+        )
+        # auto_vacuum moet vóór de eerste tabel gezet worden
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        Config.apply_sqlite_perf(conn)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                sleutel TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                gebruikt REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_embeddings_gebruikt
+                ON embeddings(gebruikt);
+            CREATE TABLE IF NOT EXISTS meta (
+                naam TEXT PRIMARY KEY,
+                waarde INTEGER NOT NULL
+            );
+        """)
+        conn.commit()
+        return conn
+
     def _laad(self) -> None:
-        """Laad cache van disk."""
-        if self.cache_bestand.exists():
+        """Laad de meest recent gebruikte entries en tellers van disk."""
+        try:
+            self._conn = self._verbind()
+        except sqlite3.Error as e:
+            logger.debug("EmbeddingCache openen mislukt (%s): %s", self.cache_bestand, e)
+            self._conn = None
+        if self._conn is None:
+            return
+        try:
+            meta = dict(self._conn.execute("SELECT naam, waarde FROM meta"))
+            if not self.alleen_lezen and not meta.get("json_gemigreerd"):
+                self._migreer_json()
+                meta = dict(self._conn.execute("SELECT naam, waarde FROM meta"))
+            self.hits = meta.get("hits", 0)
+            self.misses = meta.get("misses", 0)
+            rijen = self._conn.execute(
+                "SELECT sleutel, dim, vector FROM embeddings"
+                " ORDER BY gebruikt DESC, rowid DESC LIMIT ?", (self.max_grootte,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.debug("EmbeddingCache laden mislukt: %s", e)
+            return
+        # Oudste eerst: LRU-volgorde van de OrderedDict
+        for sleutel, dim, blob in reversed(rijen):
+            vec = _decodeer_vector(blob, dim)
+            if vec is not None:
+                self.cache[sleutel] = vec
+
+    def _migreer_json(self) -> None:
+        """Eenmalige import van de legacy JSON cache (bestand blijft staan)."""
+        if self._legacy_json.exists():
             try:
-                with open(self.cache_bestand, "r", encoding="utf-8") as f:
+                with open(self._legacy_json, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                    self.cache = OrderedDict(data.get("cache", {}))
-                    self.hits = data.get("hits", 0)
-                    self.misses = data.get("misses", 0)
-            except (json.JSONDecodeError, IOError):
-                self.cache = OrderedDict()
+                entries = list(data.get("cache", {}).items())[-self.max_grootte:]
+                nu = time.time()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    [(k, len(v), _codeer_vector(v, self.dtype), nu + i * 1e-6)
+                     for i, (k, v) in enumerate(entries)],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    [("hits", int(data.get("hits", 0))),
+                     ("misses", int(data.get("misses", 0)))],
+                )
+                logger.info("EmbeddingCache: %d JSON entries gemigreerd", len(entries))
+            except (json.JSONDecodeError, IOError, TypeError, ValueError) as e:
+                logger.debug("Legacy embedding cache overgeslagen: %s", e)
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('json_gemigreerd', 1)")
+        self._conn.commit()
 
     def _opslaan(self) -> None:
-        """Sla cache op naar disk."""
-        self.cache_bestand.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.cache_bestand, "w", encoding="utf-8") as f:
-            json.dump({
-                "cache": self.cache,
-                "hits": self.hits,
-                "misses": self.misses
-            }, f)
-
-    def get(self, tekst: str, provider: str) -> Optional[list]:
+        """Schrijf alleen nieuwe entries, LRU-touches en evicties weg.
+
+        De pending sets worden onder _lock overgenomen; de commit zelf
+        draait alleen onder _io_lock, zodat get()/set() van andere threads
+        niet op de schijf wachten. Niet aanroepen terwijl _lock gehouden
+        wordt (lock-volgorde: _io_lock, dan _lock).
+        """
+        with self._io_lock:
+            with self._lock:
+                nieuw, self._nieuw = self._nieuw, {}
+                geraakt, self._geraakt = self._geraakt, {}
+                verwijderd, self._verwijderd = self._verwijderd, set()
+                self._writes_since_save = 0
+                hits, misses = self.hits, self.misses
+            if self._conn is None or self.alleen_lezen:
+                return
+            try:
+                nu = time.time()
+                self._conn.executemany(
+                    "DELETE FROM embeddings WHERE sleutel = ?",
+                    [(k,) for k in verwijderd],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    [(k, len(v), _codeer_vector(v, self.dtype), geraakt.pop(k, nu))
+                     for k, v in nieuw.items()],
+                )
+                self._conn.executemany(
+                    "UPDATE embeddings SET gebruikt = ? WHERE sleutel = ?",
+                    [(t, k) for k, t in geraakt.items()],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    [("hits", hits), ("misses", misses)],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.debug("EmbeddingCache flush mislukt: %s", e)
+                return
+            if self._evicties_sinds_compactie >= max(
+                1, int(self.max_grootte * self._COMPACT_FRACTIE)
+            ):
+                self._evicties_sinds_compactie = 0
+                self.compacteer()
+
+    def _db_lookup(self, key: str) -> Optional[array]:
+        """Point lookup in SQLite (entries van andere processen)."""
+        if self._conn is None:
+            return None
+        try:
+            rij = self._conn.execute(
+                "SELECT dim, vector FROM embeddings WHERE sleutel = ?", (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("EmbeddingCache lookup mislukt: %s", e)
+            return None
+        return _decodeer_vector(rij[1], rij[0]) if rij else None
+
+    # ─── Compactie ───────────────────────────────────
+
+    def compacteer(self, wacht: bool = False) -> None:
+        """Trim het bestand tot max_grootte en geef vrije pagina's terug.
+
+        Draait op een eigen connectie in een daemon thread; met wacht=True
+        blokkeert de aanroep tot de compactie klaar is.
+        """
+        if self.alleen_lezen or self._conn is None:
+            return
+        with self._lock:
+            actief = self._compactie_thread
+            if actief is None or not actief.is_alive():
+                actief = threading.Thread(
+                    target=self._compacteer_sync, name="embedding-cache-compactie",
+                    daemon=True,
+                )
+                self._compactie_thread = actief
+                actief.start()
+        if wacht:
+            actief.join()
+
+    def _compacteer_sync(self) -> None:
+        """Verwijder alles buiten de max_grootte meest recente entries."""
+        try:
+            conn = sqlite3.connect(
+                str(self.cache_bestand), timeout=Config.SQLITE_CONNECT_TIMEOUT,
+            )
+            try:
+                Config.apply_sqlite_perf(conn)
+                conn.execute(
+                    "DELETE FROM embeddings WHERE rowid NOT IN ("
+                    " SELECT rowid FROM embeddings ORDER BY gebruikt DESC LIMIT ?)",
+                    (self.max_grootte,),
+                )
+                conn.commit()
+                conn.execute("PRAGMA incremental_vacuum")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug("EmbeddingCache compactie mislukt: %s", e)
+
+    # ─── API ─────────────────────────────────────────
+
+    def get(self, tekst: str, provider: str, dim: int = None) -> Optional[list]:
         """
         Haal embedding uit cache (LRU: verplaatst naar einde).
 
         Returns:
             Embedding of None als niet gecached
         """
-        key = self._hash_tekst(tekst, provider)
-        if key in self.cache:
+        key = self._hash_tekst(tekst, provider, dim)
+        with self._lock:
+            vec = self.cache.get(key)
+            if vec is not None:
+                self.cache.move_to_end(key)
+            elif self.gedeeld and key not in self._verwijderd:
+                # Entries van andere processen; ge-evicte keys niet
+                # terughalen vóór hun DELETE geflusht is
+                vec = self._db_lookup(key)
+                if vec is not None:
+                    self._plaats(key, vec)
+            if vec is None:
+                self.misses += 1
+                return None
             self.hits += 1
-            self.cache.move_to_end(key)
-            return self.cache[key]
-        self.misses += 1
-        return None
-
-    def set(self, tekst: str, provider: str, embedding: list) -> None:
-        """Voeg embedding toe aan cache."""
-        key = self._hash_tekst(tekst, provider)
+            self._geraakt[key] = time.time()
+            return vec.tolist()
 
-        # Move existing key to end (LRU) or evict oldest if full
+    def _plaats(self, key: str, vec: array) -> None:
+        """Zet key achteraan in de LRU; evict de oudste entry (O(1)) bij vol."""
+        self._verwijderd.discard(key)
         if key in self.cache:
             self.cache.move_to_end(key)
         elif len(self.cache) >= self.max_grootte:
-            # Verwijder oudste 10% (least recently used)
-            te_verwijderen = self.max_grootte // 10 or 1
-            for _ in range(min(te_verwijderen, len(self.cache))):
-                self.cache.popitem(last=False)
-
-        self.cache[key] = embedding
-
-        # Auto-save periodiek
-        self._writes_since_save += 1
-        if self._writes_since_save >= self._SAVE_INTERVAL:
+            oud, _ = self.cache.popitem(last=False)
+            # Gedeeld bestand: geen DELETE per evictie (de entry blijft voor
+            # andere processen bruikbaar); trimmen gebeurt in compacteer()
+            if not self.gedeeld:
+                if self._nieuw.pop(oud, None) is None:
+                    self._verwijderd.add(oud)
+                self._geraakt.pop(oud, None)
+            self._evicties_sinds_compactie += 1
+        self.cache[key] = vec
+
+    def set(self, tekst: str, provider: str, embedding: list,
+            dim: int = None) -> None:
+        """Voeg embedding toe aan cache."""
+        key = self._hash_tekst(tekst, provider, dim)
+        vec = array("f", embedding)
+        with self._lock:
+            self._plaats(key, vec)
+            self._nieuw[key] = vec
+            self._geraakt[key] = time.time()
+
+            # Periodiek alleen de nieuwe entries wegschrijven
+            self._writes_since_save += 1
+            flush = self._writes_since_save >= self._SAVE_INTERVAL
+        if flush:
             self._opslaan()
-            self._writes_since_save = 0
 
     def opslaan(self) -> None:
         """Expliciet opslaan."""
         self._opslaan()
 
+    def publiceer(self) -> None:
+        """Maak nieuwe entries direct zichtbaar voor andere processen.
+
+        Alleen in gedeelde modus; anders blijft de periodieke flush gelden.
+        """
+        if self.gedeeld and self._nieuw:
+            self._opslaan()
+
+    def sluit(self) -> None:
+        """Flush, wacht op compactie en sluit de connectie."""
+        self._opslaan()
+        thread = self._compactie_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def wis(self) -> None:
         """Wis de hele cache."""
-        self.cache = OrderedDict()
-        self.hits = 0
-        self.misses = 0
-        self._writes_since_save = 0
+        with self._lock:
+            self.cache = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self._writes_since_save = 0
+            self._nieuw, self._geraakt, self._verwijderd = {}, {}, set()
+            if self._conn is not None and not self.alleen_lezen:
+                try:
+                    self._conn.execute("DELETE FROM embeddings")
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.debug("EmbeddingCache wissen mislukt: %s", e)
         self._opslaan()
 
     def statistieken(self) -> dict:
@@ -470,10 +784,35 @@ class EmbeddingCache:
             "max_grootte": self.max_grootte,
             "hits": self.hits,
             "misses": self.misses,
-            "hit_rate": f"{hit_rate:.1f}%"
+            "hit_rate": f"{hit_rate:.1f}%",
+            "dtype": self.dtype,
+            "onopgeslagen": len(self._nieuw),
+            "alleen_lezen": self.alleen_lezen,
+            "gedeeld": self.gedeeld,
+            "bestand": str(self.cache_bestand),
         }
 
 
+_gedeelde_cache: Optional[EmbeddingCache] = None
+_gedeelde_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Procesbrede EmbeddingCache (één geheugen-LRU en connectie per proces).
+
+    Alle CachedEmbeddingProviders zonder eigen cache delen deze instantie;
+    via het gedeelde bestand zien andere processen op de host dezelfde
+    entries. Bij afsluiten wordt de cache geflusht.
+    """
+    global _gedeelde_cache
+    if _gedeelde_cache is None:
+        with _gedeelde_cache_lock:
+            if _gedeelde_cache is None:
+                _gedeelde_cache = EmbeddingCache()
+                atexit.register(_gedeelde_cache.opslaan)
+    return _gedeelde_cache
+
+
 class CachedEmbeddingProvider(EmbeddingProvider):
     """Wrapper die caching toevoegt aan een embedding provider."""
 
@@ -486,7 +825,7 @@ class CachedEmbeddingProvider(EmbeddingProvider):
             cache: Optionele bestaande cache
         """
         self.provider = provider
-        self.cache = cache or EmbeddingCache()
+        self.cache = cache or get_embedding_cache()
         self.dimensies = provider.dimensies
         self.naam = f"cached_{provider.naam}"
 
@@ -498,7 +837,7 @@ class CachedEmbeddingProvider(EmbeddingProvider):
 
         # Check cache
         for i, tekst in enumerate(teksten):
-            cached = self.cache.get(tekst, self.provider.naam)
+            cached = self.cache.get(tekst, self.provider.naam, self.dimensies)
             if cached is not None:
                 resultaten.append(cached)
             else:
@@ -512,25 +851,190 @@ class CachedEmbeddingProvider(EmbeddingProvider):
 
             for idx, embedding in zip(niet_gecached_indices, nieuwe_embeddings):
                 resultaten[idx] = embedding
-                self.cache.set(teksten[idx], self.provider.naam, embedding)
+                self.cache.set(teksten[idx], self.provider.naam, embedding,
+                               self.dimensies)
+            self.cache.publiceer()
 
         return resultaten
 
     def embed_query(self, query: str) -> list:
         """Embed query met caching."""
-        cached = self.cache.get(query, self.provider.naam)
+        cached = self.cache.get(query, self.provider.naam, self.dimensies)
         if cached is not None:
             return cached
 
         embedding = self.provider.embed_query(query)
-        self.cache.set(query, self.provider.naam, embedding)
+        self.cache.set(query, self.provider.naam, embedding, self.dimensies)
+        self.cache.publiceer()
         return embedding
 
+    def embed_queries(self, queries: list) -> list:
+        """Embed queries met caching; alleen missers in één provider call."""
+        resultaten = [
+            self.cache.get(q, self.provider.naam, self.dimensies) for q in queries
+        ]
+        missers = [i for i, r in enumerate(resultaten) if r is None]
+        if missers:
+            nieuw = self.provider.embed_queries([queries[i] for i in missers])
+            for idx, embedding in zip(missers, nieuw):
+                resultaten[idx] = embedding
+                self.cache.set(queries[idx], self.provider.naam, embedding,
+                               self.dimensies)
+            self.cache.publiceer()
+        return resultaten
+
     def opslaan_cache(self) -> None:
         """Sla cache op."""
         self.cache.opslaan()
 
 
+# =============================================================================
+# MODEL REGISTRY — één geladen SentenceTransformer per (model, device)
+# =============================================================================
+
+DEFAULT_ST_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+
+class SharedEmbeddingModel:
+    """Gedeelde handle op één geladen SentenceTransformer.
+
+    Verkrijg via get_shared_model(); router, Synapse en de lokale providers
+    delen zo dezelfde gewichten in plaats van elk een eigen kopie te laden.
+    """
+
+    def __init__(self, model_name: str, device: str) -> None:
+        """Laad het model (stdout/stderr van de loader onderdrukt)."""
+        self.model_name = model_name
+        self.device = device
+        start = time.perf_counter()
+        self._model = self._laad(model_name, device)
+        self.laadtijd_s = round(time.perf_counter() - start, 3)
+        self.dimensies = self._model.get_sentence_embedding_dimension()
+        self._stats_lock = threading.Lock()
+        self.aanroepen = 0
+        self.teksten = 0
+        logger.info(
+            "SharedEmbeddingModel geladen: %s (%dd, %s, %.1fs)",
+            model_name, self.dimensies, device, self.laadtijd_s,
+        )
+
+    @staticmethod
+    def _laad(model_name: str, device: str):
+        """Laad een SentenceTransformer stil op het gevraagde device."""
+        import io as _io
+        import sys
+        from sentence_transformers import SentenceTransformer
+        _old_out, _old_err = sys.stdout, sys.stderr
+        sys.stdout = _io.StringIO()
+        sys.stderr = _io.StringIO()
+        try:
+            return SentenceTransformer(model_name, device=device)
+        finally:
+            sys.stdout = _old_out
+            sys.stderr = _old_err
+
+    def __repr__(self) -> str:
+        return f"<SharedEmbeddingModel model={self.model_name} dim={self.dimensies}d device={self.device}>"
+
+    def encode(self, teksten, batch_size: int = 32, normalize: bool = False):
+        """Batched encode; één string geeft één vector, een lijst een matrix.
+
+        Args:
+            teksten: Eén tekst of een lijst teksten.
+            batch_size: Batch grootte voor het model.
+            normalize: L2-normaliseer de embeddings.
+
+        Returns:
+            numpy array (1d voor één tekst, 2d voor een lijst).
+        """
+        with self._stats_lock:
+            self.aanroepen += 1
+            self.teksten += 1 if isinstance(teksten, str) else len(teksten)
+        return self._model.encode(
+            teksten, batch_size=batch_size,
+            normalize_embeddings=normalize, show_progress_bar=False,
+        )
+
+    @property
+    def tokenizer(self):
+        """Onderliggende HuggingFace tokenizer (voor eigen pooling)."""
+        return self._model.tokenizer
+
+    @property
+    def auto_model(self):
+        """Onderliggende HuggingFace transformer module."""
+        return self._model[0].auto_model
+
+    def stats(self) -> dict:
+        """Gebruiksstatistieken van dit model."""
+        return {
+            "model": self.model_name,
+            "device": self.device,
+            "dimensies": self.dimensies,
+            "laadtijd_s": self.laadtijd_s,
+            "aanroepen": self.aanroepen,
+            "teksten": self.teksten,
+        }
+
+
+_model_registry: Dict[tuple, SharedEmbeddingModel] = {}
+_model_laad_locks: Dict[tuple, threading.Lock] = {}
+_model_registry_lock = threading.Lock()
+
+
+def resolve_device(device: str = None) -> str:
+    """Kies device: expliciet, anders cuda als beschikbaar, anders cpu."""
+    if device:
+        return str(device)
+    try:
+        import torch as _torch
+        if _torch.cuda.is_available():
+            return "cuda"
+    except ImportError:
+        logger.debug("torch niet beschikbaar, embeddings draaien op CPU")
+    return "cpu"
+
+
+def get_shared_model(model_name: str = None, device: str = None) -> SharedEmbeddingModel:
+    """Procesbrede SharedEmbeddingModel per (model, device) — laadt één keer.
+
+    Args:
+        model_name: HuggingFace model id (default DEFAULT_ST_MODEL).
+        device: "cpu", "cuda", ... (default: resolve_device()).
+
+    Returns:
+        De gedeelde SharedEmbeddingModel instantie.
+    """
+    sleutel = (model_name or DEFAULT_ST_MODEL, resolve_device(device))
+    model = _model_registry.get(sleutel)
+    if model is not None:
+        return model
+    with _model_registry_lock:
+        laad_lock = _model_laad_locks.setdefault(sleutel, threading.Lock())
+    # Per-sleutel lock: andere modellen laden niet achter deze aan
+    with laad_lock:
+        model = _model_registry.get(sleutel)
+        if model is None:
+            model = SharedEmbeddingModel(*sleutel)
+            with _model_registry_lock:
+                _model_registry[sleutel] = model
+    return model
+
+
+def release_shared_model(model_name: str = None, device: str = None) -> bool:
+    """Verwijder een model uit de registry (volgende get laadt opnieuw)."""
+    sleutel = (model_name or DEFAULT_ST_MODEL, resolve_device(device))
+    with _model_registry_lock:
+        return _model_registry.pop(sleutel, None) is not None
+
+
+def shared_model_stats() -> List[dict]:
+    """Statistieken van alle geladen gedeelde modellen."""
+    with _model_registry_lock:
+        modellen = list(_model_registry.values())
+    return [m.stats() for m in modellen]
+
+
 # =============================================================================
 # CHROMADB ADAPTER
 # =============================================================================
@@ -546,20 +1050,12 @@ class LocalEmbeddings(EmbeddingProvider):
     naam = "local"
 
     def __init__(self, model_name: str = None) -> None:
-        """Init met optioneel model override."""
-        from sentence_transformers import SentenceTransformer
+        """Init met optioneel model override (gedeeld model via registry)."""
         self._model_name = model_name or Config.LOCAL_EMBEDDING_MODEL
-        device = "cpu"
-        try:
-            import torch as _torch
-            if _torch.cuda.is_available():
-                device = "cuda"
-        except ImportError:
-            logger.debug("torch niet beschikbaar, SentenceTransformer draait op CPU")
-        self._model = SentenceTransformer(self._model_name, device=device)
-        self.dimensies = self._model.get_sentence_embedding_dimension()
-        self._device = device
-        logger.info("LocalEmbeddings geladen: %s (%dd, %s)", self._model_name, self.dimensies, device)
+        self._shared = get_shared_model(self._model_name)
+        self.dimensies = self._shared.dimensies
+        self._device = self._shared.device
+        logger.info("LocalEmbeddings geladen: %s (%dd, %s)", self._model_name, self.dimensies, self._device)
 
     def __repr__(self) -> str:
         return f"<LocalEmbeddings model={self._model_name} dim={self.dimensies}d device={self._device}>"
@@ -567,13 +1063,11 @@ class LocalEmbeddings(EmbeddingProvider):
     def embed(self, teksten: list) -> list:
         """Embed teksten lokaal (batch, gevalideerd)."""
         teksten = self._validate_input(teksten)
-        embeddings = self._model.encode(teksten, normalize_embeddings=True, show_progress_bar=False)
-        return embeddings.tolist()
+        return self._shared.encode(teksten, normalize=True).tolist()
 
     def embed_query(self, query: str) -> list:
         """Embed enkele query."""
-        embedding = self._model.encode([query], normalize_embeddings=True, show_progress_bar=False)
-        return embedding[0].tolist()
+        return self._shared.encode([query], normalize=True)[0].tolist()
 
 
 class LocalChromaEmbedding:
@@ -591,21 +1085,13 @@ class LocalChromaEmbedding:
         self._target_dim = None  # set after first load
 
     def _ensure_model(self) -> None:
-        """Lazy-load model op eerste gebruik."""
+        """Lazy: haal het gedeelde model uit de registry op eerste gebruik."""
         if self._model is None:
             with self._lock:
                 if self._model is None:
-                    from sentence_transformers import SentenceTransformer
-                    device = "cpu"
-                    try:
-                        import torch as _torch
-                        if _torch.cuda.is_available():
-                            device = "cuda"
-                    except ImportError:
-                        logger.debug("torch niet beschikbaar, ChromaEmbedding draait op CPU")
-                    self._model = SentenceTransformer(self._model_name, device=device)
-                    self._target_dim = self._model.get_sentence_embedding_dimension()
-                    logger.info("LocalChromaEmbedding geladen: %s (%dd, %s)", self._model_name, self._target_dim, device)
+                    self._model = get_shared_model(self._model_name)
+                    self._target_dim = self._model.dimensies
+                    logger.info("LocalChromaEmbedding geladen: %s (%dd, %s)", self._model_name, self._target_dim, self._model.device)
 
     def __repr__(self) -> str:
         dim = self._target_dim or "?"
@@ -623,14 +1109,12 @@ class LocalChromaEmbedding:
             texts = [str(t) for t in raw]
         else:
             texts = [str(raw)] if raw else [""]
-        embeddings = self._model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
-        return embeddings.tolist()
+        return self._model.encode(texts, normalize=True).tolist()
 
     def __call__(self, input: list[str]) -> list[list[float]]:
         """ChromaDB embedding interface — batch embed documenten."""
         self._ensure_model()
-        embeddings = self._model.encode(input, normalize_embeddings=True, show_progress_bar=False)
-        return embeddings.tolist()
+        return self._model.encode(input, normalize=True).tolist()
 
 
 class VoyageChromaEmbedding:
@@ -1045,7 +1529,6 @@ def lijst_providers() -> List[str]:
 # =============================================================================
 
 try:
-    from transformers import AutoTokenizer, AutoModel
     from transformers import logging as transformers_logging
     transformers_logging.set_verbosity_error()
     import torch
@@ -1059,7 +1542,9 @@ class TorchGPUEmbeddings(EmbeddingProvider):
     """
     Thread-safe GPU-accelerated embedding provider (~400MB VRAM).
 
-    Het model wordt slechts één keer geladen (Singleton via get_torch_embedder).
+    Het model wordt slechts één keer geladen (Singleton via get_torch_embedder)
+    en komt uit de gedeelde model registry: dezelfde gewichten als router,
+    Synapse en de lokale providers op hetzelfde device.
     Alle 347 micro-agents tappen uit dezelfde gedeelde instantie.
     Bij GPU-fout: automatische fallback naar CPU.
     Noodrem: force_flush() vernietigt het model en leegt VRAM.
@@ -1073,22 +1558,23 @@ class TorchGPUEmbeddings(EmbeddingProvider):
             raise ImportError("TorchGPUEmbeddings vereist 'transformers' en 'torch'. Installeer met: pip install transformers torch")
         self.model_name = model_name
 
-        # GPU met automatische CPU fallback
+        # GPU met automatische CPU fallback; gewichten uit de gedeelde registry
         target_device = get_device()
         try:
             self.device = target_device
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name).to(self.device)
-            self.model.eval()
+            self._shared = get_shared_model(model_name, str(target_device))
         except Exception as e:
             if str(target_device) != "cpu":
                 logger.warning("GPU laden mislukt (%s), fallback naar CPU", e)
                 self.device = torch.device("cpu")
-                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.model = AutoModel.from_pretrained(model_name).to(self.device)
-                self.model.eval()
+                self._shared = get_shared_model(model_name, "cpu")
             else:
                 raise
+        # Eigen masked mean pooling over de gedeelde transformer (zelfde
+        # vectoren als voorheen met AutoModel, zonder tweede kopie)
+        self.tokenizer = self._shared.tokenizer
+        self.model = self._shared.auto_model
+        self.model.eval()
 
         self.dimensies = self.model.config.hidden_size
         logger.info(
@@ -1195,8 +1681,12 @@ def force_flush_embeddings() -> None:
         if _torch_gpu_instance is not None:
             import gc
             logger.warning("VRAM force flush — embedding model wordt vernietigd")
+            release_shared_model(
+                _torch_gpu_instance.model_name, str(_torch_gpu_instance.device),
+            )
             del _torch_gpu_instance.model
             del _torch_gpu_instance.tokenizer
+            del _torch_gpu_instance._shared
             _torch_gpu_instance = None
             gc.collect()
             if _HAS_TORCH_GPU and torch.cuda.is_available():
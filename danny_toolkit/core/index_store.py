@@ -4,8 +4,14 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from collections.abc import Sequence
 from pathlib import Path
 
+from .config import Config
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -17,17 +23,124 @@ except ImportError:
 
 DEFAULT_STORE = Path.home() / ".danny-toolkit" / "index"
 
-SCHEMA_VERSION = 1
+# v0: metadata.json = lijst chunks, v1: {"schema_version", "chunks"},
+# v2: metadata.json = kleine header; chunks in chunks.jsonl met
+#     memory-mapped offset- en hash-kolommen (zie _ChunkView)
+SCHEMA_VERSION = 2
+
+# Onder deze grootte een exacte Flat index, daarboven IVF
+_IVF_MIN = 256
+
+# Incrementele append: de getrainde IVF quantiser blijft staan tot de index
+# RETRAIN_GROWTH x zo groot is als bij de laatste training, of de
+# inverted lists te scheef raken (faiss imbalance factor, 1.0 = uniform).
+RETRAIN_GROWTH = 2.0
+RETRAIN_IMBALANCE = 3.0
+
+# faiss.index wordt lui geschreven: een append markeert hem dirty en
+# hooguit INDEX_PERSIST_DEBOUNCE seconden later (of bij retrain, build,
+# flush_index() en close()) volgt één atomische write. Loopt de index op
+# disk achter op de header, dan vult _load() hem aan uit vectors.npy.
+INDEX_PERSIST_DEBOUNCE = 5.0
+
+# Selecteerbare index families (Config.INDEX_TYPE of per store):
+#   flat     exact, geen training
+#   ivf_flat IVF met volledige vectoren in de lijsten (default)
+#   ivf_pq   IVF met product-quantised codes (~dim/4 bytes per vector)
+#   ivf_sq8  IVF met 8-bit scalar-quantised vectoren (4x kleiner)
+#   hnsw     HNSW graaf over volledige vectoren, geen training
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "ivf_sq8", "hnsw")
+
+# Sweep waarden voor benchmark()
+NPROBE_SWEEP = (1, 2, 4, 8, 16, 32, 64, 128)
+EF_SEARCH_SWEEP = (16, 32, 64, 128, 256, 512)
+
+
+def _mmap_npy(path: Path) -> np.ndarray:
+    """Read-only memory-map van een .npy bestand (lege arrays gewoon geladen)."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)  # mmap van 0 bytes data kan niet
+
+
+class _ChunkView(Sequence):
+    """Lazy, read-only view op de chunk metadata (schema v2).
+
+    chunks.jsonl bevat één JSON record per chunk; chunks.offsets.npy
+    (uint64, n+1) en chunks.hashes.npy (S32) zijn memory-mapped kolommen.
+    Een search leest zo alleen de k hit-records van disk.
+    """
+
+    def __init__(self, store_dir: Path, count: int) -> None:
+        """Open de kolommen; count komt uit de header (commit point)."""
+        self._pad = store_dir / "chunks.jsonl"
+        self._offsets = _mmap_npy(store_dir / "chunks.offsets.npy")
+        self._hashes = _mmap_npy(store_dir / "chunks.hashes.npy")
+        self._n = max(0, min(count, len(self._offsets) - 1, len(self._hashes)))
+        self._fh = open(self._pad, "rb")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Aantal chunks."""
+        return self._n
+
+    def __getitem__(self, i):
+        """Materialiseer één record (of een lijst bij een slice)."""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        start, eind = int(self._offsets[i]), int(self._offsets[i + 1])
+        with self._lock:
+            self._fh.seek(start)
+            raw = self._fh.read(eind - start)
+        return json.loads(raw)
+
+    def __iter__(self):
+        """Sequentiële scan (stats / verify / upgrade)."""
+        with open(self._pad, "rb") as f:
+            for _ in range(self._n):
+                yield json.loads(f.readline())
+
+    def hashes(self) -> set:
+        """Alle chunk hashes, direct uit de hash-kolom."""
+        return {h.decode() for h in self._hashes[:self._n].tolist() if h}
+
+    def consistent(self) -> bool:
+        """Kolommen en recordbestand sluiten exact aan op de header."""
+        return (
+            len(self._offsets) == self._n + 1
+            and len(self._hashes) == self._n
+            and int(self._offsets[self._n]) == self._pad.stat().st_size
+        )
+
+    def close(self) -> None:
+        """Sluit de file handle (nodig vóór herschrijven op Windows)."""
+        self._fh.close()
 
 
 class IndexStore:
     """Persistent FAISS index with document metadata."""
 
-    def __init__(self, store_dir: str = None) -> None:
+    def __init__(self, store_dir: str = None,
+                 retrain_growth: float = RETRAIN_GROWTH,
+                 retrain_imbalance: float = RETRAIN_IMBALANCE,
+                 background_retrain: bool = True,
+                 index_type: str = None,
+                 nprobe: int = None,
+                 ef_search: int = None) -> None:
         """`__init__(self, store_dir: str = None)`: Initializes the IndexStore instance.
 
  * Args:
      + store_dir (str, optional): Directory to store index files. Defaults to None, which uses the default store directory.
+     + retrain_growth (float, optional): Retrain zodra ntotal >= groeifactor x getraind aantal.
+     + retrain_imbalance (float, optional): Retrain zodra de IVF imbalance factor dit overschrijdt.
+     + background_retrain (bool, optional): Retrain in een achtergrond thread i.p.v. blokkerend.
+     + index_type (str, optional): Eén van INDEX_TYPES. Default: type uit de header, anders Config.INDEX_TYPE.
+     + nprobe / ef_search (int, optional): Operating point. Default: header, anders Config.
  * Raises:
      + ImportError: If 'numpy' and 'faiss-cpu' are not installed.
  * Attributes:
@@ -36,7 +149,7 @@ class IndexStore:
      + meta_path (Path): The path to the metadata file.
      + vectors_path (Path): The path to the vector data file.
      + index: The Faiss index object.
-     + metadata (list): The list of metadata.
+     + metadata (Sequence): Lazy view op de chunk metadata (_ChunkView).
      + _schema_version (str): The schema version of the index."""
         if not _HAS_FAISS:
             raise ImportError("IndexStore vereist 'numpy' en 'faiss-cpu'. Installeer met: pip install numpy faiss-cpu")
@@ -45,9 +158,29 @@ class IndexStore:
         self.index_path = self.store_dir / "faiss.index"
         self.meta_path = self.store_dir / "metadata.json"
         self.vectors_path = self.store_dir / "vectors.npy"
+        self.chunks_path = self.store_dir / "chunks.jsonl"
+        self.offsets_path = self.store_dir / "chunks.offsets.npy"
+        self.hashes_path = self.store_dir / "chunks.hashes.npy"
         self.index = None
         self.metadata = []
         self._schema_version = SCHEMA_VERSION
+        if index_type is not None and index_type not in INDEX_TYPES:
+            raise ValueError(f"Onbekend index_type '{index_type}', kies uit {INDEX_TYPES}")
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.retrain_growth = retrain_growth
+        self.retrain_imbalance = retrain_imbalance
+        self.background_retrain = background_retrain
+        self._trained_on = 0
+        self._generation = 0  # verhoogd bij build(); oude retrains worden verworpen
+        self._disk_generation = 0  # generatie in de header; wijzigt bij elke write
+        self._disk_state = None    # (mtime_ns, size) van de header bij laatste check
+        self._lock = threading.RLock()
+        self._retrain_thread = None
+        self.persist_debounce = INDEX_PERSIST_DEBOUNCE
+        self._index_dirty = False   # faiss.index op disk loopt achter
+        self._persist_timer = None
 
     @staticmethod
     def _hash(text: str) -> str:
@@ -61,26 +194,82 @@ class IndexStore:
             if "hash" not in m:
                 m["hash"] = self._hash(m.get("text", ""))
 
+        with self._lock:
+            self._adopt_header_settings(self._read_header())
+            self.index = self._create_index(vectors)
+            self._trained_on = self.index.ntotal
+            self._generation += 1
+            self._save(vectors, metadata)
+
+    def _resolved_type(self) -> str:
+        """Index familie: expliciet, anders uit Config."""
+        index_type = self.index_type or Config.INDEX_TYPE
+        if index_type not in INDEX_TYPES:
+            logger.warning("Onbekend INDEX_TYPE '%s' — ivf_flat gebruikt", index_type)
+            return "ivf_flat"
+        return index_type
+
+    @staticmethod
+    def _pq_m(dim: int) -> int:
+        """Aantal PQ sub-quantisers: Config.INDEX_PQ_M of de grootste deler <= dim/4."""
+        m = Config.INDEX_PQ_M or max(1, dim // 4)
+        while m > 1 and dim % m:
+            m -= 1
+        return m
+
+    def _factory_string(self, dim: int, n: int) -> str:
+        """faiss.index_factory string voor de gekozen familie."""
+        index_type = self._resolved_type()
+        # Use flat index for small datasets (en voor expliciet 'flat')
+        if index_type == "flat" or n < _IVF_MIN:
+            return "Flat"
+        if index_type == "hnsw":
+            return f"HNSW{Config.INDEX_HNSW_M},Flat"
+        nlist = min(n // 4, 1024)
+        if index_type == "ivf_pq":
+            return f"IVF{nlist},PQ{self._pq_m(dim)}"
+        if index_type == "ivf_sq8":
+            return f"IVF{nlist},SQ8"
+        return f"IVF{nlist},Flat"
+
+    def _create_index(self, vectors: np.ndarray) -> "faiss.Index":
+        """Maak, train en vul een nieuwe FAISS index."""
         dim = vectors.shape[1]
         n = vectors.shape[0]
+        index = faiss.index_factory(dim, self._factory_string(dim, n), faiss.METRIC_L2)
+        if not index.is_trained:
+            index.train(vectors)
+        index.add(vectors)
+        return index
 
-        # Use flat index for small datasets, IVF for larger
-        if n < 256:
-            self.index = faiss.IndexFlatL2(dim)
-        else:
-            nlist = min(n // 4, 1024)
-            self.index = faiss.index_factory(dim, f"IVF{nlist},Flat", faiss.METRIC_L2)
-            self.index.train(vectors)
+    @staticmethod
+    def _family(index: "faiss.Index") -> str:
+        """'ivf', 'hnsw' of 'flat' voor een bestaande index."""
+        if isinstance(index, faiss.IndexHNSW):
+            return "hnsw"
+        try:
+            faiss.extract_index_ivf(index)
+            return "ivf"
+        except Exception:
+            return "flat"
 
-        self.index.add(vectors)
-        self.metadata = metadata
-        self._vectors = vectors
-        self._save()
+    def _apply_search_params(self, nprobe: int = None, ef_search: int = None) -> None:
+        """Zet nprobe / efSearch op de index (operating point)."""
+        family = self._family(self.index)
+        if family == "ivf":
+            ivf = faiss.extract_index_ivf(self.index)
+            ivf.nprobe = max(1, min(nprobe or self.nprobe or Config.INDEX_NPROBE, ivf.nlist))
+        elif family == "hnsw":
+            self.index.hnsw.efSearch = max(1, ef_search or self.ef_search or Config.INDEX_EF_SEARCH)
 
     def append(self, vectors: np.ndarray, metadata: list[dict]) -> None:
         """Append vectors + metadata to the existing index, or create a new one.
 
         Deduplicatie via MD5-hash: chunks die al bestaan worden geskipt.
+        Nieuwe vectoren gaan direct in de reeds getrainde index en alleen de
+        nieuwe rijen worden aan vectors.npy toegevoegd; faiss.index zelf
+        wordt lui geschreven (zie INDEX_PERSIST_DEBOUNCE). Een (achtergrond)
+        retrain volgt pas als groei of scheefheid de drempels overschrijdt.
         """
         # Zorg dat nieuwe chunks een hash hebben
         for m in metadata:
@@ -91,61 +280,235 @@ class IndexStore:
             self.build(vectors, metadata)
             return
 
-        self._load()
+        with self._lock:
+            self._load()
 
-        # Bestaande hashes ophalen
-        existing_hashes = {m.get("hash") for m in self.metadata if "hash" in m}
+            # Bestaande hashes ophalen (uit de hash-kolom, zonder records te lezen)
+            existing_hashes = self.metadata.hashes()
 
-        # Filter duplicaten
-        new_indices = [
-            i for i, m in enumerate(metadata)
-            if m["hash"] not in existing_hashes
-        ]
-        n_skipped = len(metadata) - len(new_indices)
+            # Filter duplicaten (ook binnen de nieuwe batch)
+            new_indices = []
+            for i, m in enumerate(metadata):
+                if m["hash"] not in existing_hashes:
+                    existing_hashes.add(m["hash"])
+                    new_indices.append(i)
+            n_skipped = len(metadata) - len(new_indices)
+
+            if not new_indices:
+                print(f"  {n_skipped} duplicaten geskipt, 0 nieuwe chunks")
+                return
+
+            new_vectors = np.ascontiguousarray(vectors[new_indices], dtype="float32")
+            if new_vectors.shape[1] != self.index.d:
+                raise ValueError(
+                    f"Dimensie mismatch: index={self.index.d}, nieuw={new_vectors.shape[1]}"
+                )
+
+            # Volgorde: data eerst, header als laatste (commit point).
+            # vectors.npy is de bron; faiss.index volgt lui.
+            self.index.add(new_vectors)
+            self._append_npy(self.vectors_path, new_vectors)
+            self._append_chunks([metadata[i] for i in new_indices])
+            self._write_header(len(self.metadata) + len(new_indices))
+            self._markeer_dirty()
 
-        if not new_indices:
-            print(f"  {n_skipped} duplicaten geskipt, 0 nieuwe chunks")
+            if n_skipped > 0:
+                print(f"  {n_skipped} duplicaten geskipt, {len(new_indices)} nieuwe chunks")
+            print(f"  Index uitgebreid: {self.index.ntotal} chunks totaal")
+
+            if self.needs_retrain():
+                self.retrain(background=self.background_retrain)
+
+    @staticmethod
+    def _append_npy(path: Path, rows: np.ndarray) -> None:
+        """Voeg rijen toe aan een .npy bestand zonder het te herschrijven.
+
+        Alleen de .npy header (shape) wordt in-place bijgewerkt; numpy
+        reserveert daar padding voor. Past de header niet, of klopt het
+        bestand niet met de verwachte layout, dan volgt een volledige rewrite.
+        """
+        if not path.exists():
+            np.save(path, rows)
             return
 
-        new_vectors = vectors[new_indices]
-        new_metadata = [metadata[i] for i in new_indices]
+        fmt = np.lib.format
+        with open(path, "r+b") as f:
+            version = fmt.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = fmt.read_array_header_1_0(f)
+                prefix = 10
+            else:
+                shape, fortran, dtype = fmt.read_array_header_2_0(f)
+                prefix = 12
+            data_start = f.tell()
+            f.seek(0, 2)
+            eind = f.tell()
+
+            layout_ok = (
+                not fortran and dtype == rows.dtype and len(shape) == rows.ndim
+                and tuple(shape[1:]) == rows.shape[1:]
+                and eind == data_start + int(np.prod(shape)) * dtype.itemsize
+            )
+            if layout_ok:
+                header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+                    fmt.dtype_to_descr(rows.dtype),
+                    (shape[0] + rows.shape[0],) + rows.shape[1:],
+                )
+                ruimte = data_start - prefix - 1  # laatste byte is '\n'
+                layout_ok = len(header) <= ruimte
+            if layout_ok:
+                f.seek(prefix)
+                f.write((header.ljust(ruimte) + "\n").encode("latin1"))
+                f.seek(eind)
+                f.write(np.ascontiguousarray(rows).tobytes())
+                return
+
+        logger.info("%s header past niet — volledige rewrite", path.name)
+        oud = np.load(path)
+        np.save(path, np.concatenate([oud.astype(rows.dtype), rows]))
+
+    def _write_chunks(self, metadata: list[dict], append: bool = False) -> None:
+        """Schrijf chunk records + offset- en hash-kolom.
 
-        old_vectors = np.load(self.vectors_path)
-        all_vectors = np.vstack([old_vectors, new_vectors]).astype("float32")
-        all_metadata = self.metadata + new_metadata
+        append=True voegt alleen de nieuwe records toe aan bestaande bestanden.
+        """
+        with open(self.chunks_path, "ab" if append else "wb") as f:
+            pos = f.tell()
+            offsets = [] if append else [0]
+            for m in metadata:
+                regel = (json.dumps(m, ensure_ascii=False) + "\n").encode("utf-8")
+                f.write(regel)
+                pos += len(regel)
+                offsets.append(pos)
+        offsets = np.asarray(offsets, dtype=np.uint64)
+        hashes = np.asarray([m.get("hash", "").encode() for m in metadata], dtype="S32")
+        if append:
+            self._append_npy(self.offsets_path, offsets)
+            self._append_npy(self.hashes_path, hashes)
+        else:
+            np.save(self.offsets_path, offsets)
+            np.save(self.hashes_path, hashes)
 
-        self.index = None  # Reset zodat build() een nieuwe index maakt
-        self.build(all_vectors, all_metadata)
-        if n_skipped > 0:
-            print(f"  {n_skipped} duplicaten geskipt, {len(new_indices)} nieuwe chunks")
-        print(f"  Index uitgebreid: {all_vectors.shape[0]} chunks totaal")
+    def _append_chunks(self, metadata: list[dict]) -> None:
+        """Voeg records toe; herschrijf eerst als de bestanden niet aansluiten.
+
+        Een afgebroken append kan records voorbij de header-count achterlaten;
+        die worden dan weggeschreven door de bestanden opnieuw op te bouwen.
+        """
+        bestaand = None
+        if not self.metadata.consistent():
+            logger.warning("IndexStore: chunk bestanden niet consistent — herschrijven")
+            bestaand = list(self.metadata)
+        self._close_view()
+        if bestaand is not None:
+            self._write_chunks(bestaand + metadata)
+        else:
+            self._write_chunks(metadata, append=True)
+
+    def _imbalance(self) -> float:
+        """Imbalance factor van de IVF inverted lists (1.0 = uniform)."""
+        try:
+            return float(faiss.extract_index_ivf(self.index).invlists.imbalance_factor())
+        except Exception as e:
+            logger.debug("Imbalance factor niet beschikbaar: %s", e)
+            return 1.0
+
+    def needs_retrain(self) -> bool:
+        """True als groei of list-scheefheid een nieuwe training rechtvaardigt."""
+        with self._lock:
+            self._load()
+            n = self.index.ntotal
+            family = self._family(self.index)
+            if family == "hnsw":
+                return False  # HNSW groeit incrementeel, geen quantiser
+            if family == "flat":
+                # Flat index groeit door naar de gekozen familie
+                return self._resolved_type() != "flat" and n >= _IVF_MIN
+            if self._trained_on and n >= self._trained_on * self.retrain_growth:
+                return True
+            return self._imbalance() > self.retrain_imbalance
+
+    def retrain(self, background: bool = False) -> None:
+        """Train de index opnieuw op alle vectoren in vectors.npy.
+
+        Op de achtergrond wordt een nieuwe index gebouwd terwijl search en
+        append op de oude doorlopen; vectoren die intussen zijn toegevoegd
+        worden vóór de swap alsnog in de nieuwe index gezet.
+        """
+        with self._lock:
+            self._load()
+            if self._retrain_thread is not None and self._retrain_thread.is_alive():
+                return
+            n0 = self.index.ntotal
+            generation = self._generation
+            if not background:
+                self._retrain_worker(n0, generation)
+                return
+            self._retrain_thread = threading.Thread(
+                target=self._retrain_worker, args=(n0, generation),
+                name="IndexStoreRetrain", daemon=True,
+            )
+            self._retrain_thread.start()
+
+    def wait_for_retrain(self, timeout: float = None) -> bool:
+        """Wacht op een lopende achtergrond retrain. True als die klaar is."""
+        thread = self._retrain_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _retrain_worker(self, n0: int, generation: int) -> None:
+        """Bouw een nieuwe index op de eerste n0 vectoren en swap atomisch."""
+        try:
+            vectors = np.load(self.vectors_path, mmap_mode="r")
+            new_index = self._create_index(np.ascontiguousarray(vectors[:n0]))
+            del vectors
+            with self._lock:
+                if generation != self._generation:
+                    logger.info("Retrain verworpen: index is intussen opnieuw gebouwd")
+                    return
+                n = self.index.ntotal
+                if n > n0:
+                    extra = np.load(self.vectors_path, mmap_mode="r")[n0:n]
+                    new_index.add(np.ascontiguousarray(extra))
+                self.index = new_index
+                self._trained_on = n0  # gegroeide staart telt niet als training
+                self._write_index()
+                self._write_header(len(self.metadata))
+            logger.info("IndexStore retrain klaar: %d vectoren", n)
+        except Exception as e:
+            logger.warning("IndexStore retrain mislukt: %s", e)
 
     def search(self, query_vec: np.ndarray, k: int = 5) -> list[dict]:
         """Search the index and return results with metadata."""
-        self._load()
-        # Verhoog nprobe voor IVF indices zodat meer clusters doorzocht worden
-        if hasattr(self.index, "nprobe"):
-            self.index.nprobe = min(10, getattr(self.index, "nlist", 10))
-        k = min(k, self.index.ntotal)
-        D, I = self.index.search(query_vec, k)
+        return self.search_batch(np.atleast_2d(query_vec)[:1], k)[0]
+
+    def search_batch(self, query_vecs: np.ndarray, k: int = 5) -> list[list[dict]]:
+        """Search many query vectors in one FAISS call.
+
+        Args:
+            query_vecs: (n_queries, dim) float32 matrix.
+            k: Aantal resultaten per query.
 
+        Returns:
+            Per query een lijst met resultaten (zelfde vorm als search()).
+        """
+        query_vecs = np.ascontiguousarray(np.atleast_2d(query_vecs), dtype="float32")
+        with self._lock:
+            self._load()
+            # Operating point: nprobe (IVF) of efSearch (HNSW)
+            self._apply_search_params()
+            k = min(k, self.index.ntotal)
+            if k <= 0 or query_vecs.shape[0] == 0:
+                return [[] for _ in range(query_vecs.shape[0])]
+            D, I = self.index.search(query_vecs, k)
+            return [self._resultaten(D[q], I[q]) for q in range(query_vecs.shape[0])]
+
+    def _resultaten(self, distances: np.ndarray, indices: np.ndarray) -> list[dict]:
+        """Zet één rij FAISS (D, I) om naar resultaat-dicts met metadata."""
         results = []
-        for rank, idx in enumerate(I[0]):
-            """### Docstring
-
-Creates a list of result dictionaries from provided indices and distances.
-
-*   Iterates over the provided indices (`I[0]`) and their corresponding ranks.
-*   For each valid index, retrieves the associated metadata and distance (`D[0][rank]`).
-*   Constructs a result dictionary containing:
-    *   `rank`: The 1-based rank of the result.
-    *   `text`: The text associated with the result.
-    *   `source`: The source of the result.
-    *   `chunk`: The chunk of the result.
-    *   `hash`: The optional hash value of the result (defaults to an empty string).
-    *   `distance`: The distance of the result.
-
-Appends each result dictionary to the `results` list."""
+        for rank, idx in enumerate(indices):
             if idx < 0 or idx >= len(self.metadata):
                 continue
             meta = self.metadata[idx]
@@ -155,35 +518,259 @@ Appends each result dictionary to the `results` list."""
                 "source": meta["source"],
                 "chunk": meta["chunk"],
                 "hash": meta.get("hash", ""),
-                "distance": float(D[0][rank]),
+                "distance": float(distances[rank]),
             })
         return results
 
-    def _save(self) -> None:
+    def set_operating_point(self, nprobe: int = None, ef_search: int = None) -> None:
+        """Leg nprobe / efSearch vast voor deze store (persistent in de header)."""
+        with self._lock:
+            self._load()
+            if nprobe is not None:
+                self.nprobe = int(nprobe)
+            if ef_search is not None:
+                self.ef_search = int(ef_search)
+            self._write_header(len(self.metadata))
+
+    def _exact_knn(self, queries: np.ndarray, k: int, block: int = 65536) -> np.ndarray:
+        """Exacte L2 top-k over de memory-mapped vectoren, bloksgewijs."""
+        vectors = _mmap_npy(self.vectors_path)
+        q_norm = (queries ** 2).sum(axis=1, keepdims=True)
+        best_d = np.full((len(queries), 0), np.inf, dtype="float32")
+        best_i = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, vectors.shape[0], block):
+            blok = np.asarray(vectors[start:start + block], dtype="float32")
+            d = q_norm - 2.0 * queries @ blok.T + (blok ** 2).sum(axis=1)[None, :]
+            idx = np.arange(start, start + blok.shape[0])[None, :].repeat(len(queries), 0)
+            d = np.concatenate([best_d, d], axis=1)
+            idx = np.concatenate([best_i, idx], axis=1)
+            kk = min(k, d.shape[1])
+            part = np.argpartition(d, kk - 1, axis=1)[:, :kk]
+            best_d = np.take_along_axis(d, part, axis=1)
+            best_i = np.take_along_axis(idx, part, axis=1)
+        return best_i
+
+    def benchmark(self, queries: np.ndarray = None, k: int = 10,
+                  n_queries: int = 100, target_recall: float = 0.95,
+                  values: tuple = None) -> dict:
+        """Recall@k vs. latency sweep over nprobe (IVF) of efSearch (HNSW).
+
+        Args:
+            queries: (n, dim) query vectoren. Default: n_queries willekeurige
+                opgeslagen vectoren met een beetje ruis.
+            k: Recall@k tegen een exacte (brute-force) baseline.
+            n_queries: Aantal steekproef-queries als queries None is.
+            target_recall: Drempel voor het aanbevolen operating point.
+            values: Sweep waarden (default NPROBE_SWEEP / EF_SEARCH_SWEEP).
+
+        Returns:
+            Dict met per sweep-waarde recall en latency (ms/query) en het
+            snelste punt dat target_recall haalt onder "recommended"; dat
+            kan direct naar set_operating_point(**recommended).
+        """
+        with self._lock:
+            self._load()
+            if queries is None:
+                vectors = _mmap_npy(self.vectors_path)
+                rng = np.random.default_rng(0)
+                rows = np.sort(rng.choice(vectors.shape[0], min(n_queries, vectors.shape[0]),
+                                          replace=False))
+                queries = np.asarray(vectors[rows], dtype="float32")
+                queries = queries + rng.normal(0, 0.01 * queries.std(), queries.shape).astype("float32")
+            queries = np.ascontiguousarray(np.atleast_2d(queries), dtype="float32")
+            k = min(k, self.index.ntotal)
+
+            t0 = time.perf_counter()
+            exact = self._exact_knn(queries, k)
+            baseline_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+
+            family = self._family(self.index)
+            if family == "ivf":
+                param = "nprobe"
+                nlist = faiss.extract_index_ivf(self.index).nlist
+                values = [v for v in (values or NPROBE_SWEEP) if v <= nlist] or [nlist]
+            elif family == "hnsw":
+                param = "ef_search"
+                values = list(values or EF_SEARCH_SWEEP)
+            else:
+                param, values = None, [None]
+
+            sweep = []
+            for value in values:
+                self._apply_search_params(**({param: value} if param else {}))
+                t0 = time.perf_counter()
+                _, approx = self.index.search(queries, k)
+                latency_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+                hits = sum(len(set(a) & set(e)) for a, e in zip(approx.tolist(), exact.tolist()))
+                sweep.append({
+                    "param": param,
+                    "value": value,
+                    "recall": round(hits / (len(queries) * k), 4),
+                    "latency_ms": round(latency_ms, 4),
+                })
+            self._apply_search_params()  # herstel huidig operating point
+
+        haalbaar = [p for p in sweep if p["recall"] >= target_recall]
+        best = min(haalbaar, key=lambda p: p["latency_ms"]) if haalbaar else max(
+            sweep, key=lambda p: p["recall"])
+        return {
+            "index_type": type(self.index).__name__,
+            "k": k,
+            "n_queries": len(queries),
+            "baseline_ms": round(baseline_ms, 4),
+            "sweep": sweep,
+            "recommended": {best["param"]: best["value"]} if best["param"] else {},
+        }
+
+    def _save(self, vectors: np.ndarray, metadata: list[dict]) -> None:
         """Save."""
-        faiss.write_index(self.index, str(self.index_path))
+        self._write_index()
+        np.save(self.vectors_path, np.ascontiguousarray(vectors, dtype="float32"))
+        self._close_view()
+        self._write_chunks(metadata)
+        self._write_header(len(metadata))
+        self._schema_version = SCHEMA_VERSION
+        print(f"  Index opgeslagen: {self.store_dir}")
+
+    def _write_index(self) -> None:
+        """Schrijf de FAISS index atomisch naar disk (tmp + os.replace)."""
+        tmp = self.index_path.with_suffix(".index.tmp")
+        faiss.write_index(self.index, str(tmp))
+        os.replace(tmp, self.index_path)
+        self._index_dirty = False
+
+    def _markeer_dirty(self) -> None:
+        """Index op disk loopt achter; plan één write na de debounce (onder self._lock)."""
+        self._index_dirty = True
+        if self.persist_debounce <= 0:
+            self._write_index()
+            return
+        if self._persist_timer is None:
+            self._persist_timer = threading.Timer(self.persist_debounce, self._persist_na_debounce)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def _persist_na_debounce(self) -> None:
+        """Timer callback: schrijf de index als die nog dirty is."""
+        with self._lock:
+            self._persist_timer = None
+            try:
+                self.flush_index()
+            except Exception as e:
+                logger.warning("IndexStore: index schrijven mislukt: %s", e)
+
+    def flush_index(self) -> None:
+        """Schrijf faiss.index nu als die achterloopt op vectors.npy."""
+        with self._lock:
+            if self._index_dirty and self.index is not None:
+                self._write_index()
+
+    def close(self) -> None:
+        """Schrijf een dirty index weg en stop de debounce timer."""
+        with self._lock:
+            if self._persist_timer is not None:
+                self._persist_timer.cancel()
+                self._persist_timer = None
+            self.flush_index()
+            self._close_view()
+
+    def _herstel_index(self, count: int) -> None:
+        """Vul een achterlopende faiss.index aan uit vectors.npy.
+
+        Na een crash vóór de luie write (of een andere instantie die nog
+        niet schreef) bevat de index minder vectoren dan de header telt.
+        """
+        n = self.index.ntotal
+        vectors = _mmap_npy(self.vectors_path) if self.vectors_path.exists() else None
+        if vectors is None or vectors.shape[0] < count:
+            logger.warning("IndexStore: index (%d) loopt achter op header (%d), "
+                           "maar vectors.npy is te kort", n, count)
+            return
+        self.index.add(np.ascontiguousarray(vectors[n:count], dtype="float32"))
+        del vectors
+        logger.info("IndexStore: %d vectoren uit vectors.npy hersteld", count - n)
+        self._markeer_dirty()
+
+    def _write_header(self, count: int) -> None:
+        """Schrijf metadata.json (header) atomisch en heropen de chunk view.
+
+        De header is het commit point: count bepaalt hoeveel records geldig
+        zijn en generation laat andere instanties zien dat ze moeten herladen.
+        """
+        # Nooit onder een generatie van een andere instantie uitkomen
+        self._disk_generation = max(self._disk_generation,
+                                    self._read_header().get("generation", 0))
+        self._disk_generation += 1
         wrapper = {
             "schema_version": SCHEMA_VERSION,
-            "chunks": self.metadata,
+            "generation": self._disk_generation,
+            "count": count,
+            "trained_on": self._trained_on,
+            "index_type": self._resolved_type(),
+            "search_params": {"nprobe": self.nprobe, "efSearch": self.ef_search},
         }
-        with open(self.meta_path, "w", encoding="utf-8") as f:
-            """Writes a JSON object to a file.
-
- Args:
-  wrapper: The JSON object to be written.
- 
- Writes the JSON object to the file specified by `self.meta_path` in UTF-8 encoding, 
- ensuring that non-ASCII characters are preserved."""
-            json.dump(wrapper, f, ensure_ascii=False)
-        if hasattr(self, "_vectors"):
-            np.save(self.vectors_path, self._vectors)
-        self._schema_version = SCHEMA_VERSION
-        print(f"  Index opgeslagen: {self.store_dir}")
+        tmp = self.meta_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(wrapper, f)
+        os.replace(tmp, self.meta_path)
+        self._disk_state = self._header_state()
+        self._close_view()
+        self.metadata = _ChunkView(self.store_dir, count)
+
+    def _read_header(self) -> dict:
+        """Lees de v2 header ({} als die ontbreekt of een legacy formaat is)."""
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug("Header niet leesbaar: %s", e)
+            return {}
+        return raw if isinstance(raw, dict) and raw.get("schema_version", 0) >= 2 else {}
+
+    def _adopt_header_settings(self, header: dict) -> None:
+        """Neem index_type en operating point van de store over.
+
+        Expliciete constructor argumenten winnen van de header.
+        """
+        params = header.get("search_params") or {}
+        self.index_type = self.index_type or header.get("index_type")
+        self.nprobe = self.nprobe or params.get("nprobe")
+        self.ef_search = self.ef_search or params.get("efSearch")
+
+    def _close_view(self) -> None:
+        """Sluit de huidige chunk view (indien aanwezig)."""
+        if isinstance(self.metadata, _ChunkView):
+            self.metadata.close()
+
+    def _header_state(self) -> tuple:
+        """Goedkope fingerprint van de header: (mtime_ns, size)."""
+        try:
+            st = os.stat(self.meta_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _disk_changed(self) -> bool:
+        """True als een andere instantie een nieuwere generatie schreef."""
+        state = self._header_state()
+        if state is None or state == self._disk_state:
+            return False
+        self._disk_state = state
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return isinstance(raw, dict) and raw.get("generation") != self._disk_generation
 
     def _load(self) -> None:
-        """Load."""
+        """Laad de index één keer; herlaad alleen als de disk-generatie wijzigt."""
         if self.index is not None:
-            return
+            if not self._disk_changed():
+                return
+            logger.info("IndexStore: nieuwe generatie op disk — herladen")
+            self.index = None
+            self._index_dirty = False  # staart staat in vectors.npy; herstel hieronder
         if not self.index_path.exists():
             raise FileNotFoundError(
                 "Geen index gevonden. Draai eerst: danny index <directory>"
@@ -191,16 +778,32 @@ Appends each result dictionary to the `results` list."""
         self.index = faiss.read_index(str(self.index_path))
         with open(self.meta_path, "r", encoding="utf-8") as f:
             raw = json.load(f)
+        self._disk_state = self._header_state()
         # Backwards-compatible: plain list = schema v0, dict met schema_version = die versie
-        if isinstance(raw, list):
-            self.metadata = raw
-            self._schema_version = 0
-        elif isinstance(raw, dict) and "schema_version" in raw:
+        if isinstance(raw, dict) and raw.get("schema_version", 0) >= 2:
             self._schema_version = raw["schema_version"]
-            self.metadata = raw.get("chunks", [])
+            self._disk_generation = raw.get("generation", 0)
+            self._trained_on = raw.get("trained_on", 0) or self.index.ntotal
+            self._adopt_header_settings(raw)
+            self._close_view()
+            self.metadata = _ChunkView(self.store_dir, raw.get("count", 0))
+            if self.index.ntotal < raw.get("count", 0):
+                self._herstel_index(raw["count"])
         else:
-            self.metadata = raw if isinstance(raw, list) else []
-            self._schema_version = 0
+            if isinstance(raw, dict) and "schema_version" in raw:
+                self._schema_version = raw["schema_version"]
+                chunks = raw.get("chunks", [])
+                self._trained_on = raw.get("trained_on", 0)
+            else:
+                chunks = raw if isinstance(raw, list) else []
+                self._schema_version = 0
+            self._trained_on = self._trained_on or self.index.ntotal
+            # Eenmalige migratie naar v2: records naar chunks.jsonl, header klein
+            self._write_chunks(chunks)
+            self._write_header(len(chunks))
+            logger.info("IndexStore gemigreerd van schema v%d naar v%d",
+                        self._schema_version, SCHEMA_VERSION)
+            self._schema_version = SCHEMA_VERSION
         print(f"  Index geladen: {self.index.ntotal} chunks")
 
     def exists(self) -> bool:
@@ -225,12 +828,12 @@ Appends each result dictionary to the `results` list."""
 
         has_hashes = sum(1 for m in self.metadata if m.get("hash"))
 
-        # Index type detectie
+        # Index type detectie (IndexIVFPQ -> "IVFPQ", IndexFlatL2 -> "Flat")
         index_type = "Flat"
         try:
-            # IVF indices hebben een nlist attribuut via de quantizer
-            if hasattr(self.index, "nlist"):
-                index_type = "IVFFlat"
+            index_type = type(self.index).__name__.replace("Index", "", 1)
+            if index_type.startswith("Flat"):
+                index_type = "Flat"
         except Exception as e:
             logger.debug("Index type detectie mislukt: %s", e)
 
@@ -239,9 +842,12 @@ Appends each result dictionary to the `results` list."""
         if self.vectors_path.exists():
             vectors_size_mb = round(self.vectors_path.stat().st_size / (1024 * 1024), 2)
 
-        metadata_size_mb = 0.0
-        if self.meta_path.exists():
-            metadata_size_mb = round(self.meta_path.stat().st_size / (1024 * 1024), 2)
+        metadata_bytes = sum(
+            p.stat().st_size
+            for p in (self.meta_path, self.chunks_path, self.offsets_path, self.hashes_path)
+            if p.exists()
+        )
+        metadata_size_mb = round(metadata_bytes / (1024 * 1024), 2)
 
         return {
             "total_chunks": len(self.metadata),
@@ -253,6 +859,12 @@ Appends each result dictionary to the `results` list."""
             "index_type": index_type,
             "vectors_size_mb": vectors_size_mb,
             "metadata_size_mb": metadata_size_mb,
+            "trained_on": self._trained_on,
+            "imbalance": round(self._imbalance(), 3) if self._family(self.index) == "ivf" else 1.0,
+            "configured_type": self._resolved_type(),
+            "nprobe": self.nprobe or Config.INDEX_NPROBE,
+            "ef_search": self.ef_search or Config.INDEX_EF_SEARCH,
+            "retrain_running": bool(self._retrain_thread and self._retrain_thread.is_alive()),
         }
 
     def verify(self) -> dict:
@@ -264,8 +876,7 @@ Appends each result dictionary to the `results` list."""
         # 1. vectors.npy rijen == len(metadata)
         vectors_count = 0
         if self.vectors_path.exists():
-            vecs = np.load(self.vectors_path)
-            vectors_count = vecs.shape[0]
+            vectors_count = _mmap_npy(self.vectors_path).shape[0]
 
         meta_count = len(self.metadata)
         checks.append({
@@ -282,7 +893,14 @@ Appends each result dictionary to the `results` list."""
             "detail": f"vectors={vectors_count}, faiss={faiss_total}",
         })
 
-        # 3. Missing hashes (legacy entries)
+        # 3. Chunk kolommen sluiten aan op de header
+        checks.append({
+            "name": "chunk_columns",
+            "passed": self.metadata.consistent(),
+            "detail": f"{self.chunks_path.name} + offsets/hashes, count={meta_count}",
+        })
+
+        # 4. Missing hashes (legacy entries)
         missing_hashes = sum(1 for m in self.metadata if not m.get("hash"))
         checks.append({
             "name": "missing_hashes",
@@ -290,7 +908,7 @@ Appends each result dictionary to the `results` list."""
             "detail": f"{missing_hashes} chunks zonder hash",
         })
 
-        # 4. Duplicate hashes
+        # 5. Duplicate hashes
         from collections import Counter
         hash_counts = Counter(m.get("hash") for m in self.metadata if m.get("hash"))
         duplicate_hashes = sum(1 for h, c in hash_counts.items() if c > 1)
@@ -300,7 +918,7 @@ Appends each result dictionary to the `results` list."""
             "detail": f"{duplicate_hashes} hashes komen >1x voor",
         })
 
-        # 5. Empty texts
+        # 6. Empty texts
         empty_texts = sum(1 for m in self.metadata if not m.get("text", "").strip())
         checks.append({
             "name": "empty_texts",
@@ -308,7 +926,7 @@ Appends each result dictionary to the `results` list."""
             "detail": f"{empty_texts} chunks met lege tekst",
         })
 
-        # 6. Missing sources
+        # 7. Missing sources
         missing_sources = sum(1 for m in self.metadata if not m.get("source"))
         checks.append({
             "name": "missing_sources",
@@ -316,7 +934,7 @@ Appends each result dictionary to the `results` list."""
             "detail": f"{missing_sources} chunks zonder source",
         })
 
-        # 7. Schema versie
+        # 8. Schema versie
         checks.append({
             "name": "schema_version",
             "passed": self._schema_version >= SCHEMA_VERSION,
@@ -338,6 +956,9 @@ Appends each result dictionary to the `results` list."""
         """
         self._load()
         vectors = np.load(self.vectors_path)
+        materialised = list(self.metadata)  # materialiseer voor in-place fixes
+        self._close_view()
+        self.metadata = materialised
 
         old_schema = self._schema_version
         original_count = len(self.metadata)
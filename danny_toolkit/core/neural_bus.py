@@ -4,12 +4,14 @@ NeuralBus - Centraal Pub/Sub Event Systeem voor inter-app communicatie.
 Singleton event bus die apps laat communiceren via events.
 Thread-safe, met optionele UnifiedMemory persistentie.
 HMAC-SHA256 payload signing via OMEGA_BUS_SIGNING_KEY.
+Per subscriber een aflevermodus: inline, pool lane of async lane.
 
 Gebruik:
-    from danny_toolkit.core.neural_bus import get_bus, EventTypes
+    from danny_toolkit.core.neural_bus import get_bus, EventTypes, LANE_POOL
 
     bus = get_bus()
     bus.subscribe(EventTypes.HEALTH_STATUS_CHANGE, mijn_callback)
+    bus.subscribe(EventTypes.MISSION_STARTED, trage_callback, modus=LANE_POOL)
     bus.publish(EventTypes.WEATHER_UPDATE, {"stad": "Amsterdam", "temp": 12})
 """
 
@@ -17,7 +19,9 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import heapq
 import hmac
+import itertools
 import json
 import logging
 import os
@@ -54,6 +58,8 @@ _AEGIS_STATS = {
     "nonce_rejections": 0,
     "replay_attempts": 0,
     "valid_seals": 0,
+    "trusted_seals": 0,   # in-process fast path (geen her-HMAC)
+    "batch_verifies": 0,  # verify_batch() aanroepen
 }
 _AEGIS_STATS_LOCK = threading.Lock()
 
@@ -215,21 +221,37 @@ class OmegaSeal:
         Returns:
             (seal_hex, timestamp, nonce) — of ("", 0.0, "") als key ontbreekt.
         """
+        seal, ts, nonce, _ = cls.seal(payload)
+        return seal, ts, nonce
+
+    @staticmethod
+    def canoniek(payload: dict, aegis_ts: float = 0.0,
+                 aegis_nonce: str = "") -> bytes:
+        """Canonieke signing-bytes: payload + Aegis velden, gesorteerd JSON."""
+        sign_data = dict(payload)
+        if aegis_ts > 0.0:
+            sign_data["_aegis_ts"] = aegis_ts
+        if aegis_nonce:
+            sign_data["_aegis_nonce"] = aegis_nonce
+        return json.dumps(sign_data, sort_keys=True, default=str).encode("utf-8")
+
+    @classmethod
+    def seal(cls, payload: dict) -> tuple[str, float, str, bytes]:
+        """Als sign_payload(), plus de canonieke bytes voor hergebruik.
+
+        Returns:
+            (seal_hex, timestamp, nonce, canonical) — of ("", 0.0, "", b"")
+            als key ontbreekt.
+        """
         key = cls._load_key()
         if not key:
-            return "", 0.0, ""
+            return "", 0.0, "", b""
 
         ts = _time.time()
         nonce = _secrets.token_hex(8)
-
-        # Bouw de canonieke signing-payload (payload + Aegis velden)
-        sign_data = dict(payload)
-        sign_data["_aegis_ts"] = ts
-        sign_data["_aegis_nonce"] = nonce
-
-        canonical = json.dumps(sign_data, sort_keys=True, default=str)
-        seal = hmac.new(key, canonical.encode("utf-8"), hashlib.sha256).hexdigest()
-        return seal, ts, nonce
+        canonical = cls.canoniek(payload, ts, nonce)
+        seal = hmac.new(key, canonical, hashlib.sha256).hexdigest()
+        return seal, ts, nonce, canonical
 
     @classmethod
     def sign_payload_legacy(cls, payload: dict) -> str:
@@ -248,7 +270,9 @@ class OmegaSeal:
 
     @classmethod
     def verify(cls, payload: dict, seal: str,
-               aegis_ts: float = 0.0, aegis_nonce: str = "") -> bool:
+               aegis_ts: float = 0.0, aegis_nonce: str = "",
+               canonical: Optional[bytes] = None,
+               consume_nonce: bool = True) -> bool:
         """Verifieer een omega_seal met 3-laags Aegis anti-replay.
 
         Layer 1: Payload Binding — HMAC over payload+ts+nonce
@@ -262,6 +286,10 @@ class OmegaSeal:
             seal:        De hex-encoded HMAC handtekening.
             aegis_ts:    De timestamp waarmee gesigned is.
             aegis_nonce: De nonce waarmee gesigned is.
+            canonical:   Reeds bekende canonieke bytes (bespaart de
+                         json.dumps); None = opnieuw opbouwen uit payload.
+            consume_nonce: False = nonce wel in de HMAC, maar niet in de
+                         ledger (self-check bij publicatie).
 
         Returns:
             True als alle 3 lagen slagen. False bij elke overtreding.
@@ -273,73 +301,171 @@ class OmegaSeal:
         if not key:
             return False
 
-        # ── Layer 2: Micro-TTL ──
-        if aegis_ts > 0.0:
-            age = _time.time() - aegis_ts
-            if age > AEGIS_TTL_SECONDS:
-                with _AEGIS_STATS_LOCK:
-                    _AEGIS_STATS["ttl_rejections"] += 1
-                    _AEGIS_STATS["replay_attempts"] += 1
-                logger.warning(
-                    "[AEGIS] Token EXPIRED — age=%.3fs > TTL=%.1fs. "
-                    "Mogelijke Replay Attack.",
-                    age, AEGIS_TTL_SECONDS,
-                )
-                return False
-            if age < -1.0:
-                with _AEGIS_STATS_LOCK:
-                    _AEGIS_STATS["ttl_rejections"] += 1
-                    _AEGIS_STATS["replay_attempts"] += 1
-                logger.warning(
-                    "[AEGIS] Token FUTURE timestamp — age=%.3fs. "
-                    "Clock manipulation detected.",
-                    age,
-                )
-                return False
+        if not cls._check_ttl(aegis_ts):
+            return False
+        if consume_nonce and not cls._verbruik_nonce(aegis_nonce):
+            return False
 
-        # ── Layer 3: Nonce Ledger ──
-        if aegis_nonce:
+        # ── Layer 1: Payload Binding (HMAC verificatie) ──
+        if canonical is None:
+            canonical = cls.canoniek(payload, aegis_ts, aegis_nonce)
+        if not cls._hmac_klopt(key, canonical, seal):
+            return False
+
+        with _AEGIS_STATS_LOCK:
+            _AEGIS_STATS["valid_seals"] += 1
+        return True
+
+    @classmethod
+    def verify_vertrouwd(cls, aegis_ts: float, aegis_nonce: str = "") -> bool:
+        """Fast path voor events die dit proces zelf gesigned heeft.
+
+        Het zegel is net met de eigen key over de gecachte canonieke bytes
+        berekend; opnieuw serialiseren en HMAC'en bewijst niets nieuws.
+        TTL en nonce ledger (Layer 2+3) blijven wel gelden.
+        """
+        if not cls._check_ttl(aegis_ts) or not cls._verbruik_nonce(aegis_nonce):
+            return False
+        with _AEGIS_STATS_LOCK:
+            _AEGIS_STATS["valid_seals"] += 1
+            _AEGIS_STATS["trusted_seals"] += 1
+        return True
+
+    @classmethod
+    def verify_batch(cls, items: List[tuple],
+                     consume_nonce: bool = True) -> List[bool]:
+        """Verifieer een batch zegels van buiten dit proces.
+
+        Eén key load, één nonce-ledger lock en één stats update voor de
+        hele batch; de HMAC gaat over de meegestuurde canonieke bytes,
+        zodat er niets opnieuw geserialiseerd wordt.
+
+        Args:
+            items: Lijst van (canonical_bytes, seal, aegis_ts, aegis_nonce).
+            consume_nonce: Nonces registreren in de ledger (en duplicaten
+                binnen de batch weigeren).
+
+        Returns:
+            Per item True/False, in dezelfde volgorde.
+        """
+        key = cls._load_key()
+        if not key:
+            return [False] * len(items)
+
+        nu = _time.time()
+        uitslag = []
+        for canonical, seal, aegis_ts, _nonce in items:
+            leeftijd = nu - aegis_ts if aegis_ts > 0.0 else 0.0
+            uitslag.append(
+                bool(seal) and -1.0 <= leeftijd <= AEGIS_TTL_SECONDS
+            )
+        ttl_weg = sum(1 for ok, item in zip(uitslag, items) if not ok and item[1])
+
+        nonce_weg = 0
+        if consume_nonce:
             with _NONCE_LOCK:
-                if aegis_nonce in _NONCE_SET:
-                    _AEGIS_STATS["nonce_rejections"] += 1
-                    _AEGIS_STATS["replay_attempts"] += 1
-                    logger.warning(
-                        "[AEGIS] Token DUPLICATIE — nonce '%s' is al gebruikt. "
-                        "Replay Attack geblokkeerd.",
-                        aegis_nonce[:8],
-                    )
-                    return False
-                # Registreer nonce in ledger
-                if len(_NONCE_LEDGER) >= AEGIS_NONCE_LEDGER_SIZE:
-                    evicted = _NONCE_LEDGER[0]
-                    _NONCE_SET.discard(evicted)
-                _NONCE_LEDGER.append(aegis_nonce)
-                _NONCE_SET.add(aegis_nonce)
+                for i, (_, _, _, nonce) in enumerate(items):
+                    if not uitslag[i] or not nonce:
+                        continue
+                    if nonce in _NONCE_SET:
+                        uitslag[i] = False
+                        nonce_weg += 1
+                        continue
+                    if len(_NONCE_LEDGER) >= AEGIS_NONCE_LEDGER_SIZE:
+                        _NONCE_SET.discard(_NONCE_LEDGER[0])
+                    _NONCE_LEDGER.append(nonce)
+                    _NONCE_SET.add(nonce)
+
+        hmac_weg = 0
+        for i, (canonical, seal, _, _) in enumerate(items):
+            if uitslag[i] and not hmac.compare_digest(
+                hmac.new(key, canonical, hashlib.sha256).hexdigest(), seal,
+            ):
+                uitslag[i] = False
+                hmac_weg += 1
 
-        # ── Layer 1: Payload Binding (HMAC verificatie) ──
-        sign_data = dict(payload)
-        if aegis_ts > 0.0:
-            sign_data["_aegis_ts"] = aegis_ts
-        if aegis_nonce:
-            sign_data["_aegis_nonce"] = aegis_nonce
+        with _AEGIS_STATS_LOCK:
+            _AEGIS_STATS["batch_verifies"] += 1
+            _AEGIS_STATS["ttl_rejections"] += ttl_weg
+            _AEGIS_STATS["nonce_rejections"] += nonce_weg
+            _AEGIS_STATS["replay_attempts"] += ttl_weg + nonce_weg + hmac_weg
+            _AEGIS_STATS["valid_seals"] += sum(uitslag)
+        if ttl_weg or nonce_weg or hmac_weg:
+            logger.warning(
+                "[AEGIS] Batch: %d/%d geweigerd (ttl=%d nonce=%d hmac=%d)",
+                ttl_weg + nonce_weg + hmac_weg, len(items),
+                ttl_weg, nonce_weg, hmac_weg,
+            )
+        return uitslag
 
-        canonical = json.dumps(sign_data, sort_keys=True, default=str)
-        expected = hmac.new(key, canonical.encode("utf-8"), hashlib.sha256).hexdigest()
+    # ── Aegis lagen (gedeeld door verify / verify_vertrouwd) ──
 
-        if not hmac.compare_digest(expected, seal):
+    @staticmethod
+    def _check_ttl(aegis_ts: float) -> bool:
+        """Layer 2: Micro-TTL."""
+        if aegis_ts <= 0.0:
+            return True
+        age = _time.time() - aegis_ts
+        if age > AEGIS_TTL_SECONDS:
+            with _AEGIS_STATS_LOCK:
+                _AEGIS_STATS["ttl_rejections"] += 1
+                _AEGIS_STATS["replay_attempts"] += 1
+            logger.warning(
+                "[AEGIS] Token EXPIRED — age=%.3fs > TTL=%.1fs. "
+                "Mogelijke Replay Attack.",
+                age, AEGIS_TTL_SECONDS,
+            )
+            return False
+        if age < -1.0:
             with _AEGIS_STATS_LOCK:
+                _AEGIS_STATS["ttl_rejections"] += 1
                 _AEGIS_STATS["replay_attempts"] += 1
             logger.warning(
-                "[AEGIS] HMAC MISMATCH — payload is gewijzigd of seal is gestolen. "
-                "Verwacht: %s...  Ontvangen: %s...",
-                expected[:12], seal[:12],
+                "[AEGIS] Token FUTURE timestamp — age=%.3fs. "
+                "Clock manipulation detected.",
+                age,
             )
             return False
+        return True
 
-        with _AEGIS_STATS_LOCK:
-            _AEGIS_STATS["valid_seals"] += 1
+    @staticmethod
+    def _verbruik_nonce(aegis_nonce: str) -> bool:
+        """Layer 3: Nonce Ledger (leeg = niet consumeren)."""
+        if not aegis_nonce:
+            return True
+        with _NONCE_LOCK:
+            if aegis_nonce in _NONCE_SET:
+                _AEGIS_STATS["nonce_rejections"] += 1
+                _AEGIS_STATS["replay_attempts"] += 1
+                logger.warning(
+                    "[AEGIS] Token DUPLICATIE — nonce '%s' is al gebruikt. "
+                    "Replay Attack geblokkeerd.",
+                    aegis_nonce[:8],
+                )
+                return False
+            # Registreer nonce in ledger
+            if len(_NONCE_LEDGER) >= AEGIS_NONCE_LEDGER_SIZE:
+                evicted = _NONCE_LEDGER[0]
+                _NONCE_SET.discard(evicted)
+            _NONCE_LEDGER.append(aegis_nonce)
+            _NONCE_SET.add(aegis_nonce)
         return True
 
+    @staticmethod
+    def _hmac_klopt(key: bytes, canonical: bytes, seal: str) -> bool:
+        """Layer 1: HMAC vergelijking (timing-safe)."""
+        expected = hmac.new(key, canonical, hashlib.sha256).hexdigest()
+        if hmac.compare_digest(expected, seal):
+            return True
+        with _AEGIS_STATS_LOCK:
+            _AEGIS_STATS["replay_attempts"] += 1
+        logger.warning(
+            "[AEGIS] HMAC MISMATCH — payload is gewijzigd of seal is gestolen. "
+            "Verwacht: %s...  Ontvangen: %s...",
+            expected[:12], seal[:12],
+        )
+        return False
+
     @classmethod
     def is_armed(cls) -> bool:
         """Check of de signing key geladen is."""
@@ -406,11 +532,18 @@ def verified_callback(callback: Callable) -> Callable:
 
 
 class BusEvent:
-    """Representatie van een event op de bus met Aegis anti-replay."""
+    """Representatie van een event op de bus met Aegis anti-replay.
+
+    Sign-once: de canonieke bytes van het zegel worden bij creatie bewaard.
+    Een event dat dit proces zelf gesigned heeft (zelfde key) hoeft bij
+    verify_seal() niet opnieuw geserialiseerd en ge-HMAC'd te worden; events
+    van buiten (uit_zegel) verifiëren over hun meegestuurde bytes.
+    """
 
     __slots__ = (
         "event_type", "data", "bron", "timestamp",
         "omega_seal", "_aegis_ts", "_aegis_nonce",
+        "_canonical", "_sleutel", "seq", "herkomst",
     )
 
     def __init__(
@@ -430,12 +563,67 @@ class BusEvent:
         self.data = data
         self.bron = bron
         self.timestamp = datetime.now()
-        # Protocol Aegis: sign met timestamp + nonce (anti-replay)
+        self.seq = 0  # volgnummer op de bus, gezet bij publicatie
+        self.herkomst = ""  # peer naam als het event uit een ander proces kwam
         seal_payload = {"event_type": event_type, "data": data, "bron": bron}
-        seal, ts, nonce = OmegaSeal.sign_payload(seal_payload)
+        seal, ts, nonce, canonical = OmegaSeal.seal(seal_payload)
         self.omega_seal = seal
         self._aegis_ts = ts
         self._aegis_nonce = nonce
+        self._canonical = canonical
+        # Key waarmee dit proces het zegel zette (None = extern/ongesigned)
+        self._sleutel = OmegaSeal._key if seal else None
+
+    @classmethod
+    def uit_zegel(cls, canonical: bytes, omega_seal: str) -> "BusEvent":
+        """Reconstrueer een extern gesigned event uit zijn canonieke bytes.
+
+        Alle velden komen uit de gesignde bytes zelf, zodat de HMAC precies
+        dekt wat de subscribers te zien krijgen. Er wordt niet opnieuw
+        gesigned; verifiëren gaat via verify_seal() of OmegaSeal.verify_batch().
+
+        Raises:
+            ValueError: Als de bytes geen geldig event-payload zijn.
+        """
+        try:
+            velden = json.loads(canonical)
+            event_type = velden["event_type"]
+            data = velden["data"]
+            bron = velden["bron"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Ongeldig gezegeld event: {e}") from e
+        event = cls.__new__(cls)
+        event.event_type = event_type
+        event.data = data
+        event.bron = bron
+        event.timestamp = datetime.now()
+        event.omega_seal = omega_seal
+        event._aegis_ts = float(velden.get("_aegis_ts", 0.0))
+        event._aegis_nonce = str(velden.get("_aegis_nonce", ""))
+        event._canonical = bytes(canonical)
+        event._sleutel = None
+        event.seq = 0
+        event.herkomst = ""
+        return event
+
+    def zegel(self) -> tuple[bytes, str]:
+        """(canonical, omega_seal) — alles wat een ander proces nodig heeft."""
+        return self.canonical, self.omega_seal
+
+    @property
+    def canonical(self) -> bytes:
+        """Canonieke signing-bytes (gecachet; opgebouwd als ze ontbreken)."""
+        if not self._canonical:
+            self._canonical = OmegaSeal.canoniek(
+                {"event_type": self.event_type, "data": self.data,
+                 "bron": self.bron},
+                self._aegis_ts, self._aegis_nonce,
+            )
+        return self._canonical
+
+    def is_lokaal(self) -> bool:
+        """True als dit proces het zegel met zijn huidige key zette."""
+        return self._sleutel is not None and self._sleutel is OmegaSeal._key
 
     def verify_seal(self, consume_nonce: bool = True) -> bool:
         """Verifieer het omega_seal met 3-laags Aegis anti-replay.
@@ -444,6 +632,8 @@ class BusEvent:
         Layer 2: Micro-TTL        — Event ouder dan 2s → geweigerd
         Layer 3: Nonce Ledger     — Dubbele nonce → geweigerd
 
+        Lokaal gesigned events nemen de fast path: alleen Layer 2+3.
+
         Args:
             consume_nonce: Als True, wordt de nonce geregistreerd in de
                 ledger (standaard bij ontvangst). Als False, wordt alleen
@@ -451,15 +641,18 @@ class BusEvent:
                 self-check bij publicatie — voorkomt dat de eerste
                 verify het nonce al opmaakt).
         """
-        seal_payload = {
-            "event_type": self.event_type,
-            "data": self.data,
-            "bron": self.bron,
-        }
+        if not self.omega_seal:
+            return False
+        if self.is_lokaal():
+            return OmegaSeal.verify_vertrouwd(
+                self._aegis_ts, self._aegis_nonce if consume_nonce else "",
+            )
         return OmegaSeal.verify(
-            seal_payload, self.omega_seal,
+            {}, self.omega_seal,
             aegis_ts=self._aegis_ts,
-            aegis_nonce=self._aegis_nonce if consume_nonce else "",
+            aegis_nonce=self._aegis_nonce,
+            canonical=self.canonical,
+            consume_nonce=consume_nonce,
         )
 
     def to_dict(self) -> dict:
@@ -473,6 +666,241 @@ class BusEvent:
         }
 
 
+# ═══════════════════════════════════════════════════════════════
+#  DISPATCH LANES — per-subscriber aflevering
+# ═══════════════════════════════════════════════════════════════
+#  inline  callback op de thread van de publisher (oud gedrag)
+#  pool    eigen begrensde wachtrij, geleegd door de gedeelde "bus" pool
+#  async   eigen begrensde wachtrij, geleegd op een vaste achtergrond-loop
+#
+#  Vol wachtrij: drop_oudste (default), drop_nieuwste, of blokkeer
+#  (publisher wacht max. blokkeer_timeout_s, daarna drop_nieuwste).
+
+LANE_INLINE = "inline"
+LANE_POOL = "pool"
+LANE_ASYNC = "async"
+_LANE_MODI = (LANE_INLINE, LANE_POOL, LANE_ASYNC)
+
+BELEID_DROP_OUDSTE = "drop_oudste"
+BELEID_DROP_NIEUWSTE = "drop_nieuwste"
+BELEID_BLOKKEER = "blokkeer"
+_LANE_BELEID = (BELEID_DROP_OUDSTE, BELEID_DROP_NIEUWSTE, BELEID_BLOKKEER)
+
+_LANE_BATCH = 64  # max events per drain-beurt (eerlijkheid tussen lanes)
+
+
+class _AsyncLaanLoop:
+    """Eén achtergrond event loop voor alle async lanes van een bus."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Start de loop-thread bij eerste gebruik."""
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="neuralbus-async",
+                    daemon=True,
+                ).start()
+                self._loop = loop
+        return self._loop
+
+
+class _Laan:
+    """Aflevering aan één subscriber: modus, begrensde wachtrij en counters."""
+
+    def __init__(
+        self,
+        bus: "NeuralBus",
+        event_type: str,
+        callback: Callable,
+        modus: str = LANE_INLINE,
+        max_wachtrij: int = 1000,
+        beleid: str = BELEID_DROP_OUDSTE,
+        blokkeer_timeout_s: float = 1.0,
+        telt_mee: bool = True,
+    ) -> None:
+        self.bus = bus
+        self.event_type = event_type
+        self.callback = callback
+        self.naam = getattr(callback, "__qualname__", repr(callback))
+        self.modus = modus
+        self.max_wachtrij = max(int(max_wachtrij), 1)
+        self.beleid = beleid
+        self.blokkeer_timeout_s = blokkeer_timeout_s
+        self.telt_mee = telt_mee  # False: niet in events_afgeleverd/fouten
+        self.actief = True
+        self._wachtrij: Deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self._bezig = False
+        self.afgeleverd = 0
+        self.fouten = 0
+        self.gedropt = 0
+        self.max_backlog = 0
+        self._latency_ms_totaal = 0.0
+        self.latency_ms_max = 0.0
+
+    # ── plaatsen ──
+
+    def plaats(self, event: "BusEvent") -> None:
+        """Lever af (inline) of zet in de wachtrij volgens het beleid."""
+        t_in = _time.perf_counter()
+        if self.modus == LANE_INLINE:
+            self._lever(event, t_in)
+            return
+        with self._cond:
+            if len(self._wachtrij) >= self.max_wachtrij:
+                if self.beleid == BELEID_DROP_OUDSTE:
+                    self._wachtrij.popleft()
+                    self.gedropt += 1
+                elif self.beleid == BELEID_BLOKKEER:
+                    # Backpressure: wacht op ruimte, daarna alsnog droppen
+                    self._cond.wait_for(
+                        lambda: len(self._wachtrij) < self.max_wachtrij,
+                        timeout=self.blokkeer_timeout_s,
+                    )
+                    if len(self._wachtrij) >= self.max_wachtrij:
+                        self.gedropt += 1
+                        return
+                else:
+                    self.gedropt += 1
+                    return
+            self._wachtrij.append((event, t_in))
+            if len(self._wachtrij) > self.max_backlog:
+                self.max_backlog = len(self._wachtrij)
+            if self._bezig:
+                return
+            self._bezig = True
+        self._plan_drain()
+
+    def _plan_drain(self) -> None:
+        """Laat de wachtrij leeglopen op de pool of de async loop."""
+        try:
+            if self.modus == LANE_ASYNC:
+                asyncio.run_coroutine_threadsafe(
+                    self._drain_async(), self.bus._async_lanes.loop(),
+                )
+            else:
+                from danny_toolkit.core.workload_pools import BUS, get_pool
+                get_pool(BUS).submit(self._drain)
+        except Exception as e:
+            logger.debug("NeuralBus lane %s niet te plannen: %s", self.naam, e)
+            with self._cond:
+                self._bezig = False
+
+    def _volgende(self) -> Optional[tuple]:
+        """Pak het volgende event, of meld de lane als leeg (niet bezig)."""
+        with self._cond:
+            if not self.actief:
+                self._wachtrij.clear()
+            if not self._wachtrij:
+                self._bezig = False
+                self._cond.notify_all()
+                return None
+            item = self._wachtrij.popleft()
+            self._cond.notify_all()
+            return item
+
+    # ── leegmaken ──
+
+    def _drain(self) -> None:
+        """Pool worker: lever tot _LANE_BATCH events af, plan zo nodig opnieuw."""
+        for _ in range(_LANE_BATCH):
+            item = self._volgende()
+            if item is None:
+                return
+            self._lever(*item)
+        self._plan_drain()
+
+    async def _drain_async(self) -> None:
+        """Async lane: zelfde als _drain, maar op de achtergrond-loop."""
+        for _ in range(_LANE_BATCH):
+            item = self._volgende()
+            if item is None:
+                return
+            event, t_in = item
+            try:
+                resultaat = self.callback(event)
+                if asyncio.iscoroutine(resultaat):
+                    await resultaat
+                self._meet(t_in, fout=None)
+            except Exception as e:
+                self._meet(t_in, fout=e)
+        self._plan_drain()
+
+    def _lever(self, event: "BusEvent", t_in: float) -> None:
+        """Roep de callback aan (sync of coroutine) en meet latency."""
+        cb = self.callback
+        try:
+            if asyncio.iscoroutinefunction(cb):
+                # Async callback — dispatch via event loop
+                try:
+                    loop = asyncio.get_running_loop()
+                    loop.create_task(self.bus._safe_async_dispatch(cb, event))
+                except RuntimeError:
+                    # Geen actieve loop — run blocking (safe)
+                    try:
+                        asyncio.run(cb(event))
+                    except RuntimeError:
+                        logger.debug("Async callback kon niet starten: geen event loop")
+            else:
+                cb(event)
+            self._meet(t_in, fout=None)
+        except Exception as e:
+            self._meet(t_in, fout=e)
+
+    def _meet(self, t_in: float, fout: Optional[Exception]) -> None:
+        """Latency (publish -> klaar) en bus-counters bijwerken."""
+        latency_ms = (_time.perf_counter() - t_in) * 1000
+        with self._cond:
+            self._latency_ms_totaal += latency_ms
+            if latency_ms > self.latency_ms_max:
+                self.latency_ms_max = latency_ms
+            if fout is None:
+                self.afgeleverd += 1
+            else:
+                self.fouten += 1
+        if self.telt_mee:
+            with self.bus._lock:
+                if fout is None:
+                    self.bus._stats["events_afgeleverd"] += 1
+                else:
+                    self.bus._stats["fouten"] += 1
+        if fout is not None:
+            logger.debug("Event callback fout (%s): %s", self.naam, fout)
+
+    # ── status ──
+
+    def is_leeg(self) -> bool:
+        """Geen backlog en geen drain bezig."""
+        with self._cond:
+            return not self._wachtrij and not self._bezig
+
+    def stats(self) -> dict:
+        """Counters voor NeuralBus.statistieken()."""
+        with self._cond:
+            klaar = max(self.afgeleverd + self.fouten, 1)
+            return {
+                "subscriber": self.naam,
+                "event_type": self.event_type,
+                "modus": self.modus,
+                "beleid": self.beleid,
+                "max_wachtrij": self.max_wachtrij,
+                "backlog": len(self._wachtrij),
+                "max_backlog": self.max_backlog,
+                "afgeleverd": self.afgeleverd,
+                "fouten": self.fouten,
+                "gedropt": self.gedropt,
+                "latency_ms_gem": round(self._latency_ms_totaal / klaar, 2),
+                "latency_ms_max": round(self.latency_ms_max, 2),
+            }
+
+
 class NeuralBus:
     """
     Centraal event bus systeem.
@@ -482,6 +910,7 @@ class NeuralBus:
     """
 
     _MAX_HISTORY = 100  # events per type
+    _MAX_TIJDLIJN = 2000  # events in de globale tijdlijn (alle types)
     _MAX_CHAIN_DEPTH = 5  # agent-to-agent recursion limit
 
     def __init__(self) -> None:
@@ -489,15 +918,31 @@ class NeuralBus:
         self._lock = threading.RLock()
         # event_type -> [callback, ...]
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        # event_type -> deque[BusEvent] (ringbuffer per type)
+        # event_type -> deque[BusEvent] (index-ring per type, seq-oplopend)
         self._history: Dict[str, Deque[BusEvent]] = defaultdict(
             lambda: deque(maxlen=self._MAX_HISTORY)
         )
+        # Globale tijdlijn: alle events op volgnummer (aaneengesloten seqs)
+        self._tijdlijn: Deque[BusEvent] = deque(maxlen=self._MAX_TIJDLIJN)
+        self._seq = 0
         # Globale wildcard subscribers (* = alle events)
         self._wildcard_subscribers: List[Callable] = []
-        # Optionele UnifiedMemory koppeling
+        # (event_type, callback) -> aflever-lane (modus, wachtrij, counters)
+        self._lanes: Dict[tuple, _Laan] = {}
+        self._async_lanes = _AsyncLaanLoop()
+        # Optionele UnifiedMemory koppeling (schrijft via een eigen pool lane)
         self._memory = None
         self._persist = False
+        self._persist_lane = _Laan(
+            self, "*", self._persisteer, modus=LANE_POOL, max_wachtrij=1000,
+            telt_mee=False,
+        )
+        # Optionele BusBridge (core.bus_bridge) naar andere processen
+        self._bridge = None
+        # Replay-ledger voor bridged events (nonce -> gezien); los van de
+        # procesbrede Aegis ledger, die blijft voor @verified_callback
+        self._bridge_nonces: Deque[str] = deque(maxlen=AEGIS_NONCE_LEDGER_SIZE)
+        self._bridge_nonce_set: set = set()
         # Agent chain tracking — voorkomt infinite loops
         self._active_chains: Dict[str, int] = {}  # chain_id -> depth
         self._chain_lock = threading.Lock()
@@ -528,6 +973,9 @@ class NeuralBus:
         self,
         event_type: str,
         callback: Callable[[BusEvent], None],
+        modus: str = LANE_INLINE,
+        max_wachtrij: int = 1000,
+        beleid: str = BELEID_DROP_OUDSTE,
     ) -> None:
         """
         Abonneer op een event type.
@@ -535,7 +983,16 @@ class NeuralBus:
         Args:
             event_type: EventTypes constante, of "*" voor alle events
             callback: Functie die een BusEvent ontvangt
+            modus: "inline" (op de publisher thread), "pool" (begrensde
+                worker-pool lane) of "async" (vaste achtergrond-loop)
+            max_wachtrij: Max backlog van een pool/async lane
+            beleid: Bij volle wachtrij "drop_oudste", "drop_nieuwste"
+                of "blokkeer" (publisher wacht, backpressure)
         """
+        if modus not in _LANE_MODI:
+            raise ValueError(f"Onbekende lane modus: {modus!r}")
+        if beleid not in _LANE_BELEID:
+            raise ValueError(f"Onbekend wachtrij beleid: {beleid!r}")
         try:
             with self._lock:
                 if event_type == "*":
@@ -544,6 +1001,16 @@ class NeuralBus:
                 else:
                     if callback not in self._subscribers[event_type]:
                         self._subscribers[event_type].append(callback)
+                laan = self._lanes.get((event_type, callback))
+                if laan is None:
+                    self._lanes[(event_type, callback)] = _Laan(
+                        self, event_type, callback, modus=modus,
+                        max_wachtrij=max_wachtrij, beleid=beleid,
+                    )
+                else:
+                    laan.modus = modus
+                    laan.max_wachtrij = max(int(max_wachtrij), 1)
+                    laan.beleid = beleid
         except Exception as e:
             logger.debug("NeuralBus subscribe fout: %s", e)
 
@@ -561,6 +1028,9 @@ class NeuralBus:
                 elif event_type in self._subscribers:
                     if callback in self._subscribers[event_type]:
                         self._subscribers[event_type].remove(callback)
+                laan = self._lanes.pop((event_type, callback), None)
+            if laan is not None:
+                laan.actief = False
         except Exception as e:
             logger.debug("NeuralBus unsubscribe fout: %s", e)
 
@@ -587,7 +1057,8 @@ class NeuralBus:
 
         # Seal verificatie op het moment van publicatie
         # consume_nonce=False: nonce NIET consumeren bij self-check,
-        # anders is het nonce al "gebruikt" voordat subscribers het zien
+        # anders is het nonce al "gebruikt" voordat subscribers het zien.
+        # Eigen events nemen de fast path (geen tweede json.dumps + HMAC).
         if OmegaSeal.is_armed() and event.omega_seal:
             if not event.verify_seal(consume_nonce=False):
                 logger.warning(
@@ -600,52 +1071,141 @@ class NeuralBus:
             with self._lock:
                 self._stats["seals_verified"] += 1
 
+        self._verspreid(event)
+
+    def ontvang_batch(self, zegels: List[tuple], herkomst: str = "") -> int:
+        """Publiceer een batch gezegelde events van een ander proces.
+
+        Alle HMACs worden in één OmegaSeal.verify_batch() gecontroleerd,
+        zonder de nonces te verbranden: dat doet @verified_callback bij de
+        subscriber (Aegis ontvanger-contract). Replays vangt een eigen
+        ledger van deze bus: een nonce die hier al geaccepteerd is wordt
+        geweigerd. Alleen geldige events worden verspreid. Zonder key valt
+        niets te verifiëren: dan wordt de hele batch geweigerd (anders kan
+        elk lokaal proces events injecteren).
+
+        Args:
+            zegels: Lijst van (canonical_bytes, omega_seal), zie BusEvent.zegel().
+            herkomst: Naam van het bronproces (gezet op BusEvent.herkomst).
+
+        Returns:
+            Aantal geaccepteerde events.
+        """
+        events = []
+        for canonical, seal in zegels:
+            try:
+                event = BusEvent.uit_zegel(canonical, seal)
+            except ValueError as e:
+                logger.debug("NeuralBus ontvang_batch: %s", e)
+                with self._lock:
+                    self._stats["seals_rejected"] += 1
+                continue
+            event.herkomst = herkomst
+            events.append(event)
+        if not events:
+            return 0
+        if not OmegaSeal.is_armed():
+            logger.warning(
+                "NeuralBus ontvang_batch: %d events van %s geweigerd — "
+                "OmegaSeal niet armed (OMEGA_BUS_SIGNING_KEY ontbreekt)",
+                len(events), herkomst or "?",
+            )
+            with self._lock:
+                self._stats["seals_rejected"] += len(events)
+            return 0
+        uitslag = OmegaSeal.verify_batch(
+            [(e.canonical, e.omega_seal, e._aegis_ts, e._aegis_nonce)
+             for e in events],
+            consume_nonce=False,
+        )
+        geldig = []
+        with self._lock:
+            for event, ok in zip(events, uitslag):
+                if not ok:
+                    continue
+                nonce = event._aegis_nonce
+                if nonce in self._bridge_nonce_set:
+                    continue  # replay (of dubbel binnen de batch)
+                if len(self._bridge_nonces) >= AEGIS_NONCE_LEDGER_SIZE:
+                    self._bridge_nonce_set.discard(self._bridge_nonces[0])
+                self._bridge_nonces.append(nonce)
+                self._bridge_nonce_set.add(nonce)
+                geldig.append(event)
+            if len(geldig) < sum(uitslag):
+                logger.warning(
+                    "NeuralBus ontvang_batch: %d herhaalde nonce(s) van %s geweigerd",
+                    sum(uitslag) - len(geldig), herkomst or "?",
+                )
+            self._stats["seals_verified"] += len(geldig)
+            self._stats["seals_rejected"] += len(events) - len(geldig)
+        for event in geldig:
+            self._verspreid(event)
+        return len(geldig)
+
+    def _verspreid(self, event: BusEvent) -> None:
+        """History bijwerken en het event aan alle lanes afleveren."""
+        event_type = event.event_type
         with self._lock:
             # Overflow detectie — log als events verloren gaan
             hist = self._history[event_type]
             if len(hist) >= self._MAX_HISTORY:
                 self._stats.setdefault("events_dropped", 0)
                 self._stats["events_dropped"] += 1
+            self._seq += 1
+            event.seq = self._seq
             hist.append(event)
+            self._tijdlijn.append(event)
 
             self._stats["events_gepubliceerd"] += 1
 
-            # Verzamel subscribers (type-specifiek + wildcard)
-            callbacks = list(self._subscribers.get(event_type, []))
-            callbacks.extend(self._wildcard_subscribers)
+            # Verzamel lanes (type-specifiek + wildcard)
+            lanes = [
+                self._laan(event_type, cb)
+                for cb in self._subscribers.get(event_type, [])
+            ]
+            lanes.extend(self._laan("*", cb) for cb in self._wildcard_subscribers)
 
-        # Lever af buiten de lock (voorkom deadlocks)
-        for cb in callbacks:
-            try:
-                if asyncio.iscoroutinefunction(cb):
-                    # Async callback — dispatch via event loop
-                    try:
-                        loop = asyncio.get_running_loop()
-                        loop.create_task(self._safe_async_dispatch(cb, event))
-                    except RuntimeError:
-                        # Geen actieve loop — run blocking (safe)
-                        try:
-                            asyncio.run(cb(event))
-                        except RuntimeError:
-                            logger.debug("Async callback kon niet starten: geen event loop")
-                else:
-                    cb(event)
-                self._stats["events_afgeleverd"] += 1
-            except Exception as e:
-                logger.debug("Event callback fout: %s", e)
-                self._stats["fouten"] += 1
+        # Lever af buiten de lock (voorkom deadlocks); pool/async lanes
+        # zetten alleen in hun wachtrij
+        for laan in lanes:
+            laan.plaats(event)
 
-        # Optioneel: persist naar UnifiedMemory
+        # Optioneel: persist naar UnifiedMemory (pool lane, niet inline)
         if self._persist and self._memory:
-            try:
-                self._memory.store_event(
-                    app=bron,
-                    event_type=event_type,
-                    data=data,
-                    store_vector=False,
-                )
-            except Exception as e:
-                logger.debug("Event persistentie mislukt: %s", e)
+            self._persist_lane.plaats(event)
+
+    def _laan(self, event_type: str, callback: Callable) -> _Laan:
+        """Lane van een subscriber (inline als hij buiten subscribe() om kwam)."""
+        laan = self._lanes.get((event_type, callback))
+        if laan is None:
+            laan = _Laan(self, event_type, callback)
+            self._lanes[(event_type, callback)] = laan
+        return laan
+
+    def _persisteer(self, event: BusEvent) -> None:
+        """Schrijf een event naar UnifiedMemory (draait op de persist lane)."""
+        self._memory.store_event(
+            app=event.bron,
+            event_type=event.event_type,
+            data=event.data,
+            store_vector=False,
+        )
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wacht tot alle pool/async lanes leeg zijn.
+
+        Returns:
+            True als alles binnen de timeout afgeleverd (of gedropt) is.
+        """
+        deadline = _time.monotonic() + timeout
+        while True:
+            with self._lock:
+                lanes = list(self._lanes.values()) + [self._persist_lane]
+            if all(laan.is_leeg() for laan in lanes):
+                return True
+            if _time.monotonic() >= deadline:
+                return False
+            _time.sleep(0.005)
 
     def publish_verified(
         self,
@@ -666,7 +1226,7 @@ class NeuralBus:
             return False
         with self._lock:
             self._stats["seals_verified"] += 1
-        self.publish(event_type, data, bron)
+        self._verspreid(event)
         return True
 
     def chain_dispatch(
@@ -744,12 +1304,10 @@ class NeuralBus:
         """
         try:
             with self._lock:
-                events = list(self._history.get(event_type, []))
-
-            if bron:
-                events = [e for e in events if e.bron == bron]
-
-            return list(reversed(events[-count:]))
+                nieuwste = reversed(self._history.get(event_type, ()))
+                if bron:
+                    nieuwste = (e for e in nieuwste if e.bron == bron)
+                return list(itertools.islice(nieuwste, max(count, 0)))
         except Exception as e:
             logger.debug("NeuralBus get_history fout: %s", e)
             return []
@@ -780,19 +1338,78 @@ class NeuralBus:
             Dict van event_type -> [event_dicts]
         """
         try:
-            result = {}
-            types = event_types or list(self._history.keys())
-
-            for et in types:
-                events = self.get_history(et, count=count)
-                if events:
-                    result[et] = [e.to_dict() for e in events]
-
-            return result
+            with self._lock:
+                types = event_types or list(self._history.keys())
+                per_type = {
+                    et: list(itertools.islice(reversed(self._history[et]), count))
+                    for et in types if self._history.get(et)
+                }
+            return {et: [e.to_dict() for e in events]
+                    for et, events in per_type.items()}
         except Exception as e:
             logger.debug("NeuralBus get_context fout: %s", e)
             return {}
 
+    def recente_events(
+        self,
+        count: int = 20,
+        event_types: Optional[List[str]] = None,
+    ) -> List[BusEvent]:
+        """Laatste `count` events over types heen (nieuwste eerst).
+
+        Zonder filter: O(count) uit de globale tijdlijn. Met filter: een
+        k-way merge van de per-type index-rings op seq — geen volledige sort.
+        """
+        count = max(count, 0)
+        with self._lock:
+            if not event_types:
+                return list(itertools.islice(reversed(self._tijdlijn), count))
+            rings = [reversed(self._history[et]) for et in set(event_types)
+                     if self._history.get(et)]
+            samengevoegd = heapq.merge(
+                *rings, key=lambda e: e.seq, reverse=True,
+            )
+            return list(itertools.islice(samengevoegd, count))
+
+    def get_events(
+        self,
+        since_seq: int = 0,
+        event_types: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> List[BusEvent]:
+        """Cursor-read: events met seq > since_seq (oudste eerst).
+
+        Dashboards pollen met de seq van het laatst ontvangen event als
+        cursor. Is de cursor ouder dan de tijdlijn, dan begint het
+        resultaat bij het oudste bewaarde event (het gat is zichtbaar
+        doordat het eerste seq > since_seq + 1). Een cursor voorbij
+        laatste_seq (na reset()) leest opnieuw vanaf het begin.
+
+        Args:
+            since_seq: Cursor; 0 = vanaf het begin van de tijdlijn.
+            event_types: Optionele filter op types.
+            limit: Max aantal events.
+        """
+        with self._lock:
+            if since_seq > self._seq:
+                since_seq = 0  # cursor van vóór een reset()
+            if not self._tijdlijn or since_seq >= self._seq:
+                return []
+            # Seqs in de tijdlijn zijn aaneengesloten: de laatste
+            # (laatste_seq - since_seq) events zijn precies de nieuwe
+            aantal = min(self._seq - max(since_seq, 0), len(self._tijdlijn))
+            nieuw = list(itertools.islice(reversed(self._tijdlijn), aantal))
+        nieuw.reverse()
+        if event_types:
+            types = set(event_types)
+            nieuw = [e for e in nieuw if e.event_type in types]
+        return nieuw[:max(limit, 0)]
+
+    @property
+    def laatste_seq(self) -> int:
+        """Volgnummer van het laatst gepubliceerde event (cursor startpunt)."""
+        return self._seq
+
     def get_context_stream(
         self,
         event_types: List[str] = None,
@@ -812,19 +1429,10 @@ class NeuralBus:
             Leesbare string voor LLM context, of lege string.
         """
         try:
-            with self._lock:
-                types = event_types or list(self._history.keys())
-                # Verzamel alle events, sorteer op timestamp
-                all_events: List[BusEvent] = []
-                for et in types:
-                    all_events.extend(self._history.get(et, []))
-
-            if not all_events:
+            recent = list(reversed(self.recente_events(count, event_types)))
+            if not recent:
                 return ""
 
-            all_events.sort(key=lambda e: e.timestamp)
-            recent = all_events[-count:]
-
             lines = ["[REAL-TIME SYSTEM STATE]"]
             for e in recent:
                 t = e.timestamp.strftime("%H:%M:%S")
@@ -855,9 +1463,23 @@ class NeuralBus:
                 with self._chain_lock:
                     active_chains = len(self._active_chains)
 
+                lanes = [
+                    self._laan(et, cb).stats()
+                    for et, cbs in list(self._subscribers.items())
+                    for cb in cbs
+                ]
+                lanes.extend(
+                    self._laan("*", cb).stats()
+                    for cb in self._wildcard_subscribers
+                )
+                if self._persist:
+                    lanes.append(self._persist_lane.stats())
+
                 return {
                     "subscribers": subscriber_count,
                     "event_types_actief": len(self._history),
+                    "laatste_seq": self._seq,
+                    "events_in_tijdlijn": len(self._tijdlijn),
                     "events_in_history": sum(
                         len(h) for h in self._history.values()
                     ),
@@ -867,6 +1489,10 @@ class NeuralBus:
                     "active_chains": active_chains,
                     "max_chain_depth": self._MAX_CHAIN_DEPTH,
                     "aegis": OmegaSeal.get_aegis_stats(),
+                    "lanes": lanes,
+                    "lane_backlog": sum(laan["backlog"] for laan in lanes),
+                    "lane_gedropt": sum(laan["gedropt"] for laan in lanes),
+                    "bridge": self._bridge.stats() if self._bridge else None,
                     **self._stats,
                 }
         except Exception as e:
@@ -888,7 +1514,12 @@ class NeuralBus:
             with self._lock:
                 self._subscribers.clear()
                 self._wildcard_subscribers.clear()
+                for laan in self._lanes.values():
+                    laan.actief = False
+                self._lanes.clear()
                 self._history.clear()
+                self._tijdlijn.clear()
+                self._seq = 0
                 self._stats = {
                     "events_gepubliceerd": 0,
                     "events_afgeleverd": 0,
@@ -1076,6 +1707,15 @@ def get_bus() -> NeuralBus:
                     logger.warning(
                         "[OMEGA BUS] NOT ARMED — bus draait onbeveiligd!"
                     )
+
+                # Stap 6: optionele bridge naar de andere processen
+                try:
+                    from danny_toolkit.core.config import Config
+                    if Config.NEURALBUS_BRIDGE:
+                        from danny_toolkit.core.bus_bridge import start_bridge
+                        start_bridge(_bus_instance)
+                except Exception as e:
+                    logger.warning("[OMEGA BUS] Bridge niet gestart: %s", e)
     return _bus_instance
 
 
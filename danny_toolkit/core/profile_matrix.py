@@ -0,0 +1,175 @@
+"""
+ProfielMatrix — Gestapelde agent profiel-embeddings voor matrix routing.
+
+Alle sub-profielen van AdaptiveRouter.AGENT_PROFIELEN staan als rijen in één
+genormaliseerde float32 matrix; per agent is een segment (startrij) bekend.
+Routing wordt dan één matrix-vector product plus een gesegmenteerde max
+(np.maximum.reduceat) in plaats van een Python-lus van cosine similarities.
+
+De matrix wordt op disk bewaard, gesleuteld op modelnaam + hash van de
+profielteksten, zodat een koude router hem inlaadt in plaats van alle
+profielteksten opnieuw te embedden. Een wijziging in AGENT_PROFIELEN of
+een ander model levert automatisch een nieuwe sleutel (en dus herberekening).
+
+Gebruik:
+    from danny_toolkit.core.profile_matrix import ProfielMatrix
+
+    matrix = ProfielMatrix.bouw(AGENT_PROFIELEN, model.encode)
+    per_agent = matrix.scores(model.encode("vraag"))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Versie van het bestandsformaat; ophogen maakt oude bestanden ongeldig
+MATRIX_VERSIE = 1
+
+
+def profiel_hash(profielen: Dict[str, List[str]]) -> str:
+    """Korte sha256 over de profielteksten (volgorde van agents telt mee)."""
+    data = json.dumps(
+        [[agent, list(subs)] for agent, subs in profielen.items()],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_pad(map_: Path, model_naam: str,
+              profielen: Dict[str, List[str]]) -> Path:
+    """Bestandspad voor (model, profielen): <map>/<model>_<hash>.npz."""
+    veilig = re.sub(r"[^A-Za-z0-9._-]+", "_", model_naam).strip("_")
+    return Path(map_) / f"{veilig or 'model'}_{profiel_hash(profielen)}.npz"
+
+
+class ProfielMatrix:
+    """Genormaliseerde profielmatrix met één segment per agent.
+
+    Attributes:
+        agenten: Agent keys in profielvolgorde.
+        matrix: float32 (n_sub_profielen, dim), rijen met norm 1.
+        starts: int64 startrij per agent (voor np.maximum.reduceat).
+        model: Model sleutel waarmee de matrix berekend is.
+    """
+
+    def __init__(self, agenten: List[str], matrix: Any, starts: Any,
+                 model: str = "") -> None:
+        self.agenten = list(agenten)
+        self.matrix = matrix
+        self.starts = starts
+        self.model = model
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimensie."""
+        return int(self.matrix.shape[1])
+
+    @staticmethod
+    def _normaliseer(matrix: Any) -> Any:
+        """L2-normaliseer rijen; nulrijen blijven nul."""
+        normen = np.linalg.norm(matrix, axis=1, keepdims=True)
+        normen[normen == 0] = 1.0
+        return matrix / normen
+
+    @classmethod
+    def bouw(cls, profielen: Dict[str, List[str]],
+             embed: Callable[[List[str]], Any],
+             model: str = "") -> "ProfielMatrix":
+        """Embed alle sub-profielen in één batch en stapel ze.
+
+        Args:
+            profielen: Agent -> lijst van profielteksten.
+            embed: Batch embed functie (lijst teksten -> vectoren).
+            model: Model sleutel voor hergebruik-controle.
+        """
+        agenten = [agent for agent, subs in profielen.items() if subs]
+        teksten = [tekst for agent in agenten for tekst in profielen[agent]]
+        ruw = np.asarray(embed(teksten), dtype=np.float32)
+        lengtes = [len(profielen[agent]) for agent in agenten]
+        starts = np.concatenate(([0], np.cumsum(lengtes)[:-1])).astype(np.int64)
+        matrix = np.ascontiguousarray(cls._normaliseer(ruw), dtype=np.float32)
+        return cls(agenten, matrix, starts, model)
+
+    def scores(self, vec: Any) -> Any:
+        """Per agent de max cosine similarity met `vec` (float32 array)."""
+        q = np.asarray(vec, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(q))
+        if norm == 0:
+            return np.zeros(len(self.agenten), dtype=np.float32)
+        sims = self.matrix @ (q / norm)
+        return np.maximum.reduceat(sims, self.starts)
+
+    def als_dict(self) -> Dict[str, List[Any]]:
+        """Agent -> lijst van (genormaliseerde) sub-profiel vectoren."""
+        grenzen = list(self.starts[1:]) + [self.matrix.shape[0]]
+        return {
+            agent: list(self.matrix[int(start):int(eind)])
+            for agent, start, eind in zip(self.agenten, self.starts, grenzen)
+        }
+
+    # ─── Persistentie ────────────────────────────────
+
+    def bewaar(self, pad: Path) -> bool:
+        """Schrijf de matrix atomair naar disk (tmp + replace)."""
+        try:
+            pad = Path(pad)
+            pad.parent.mkdir(parents=True, exist_ok=True)
+            tmp = pad.with_suffix(pad.suffix + ".tmp")
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    versie=np.int64(MATRIX_VERSIE),
+                    agenten=np.array(self.agenten),
+                    matrix=self.matrix,
+                    starts=self.starts,
+                )
+            os.replace(tmp, pad)
+            return True
+        except Exception as e:
+            logger.debug("ProfielMatrix opslaan fout: %s", e)
+            return False
+
+    @classmethod
+    def laad(cls, pad: Path, profielen: Dict[str, List[str]],
+             model: str = "") -> Optional["ProfielMatrix"]:
+        """Laad een eerder bewaarde matrix; None als hij ontbreekt of niet past.
+
+        De bestandsnaam bevat al de profielhash; hier wordt alleen nog
+        gecontroleerd dat agents en segmenten kloppen met `profielen`.
+        """
+        pad = Path(pad)
+        if not pad.exists():
+            return None
+        try:
+            with np.load(pad, allow_pickle=False) as data:
+                if int(data["versie"]) != MATRIX_VERSIE:
+                    return None
+                agenten = [str(a) for a in data["agenten"]]
+                matrix = np.ascontiguousarray(data["matrix"], dtype=np.float32)
+                starts = np.asarray(data["starts"], dtype=np.int64)
+        except Exception as e:
+            logger.debug("ProfielMatrix laden fout (%s): %s", pad.name, e)
+            return None
+        verwacht = [agent for agent, subs in profielen.items() if subs]
+        lengtes = [len(profielen[agent]) for agent in verwacht]
+        if (agenten != verwacht
+                or matrix.ndim != 2
+                or matrix.shape[0] != sum(lengtes)
+                or starts.tolist() != [sum(lengtes[:i]) for i in range(len(lengtes))]):
+            logger.debug("ProfielMatrix %s past niet bij profielen", pad.name)
+            return None
+        return cls(agenten, matrix, starts, model)
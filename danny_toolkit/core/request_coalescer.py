@@ -0,0 +1,179 @@
+"""
+RequestCoalescer — Single-flight + kortlevende resultaat-cache voor requests.
+
+Identieke gelijktijdige requests (zelfde genormaliseerde sleutel) delen één
+uitvoering: de eerste draait, de rest wacht op hetzelfde resultaat. Een
+afgerond, cachebaar resultaat blijft `ttl_s` seconden beschikbaar, zodat een
+herhaalde vraag het antwoord krijgt in plaats van een nieuwe run.
+
+De uitvoering draait als eigen asyncio task (shield): als de eerste aanvrager
+afhaakt terwijl anderen nog wachten, loopt hij door; zonder wachtenden wordt
+hij geannuleerd.
+
+Gebruik:
+    from danny_toolkit.core.request_coalescer import RequestCoalescer
+
+    coalescer = RequestCoalescer(ttl_s=60)
+    resultaat, bron = await coalescer.uitvoeren(
+        RequestCoalescer.sleutel(vraag), lambda: pipeline(vraag),
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bron van een resultaat
+BRON_UITGEVOERD = "uitgevoerd"
+BRON_GECOALESCEERD = "gecoalesceerd"
+BRON_CACHE = "cache"
+
+
+class _Vlucht:
+    """Eén lopende uitvoering met het aantal wachtenden."""
+
+    __slots__ = ("taak", "loop", "wachtenden", "eigenaar_weg")
+
+    def __init__(self, taak: asyncio.Task, loop: asyncio.AbstractEventLoop) -> None:
+        self.taak = taak
+        self.loop = loop
+        self.wachtenden = 0
+        self.eigenaar_weg = False
+
+
+class RequestCoalescer:
+    """Single-flight per sleutel met TTL resultaat-cache (thread-safe)."""
+
+    def __init__(self, ttl_s: float = 60.0, max_resultaten: int = 256) -> None:
+        """
+        Args:
+            ttl_s: Hoe lang een afgerond resultaat hergebruikt wordt (0 = niet).
+            max_resultaten: Maximaal aantal gecachte resultaten (LRU).
+        """
+        self.ttl_s = ttl_s
+        self.max_resultaten = max_resultaten
+        self._lock = threading.Lock()
+        self._vluchten: Dict[str, _Vlucht] = {}
+        self._resultaten: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self.uitgevoerd = 0
+        self.gecoalesceerd = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def sleutel(tekst: str) -> str:
+        """Sleutel op genormaliseerde tekst (NFC, lowercase, whitespace samengevouwen)."""
+        norm = " ".join(unicodedata.normalize("NFC", str(tekst)).lower().split())
+        return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, sleutel: str) -> Optional[Any]:
+        """Geldig gecacht resultaat of None (verlopen entries vallen af)."""
+        entry = self._resultaten.get(sleutel)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl_s:
+            del self._resultaten[sleutel]
+            return None
+        self._resultaten.move_to_end(sleutel)
+        return entry[1]
+
+    def _cache_set(self, sleutel: str, resultaat: Any) -> None:
+        """Bewaar resultaat; oudste eruit bij vol."""
+        self._resultaten[sleutel] = (time.monotonic(), resultaat)
+        self._resultaten.move_to_end(sleutel)
+        while len(self._resultaten) > self.max_resultaten:
+            self._resultaten.popitem(last=False)
+
+    async def uitvoeren(
+        self,
+        sleutel: str,
+        maak: Callable[[], Awaitable[Any]],
+        cachebaar: Callable[[Any], bool] = None,
+    ) -> Tuple[Any, str]:
+        """Voer `maak()` uit, of deel een lopende/recente uitvoering.
+
+        Args:
+            sleutel: Coalescing sleutel (zie sleutel()).
+            maak: Factory voor de coroutine die het werk doet.
+            cachebaar: Predicaat: mag dit resultaat in de TTL-cache?
+
+        Returns:
+            (resultaat, bron) met bron uitgevoerd / gecoalesceerd / cache.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            resultaat = self._cache_get(sleutel) if self.ttl_s > 0 else None
+            if resultaat is not None:
+                self.cache_hits += 1
+                return resultaat, BRON_CACHE
+            vlucht = self._vluchten.get(sleutel)
+            # Alleen coalescen binnen dezelfde event loop
+            eigenaar = vlucht is None or vlucht.loop is not loop
+            if eigenaar:
+                vlucht = _Vlucht(loop.create_task(maak()), loop)
+                self._vluchten.setdefault(sleutel, vlucht)
+                self.uitgevoerd += 1
+            else:
+                vlucht.wachtenden += 1
+                self.gecoalesceerd += 1
+        if eigenaar:
+            # Opruimen + cachen zodra de taak klaar is, ook als de
+            # eigenaar zelf al afgehaakt is
+            vlucht.taak.add_done_callback(
+                lambda taak: self._afronden(sleutel, vlucht, cachebaar)
+            )
+
+        try:
+            resultaat = await asyncio.shield(vlucht.taak)
+        except asyncio.CancelledError:
+            with self._lock:
+                if eigenaar:
+                    vlucht.eigenaar_weg = True
+                else:
+                    vlucht.wachtenden -= 1
+                verlaten = vlucht.eigenaar_weg and vlucht.wachtenden == 0
+            if verlaten:
+                vlucht.taak.cancel()
+            raise
+        return resultaat, (BRON_UITGEVOERD if eigenaar else BRON_GECOALESCEERD)
+
+    def _afronden(self, sleutel: str, vlucht: _Vlucht,
+                  cachebaar: Optional[Callable[[Any], bool]]) -> None:
+        """Done-callback: vlucht afmelden en een geslaagd resultaat cachen."""
+        with self._lock:
+            if self._vluchten.get(sleutel) is vlucht:
+                del self._vluchten[sleutel]
+            taak = vlucht.taak
+            if taak.cancelled() or taak.exception() is not None or self.ttl_s <= 0:
+                return
+            resultaat = taak.result()
+            try:
+                if cachebaar is None or cachebaar(resultaat):
+                    self._cache_set(sleutel, resultaat)
+            except Exception as e:
+                logger.debug("RequestCoalescer cachebaar-check fout: %s", e)
+
+    def wis(self) -> None:
+        """Leeg de resultaat-cache (lopende uitvoeringen blijven)."""
+        with self._lock:
+            self._resultaten.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Tellers en huidige omvang."""
+        with self._lock:
+            return {
+                "uitgevoerd": self.uitgevoerd,
+                "gecoalesceerd": self.gecoalesceerd,
+                "cache_hits": self.cache_hits,
+                "in_vlucht": len(self._vluchten),
+                "gecacht": len(self._resultaten),
+                "ttl_s": self.ttl_s,
+            }
@@ -3,6 +3,8 @@ RequestTracer — Distributed tracing voor de SwarmEngine pipeline.
 
 Volgt een request door alle pipeline-fases: routing, memex, dispatch,
 tribunal, sentinel, schild. Gebruikt contextvars voor per-request state.
+Spans krijgen de EmbeddingMemo hit/miss delta van hun fase mee; de
+pre-routing stage-graaf en zijn kritieke pad komen op de trace.
 
 Singleton via get_request_tracer().
 
@@ -24,7 +26,9 @@ import threading
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from danny_toolkit.core.embedding_memo import huidige_memo
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +55,7 @@ class TraceSpan:
     eind_ms: float = 0.0
     status: str = "pending"  # "pending", "ok", "error", "skipped"
     details: Dict[str, Any] = field(default_factory=dict)
+    memo_start: Optional[Tuple[int, int]] = field(default=None, repr=False)
 
     @property
     def duration_ms(self) -> float:
@@ -84,6 +89,7 @@ class RequestTrace:
     spans: List[TraceSpan] = field(default_factory=list)
     fout_ids: List[str] = field(default_factory=list)  # fout_id referenties
     afgerond: bool = False
+    stage_graaf: Dict[str, Any] = field(default_factory=dict)  # StageGraaf rapport
 
     @property
     def duration_ms(self) -> float:
@@ -105,6 +111,7 @@ class RequestTrace:
             "spans": [s.to_dict() for s in self.spans],
             "fouten": self.fout_ids,
             "afgerond": self.afgerond,
+            "stage_graaf": self.stage_graaf,
         }
 
     def to_summary(self) -> Dict[str, Any]:
@@ -191,6 +198,9 @@ class RequestTracer:
                 agent=agent,
                 start_ms=time.time() * 1000,
             )
+            memo = huidige_memo()
+            if memo is not None:
+                span.memo_start = (memo.hits, memo.misses)
             trace.spans.append(span)
             _current_span.set(span)
             return span
@@ -218,6 +228,12 @@ class RequestTracer:
             span.status = status
             if details:
                 span.details.update(details)
+            memo = huidige_memo()
+            if memo is not None and span.memo_start is not None:
+                hits = memo.hits - span.memo_start[0]
+                misses = memo.misses - span.memo_start[1]
+                if hits or misses:
+                    span.details["embed_memo"] = {"hits": hits, "misses": misses}
             _current_span.set(None)
         except Exception as e:
             logger.debug("RequestTracer eind_span fout: %s", e)
@@ -235,6 +251,19 @@ class RequestTracer:
         except Exception as e:
             logger.debug("RequestTracer registreer_fout fout: %s", e)
 
+    def registreer_graaf(self, rapport: Dict[str, Any]) -> None:
+        """Leg de stage-graaf en het kritieke pad vast op de huidige trace.
+
+        Args:
+            rapport: StageGraaf.rapport() (stages, kritiek_pad, timings).
+        """
+        try:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.stage_graaf = rapport
+        except Exception as e:
+            logger.debug("RequestTracer registreer_graaf fout: %s", e)
+
     def eind_trace(self) -> Optional[RequestTrace]:
         """Sluit de huidige trace en log naar CorticalStack.
 
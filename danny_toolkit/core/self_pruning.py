@@ -29,6 +29,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from danny_toolkit.core.config import Config
+from danny_toolkit.core.storage_writer import get_writer
 
 try:
     from danny_toolkit.core.shard_router import ALL_SHARDS
@@ -96,6 +97,8 @@ class AccessTracker:
 
     Vult de ontbrekende observability gap: ChromaDB heeft geen
     timestamp/access metadata. SQLite WAL mode, thread-safe.
+    Writes gaan write-behind via de StorageWriter; leesqueries
+    flushen eerst (in _connect).
     """
 
     def __init__(self, db_path: Optional[str] = None) -> None:
@@ -109,6 +112,7 @@ class AccessTracker:
         self._db_path = db_path or str(Config.DATA_DIR / "self_pruning.db")
         self._lock = threading.Lock()
         self._init_db()
+        self._writer = get_writer(self._db_path)
 
     def _init_db(self) -> None:
         """Maak database en tabel aan."""
@@ -140,7 +144,8 @@ class AccessTracker:
             logger.debug("AccessTracker DB init fout: %s", e)
 
     def _connect(self) -> sqlite3.Connection:
-        """Connect."""
+        """Leesverbinding; flusht eerst de wachtrij zodat eigen writes zichtbaar zijn."""
+        self._writer.flush()
         conn = sqlite3.connect(self._db_path, timeout=Config.SQLITE_CONNECT_TIMEOUT)
         Config.apply_sqlite_perf(conn)
         conn.row_factory = sqlite3.Row
@@ -155,22 +160,17 @@ class AccessTracker:
         if not fragment_ids:
             return
         nu = datetime.now().isoformat()
-        with self._lock:
-            try:
-                conn = self._connect()
-                for fid in fragment_ids:
-                    conn.execute("""
-                        INSERT INTO fragment_access
-                            (fragment_id, shard, last_accessed, access_count, created_at)
-                        VALUES (?, ?, ?, 1, ?)
-                        ON CONFLICT(fragment_id, shard) DO UPDATE SET
-                            last_accessed = ?,
-                            access_count = access_count + 1
-                    """, (fid, shard, nu, nu, nu))
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.debug("AccessTracker registreer_toegang fout: %s", e)
+        try:
+            self._writer.schrijf_veel("""
+                INSERT INTO fragment_access
+                    (fragment_id, shard, last_accessed, access_count, created_at)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(fragment_id, shard) DO UPDATE SET
+                    last_accessed = ?,
+                    access_count = access_count + 1
+            """, [(fid, shard, nu, nu, nu) for fid in fragment_ids])
+        except Exception as e:
+            logger.debug("AccessTracker registreer_toegang fout: %s", e)
 
     def registreer_creatie(self, fragment_ids: List[str], shard: str) -> None:
         """Registreer nieuw aangemaakte fragmenten.
@@ -181,22 +181,17 @@ class AccessTracker:
         if not fragment_ids:
             return
         nu = datetime.now().isoformat()
-        with self._lock:
-            try:
-                conn = self._connect()
-                for fid in fragment_ids:
-                    conn.execute("""
-                        INSERT INTO fragment_access
-                            (fragment_id, shard, last_accessed, access_count, created_at)
-                        VALUES (?, ?, ?, 0, ?)
-                        ON CONFLICT(fragment_id, shard) DO UPDATE SET
-                            last_accessed = ?,
-                            access_count = access_count
-                    """, (fid, shard, nu, nu, nu))
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.debug("AccessTracker registreer_creatie fout: %s", e)
+        try:
+            self._writer.schrijf_veel("""
+                INSERT INTO fragment_access
+                    (fragment_id, shard, last_accessed, access_count, created_at)
+                VALUES (?, ?, ?, 0, ?)
+                ON CONFLICT(fragment_id, shard) DO UPDATE SET
+                    last_accessed = ?,
+                    access_count = access_count
+            """, [(fid, shard, nu, nu, nu) for fid in fragment_ids])
+        except Exception as e:
+            logger.debug("AccessTracker registreer_creatie fout: %s", e)
 
     def haal_stale_fragmenten(self, dagen: int = 14) -> List[dict]:
         """Haal fragmenten op die langer dan `dagen` niet zijn geraadpleegd.
@@ -245,35 +240,31 @@ class AccessTracker:
     def update_shard(self, fragment_id: str, oud_shard: str, nieuw_shard: str) -> None:
         """Update de shard van een fragment (na cold migratie)."""
         nu = datetime.now().isoformat()
-        with self._lock:
-            try:
-                conn = self._connect()
-                conn.execute("""
-                    UPDATE fragment_access
-                    SET shard = ?, last_accessed = ?
-                    WHERE fragment_id = ? AND shard = ?
-                """, (nieuw_shard, nu, fragment_id, oud_shard))
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.debug("AccessTracker update_shard fout: %s", e)
+        try:
+            self._writer.schrijf("""
+                UPDATE fragment_access
+                SET shard = ?, last_accessed = ?
+                WHERE fragment_id = ? AND shard = ?
+            """, (nieuw_shard, nu, fragment_id, oud_shard))
+        except Exception as e:
+            logger.debug("AccessTracker update_shard fout: %s", e)
 
     def verwijder(self, fragment_ids: List[str], shard: str) -> None:
         """Verwijder fragmenten uit de tracker (na destructie)."""
         if not fragment_ids:
             return
-        with self._lock:
-            try:
-                conn = self._connect()
-                placeholders = ",".join("?" * len(fragment_ids))
-                conn.execute(f"""
-                    DELETE FROM fragment_access
-                    WHERE fragment_id IN ({placeholders}) AND shard = ?
-                """, (*fragment_ids, shard))
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.debug("AccessTracker verwijder fout: %s", e)
+        placeholders = ",".join("?" * len(fragment_ids))
+        try:
+            self._writer.schrijf(f"""
+                DELETE FROM fragment_access
+                WHERE fragment_id IN ({placeholders}) AND shard = ?
+            """, (*fragment_ids, shard))
+        except Exception as e:
+            logger.debug("AccessTracker verwijder fout: %s", e)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wacht tot alle access/creatie writes in de wachtrij gecommit zijn."""
+        return self._writer.flush(timeout)
 
     def totaal_gevolgd(self) -> int:
         """Totaal aantal gevolgde fragmenten."""
@@ -4,6 +4,10 @@ SemanticCache — Vector-based LLM response cache met per-agent configuratie.
 Gebruikt Voyage 256d MRL embeddings voor cosine-similarity matching.
 Fallback naar SHA-256 exact-match als embeddings niet beschikbaar zijn.
 
+Vector lookups lopen via een in-memory index per agent (genormaliseerde
+float32 matrix + TTL side-array), bij startup herbouwd uit SQLite en bijgewerkt
+bij store/evict. SQLite blijft de duurzame opslag.
+
 Singleton via get_semantic_cache(). Thread-safe (SQLite WAL).
 
 Gebruik:
@@ -30,9 +34,11 @@ import struct
 import threading
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from danny_toolkit.core.config import Config
+from danny_toolkit.core.embedding_memo import memo_embed
+from danny_toolkit.core.storage_writer import get_writer
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +56,74 @@ except ImportError:
     HAS_EMBEDDINGS = False
 
 
+class _AgentIndex:
+    """In-memory vector index voor één agent.
+
+    Rijen: genormaliseerde float32 embedding, SQLite row id, verloop-tijdstip
+    (created + ttl) en de payload (response, type, metadata). Eén matvec
+    doorzoekt alle levende entries; verlopen rijen worden gemaskeerd tot
+    evict_expired ze compacteert.
+    """
+
+    _START_CAPACITEIT = 64
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.n = 0
+        self._matrix = np.zeros((self._START_CAPACITEIT, dim), dtype=np.float32)
+        self._ids = np.zeros(self._START_CAPACITEIT, dtype=np.int64)
+        self._verloopt = np.zeros(self._START_CAPACITEIT, dtype=np.float64)
+        self._payloads: list = []
+
+    def voeg_toe(self, row_id: int, vec: "np.ndarray", verloopt: float,
+                 payload: tuple) -> None:
+        """Voeg één genormaliseerde vector toe (capaciteit verdubbelt)."""
+        if self.n == len(self._ids):
+            nieuw = len(self._ids) * 2
+            self._matrix = np.resize(self._matrix, (nieuw, self.dim))
+            self._ids = np.resize(self._ids, nieuw)
+            self._verloopt = np.resize(self._verloopt, nieuw)
+        self._matrix[self.n] = vec
+        self._ids[self.n] = row_id
+        self._verloopt[self.n] = verloopt
+        self._payloads.append(payload)
+        self.n += 1
+
+    def _behoud(self, masker: "np.ndarray") -> int:
+        """Compacteer naar de rijen waar masker True is; geeft #verwijderd."""
+        verwijderd = int(self.n - masker.sum())
+        if verwijderd:
+            k = self.n - verwijderd
+            self._matrix[:k] = self._matrix[:self.n][masker]
+            self._ids[:k] = self._ids[:self.n][masker]
+            self._verloopt[:k] = self._verloopt[:self.n][masker]
+            self._payloads = [p for p, m in zip(self._payloads, masker) if m]
+            self.n = k
+        return verwijderd
+
+    def verwijder_ids(self, row_ids) -> int:
+        """Verwijder rijen op SQLite id."""
+        if not self.n:
+            return 0
+        return self._behoud(~np.isin(self._ids[:self.n], np.fromiter(row_ids, dtype=np.int64)))
+
+    def verwijder_verlopen(self, now: float) -> int:
+        """Verwijder rijen waarvan de TTL verstreken is."""
+        if not self.n:
+            return 0
+        return self._behoud(self._verloopt[:self.n] >= now)
+
+    def zoek(self, q: "np.ndarray", now: float) -> Optional[Tuple[int, float]]:
+        """Beste levende rij voor genormaliseerde query: (positie, score)."""
+        if not self.n:
+            return None
+        scores = self._matrix[:self.n] @ q
+        scores[self._verloopt[:self.n] < now] = -np.inf
+        pos = int(np.argmax(scores))
+        if not np.isfinite(scores[pos]):
+            return None
+        return pos, float(scores[pos])
+
 
 class SemanticCache:
     """Vector-based LLM response cache met per-agent configuratie."""
@@ -104,7 +178,13 @@ class SemanticCache:
         self._embed_provider = None
         self._embed_init_tried = False
 
+        # In-memory vector index per agent (SQLite = duurzame opslag)
+        self._indexen: Dict[str, _AgentIndex] = {}
+
         self._init_db()
+        self._herbouw_index()
+        # Write-behind: store() en eviction via de writer van dit bestand
+        self._writer = get_writer(self._db_path)
 
     def _init_db(self) -> None:
         """Maak SQLite database + tabel aan."""
@@ -154,13 +234,53 @@ class SemanticCache:
         Config.apply_sqlite_perf(conn)
         return conn
 
+    def _herbouw_index(self) -> None:
+        """Bouw de per-agent vector index op uit alle levende SQLite entries."""
+        if not HAS_NUMPY:
+            return
+        now = time.time()
+        indexen: Dict[str, _AgentIndex] = {}
+        try:
+            conn = self._get_conn()
+            try:
+                rows = conn.execute(
+                    """SELECT id, agent, embedding, response, created,
+                              ttl_seconds, payload_type, payload_meta
+                       FROM cache_entries
+                       WHERE embedding IS NOT NULL
+                         AND (created + ttl_seconds) >= ?
+                       ORDER BY created ASC""",
+                    (now,),
+                ).fetchall()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.debug("SemanticCache index herbouw fout: %s", e)
+            return
+        for row_id, agent, blob, response, created, ttl, p_type, p_meta in rows:
+            vec = self._blob_to_vector(blob)
+            if vec is None:
+                continue
+            idx = indexen.get(agent)
+            if idx is None or idx.dim != len(vec):
+                # Nieuwste dimensie wint (bijv. na wissel van embedding model)
+                idx = indexen[agent] = _AgentIndex(len(vec))
+            idx.voeg_toe(row_id, vec, created + ttl,
+                         (response, p_type, self._parse_meta(p_meta)))
+        with self._lock:
+            self._indexen = indexen
+        if rows:
+            logger.debug("SemanticCache: index herbouwd (%d entries)", len(rows))
+
     def _get_embed_provider(self) -> None:
         """Lazy init van CachedEmbeddingProvider."""
         if self._embed_init_tried:
             return self._embed_provider
         self._embed_init_tried = True
         try:
-            pass  # import moved to top-level
+            from danny_toolkit.core.embeddings import (
+                CachedEmbeddingProvider, VoyageEmbeddings,
+            )
             voyage = VoyageEmbeddings()
             self._embed_provider = CachedEmbeddingProvider(voyage)
             logger.debug("SemanticCache: Voyage embedding provider geladen")
@@ -192,6 +312,34 @@ class SemanticCache:
             return []
         return result
 
+    @staticmethod
+    def _normaliseer(vec) -> Optional["np.ndarray"]:
+        """Float32 eenheidsvector, of None bij nul/NaN/Inf."""
+        v = np.asarray(vec, dtype=np.float32).ravel()
+        if not v.size or not np.all(np.isfinite(v)):
+            return None
+        norm = float(np.linalg.norm(v))
+        if norm == 0.0:
+            return None
+        return v / norm
+
+    @classmethod
+    def _blob_to_vector(cls, blob: bytes) -> Optional["np.ndarray"]:
+        """Decodeer een embedding BLOB direct naar een genormaliseerde vector."""
+        if not blob or len(blob) % 4 != 0:
+            logger.debug("Ongeldige embedding blob: len=%d", len(blob) if blob else 0)
+            return None
+        return cls._normaliseer(np.frombuffer(blob, dtype=np.float32))
+
+    @staticmethod
+    def _parse_meta(p_meta) -> dict:
+        """payload_meta JSON → dict (leeg bij fout)."""
+        try:
+            return json.loads(p_meta) if p_meta else {}
+        except (json.JSONDecodeError, TypeError) as _sup_err:
+            logger.debug("Suppressed: %s", _sup_err)
+            return {}
+
     @staticmethod
     def _cosine_similarity(a: list, b: list) -> float:
         """Cosine similarity tussen twee vectoren."""
@@ -233,7 +381,7 @@ class SemanticCache:
             # Probeer vector-based lookup
             provider = self._get_embed_provider()
             if provider is not None:
-                query_emb = provider.embed_query(query)
+                query_emb = memo_embed(query, provider.embed_query)
                 return self._vector_lookup(
                     agent_naam, query_emb, threshold, ttl, now
                 )
@@ -252,98 +400,158 @@ class SemanticCache:
     def _vector_lookup(self, agent: str, query_emb: list,
                        threshold: float, ttl: int, now: float
                        ) -> Optional[dict]:
-        """Vector similarity lookup tegen recente entries."""
+        """Vector similarity lookup tegen alle levende entries van de agent.
+
+        Eén matvec over de in-memory index. Vóór een hit bevestigt een
+        lees-connectie (buiten self._lock) dat de rij nog bestaat: een
+        rij die een ander proces verwijderde wordt zo een miss en gaat
+        uit de index. De hit-teller loopt via de writer (write-behind)
+        en is pas na flush() in SQLite zichtbaar.
+        """
+        if not HAS_NUMPY:
+            return self._vector_lookup_sql(agent, query_emb, threshold, ttl, now)
+        q = self._normaliseer(query_emb)
+        with self._lock:
+            idx = self._indexen.get(agent)
+            if q is None or idx is None or idx.dim != len(q):
+                self._total_misses += 1
+                return None
+            beste = idx.zoek(q, now)
+            if beste is None or beste[1] < threshold:
+                self._total_misses += 1
+                return None
+            pos = beste[0]
+            row_id = int(idx._ids[pos])
+            response, p_type, meta = idx._payloads[pos]
+        if not self._rij_bestaat(row_id):
+            with self._lock:
+                idx = self._indexen.get(agent)
+                if idx is not None:
+                    idx.verwijder_ids([row_id])
+                self._total_misses += 1
+            return None
         with self._lock:
+            self._total_hits += 1
+        self._tel_hit(row_id)
+        return {
+            "content": response,
+            "type": p_type or "text",
+            "metadata": dict(meta),
+        }
+
+    def _rij_bestaat(self, row_id: int) -> bool:
+        """Bestaat de rij nog op disk? Bij een leesfout: aannemen van wel."""
+        try:
             conn = self._get_conn()
             try:
-                rows = conn.execute(
-                    """SELECT id, embedding, response, created, ttl_seconds,
-                            hits, payload_type, payload_meta
-                       FROM cache_entries
-                       WHERE agent = ? AND embedding IS NOT NULL
-                       ORDER BY created DESC LIMIT 50""",
-                    (agent,),
-                ).fetchall()
+                return conn.execute(
+                    "SELECT 1 FROM cache_entries WHERE id = ?", (row_id,)
+                ).fetchone() is not None
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug("SemanticCache bestaat-check fout: %s", e)
+            return True
 
-                best_score = 0.0
-                best_row = None
-
-                for row_id, blob, response, created, row_ttl, hits, p_type, p_meta in rows:
-                    # TTL check
-                    if now - created > row_ttl:
-                        continue
-                    cached_emb = self._blob_to_embedding(blob)
-                    score = self._cosine_similarity(query_emb, cached_emb)
-                    if score > best_score:
-                        best_score = score
-                        best_row = (row_id, response, hits, p_type, p_meta)
-
-                if best_row and best_score >= threshold:
-                    row_id, response, hits, p_type, p_meta = best_row
-                    conn.execute(
-                        "UPDATE cache_entries SET hits = ? WHERE id = ?",
-                        (hits + 1, row_id),
-                    )
-                    conn.commit()
-                    self._total_hits += 1
-                    meta = {}
-                    try:
-                        meta = json.loads(p_meta) if p_meta else {}
-                    except (json.JSONDecodeError, TypeError) as _sup_err:
-                        logger.debug("Suppressed: %s", _sup_err)
-                    return {
-                        "content": response,
-                        "type": p_type or "text",
-                        "metadata": meta,
-                    }
+    def _tel_hit(self, row_id: int) -> None:
+        """Verhoog de hit-teller via de writer (write-behind)."""
+        try:
+            self._writer.taak(
+                lambda conn: conn.execute(
+                    "UPDATE cache_entries SET hits = hits + 1 WHERE id = ?",
+                    (row_id,),
+                )
+            )
+        except Exception as e:
+            logger.debug("SemanticCache hit-teller fout: %s", e)
+
+    def _vector_lookup_sql(self, agent: str, query_emb: list,
+                           threshold: float, ttl: int, now: float
+                           ) -> Optional[dict]:
+        """Vector similarity lookup tegen recente entries (zonder numpy)."""
+        self._writer.flush()  # eigen store() writes zichtbaar maken
+        conn = self._get_conn()
+        try:
+            rows = conn.execute(
+                """SELECT id, embedding, response, created, ttl_seconds,
+                        payload_type, payload_meta
+                   FROM cache_entries
+                   WHERE agent = ? AND embedding IS NOT NULL
+                   ORDER BY created DESC LIMIT 50""",
+                (agent,),
+            ).fetchall()
+        finally:
+            conn.close()
 
+        best_score = 0.0
+        best_row = None
+
+        for row_id, blob, response, created, row_ttl, p_type, p_meta in rows:
+            # TTL check
+            if now - created > row_ttl:
+                continue
+            cached_emb = self._blob_to_embedding(blob)
+            score = self._cosine_similarity(query_emb, cached_emb)
+            if score > best_score:
+                best_score = score
+                best_row = (row_id, response, p_type, p_meta)
+
+        if not best_row or best_score < threshold:
+            with self._lock:
                 self._total_misses += 1
-                return None
-            finally:
-                conn.close()
+            return None
+
+        row_id, response, p_type, p_meta = best_row
+        with self._lock:
+            self._total_hits += 1
+        self._tel_hit(row_id)
+        meta = {}
+        try:
+            meta = json.loads(p_meta) if p_meta else {}
+        except (json.JSONDecodeError, TypeError) as _sup_err:
+            logger.debug("Suppressed: %s", _sup_err)
+        return {
+            "content": response,
+            "type": p_type or "text",
+            "metadata": meta,
+        }
 
     def _hash_lookup(self, agent: str, qhash: str,
                      ttl: int, now: float) -> Optional[dict]:
         """Exacte hash lookup (fallback wanneer embeddings niet beschikbaar)."""
+        self._writer.flush()  # eigen store() writes zichtbaar maken
+        conn = self._get_conn()
+        try:
+            row = conn.execute(
+                """SELECT id, response, created, ttl_seconds,
+                        payload_type, payload_meta
+                   FROM cache_entries
+                   WHERE agent = ? AND query_hash = ?
+                   ORDER BY created DESC LIMIT 1""",
+                (agent, qhash),
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None or now - row[2] > row[3]:
+            with self._lock:
+                self._total_misses += 1
+            return None
+
+        row_id, response, _created, _row_ttl, p_type, p_meta = row
         with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    """SELECT id, response, created, ttl_seconds, hits,
-                            payload_type, payload_meta
-                       FROM cache_entries
-                       WHERE agent = ? AND query_hash = ?
-                       ORDER BY created DESC LIMIT 1""",
-                    (agent, qhash),
-                ).fetchone()
-
-                if row is None:
-                    self._total_misses += 1
-                    return None
-
-                row_id, response, created, row_ttl, hits, p_type, p_meta = row
-                if now - created > row_ttl:
-                    self._total_misses += 1
-                    return None
-
-                conn.execute(
-                    "UPDATE cache_entries SET hits = ? WHERE id = ?",
-                    (hits + 1, row_id),
-                )
-                conn.commit()
-                self._total_hits += 1
-                meta = {}
-                try:
-                    meta = json.loads(p_meta) if p_meta else {}
-                except (json.JSONDecodeError, TypeError) as _sup_err:
-                    logger.debug("Suppressed: %s", _sup_err)
-                return {
-                    "content": response,
-                    "type": p_type or "text",
-                    "metadata": meta,
-                }
-            finally:
-                conn.close()
+            self._total_hits += 1
+        self._tel_hit(row_id)
+        meta = {}
+        try:
+            meta = json.loads(p_meta) if p_meta else {}
+        except (json.JSONDecodeError, TypeError) as _sup_err:
+            logger.debug("Suppressed: %s", _sup_err)
+        return {
+            "content": response,
+            "type": p_type or "text",
+            "metadata": meta,
+        }
 
     def store(self, agent_naam: str, query: str, response: str,
               payload_type: str = "text", payload_meta: dict = None) -> None:
@@ -378,49 +586,35 @@ class SemanticCache:
 
         # Probeer embedding te genereren
         embedding_blob = None
+        vec = None
         try:
             provider = self._get_embed_provider()
             if provider is not None:
-                emb = provider.embed_query(query)
+                # Zelfde request als lookup → memo hit, geen tweede embed
+                emb = memo_embed(query, provider.embed_query)
                 embedding_blob = self._embedding_to_blob(emb)
+                if HAS_NUMPY:
+                    vec = self._normaliseer(emb)
         except Exception as e:
             logger.debug("SemanticCache embed voor store mislukt: %s", e)
 
-        with self._lock:
-            try:
-                conn = self._get_conn()
-                conn.execute(
-                    """INSERT INTO cache_entries
-                       (agent, query_hash, query_text, embedding, response,
-                        created, ttl_seconds, hits, payload_type, payload_meta)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)""",
-                    (agent_naam, qhash, query[:500], embedding_blob,
-                     response, now, ttl, payload_type or "text", meta_json),
-                )
-                conn.commit()
-
-                # FIFO eviction per agent
-                _row = conn.execute(
-                    "SELECT COUNT(*) FROM cache_entries WHERE agent = ?",
-                    (agent_naam,),
-                ).fetchone()
-                count = _row[0] if _row else 0
-                if count > self._MAX_ENTRIES_PER_AGENT:
-                    overschot = count - self._MAX_ENTRIES_PER_AGENT
-                    conn.execute(
-                        """DELETE FROM cache_entries WHERE id IN (
-                               SELECT id FROM cache_entries
-                               WHERE agent = ?
-                               ORDER BY created ASC LIMIT ?
-                           )""",
-                        (agent_naam, overschot),
-                    )
-                    conn.commit()
-
-                conn.close()
-            except Exception as e:
-                logger.debug("SemanticCache store fout: %s", e)
-                return
+        # Write-behind: INSERT + FIFO eviction op de writer-thread;
+        # de index volgt pas na de commit (één keer, ook bij een retry)
+        payload_type = payload_type or "text"
+        try:
+            self._writer.taak(
+                lambda conn: self._schrijf_entry(
+                    conn, agent_naam, qhash, query, embedding_blob, response,
+                    now, ttl, payload_type, meta_json,
+                ),
+                na_commit=lambda res: self._indexeer_entry(
+                    agent_naam, res, vec, now + ttl,
+                    (response, payload_type, json.loads(meta_json)),
+                ),
+            )
+        except Exception as e:
+            logger.debug("SemanticCache store fout: %s", e)
+            return
 
         # Periodieke eviction van verlopen entries
         self._write_count += 1
@@ -428,25 +622,87 @@ class SemanticCache:
             self._write_count = 0
             self.evict_expired()
 
+    def _schrijf_entry(self, conn: sqlite3.Connection, agent_naam: str,
+                       qhash: str, query: str, embedding_blob: Optional[bytes],
+                       response: str, now: float, ttl: int, payload_type: str,
+                       meta_json: str) -> Tuple[int, List[int]]:
+        """Writer-taak voor store(): rij invoegen en FIFO eviction.
+
+        Alleen SQL (kan bij een retry opnieuw draaien); de index wordt in
+        _indexeer_entry bijgewerkt zodra de batch gecommit is.
+
+        Returns:
+            (row_id, ge-evicte ids)
+        """
+        row_id = conn.execute(
+            """INSERT INTO cache_entries
+               (agent, query_hash, query_text, embedding, response,
+                created, ttl_seconds, hits, payload_type, payload_meta)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?, ?)""",
+            (agent_naam, qhash, query[:500], embedding_blob,
+             response, now, ttl, payload_type, meta_json),
+        ).lastrowid
+
+        # FIFO eviction per agent
+        _row = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE agent = ?",
+            (agent_naam,),
+        ).fetchone()
+        count = _row[0] if _row else 0
+        oudste = []
+        if count > self._MAX_ENTRIES_PER_AGENT:
+            overschot = count - self._MAX_ENTRIES_PER_AGENT
+            oudste = [r[0] for r in conn.execute(
+                """SELECT id FROM cache_entries
+                   WHERE agent = ?
+                   ORDER BY created ASC LIMIT ?""",
+                (agent_naam, overschot),
+            ).fetchall()]
+            conn.executemany(
+                "DELETE FROM cache_entries WHERE id = ?",
+                [(i,) for i in oudste],
+            )
+        return row_id, oudste
+
+    def _indexeer_entry(self, agent_naam: str, resultaat: Tuple[int, List[int]],
+                        vec: Optional["np.ndarray"], verloopt: float,
+                        payload: tuple) -> None:
+        """na_commit van store(): gecommitte rij in de index, evicties eruit."""
+        if not HAS_NUMPY:
+            return
+        row_id, oudste = resultaat
+        with self._lock:
+            idx = self._indexen.get(agent_naam)
+            if oudste and idx is not None:
+                idx.verwijder_ids(oudste)
+            if vec is not None:
+                if idx is None or idx.dim != len(vec):
+                    idx = self._indexen[agent_naam] = _AgentIndex(len(vec))
+                idx.voeg_toe(row_id, vec, verloopt, payload)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wacht tot alle store() writes in de wachtrij gecommit zijn."""
+        return self._writer.flush(timeout)
+
     def evict_expired(self) -> None:
         """Verwijder alle verlopen cache entries."""
         now = time.time()
+        try:
+            self._writer.schrijf(
+                "DELETE FROM cache_entries WHERE (created + ttl_seconds) < ?",
+                (now,),
+            )
+        except Exception as e:
+            logger.debug("SemanticCache evict fout: %s", e)
+            return
         with self._lock:
-            try:
-                conn = self._get_conn()
-                deleted = conn.execute(
-                    "DELETE FROM cache_entries WHERE (created + ttl_seconds) < ?",
-                    (now,),
-                ).rowcount
-                conn.commit()
-                conn.close()
-                if deleted:
-                    logger.debug("SemanticCache: %d verlopen entries verwijderd", deleted)
-            except Exception as e:
-                logger.debug("SemanticCache evict fout: %s", e)
+            verwijderd = sum(idx.verwijder_verlopen(now) for idx in self._indexen.values())
+        if verwijderd:
+            logger.debug("SemanticCache: %d verlopen index entries verwijderd", verwijderd)
 
     def stats(self) -> dict:
         """Cache statistieken per agent en totaal."""
+        self._writer.flush()
         try:
             conn = self._get_conn()
             rows = conn.execute(
@@ -459,9 +715,11 @@ class SemanticCache:
             per_agent = {}
             for agent, cnt, hits in rows:
                 hits = hits or 0
+                idx = self._indexen.get(agent)
                 per_agent[agent] = {
                     "entries": cnt,
                     "hits": hits,
+                    "index_entries": idx.n if idx is not None else 0,
                 }
                 total_entries += cnt
                 total_hits += hits
@@ -483,6 +741,7 @@ class SemanticCache:
                     round(self._total_hits / max(total_lookups, 1) * 100, 1)
                 ),
                 "db_size_kb": db_size_kb,
+                "index_entries": sum(i.n for i in self._indexen.values()),
                 "per_agent": per_agent,
             }
         except Exception as e:
@@ -491,20 +750,23 @@ class SemanticCache:
 
     def clear(self, agent: str = None) -> None:
         """Wis cache entries. Optioneel per agent."""
+        # Via de writer: openstaande store() landen vóór de DELETE
+        try:
+            if agent:
+                self._writer.schrijf(
+                    "DELETE FROM cache_entries WHERE agent = ?", (agent,),
+                )
+            else:
+                self._writer.schrijf("DELETE FROM cache_entries")
+            self._writer.flush()
+        except Exception as e:
+            logger.debug("SemanticCache clear fout: %s", e)
+            return
         with self._lock:
-            try:
-                conn = self._get_conn()
-                if agent:
-                    conn.execute(
-                        "DELETE FROM cache_entries WHERE agent = ?",
-                        (agent,),
-                    )
-                else:
-                    conn.execute("DELETE FROM cache_entries")
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.debug("SemanticCache clear fout: %s", e)
+            if agent:
+                self._indexen.pop(agent, None)
+            else:
+                self._indexen = {}
 
 
 # -- Singleton --
@@ -6,22 +6,44 @@ Verdeelt documenten over drie gespecialiseerde shards:
 - danny_docs: documentatie (.txt, .md, .html, .pdf)
 - danny_data: data/config (.json, .csv, .yaml, .yml, .toml, .xml, .cfg, .ini, .log)
 
+Queries worden één keer ge-embed en parallel (bounded pool, deadline per
+fan-out) naar de shards gestuurd; resultaten worden via een heap gemerged.
+
+Geleerde routing: per shard een klein aantal centroid embeddings, incrementeel
+bijgewerkt bij ingest (mini-batch online k-means). Een query gaat alleen naar
+shards waarvan de beste centroid-similarity binnen SHARD_ROUTE_MARGIN van de
+topscore valt. routing_recall() meet of die pruning hits verliest t.o.v. een
+volledige fan-out.
+
 Singleton via get_shard_router().
 Backward compatible: Config.SHARD_ENABLED=False (default) = legacy danny_knowledge.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import json
 import logging
 import math
 import os
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 from danny_toolkit.core.config import Config
+from danny_toolkit.core.embedding_memo import memo_embed, model_sleutel
 
 # ─── Constanten ──────────────────────────────────────
 
@@ -32,6 +54,13 @@ LEGACY_COLLECTION = "danny_knowledge"
 
 ALL_SHARDS = [SHARD_CODE, SHARD_DOCS, SHARD_DATA]
 
+# Aantal recente latencies per shard voor gemiddelde / p95
+_LATENCY_VENSTER = 256
+
+# Persistente shard centroids (geleerde routing)
+CENTROID_BESTAND = "shard_centroids.json"
+CENTROID_VERSIE = 1
+
 EXTENSIE_ROUTING: Dict[str, str] = {
     # Code
     ".py": SHARD_CODE,
@@ -67,6 +96,25 @@ class ShardStatistiek:
     naam: str
     aantal_chunks: int = 0
     extensies: List[str] = field(default_factory=list)
+    queries: int = 0
+    timeouts: int = 0
+    fouten: int = 0
+    laatste_latency_ms: float = 0.0
+    gem_latency_ms: float = 0.0
+    p95_latency_ms: float = 0.0
+
+
+def _normaliseer(matrix: "np.ndarray") -> "np.ndarray":
+    """L2-normaliseer rijen (nul-rijen blijven nul)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _hit_sleutel(resultaat: Dict[str, Any]) -> tuple:
+    """Identiteit van een zoekresultaat voor recall vergelijking."""
+    meta = resultaat.get("metadata", {})
+    return (resultaat.get("shard", ""), meta.get("id") or resultaat.get("tekst", ""))
 
 
 # ═══════════════════════════════════════════════════════
@@ -78,7 +126,8 @@ class ShardRouter:
 
     Verdeelt documenten over code/docs/data shards
     op basis van bestandsextensie. Fan-out queries
-    over meerdere shards met merge op distance.
+    over meerdere shards (parallel, één query embedding)
+    met heap-merge op distance.
     """
 
     def __init__(self) -> None:
@@ -88,11 +137,21 @@ class ShardRouter:
   _collections (Dict[str, Any]): A dictionary to store collections.
   _client: The client object, initially set to None.
   _embed_fn: The embedding function, initially set to None.
-  _lock (threading.Lock): A lock object for thread synchronization."""
+  _lock (threading.Lock): A lock object for thread synchronization.
+  _pool: Bounded thread pool voor shard fan-out (lazy).
+  _latencies / _tellers: Per-shard latency venster en query/timeout/fout tellers.
+  _centroids: Per shard {"c": centroid matrix, "n": aantal toegewezen chunks}.
+  _centroid_pad: JSON bestand voor de centroids (lazy geladen)."""
         self._collections: Dict[str, Any] = {}
         self._client = None
         self._embed_fn = None
         self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._latencies: Dict[str, deque] = {}
+        self._tellers: Dict[str, Dict[str, int]] = {}
+        self._centroids: Dict[str, Dict[str, Any]] = {}
+        self._centroid_pad = Config.RAG_DATA_DIR / CENTROID_BESTAND
+        self._centroids_geladen = False
 
     def _ensure_client(self) -> None:
         """Lazy init ChromaDB client + embedding functie."""
@@ -121,7 +180,9 @@ class ShardRouter:
             sys.stdout = _io.StringIO()
             sys.stderr = _io.StringIO()
             try:
-                self._embed_fn = get_chroma_embed_fn()
+                # Een via ingest() vastgelegde embedder blijft leidend
+                if self._embed_fn is None:
+                    self._embed_fn = get_chroma_embed_fn()
             finally:
                 sys.stdout = _old_out
                 sys.stderr = _old_err
@@ -182,14 +243,28 @@ class ShardRouter:
 
         Args:
             documenten: Lijst van dicts met 'id', 'tekst', 'metadata'.
-            embed_fn: Optionele embedding functie (anders intern).
+            embed_fn: Optionele embedding functie (anders intern). Een
+                router kent één embedder: de eerste wordt onthouden en ook
+                voor queries gebruikt; een afwijkende later geeft ValueError.
 
         Returns:
             Dict van shard naam -> aantal ingested chunks.
+
+        Raises:
+            ValueError: Als embed_fn afwijkt van de embedder van de router.
         """
         if not getattr(Config, "SHARD_ENABLED", False):
             return {}
 
+        if embed_fn is not None:
+            if self._embed_fn is None:
+                self._embed_fn = embed_fn
+            elif embed_fn is not self._embed_fn:
+                raise ValueError(
+                    "ShardRouter: embed_fn wijkt af van de embedder van deze "
+                    "router (queries en documenten moeten in dezelfde ruimte)"
+                )
+
         # Groepeer per shard
         per_shard: Dict[str, List[Dict]] = {s: [] for s in ALL_SHARDS}
         for doc in documenten:
@@ -197,6 +272,7 @@ class ShardRouter:
             per_shard[shard].append(doc)
 
         resultaat: Dict[str, int] = {}
+        centroids_bijgewerkt = False
 
         for shard_naam, docs in per_shard.items():
             if not docs:
@@ -247,16 +323,30 @@ class ShardRouter:
                     clean["_ingest_ts"] = str(int(time.time()))
                     metadatas.append(clean)
 
-                coll.upsert(
-                    ids=ids,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
+                # Zelf embedden: dezelfde vectoren voeden Chroma én de centroids
+                embeddings = self._embed_documenten(self._embed_fn, documents)
+                if embeddings is not None:
+                    coll.upsert(
+                        ids=ids,
+                        documents=documents,
+                        metadatas=metadatas,
+                        embeddings=embeddings,
+                    )
+                    centroids_bijgewerkt |= self._update_centroids(shard_naam, embeddings)
+                else:
+                    coll.upsert(
+                        ids=ids,
+                        documents=documents,
+                        metadatas=metadatas,
+                    )
                 resultaat[shard_naam] = len(ids)
             except Exception as e:
                 logger.debug("ShardRouter ingest fout %s: %s", shard_naam, e)
                 resultaat[shard_naam] = 0
 
+        if centroids_bijgewerkt:
+            self._bewaar_centroids()
+
         # NeuralBus event
         try:
             from danny_toolkit.core.neural_bus import (
@@ -287,7 +377,8 @@ class ShardRouter:
         Args:
             query: Zoekquery tekst.
             top_k: Aantal resultaten.
-            shards: Welke shards doorzoeken (None = alle).
+            shards: Welke shards doorzoeken (None = geleerde routing via
+                centroids; zonder centroids alle shards).
             min_score: Minimum score drempel.
 
         Returns:
@@ -306,80 +397,14 @@ class ShardRouter:
         except ImportError:
             pass  # VectorStore niet beschikbaar, skip guard
 
-        zoek_shards = shards or ALL_SHARDS
-        alle_resultaten = []
+        # Eén query embedding voor routing én alle shards
+        # (anders embedt Chroma per shard)
+        self._ensure_client()
+        query_emb = self._embed_query(query)
+        if shards is None:
+            shards = self.kies_shards(query_emb)
 
-        for shard_naam in zoek_shards:
-            coll = self._get_collection(shard_naam)
-            if coll is None:
-                continue
-            try:
-                count = coll.count()
-                if count == 0:
-                    continue
-                n = min(top_k, count)
-                results = coll.query(
-                    query_texts=[query],
-                    n_results=n,
-                    include=["documents", "metadatas", "distances"],
-                )
-                if not results.get("documents") or not results["documents"]:
-                    continue
-                docs = results["documents"][0]
-                metas = results["metadatas"][0]
-                dists = results["distances"][0]
-
-                for doc, meta, dist in zip(docs, metas, dists):
-                    # Vector fraud guard: valideer resultaat-integriteit
-                    if not isinstance(doc, str) or not doc.strip():
-                        continue
-                    if not isinstance(dist, (int, float)):
-                        continue
-                    if isinstance(dist, float) and (
-                        math.isnan(dist) or math.isinf(dist) or dist < 0
-                    ):
-                        logger.warning(
-                            "Vector fraud: ongeldige distance %.4f in shard %s",
-                            dist, shard_naam,
-                        )
-                        continue
-                    if min_score and dist > min_score:
-                        continue
-
-                    # Crypto metadata verificatie — check OmegaSeal hash
-                    if isinstance(meta, dict) and "_omega_hash" in meta:
-                        import hashlib as _hl
-                        expected_hash = _hl.sha256(
-                            doc.encode("utf-8", errors="replace")
-                        ).hexdigest()[:16]
-                        if meta["_omega_hash"] != expected_hash:
-                            logger.warning(
-                                "METADATA SPOOFING: hash mismatch in shard %s "
-                                "(expected=%s, stored=%s) — chunk verwijderd",
-                                shard_naam, expected_hash[:8],
-                                str(meta["_omega_hash"])[:8],
-                            )
-                            continue
-
-                    # Sanitize metadata — alleen primitieve types
-                    clean_meta = {}
-                    if isinstance(meta, dict):
-                        for k, v in meta.items():
-                            if isinstance(v, (str, int, float, bool)):
-                                clean_meta[str(k)[:200]] = v
-                    alle_resultaten.append({
-                        "tekst": doc,
-                        "metadata": clean_meta,
-                        "distance": dist,
-                        "shard": shard_naam,
-                    })
-            except Exception as e:
-                logger.debug("ShardRouter zoek fout %s: %s", shard_naam, e)
-
-        # Sorteer op distance (lager = beter)
-        alle_resultaten.sort(key=lambda x: x["distance"])
-
-        top = alle_resultaten[:top_k]
+        top = self._zoek_intern(query, query_emb, top_k, shards, min_score)
 
         # Phase 37: track fragment access
         if top:
@@ -401,6 +426,437 @@ class ShardRouter:
 
         return top
 
+    def _zoek_intern(self, query: str, query_emb: Optional[List[float]],
+                     top_k: int, shards: Optional[List[str]],
+                     min_score: float) -> List[Dict[str, Any]]:
+        """Doorzoek de opgegeven shards (None = alle) en merge de top-k."""
+        # Collecties in de aanroepende thread ophalen (_get_collection is lazy)
+        zoek_shards = []
+        for shard_naam in shards or ALL_SHARDS:
+            coll = self._get_collection(shard_naam)
+            if coll is not None:
+                zoek_shards.append((shard_naam, coll))
+        if not zoek_shards:
+            return []
+
+        if len(zoek_shards) == 1:
+            naam, coll = zoek_shards[0]
+            shard_resultaten = [
+                self._zoek_shard(naam, coll, query, query_emb, top_k, min_score),
+            ]
+        else:
+            shard_resultaten = self._fan_out(zoek_shards, query, query_emb, top_k, min_score)
+
+        # Heap-merge op distance (lager = beter); stabiel in shard-volgorde
+        return heapq.nsmallest(
+            top_k, itertools.chain.from_iterable(shard_resultaten),
+            key=lambda x: x["distance"],
+        )
+
+    def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed de query één keer met de shard embedding functie.
+
+        Returns:
+            Embedding als lijst floats, of None (shards embedden dan zelf).
+        """
+        fn = self._embed_fn
+        if fn is None:
+            return None
+        try:
+            if hasattr(fn, "embed_query"):
+                compute = lambda q: fn.embed_query(input=[q])[0]
+            else:
+                compute = lambda q: fn(input=[q])[0]
+            # Request-scoped memo: Memex/SemanticCache embedden dezelfde query
+            emb = memo_embed(query, compute, model=model_sleutel(fn))
+            return [float(v) for v in emb]
+        except Exception as e:
+            logger.debug("ShardRouter query embedding fout: %s", e)
+            return None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Lazy bounded pool voor shard queries."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=max(1, getattr(Config, "SHARD_MAX_WORKERS", 4)),
+                        thread_name_prefix="shard",
+                    )
+        return self._pool
+
+    def _fan_out(self, zoek_shards: List[tuple], query: str,
+                 query_emb: Optional[List[float]], top_k: int,
+                 min_score: float) -> List[List[Dict[str, Any]]]:
+        """Query alle shards parallel; shards voorbij de deadline vallen af."""
+        deadline = getattr(Config, "SHARD_DEADLINE_S", 2.0)
+        pool = self._get_pool()
+        futures = {
+            pool.submit(self._zoek_shard, naam, coll, query, query_emb, top_k, min_score): naam
+            for naam, coll in zoek_shards
+        }
+        klaar, te_laat = wait(futures, timeout=deadline)
+        for fut in te_laat:
+            naam = futures[fut]
+            fut.cancel()
+            self._registreer(naam, deadline * 1000, "timeouts")
+            logger.warning("ShardRouter: shard %s over deadline (%.1fs)", naam, deadline)
+        # Resultaten in aanvraagvolgorde voor een deterministische merge
+        return [fut.result() for fut in futures if fut in klaar]
+
+    def _zoek_shard(self, shard_naam: str, coll: Any, query: str,
+                    query_emb: Optional[List[float]], top_k: int,
+                    min_score: float) -> List[Dict[str, Any]]:
+        """Query één shard en valideer de resultaten (draait in de pool)."""
+        start = time.perf_counter()
+        resultaten: List[Dict[str, Any]] = []
+        fout = False
+        try:
+            count = coll.count()
+            if count == 0:
+                return resultaten
+            n = min(top_k, count)
+            if query_emb is not None:
+                results = coll.query(
+                    query_embeddings=[query_emb],
+                    n_results=n,
+                    include=["documents", "metadatas", "distances"],
+                )
+            else:
+                results = coll.query(
+                    query_texts=[query],
+                    n_results=n,
+                    include=["documents", "metadatas", "distances"],
+                )
+            if not results.get("documents") or not results["documents"]:
+                return resultaten
+            docs = results["documents"][0]
+            metas = results["metadatas"][0]
+            dists = results["distances"][0]
+
+            for doc, meta, dist in zip(docs, metas, dists):
+                # Vector fraud guard: valideer resultaat-integriteit
+                if not isinstance(doc, str) or not doc.strip():
+                    continue
+                if not isinstance(dist, (int, float)):
+                    continue
+                if isinstance(dist, float) and (
+                    math.isnan(dist) or math.isinf(dist) or dist < 0
+                ):
+                    logger.warning(
+                        "Vector fraud: ongeldige distance %.4f in shard %s",
+                        dist, shard_naam,
+                    )
+                    continue
+                if min_score and dist > min_score:
+                    continue
+
+                # Crypto metadata verificatie — check OmegaSeal hash
+                if isinstance(meta, dict) and "_omega_hash" in meta:
+                    import hashlib as _hl
+                    expected_hash = _hl.sha256(
+                        doc.encode("utf-8", errors="replace")
+                    ).hexdigest()[:16]
+                    if meta["_omega_hash"] != expected_hash:
+                        logger.warning(
+                            "METADATA SPOOFING: hash mismatch in shard %s "
+                            "(expected=%s, stored=%s) — chunk verwijderd",
+                            shard_naam, expected_hash[:8],
+                            str(meta["_omega_hash"])[:8],
+                        )
+                        continue
+
+                # Sanitize metadata — alleen primitieve types
+                clean_meta = {}
+                if isinstance(meta, dict):
+                    for k, v in meta.items():
+                        if isinstance(v, (str, int, float, bool)):
+                            clean_meta[str(k)[:200]] = v
+                resultaten.append({
+                    "tekst": doc,
+                    "metadata": clean_meta,
+                    "distance": dist,
+                    "shard": shard_naam,
+                })
+        except Exception as e:
+            fout = True
+            logger.debug("ShardRouter zoek fout %s: %s", shard_naam, e)
+        finally:
+            self._registreer(
+                shard_naam, (time.perf_counter() - start) * 1000,
+                "fouten" if fout else None,
+            )
+        return resultaten
+
+    def _registreer(self, shard_naam: str, latency_ms: float,
+                    teller: Optional[str] = None) -> None:
+        """Leg latency en query/timeout/fout tellers vast per shard."""
+        with self._lock:
+            tellers = self._tellers.setdefault(
+                shard_naam, {"queries": 0, "timeouts": 0, "fouten": 0},
+            )
+            if teller == "timeouts":
+                tellers["timeouts"] += 1  # late shard telt later zelf als query
+                return
+            tellers["queries"] += 1
+            if teller:
+                tellers[teller] += 1
+            self._latencies.setdefault(
+                shard_naam, deque(maxlen=_LATENCY_VENSTER),
+            ).append(latency_ms)
+
+    def _latency_stats(self, shard_naam: str) -> Dict[str, Any]:
+        """Latency samenvatting voor één shard."""
+        with self._lock:
+            tellers = dict(self._tellers.get(
+                shard_naam, {"queries": 0, "timeouts": 0, "fouten": 0},
+            ))
+            venster = sorted(self._latencies.get(shard_naam, ()))
+            laatste = self._latencies[shard_naam][-1] if venster else 0.0
+        if venster:
+            tellers["laatste_latency_ms"] = round(laatste, 2)
+            tellers["gem_latency_ms"] = round(sum(venster) / len(venster), 2)
+            tellers["p95_latency_ms"] = round(
+                venster[min(len(venster) - 1, int(len(venster) * 0.95))], 2,
+            )
+        return tellers
+
+    # ─── Geleerde routing ────────────────────────────
+
+    def kan_routeren(self) -> bool:
+        """True als er centroids én een query embedding functie zijn."""
+        if not HAS_NUMPY:
+            return False
+        self._ensure_client()
+        if self._embed_fn is None:
+            return False
+        self._laad_centroids()
+        with self._lock:
+            return any(len(st["c"]) for st in self._centroids.values())
+
+    def kies_shards(self, query_emb: Optional[List[float]],
+                    marge: Optional[float] = None) -> Optional[List[str]]:
+        """Kies shards op centroid-similarity met de query.
+
+        Score per shard = hoogste cosine similarity over zijn centroids.
+        Gekozen worden alle shards binnen `marge` van de beste score; shards
+        zonder centroids worden altijd meegenomen (geen kennis = niet prunen).
+
+        Args:
+            query_emb: Query embedding (None = geen routing).
+            marge: Similarity marge (default Config.SHARD_ROUTE_MARGIN).
+
+        Returns:
+            Lijst shard namen, of None (alle shards) zonder bruikbare centroids.
+        """
+        if not HAS_NUMPY or query_emb is None:
+            return None
+        self._laad_centroids()
+        with self._lock:
+            matrices = {
+                naam: st["c"] for naam, st in self._centroids.items()
+                if len(st["c"])
+            }
+        if not matrices:
+            return None
+        if marge is None:
+            marge = getattr(Config, "SHARD_ROUTE_MARGIN", 0.05)
+
+        q = _normaliseer(np.asarray(query_emb, dtype=np.float32).reshape(1, -1))[0]
+        scores: Dict[str, float] = {}
+        for naam, centroids in matrices.items():
+            if centroids.shape[1] != q.shape[0]:
+                logger.debug("ShardRouter: centroid dimensie mismatch voor %s", naam)
+                return None
+            scores[naam] = float(np.max(_normaliseer(centroids) @ q))
+        beste = max(scores.values())
+        gekozen = [
+            naam for naam in ALL_SHARDS
+            if naam not in scores or scores[naam] >= beste - marge
+        ]
+        logger.debug("ShardRouter routing: %s (scores=%s)", gekozen, scores)
+        return gekozen
+
+    def routing_recall(self, queries: List[str], top_k: int = 5,
+                       marge: Optional[float] = None) -> Dict[str, Any]:
+        """Vergelijk geleerde routing met volledige fan-out.
+
+        Per query worden de top-k hits over alle shards als referentie
+        genomen; recall = fractie daarvan die de gerouteerde zoekopdracht
+        ook vindt. Omzeilt de anti-extraction guard (interne diagnose).
+
+        Args:
+            queries: Lijst query teksten (bijv. een steekproef uit de logs).
+            top_k: Aantal resultaten per query.
+            marge: Similarity marge voor kies_shards.
+
+        Returns:
+            Dict met recall, min_recall, gem_shards en gemiste_queries.
+        """
+        self._ensure_client()
+        recalls: List[float] = []
+        shard_aantallen: List[int] = []
+        gemist: List[str] = []
+        for query in queries:
+            query_emb = self._embed_query(query)
+            volledig = self._zoek_intern(query, query_emb, top_k, ALL_SHARDS, 0.0)
+            gekozen = self.kies_shards(query_emb, marge) or ALL_SHARDS
+            gerouteerd = self._zoek_intern(query, query_emb, top_k, gekozen, 0.0)
+            shard_aantallen.append(len(gekozen))
+            referentie = {_hit_sleutel(r) for r in volledig}
+            if not referentie:
+                recalls.append(1.0)
+                continue
+            gevonden = referentie & {_hit_sleutel(r) for r in gerouteerd}
+            recall = len(gevonden) / len(referentie)
+            recalls.append(recall)
+            if recall < 1.0:
+                gemist.append(query)
+        n = len(recalls)
+        return {
+            "queries": n,
+            "top_k": top_k,
+            "recall": round(sum(recalls) / n, 4) if n else 1.0,
+            "min_recall": round(min(recalls), 4) if n else 1.0,
+            "gem_shards": round(sum(shard_aantallen) / n, 2) if n else 0.0,
+            "totaal_shards": len(ALL_SHARDS),
+            "gemiste_queries": gemist,
+        }
+
+    def herbereken_centroids(self, steekproef: int = 2000) -> Dict[str, int]:
+        """Bouw centroids opnieuw op uit bestaande shard collecties.
+
+        Voor stores die vóór de geleerde routing zijn gevuld.
+
+        Args:
+            steekproef: Max aantal embeddings per shard.
+
+        Returns:
+            Dict van shard naam -> aantal gebruikte embeddings.
+        """
+        resultaat: Dict[str, int] = {}
+        if not HAS_NUMPY:
+            return resultaat
+        with self._lock:
+            self._centroids = {}
+            self._centroids_geladen = True
+        for shard_naam in ALL_SHARDS:
+            coll = self._get_collection(shard_naam)
+            if coll is None:
+                continue
+            try:
+                batch = coll.get(limit=steekproef, include=["embeddings"])
+                embeddings = batch.get("embeddings")
+                if embeddings is None or len(embeddings) == 0:
+                    resultaat[shard_naam] = 0
+                    continue
+                self._update_centroids(shard_naam, embeddings)
+                resultaat[shard_naam] = len(embeddings)
+            except Exception as e:
+                logger.debug("ShardRouter centroid herberekening %s: %s", shard_naam, e)
+        self._bewaar_centroids()
+        return resultaat
+
+    def _embed_documenten(self, fn: Optional[Callable],
+                          documenten: List[str]) -> Optional[List[List[float]]]:
+        """Embed documenten voor upsert + centroids (None = Chroma embedt zelf)."""
+        if fn is None or not HAS_NUMPY:
+            return None
+        try:
+            embs = fn(documenten)
+            return [[float(v) for v in emb] for emb in embs]
+        except Exception as e:
+            logger.debug("ShardRouter document embedding fout: %s", e)
+            return None
+
+    def _update_centroids(self, shard_naam: str, embeddings: Any) -> bool:
+        """Werk de centroids van een shard bij met een batch embeddings.
+
+        Mini-batch online k-means: lege plekken worden gevuld met gespreide
+        seeds uit de batch, de rest wordt aan de dichtstbijzijnde centroid
+        toegewezen die naar het gewogen gemiddelde schuift.
+        """
+        if not HAS_NUMPY:
+            return False
+        X = np.asarray(embeddings, dtype=np.float32)
+        if X.ndim != 2 or len(X) == 0:
+            return False
+        X = _normaliseer(X)
+        k = max(1, int(getattr(Config, "SHARD_CENTROIDS", 8)))
+        self._laad_centroids()
+        with self._lock:
+            st = self._centroids.get(shard_naam)
+            if st is None or st["c"].shape[1] != X.shape[1]:
+                st = {
+                    "c": np.empty((0, X.shape[1]), dtype=np.float32),
+                    "n": np.empty(0, dtype=np.float64),
+                }
+            vrij = k - len(st["c"])
+            if vrij > 0:
+                idx = np.unique(np.linspace(0, len(X) - 1, min(vrij, len(X))).astype(int))
+                st["c"] = np.vstack([st["c"], X[idx]])
+                st["n"] = np.concatenate([st["n"], np.ones(len(idx))])
+                rest = np.ones(len(X), dtype=bool)
+                rest[idx] = False
+                X = X[rest]
+            if len(X):
+                toewijzing = np.argmax(X @ _normaliseer(st["c"]).T, axis=1)
+                sommen = np.zeros(st["c"].shape, dtype=np.float64)
+                np.add.at(sommen, toewijzing, X)
+                aantallen = np.bincount(toewijzing, minlength=len(st["c"]))
+                nieuw_n = st["n"] + aantallen
+                st["c"] = (
+                    (st["c"] * st["n"][:, None] + sommen) / nieuw_n[:, None]
+                ).astype(np.float32)
+                st["n"] = nieuw_n
+            self._centroids[shard_naam] = st
+        return True
+
+    def _laad_centroids(self) -> None:
+        """Laad centroids eenmalig van disk."""
+        if self._centroids_geladen or not HAS_NUMPY:
+            return
+        with self._lock:
+            if self._centroids_geladen:
+                return
+            self._centroids_geladen = True
+            try:
+                if not self._centroid_pad.exists():
+                    return
+                data = json.loads(self._centroid_pad.read_text(encoding="utf-8"))
+                if data.get("versie") != CENTROID_VERSIE:
+                    logger.debug("ShardRouter: onbekende centroid versie, genegeerd")
+                    return
+                for naam, st in data.get("shards", {}).items():
+                    c = np.asarray(st["centroids"], dtype=np.float32)
+                    n = np.asarray(st["aantallen"], dtype=np.float64)
+                    if c.ndim == 2 and len(c) == len(n) and naam not in self._centroids:
+                        self._centroids[naam] = {"c": c, "n": n}
+            except Exception as e:
+                logger.debug("ShardRouter centroids laden fout: %s", e)
+
+    def _bewaar_centroids(self) -> None:
+        """Schrijf centroids atomair naar disk (tmp + replace)."""
+        with self._lock:
+            data = {
+                "versie": CENTROID_VERSIE,
+                "shards": {
+                    naam: {
+                        "centroids": st["c"].tolist(),
+                        "aantallen": st["n"].tolist(),
+                    }
+                    for naam, st in self._centroids.items()
+                },
+            }
+        try:
+            pad = self._centroid_pad
+            pad.parent.mkdir(parents=True, exist_ok=True)
+            tmp = pad.with_suffix(pad.suffix + ".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, pad)
+        except Exception as e:
+            logger.debug("ShardRouter centroids opslaan fout: %s", e)
+
     # ─── Migratie ────────────────────────────────────
 
     def migreer(self, batch_size: int = 500) -> Dict[str, int]:
@@ -433,6 +889,7 @@ class ShardRouter:
 
         resultaat: Dict[str, int] = {s: 0 for s in ALL_SHARDS}
         offset = 0
+        centroids_bijgewerkt = False
 
         while offset < totaal:
             try:
@@ -467,11 +924,21 @@ class ShardRouter:
                     coll = self._get_collection(shard_naam)
                     if coll is None:
                         continue
-                    coll.upsert(
-                        ids=s_ids,
-                        documents=s_docs,
-                        metadatas=s_metas,
-                    )
+                    embeddings = self._embed_documenten(self._embed_fn, s_docs)
+                    if embeddings is not None:
+                        coll.upsert(
+                            ids=s_ids,
+                            documents=s_docs,
+                            metadatas=s_metas,
+                            embeddings=embeddings,
+                        )
+                        centroids_bijgewerkt |= self._update_centroids(shard_naam, embeddings)
+                    else:
+                        coll.upsert(
+                            ids=s_ids,
+                            documents=s_docs,
+                            metadatas=s_metas,
+                        )
                     resultaat[shard_naam] += len(s_ids)
 
                 offset += len(ids)
@@ -479,6 +946,9 @@ class ShardRouter:
                 logger.debug("ShardRouter migratie batch fout: %s", e)
                 break
 
+        if centroids_bijgewerkt:
+            self._bewaar_centroids()
+
         # NeuralBus event
         try:
             from danny_toolkit.core.neural_bus import (
@@ -501,23 +971,25 @@ class ShardRouter:
         """Haal statistieken op per shard.
 
         Returns:
-            Lijst van ShardStatistiek per shard.
+            Lijst van ShardStatistiek per shard (incl. query latency).
         """
         stats = []
         for shard_naam in ALL_SHARDS:
+            latency = self._latency_stats(shard_naam)
             coll = self._get_collection(shard_naam)
             if coll is None:
-                stats.append(ShardStatistiek(naam=shard_naam))
+                stats.append(ShardStatistiek(naam=shard_naam, **latency))
                 continue
             try:
                 count = coll.count()
                 stats.append(ShardStatistiek(
                     naam=shard_naam,
                     aantal_chunks=count,
+                    **latency,
                 ))
             except Exception as e:
                 logger.debug("ShardRouter stats fout %s: %s", shard_naam, e)
-                stats.append(ShardStatistiek(naam=shard_naam))
+                stats.append(ShardStatistiek(naam=shard_naam, **latency))
         return stats
 
 
@@ -0,0 +1,199 @@
+"""
+StageGraaf — Kleine afhankelijkheidsgraaf voor pipeline-fases.
+
+Elke stage is een async functie zonder argumenten met een lijst van stages
+waar hij op wacht. Stages zonder onderlinge afhankelijkheid lopen als
+gelijktijdige asyncio tasks; de aanroeper haalt resultaten op wanneer hij
+ze nodig heeft (bv. eerst de governor gate, daarna de rest).
+
+Per stage wordt een RequestTracer span geopend (in de eigen task-context,
+dus parallelle spans lopen niet door elkaar). Bij afsluiten komen de graaf,
+de timings en het kritieke pad op de trace.
+
+Gebruik:
+    from danny_toolkit.core.stage_graph import StageGraaf
+
+    graaf = StageGraaf(tracer=get_request_tracer())
+    graaf.stage("governor", gate)
+    graaf.stage("phantom", phantom)
+    graaf.stage("memex", memex, na=("phantom",))
+    graaf.start()
+    try:
+        ok = await graaf.resultaat("governor")
+        ...
+    finally:
+        await graaf.afsluiten()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# verslag(resultaat) -> (span status, span details)
+Verslag = Callable[[Any], Tuple[str, Dict[str, Any]]]
+
+
+class _Stage:
+    """Eén knoop in de graaf met zijn timings."""
+
+    __slots__ = ("naam", "fn", "na", "verslag", "taak", "span",
+                 "start", "eind", "status")
+
+    def __init__(self, naam: str, fn: Callable[[], Awaitable[Any]],
+                 na: Tuple[str, ...], verslag: Optional[Verslag]) -> None:
+        self.naam = naam
+        self.fn = fn
+        self.na = na
+        self.verslag = verslag
+        self.taak: Optional[asyncio.Task] = None
+        self.span = None
+        self.start = 0.0
+        self.eind = 0.0
+        self.status = "pending"
+
+
+class StageGraaf:
+    """Voert async stages uit zodra hun afhankelijkheden klaar zijn."""
+
+    def __init__(self, tracer: Any = None) -> None:
+        """
+        Args:
+            tracer: Optionele RequestTracer voor spans en het graaf-rapport.
+        """
+        self.tracer = tracer
+        self._stages: Dict[str, _Stage] = {}
+        self._t0 = 0.0
+        self._afgesloten = False
+
+    def stage(
+        self,
+        naam: str,
+        fn: Callable[[], Awaitable[Any]],
+        na: Sequence[str] = (),
+        verslag: Optional[Verslag] = None,
+    ) -> None:
+        """Registreer een stage.
+
+        Args:
+            naam: Unieke stage naam (ook de span naam).
+            fn: Async functie zonder argumenten.
+            na: Stages die eerst klaar moeten zijn (al geregistreerd).
+            verslag: Optioneel: resultaat -> (span status, span details).
+        """
+        if naam in self._stages:
+            raise ValueError(f"Stage {naam!r} bestaat al")
+        onbekend = [n for n in na if n not in self._stages]
+        if onbekend:
+            raise ValueError(f"Stage {naam!r} wacht op onbekende stages {onbekend}")
+        self._stages[naam] = _Stage(naam, fn, tuple(na), verslag)
+
+    def start(self) -> None:
+        """Start alle stages als tasks (afhankelijken wachten zelf)."""
+        self._t0 = time.perf_counter()
+        for stage in self._stages.values():
+            stage.taak = asyncio.ensure_future(self._draai(stage))
+
+    async def _draai(self, stage: _Stage) -> Any:
+        """Wacht op afhankelijkheden, voer uit en registreer de span."""
+        for naam in stage.na:
+            await self._stages[naam].taak
+        if self.tracer:
+            stage.span = self.tracer.begin_span(stage.naam)
+        stage.start = time.perf_counter()
+        try:
+            resultaat = await stage.fn()
+        except asyncio.CancelledError:
+            stage.eind = time.perf_counter()
+            stage.status = "geannuleerd"
+            if self.tracer:
+                self.tracer.eind_span("skipped")
+            raise
+        except Exception as e:
+            stage.eind = time.perf_counter()
+            stage.status = "error"
+            if self.tracer:
+                self.tracer.eind_span("error", {"fout": str(e)[:200]})
+            raise
+        stage.eind = time.perf_counter()
+        status, details = "ok", {}
+        if stage.verslag is not None:
+            try:
+                status, details = stage.verslag(resultaat)
+            except Exception as e:
+                logger.debug("StageGraaf verslag %s: %s", stage.naam, e)
+        stage.status = status
+        if self.tracer:
+            self.tracer.eind_span(status, {**details, "na": list(stage.na)})
+        return resultaat
+
+    async def resultaat(self, naam: str) -> Any:
+        """Wacht op een stage en geef zijn resultaat (of exception)."""
+        return await self._stages[naam].taak
+
+    async def afsluiten(self) -> Dict[str, Any]:
+        """Annuleer onafgemaakte stages en leg het rapport vast (idempotent)."""
+        open_ = [s.taak for s in self._stages.values()
+                 if s.taak is not None and not s.taak.done()]
+        for taak in open_:
+            taak.cancel()
+        if open_:
+            await asyncio.gather(*open_, return_exceptions=True)
+        # Exceptions van niet-opgehaalde stages ophalen (geen asyncio warnings)
+        for stage in self._stages.values():
+            if stage.taak is not None and not stage.taak.cancelled():
+                stage.taak.exception()
+        rapport = self.rapport()
+        if not self._afgesloten:
+            self._afgesloten = True
+            for naam in rapport["kritiek_pad"]:
+                span = self._stages[naam].span
+                if span is not None:
+                    span.details["kritiek"] = True
+            if self.tracer and hasattr(self.tracer, "registreer_graaf"):
+                self.tracer.registreer_graaf(rapport)
+        return rapport
+
+    def kritiek_pad(self) -> List[str]:
+        """Keten van stages die de totale duur bepaalde.
+
+        Begint bij de laatst geëindigde afgeronde stage en volgt steeds de
+        afhankelijkheid die het laatst klaar was.
+        """
+        klaar = {n: s for n, s in self._stages.items()
+                 if s.status not in ("pending", "geannuleerd") and s.eind}
+        if not klaar:
+            return []
+        pad = [max(klaar.values(), key=lambda s: s.eind).naam]
+        while True:
+            deps = [klaar[n] for n in self._stages[pad[-1]].na if n in klaar]
+            if not deps:
+                break
+            pad.append(max(deps, key=lambda s: s.eind).naam)
+        return list(reversed(pad))
+
+    def rapport(self) -> Dict[str, Any]:
+        """Graaf, per-stage timings (ms t.o.v. start) en kritiek pad."""
+        def ms(t: float) -> float:
+            return round((t - self._t0) * 1000, 2) if t else 0.0
+
+        stages = {
+            n: {
+                "na": list(s.na),
+                "start_ms": ms(s.start),
+                "duur_ms": round((s.eind - s.start) * 1000, 2) if s.eind and s.start else 0.0,
+                "status": s.status,
+            }
+            for n, s in self._stages.items()
+        }
+        pad = self.kritiek_pad()
+        return {
+            "stages": stages,
+            "kritiek_pad": pad,
+            "kritiek_ms": ms(self._stages[pad[-1]].eind) if pad else 0.0,
+            "serieel_ms": round(sum(s["duur_ms"] for s in stages.values()), 2),
+        }
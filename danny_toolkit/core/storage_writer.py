@@ -0,0 +1,453 @@
+"""
+StorageWriter — Write-behind opslag voor SQLite-backed componenten.
+
+Eén achtergrond-thread per databasebestand. Componenten zetten rijen in
+de wachtrij (schrijf) of geven een taak mee die op de writer-verbinding
+draait (taak, voor read-modify-write); de aanroeper wacht niet op de
+commit. De writer bundelt wat klaarstaat in één transactie zodra de batch
+vol is (STORAGE_WRITER_BATCH) of de oudste rij STORAGE_WRITER_INTERVAL_MS
+wacht. Opeenvolgende rijen met dezelfde SQL gaan via executemany.
+
+Lezers die hun eigen writes moeten zien roepen eerst flush() aan; dat is
+gratis als er niets openstaat. Bij shutdown flusht de LifecycleManager
+(pre-shutdown hook) en atexit alle writers.
+
+Een ":memory:" database is niet te delen tussen verbindingen; daarvoor
+levert writer_voor() een synchrone writer op de verbinding van het
+component zelf (zelfde API, commit direct).
+
+Gebruik:
+    from danny_toolkit.core.storage_writer import writer_voor
+
+    writer = writer_voor(db_path, verbinding=conn)
+    writer.schrijf("INSERT INTO metrics (agent, ms) VALUES (?, ?)", (naam, ms))
+    writer.taak(lambda conn: conn.execute("UPDATE ..."))
+    writer.taak(fn, na_commit=lambda resultaat: ...)   # na de commit, één keer
+    writer.flush()          # vóór een query die de writes moet zien
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from danny_toolkit.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SQL = "sql"
+_TAAK = "taak"
+_LOCK_POGINGEN = 3
+_VERBIND_POGINGEN = 4
+
+# (soort, sql of fn, params of na_commit, t_in)
+_Item = Tuple[str, Any, Any, float]
+
+
+class StorageWriter:
+    """Write-behind writer voor één SQLite bestand.
+
+    Met verbinding (":memory:") schrijft hij synchroon op die verbinding;
+    zonder draait een eigen thread met een eigen verbinding.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_grootte: Optional[int] = None,
+        interval_s: Optional[float] = None,
+        max_wachtrij: Optional[int] = None,
+        verbinding: Optional[sqlite3.Connection] = None,
+    ) -> None:
+        """
+        Args:
+            db_path: Pad naar het databasebestand.
+            batch_grootte: Max rijen per transactie (default Config).
+            interval_s: Max wachttijd van de oudste rij (default Config).
+            max_wachtrij: Boven dit aantal wacht de aanroeper (backpressure).
+            verbinding: Bestaande verbinding; maakt de writer synchroon.
+        """
+        self.db_path = str(db_path)
+        self.naam = Path(self.db_path).name or self.db_path
+        self.batch_grootte = max(int(batch_grootte or Config.STORAGE_WRITER_BATCH), 1)
+        self.interval_s = max(
+            interval_s if interval_s is not None
+            else Config.STORAGE_WRITER_INTERVAL_MS / 1000, 0.0,
+        )
+        self.max_wachtrij = max(int(max_wachtrij or Config.STORAGE_WRITER_MAX_WACHTRIJ), 1)
+        self.synchroon = verbinding is not None
+
+        self._conn = verbinding
+        self._wachtrij: Deque[_Item] = deque()
+        self._cond = threading.Condition()
+        self._sync_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self._nu_flushen = False
+        self._ingediend = 0
+        self._geschreven = 0
+
+        # Metrics (onder self._cond)
+        self._flushes = 0
+        self._rijen = 0
+        self._fouten = 0
+        self._laatste_fout = ""
+        self._flush_ms_totaal = 0.0
+        self._flush_ms_max = 0.0
+        self._wacht_ms_totaal = 0.0
+        self._wacht_ms_max = 0.0
+        self._max_diepte = 0
+        self._vol_gewacht = 0
+
+    # ── Aanroeper-kant ──
+
+    def schrijf(self, sql: str, params: Iterable[Any] = ()) -> None:
+        """Zet één statement in de wachtrij (keert direct terug)."""
+        self._plaats((_SQL, sql, tuple(params), time.perf_counter()))
+
+    def schrijf_veel(self, sql: str, rijen: Iterable[Iterable[Any]]) -> None:
+        """Zet meerdere rijen met dezelfde SQL in de wachtrij."""
+        nu = time.perf_counter()
+        for params in rijen:
+            self._plaats((_SQL, sql, tuple(params), nu))
+
+    def taak(self, fn: Callable[[sqlite3.Connection], Any],
+             na_commit: Optional[Callable[[Any], None]] = None) -> None:
+        """Draai fn(conn) op de writer-verbinding, binnen de batch-transactie.
+
+        Voor read-modify-write die de eigen writes moet zien. fn mag niet
+        committen; bij een mislukte batch kan fn opnieuw draaien. Bijwerken
+        van in-memory staat hoort daarom in na_commit(resultaat): die draait
+        precies één keer, met de return van fn uit de gecommitte poging,
+        buiten de transactie en vóór flush() terugkeert.
+        """
+        self._plaats((_TAAK, fn, na_commit, time.perf_counter()))
+
+    def _plaats(self, item: _Item) -> None:
+        if self.synchroon:
+            with self._sync_lock:
+                with self._cond:
+                    self._ingediend += 1
+                self._schrijf_batch([item])
+            return
+        with self._cond:
+            if self._stop:
+                raise RuntimeError(f"StorageWriter {self.naam} is gesloten")
+            if len(self._wachtrij) >= self.max_wachtrij:
+                self._vol_gewacht += 1
+                self._nu_flushen = True
+                self._cond.notify_all()
+                while len(self._wachtrij) >= self.max_wachtrij and not self._stop:
+                    if self._thread is None:
+                        # Verbinden mislukte; niet eeuwig blokkeren
+                        raise RuntimeError(
+                            f"StorageWriter {self.naam}: geen verbinding, wachtrij vol")
+                    self._cond.wait(0.1)
+            self._wachtrij.append(item)
+            self._ingediend += 1
+            if len(self._wachtrij) > self._max_diepte:
+                self._max_diepte = len(self._wachtrij)
+            if self._thread is None:
+                self._start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wacht tot alles wat tot nu toe is ingediend gecommit is.
+
+        Returns:
+            True als alles geschreven is, False bij timeout.
+        """
+        if self.synchroon or threading.current_thread() is self._thread:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            doel = self._ingediend
+            if self._geschreven >= doel:
+                return True
+            self._nu_flushen = True
+            self._cond.notify_all()
+            while self._geschreven < doel:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                rest = None if deadline is None else deadline - time.monotonic()
+                if rest is not None and rest <= 0:
+                    return False
+                self._cond.wait(rest)
+            return True
+
+    def sluit(self, timeout: float = 10.0) -> None:
+        """Flush de wachtrij en stop de thread."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ── Writer-kant ──
+
+    def _start(self) -> None:
+        """Start de writer-thread (onder self._cond)."""
+        self._thread = threading.Thread(
+            target=self._loop, name=f"storage-writer-{self.naam}", daemon=True,
+        )
+        self._thread.start()
+
+    def _verbind(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=Config.SQLITE_CONNECT_TIMEOUT)
+        Config.apply_sqlite_perf(conn)
+        return conn
+
+    def _verbind_met_backoff(self) -> Optional[sqlite3.Connection]:
+        """Verbind met oplopende wachttijd (locked DB, map nog niet aanwezig)."""
+        for poging in range(_VERBIND_POGINGEN):
+            try:
+                return self._verbind()
+            except Exception as e:
+                with self._cond:
+                    self._fouten += 1
+                    self._laatste_fout = str(e)[:200]
+                logger.warning("StorageWriter %s: verbinden mislukt (poging %d/%d): %s",
+                               self.naam, poging + 1, _VERBIND_POGINGEN, e)
+                if poging < _VERBIND_POGINGEN - 1:
+                    time.sleep(0.2 * 2 ** poging)
+        return None
+
+    def _loop(self) -> None:
+        self._conn = self._verbind_met_backoff()
+        if self._conn is None:
+            # Niet sluiten: de wachtrij blijft staan en de volgende
+            # schrijf()/taak() start een nieuwe thread die opnieuw verbindt.
+            with self._cond:
+                self._thread = None
+                wachtend = len(self._wachtrij)
+                gestopt = self._stop
+                self._cond.notify_all()
+            logger.error("StorageWriter %s: geen verbinding, %d item(s) %s",
+                         self.naam, wachtend,
+                         "verloren bij sluiten" if gestopt else "wachten op nieuwe poging")
+            return
+        while True:
+            with self._cond:
+                while not self._wachtrij and not self._stop:
+                    self._cond.wait()
+                if not self._wachtrij:
+                    break
+                # Bundel: wacht op een volle batch, het interval of een flush
+                deadline = self._wachtrij[0][3] + self.interval_s
+                while (len(self._wachtrij) < self.batch_grootte
+                       and not self._nu_flushen and not self._stop):
+                    rest = deadline - time.perf_counter()
+                    if rest <= 0:
+                        break
+                    self._cond.wait(rest)
+                aantal = min(len(self._wachtrij), self.batch_grootte)
+                batch = [self._wachtrij.popleft() for _ in range(aantal)]
+                if not self._wachtrij:
+                    self._nu_flushen = False
+                self._cond.notify_all()  # ruimte voor wachtende aanroepers
+            self._schrijf_batch(batch)
+        try:
+            self._conn.close()
+        except Exception as e:
+            logger.debug("StorageWriter %s close: %s", self.naam, e)
+
+    def _voer_uit(self, batch: List[_Item]) -> List[Tuple[Callable, Any]]:
+        """Voer de batch uit; opeenvolgende gelijke SQL via executemany.
+
+        Returns:
+            (na_commit, resultaat) van de taken die een callback hebben.
+        """
+        conn = self._conn
+        callbacks = []
+        i = 0
+        while i < len(batch):
+            soort, doel, params, _ = batch[i]
+            if soort == _TAAK:
+                resultaat = doel(conn)
+                if params is not None:
+                    callbacks.append((params, resultaat))
+                i += 1
+                continue
+            j = i + 1
+            while j < len(batch) and batch[j][0] == _SQL and batch[j][1] == doel:
+                j += 1
+            if j - i == 1:
+                conn.execute(doel, params)
+            else:
+                conn.executemany(doel, [b[2] for b in batch[i:j]])
+            i = j
+        return callbacks
+
+    def _commit_batch(self, batch: List[_Item]) -> List[Tuple[Callable, Any]]:
+        """Eén transactie voor de batch; bij "locked" opnieuw proberen."""
+        for poging in range(_LOCK_POGINGEN):
+            try:
+                callbacks = self._voer_uit(batch)
+                self._conn.commit()
+                return callbacks
+            except sqlite3.OperationalError as e:
+                self._conn.rollback()
+                if "locked" in str(e) and poging < _LOCK_POGINGEN - 1:
+                    time.sleep(0.1 * (poging + 1))
+                    continue
+                raise
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _schrijf_batch(self, batch: List[_Item]) -> None:
+        """Commit de batch; faalt hij, dan per item zodat één rij de rest niet sleept."""
+        t0 = time.perf_counter()
+        fouten = 0
+        laatste_fout = ""
+        callbacks: List[Tuple[Callable, Any]] = []
+        try:
+            callbacks = self._commit_batch(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                fouten, laatste_fout = 1, str(e)[:200]
+            else:
+                for item in batch:
+                    try:
+                        callbacks.extend(self._commit_batch([item]))
+                    except Exception as e_item:
+                        fouten += 1
+                        laatste_fout = str(e_item)[:200]
+            if fouten:
+                logger.warning("StorageWriter %s: %d rij(en) niet geschreven: %s",
+                               self.naam, fouten, laatste_fout)
+        # Na de commit, buiten de transactie; vóór flush() wachters wakker worden
+        for na_commit, resultaat in callbacks:
+            try:
+                na_commit(resultaat)
+            except Exception as e:
+                logger.debug("StorageWriter %s na_commit fout: %s", self.naam, e)
+        t1 = time.perf_counter()
+        flush_ms = (t1 - t0) * 1000
+        wacht_ms = (t1 - batch[0][3]) * 1000
+        with self._cond:
+            self._geschreven += len(batch)
+            self._flushes += 1
+            self._rijen += len(batch) - fouten
+            self._flush_ms_totaal += flush_ms
+            self._flush_ms_max = max(self._flush_ms_max, flush_ms)
+            self._wacht_ms_totaal += wacht_ms
+            self._wacht_ms_max = max(self._wacht_ms_max, wacht_ms)
+            if fouten:
+                self._fouten += fouten
+                self._laatste_fout = laatste_fout
+            self._cond.notify_all()
+
+    # ── Metrics ──
+
+    def stats(self) -> Dict[str, Any]:
+        """Metrics in het get_pipeline_metrics() formaat + writer-velden."""
+        with self._cond:
+            flushes = max(self._flushes, 1)
+            verwerkt = max(self._rijen + self._fouten, 1)
+            return {
+                "calls": self._flushes,
+                "errors": self._fouten,
+                "avg_ms": round(self._flush_ms_totaal / flushes, 2),
+                "success_rate": round(self._rijen / verwerkt * 100, 1),
+                "last_error": self._laatste_fout,
+                "db": self.db_path,
+                "synchroon": self.synchroon,
+                "queue_depth": len(self._wachtrij),
+                "max_queue_depth": self._max_diepte,
+                "rows": self._rijen,
+                "rows_per_flush": round(self._rijen / flushes, 1),
+                "flush_ms_max": round(self._flush_ms_max, 2),
+                "wait_ms_avg": round(self._wacht_ms_totaal / flushes, 1),
+                "wait_ms_max": round(self._wacht_ms_max, 1),
+                "backpressure": self._vol_gewacht,
+            }
+
+
+# ── Register: één writer per bestand ──
+
+_writers: Dict[str, StorageWriter] = {}
+_writers_lock = threading.Lock()
+_shutdown_geregistreerd = False
+
+
+def _registreer_shutdown() -> None:
+    """Flush via de LifecycleManager en bij proces-einde (eenmalig)."""
+    global _shutdown_geregistreerd
+    if _shutdown_geregistreerd:
+        return
+    _shutdown_geregistreerd = True
+    try:
+        from danny_toolkit.omega_sovereign_core.lifecycle import get_lifecycle_manager
+        get_lifecycle_manager().add_pre_shutdown_hook(flush_alle)
+    except Exception as e:
+        logger.debug("StorageWriter lifecycle hook niet geregistreerd: %s", e)
+    atexit.register(sluit_alle)
+
+
+def get_writer(db_path: str) -> StorageWriter:
+    """Procesbrede writer voor een databasebestand (aangemaakt bij eerste gebruik)."""
+    sleutel = os.path.abspath(str(db_path))
+    writer = _writers.get(sleutel)
+    if writer is not None:
+        return writer
+    with _writers_lock:
+        writer = _writers.get(sleutel)
+        if writer is None:
+            writer = StorageWriter(sleutel)
+            _writers[sleutel] = writer
+            _registreer_shutdown()
+        return writer
+
+
+def writer_voor(db_path: str, verbinding: Optional[sqlite3.Connection] = None
+                ) -> StorageWriter:
+    """Writer voor een component: gedeeld per bestand, synchroon voor ":memory:"."""
+    if str(db_path) == ":memory:":
+        if verbinding is None:
+            raise ValueError("':memory:' vereist de verbinding van het component")
+        return StorageWriter(":memory:", verbinding=verbinding)
+    return get_writer(db_path)
+
+
+def flush_alle(timeout: float = 10.0) -> bool:
+    """Flush alle writers; True als alles geschreven is."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    return all([w.flush(timeout) for w in writers])
+
+
+def sluit_writer(db_path: str, timeout: float = 10.0) -> None:
+    """Flush en stop de writer van één bestand en haal hem uit het register.
+
+    Voor componenten (en tests) die hun databasebestand weggooien; een
+    volgende get_writer() voor hetzelfde pad start een nieuwe writer.
+    """
+    with _writers_lock:
+        writer = _writers.pop(os.path.abspath(str(db_path)), None)
+    if writer is not None:
+        writer.sluit(timeout)
+
+
+def sluit_alle(timeout: float = 10.0) -> None:
+    """Flush en stop alle writers (proces-einde)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.sluit(timeout)
+
+
+def writer_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics van alle writers, gesleuteld als "storage:<bestandsnaam>"."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    return {f"storage:{w.naam}": w.stats() for w in writers}
@@ -2,13 +2,29 @@
 Vector database met JSON backend.
 
 Versie 2.0 - Met backup/restore, statistieken en filtering.
+Versie 2.1 - NumPy matrix-zoekmotor (matvec + argpartition top-k).
+Versie 3.0 - Binair sidecar formaat (vereist numpy):
+
+    vector_db.json            header (versie, generatie, dim, rijen, statistieken)
+    vector_db.g<N>.vec        raw float32 rijen (genormaliseerd), append-only, mmap
+    vector_db.g<N>.docs.jsonl tekst/metadata log (add / del / meta records)
+
+Bestaande v2.0 JSON bestanden worden bij het eerste laden eenmalig
+gemigreerd; het origineel blijft bewaard als ``.json.v2.bak``.
+
+Let op (v3.0): ``VectorStore.documenten[id]`` bevat in binaire modus geen
+"embedding" sleutel meer; de vector leeft in de (memory-mapped) matrix.
+Lees hem via ``VectorStore.document_embedding(id)`` (werkt in beide
+formaten) of ``laad_documenten()`` voor het ruwe bestand.
 """
 
 from __future__ import annotations
 
+import bisect
 import json
 import logging
 import math
+import os
 import threading
 import time
 from collections import deque
@@ -20,6 +36,100 @@ from danny_toolkit.core.embeddings import EmbeddingProvider
 
 logger = logging.getLogger(__name__)
 
+# Optionele dependencies
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+_MATRIX_MIN_CAPACITEIT = 64  # startcapaciteit van de embedding matrix
+_QUERY_BATCH_GROOTTE = 128   # max queries per embed call (provider batch limiet)
+
+# Binair formaat (v3.0)
+_BINAIR_VERSIE = "3.0"
+_BINAIR_FORMAAT = "binair"
+_COMPACT_MIN_DOOD = 256     # minimaal aantal dode rijen voor compactie
+_COMPACT_RATIO = 0.5        # compacteer als >50% van de rijen dood is
+
+
+def _sidecar_paden(db_file: Path, generatie: int) -> tuple[Path, Path]:
+    """Paden van het vector- en documentbestand voor een generatie."""
+    basis = db_file.with_suffix("")
+    return (
+        basis.with_name(f"{basis.name}.g{generatie}.vec"),
+        basis.with_name(f"{basis.name}.g{generatie}.docs.jsonl"),
+    )
+
+
+def _lees_docs_log(docs_pad: Path, rijen: int) -> tuple[dict, dict, bool]:
+    """Speel het document-log af.
+
+    Returns:
+        (documenten, doc_rij, herstel_nodig) — herstel_nodig is True als
+        het log een afgebroken regel of verweesde records bevat.
+    """
+    documenten: Dict[str, dict] = {}
+    doc_rij: Dict[str, int] = {}
+    herstel = False
+    if not docs_pad.exists():
+        return documenten, doc_rij, rijen > 0
+
+    with open(docs_pad, "r", encoding="utf-8") as f:
+        for regel in f:
+            if not regel.strip():
+                continue
+            try:
+                rec = json.loads(regel)
+            except json.JSONDecodeError:
+                herstel = True  # afgebroken schrijfactie (crash)
+                break
+            if "del" in rec:
+                documenten.pop(rec["del"], None)
+                doc_rij.pop(rec["del"], None)
+            elif "meta" in rec:
+                if rec["meta"] in documenten:
+                    documenten[rec["meta"]]["metadata"] = rec.get("metadata", {})
+            else:
+                rij = rec.get("rij", -1)
+                if not 0 <= rij < rijen:
+                    herstel = True  # vector nooit gecommit in header
+                    continue
+                documenten[rec["id"]] = {
+                    "tekst": rec.get("tekst", ""),
+                    "metadata": rec.get("metadata", {}),
+                    "toegevoegd_op": rec.get("toegevoegd_op"),
+                }
+                doc_rij[rec["id"]] = rij
+    return documenten, doc_rij, herstel
+
+
+def laad_documenten(db_file: Path) -> Dict[str, dict]:
+    """Lees alle documenten incl. embeddings, ongeacht opslagformaat.
+
+    Voor externe lezers (import/export tools) die het ruwe bestand
+    willen inspecteren zonder een VectorStore te instantiëren.
+    """
+    with open(db_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not (isinstance(data, dict) and data.get("formaat") == _BINAIR_FORMAAT):
+        if isinstance(data, dict) and "documenten" in data:
+            return data["documenten"]
+        return data if isinstance(data, dict) else {}
+
+    if not HAS_NUMPY:
+        raise ImportError("VectorStore v3 formaat vereist 'numpy'. Installeer met: pip install numpy")
+    vec_pad, docs_pad = _sidecar_paden(db_file, data.get("generatie", 1))
+    rijen = data.get("rijen", 0)
+    documenten, doc_rij, _ = _lees_docs_log(docs_pad, rijen)
+    if documenten:
+        vectoren = np.memmap(vec_pad, dtype=np.float32, mode="r",
+                             shape=(rijen, data["dim"]))
+        for doc_id, doc in documenten.items():
+            doc["embedding"] = vectoren[doc_rij[doc_id]].tolist()
+    return documenten
+
+
 # ═══════════════════════════════════════════════════════════════
 #  ANTI-EXTRACTION GUARD — Vector Search Rate Limiting + OOD
 # ═══════════════════════════════════════════════════════════════
@@ -89,6 +199,58 @@ def _vector_rate_check(query: str) -> tuple[bool, str]:
     return True, "OK"
 
 
+def _vector_rate_check_batch(queries: List[str]) -> tuple[bool, str]:
+    """Check rate limit + duplicate detection voor een batch queries.
+
+    Elke query kost één slot; past de batch niet in het resterende
+    budget van het venster, dan wordt de hele batch geweigerd (geen
+    gedeeltelijke registratie).
+
+    Returns:
+        (allowed, reason) — allowed=False blokkeert de hele batch.
+    """
+    global _extraction_alerts
+    now = time.time()
+    hashes = [str(hash(q.strip().lower())) for q in queries]
+
+    with _vector_search_lock:
+        cutoff = now - _VECTOR_SEARCH_WINDOW
+        while _vector_search_log and _vector_search_log[0] < cutoff:
+            _vector_search_log.popleft()
+
+        resterend = _VECTOR_SEARCH_LIMIT - len(_vector_search_log)
+        if len(queries) > resterend:
+            _extraction_alerts += 1
+            logger.warning(
+                "[EXTRACTION GUARD] Vector batch van %d queries overschrijdt "
+                "resterend budget (%d/%d per min). Alerts: %d",
+                len(queries), max(resterend, 0), _VECTOR_SEARCH_LIMIT,
+                _extraction_alerts,
+            )
+            return False, "Vector search rate limit bereikt"
+
+        for query_hash in hashes:
+            last_seen = _recent_queries.get(query_hash, 0)
+            if (now - last_seen) < _DUPLICATE_COOLDOWN:
+                _extraction_alerts += 1
+                logger.warning(
+                    "[EXTRACTION GUARD] Duplicate query binnen %.1fs. "
+                    "Mogelijke vectorruimte probing. Alerts: %d",
+                    now - last_seen, _extraction_alerts,
+                )
+                return False, "Duplicate query te snel herhaald"
+
+        for query_hash in hashes:
+            _vector_search_log.append(now)
+            _recent_queries[query_hash] = now
+
+        stale = [k for k, v in _recent_queries.items() if now - v > 60]
+        for k in stale:
+            del _recent_queries[k]
+
+    return True, "OK"
+
+
 def _check_tainted_results(scores: list) -> list:
     """Filter tainted results (similarity > 0.99 = verdacht kloon).
 
@@ -119,10 +281,183 @@ def get_extraction_stats() -> dict:
         }
 
 
+# ═══════════════════════════════════════════════════════════════
+#  METADATA FILTERS — declaratief, via inverted index per veld
+# ═══════════════════════════════════════════════════════════════
+# where={"type": "failure_lesson"}                 gelijkheid
+# where={"app": {"$in": ["notities", "agenda"]}}   lidmaatschap
+# where={"prio": {"$gte": 2, "$lt": 5}}            bereik
+# where={"bron": {"$prefix": "docs/"}}             prefix
+# Meerdere velden = AND (ChromaDB-stijl).
+
+_WHERE_OPERATOREN = ("$eq", "$in", "$gt", "$gte", "$lt", "$lte", "$prefix")
+
+
+def _is_getal(waarde: object) -> bool:
+    """Numeriek (bool telt niet mee voor bereik-filters)."""
+    return isinstance(waarde, (int, float)) and not isinstance(waarde, bool)
+
+
+def _match_clause(meta_waarde: object, conditie: object) -> bool:
+    """Evalueer één where-clause tegen één metadata waarde (fallback pad)."""
+    if not isinstance(conditie, dict):
+        return meta_waarde == conditie
+    for op, arg in conditie.items():
+        if op == "$eq":
+            ok = meta_waarde == arg
+        elif op == "$in":
+            ok = meta_waarde in arg
+        elif op == "$prefix":
+            ok = isinstance(meta_waarde, str) and meta_waarde.startswith(arg)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if not _is_getal(meta_waarde):
+                return False
+            ok = {
+                "$gt": meta_waarde > arg, "$gte": meta_waarde >= arg,
+                "$lt": meta_waarde < arg, "$lte": meta_waarde <= arg,
+            }[op]
+        else:
+            raise ValueError(f"Onbekende where-operator: {op}")
+        if not ok:
+            return False
+    return True
+
+
+class _MetadataIndex:
+    """Inverted index: metadata veld -> waarde -> geordende set doc_ids.
+
+    Velden worden lazy geïndexeerd bij het eerste filter erop en daarna
+    incrementeel bijgehouden. Niet-hashbare waarden (lijsten, dicts)
+    belanden in een aparte bucket die lineair wordt geëvalueerd.
+    """
+
+    _OVERIG = object()  # bucket voor niet-hashbare waarden
+
+    def __init__(self) -> None:
+        """Init lege index."""
+        self._velden: Dict[str, Dict[object, Dict[str, None]]] = {}
+        self._sleutels: Dict[str, tuple] = {}  # veld -> (getallen, strings) gesorteerd
+
+    def wis(self) -> None:
+        """Vergeet alle geïndexeerde velden."""
+        self._velden.clear()
+        self._sleutels.clear()
+
+    @staticmethod
+    def _sleutel(waarde: object) -> object:
+        """Index-sleutel voor een waarde (of _OVERIG als niet hashbaar)."""
+        try:
+            hash(waarde)
+        except TypeError:
+            return _MetadataIndex._OVERIG
+        return waarde
+
+    def _veld(self, veld: str, documenten: Dict[str, dict]) -> Dict[object, Dict[str, None]]:
+        """Haal (of bouw) de index voor één veld."""
+        index = self._velden.get(veld)
+        if index is None:
+            index = {}
+            for doc_id, doc in documenten.items():
+                meta = doc.get("metadata") or {}
+                if veld in meta and meta[veld] is not None:
+                    index.setdefault(self._sleutel(meta[veld]), {})[doc_id] = None
+            self._velden[veld] = index
+        return index
+
+    def voeg_toe(self, doc_id: str, metadata: dict) -> None:
+        """Registreer een document in alle reeds geïndexeerde velden."""
+        for veld, index in self._velden.items():
+            waarde = (metadata or {}).get(veld)
+            if waarde is None:
+                continue
+            sleutel = self._sleutel(waarde)
+            if sleutel not in index:
+                index[sleutel] = {}
+                self._sleutels.pop(veld, None)
+            index[sleutel][doc_id] = None
+
+    def verwijder(self, doc_id: str, metadata: dict) -> None:
+        """Haal een document uit alle geïndexeerde velden."""
+        for veld, index in self._velden.items():
+            waarde = (metadata or {}).get(veld)
+            if waarde is None:
+                continue
+            sleutel = self._sleutel(waarde)
+            bucket = index.get(sleutel)
+            if bucket is not None:
+                bucket.pop(doc_id, None)
+                if not bucket:
+                    del index[sleutel]
+                    self._sleutels.pop(veld, None)
+
+    def _gesorteerd(self, veld: str, index: dict) -> tuple:
+        """Gesorteerde numerieke en string sleutels (gecached per veld)."""
+        if veld not in self._sleutels:
+            getallen = sorted(k for k in index if _is_getal(k))
+            strings = sorted(k for k in index if isinstance(k, str))
+            self._sleutels[veld] = (getallen, strings)
+        return self._sleutels[veld]
+
+    def _waarden(self, veld: str, index: dict, conditie: object) -> list:
+        """Alle index-sleutels die aan een conditie voldoen."""
+        if not isinstance(conditie, dict):
+            conditie = {"$eq": conditie}
+        onbekend = set(conditie) - set(_WHERE_OPERATOREN)
+        if onbekend:
+            raise ValueError(f"Onbekende where-operator: {sorted(onbekend)}")
+
+        if "$eq" in conditie or "$in" in conditie:
+            kandidaten = [conditie["$eq"]] if "$eq" in conditie else list(conditie["$in"])
+            kandidaten = [k for k in kandidaten if self._sleutel(k) is not self._OVERIG and k in index]
+        elif "$prefix" in conditie:
+            _, strings = self._gesorteerd(veld, index)
+            prefix = conditie["$prefix"]
+            start = bisect.bisect_left(strings, prefix)
+            kandidaten = []
+            for k in strings[start:]:
+                if not k.startswith(prefix):
+                    break
+                kandidaten.append(k)
+        else:
+            getallen, _ = self._gesorteerd(veld, index)
+            lo, hi = 0, len(getallen)
+            if "$gte" in conditie:
+                lo = max(lo, bisect.bisect_left(getallen, conditie["$gte"]))
+            if "$gt" in conditie:
+                lo = max(lo, bisect.bisect_right(getallen, conditie["$gt"]))
+            if "$lte" in conditie:
+                hi = min(hi, bisect.bisect_right(getallen, conditie["$lte"]))
+            if "$lt" in conditie:
+                hi = min(hi, bisect.bisect_left(getallen, conditie["$lt"]))
+            kandidaten = getallen[lo:hi]
+        # Overige operatoren in dezelfde conditie nog exact controleren
+        return [k for k in kandidaten if _match_clause(k, conditie)]
+
+    def match(self, where: dict, documenten: Dict[str, dict]) -> Dict[str, None]:
+        """Doc IDs (geordend) die aan alle where-clauses voldoen."""
+        resultaat: Optional[Dict[str, None]] = None
+        for veld, conditie in where.items():
+            index = self._veld(veld, documenten)
+            ids: Dict[str, None] = {}
+            for sleutel in self._waarden(veld, index, conditie):
+                ids.update(index[sleutel])
+            for doc_id in index.get(self._OVERIG, ()):
+                if _match_clause(documenten[doc_id]["metadata"].get(veld), conditie):
+                    ids[doc_id] = None
+            if resultaat is None:
+                resultaat = ids
+            else:
+                resultaat = {d: None for d in resultaat if d in ids}
+            if not resultaat:
+                break
+        return resultaat or {}
+
+
 class VectorStore:
     """
     Persistente vector store met JSON backend.
     Werkt altijd, geen externe dependencies.
+    Met numpy: binair v3.0 formaat (mmap vectoren, append-only log).
     """
 
     def __init__(self, embedding_provider: EmbeddingProvider, db_file: Path = None) -> None:
@@ -150,40 +485,380 @@ class VectorStore:
             "laatste_toevoeging": None
         }
 
+        # Zoekmotor: genormaliseerde float32 matrix + id-array naast de dict.
+        # Rij i hoort bij self._ids[i]; self._id_pos mapt id -> rij.
+        self._matrix = None
+        self._ids: List[str] = []
+        self._id_pos: Dict[str, int] = {}
+        self._n = 0
+
+        # Binair formaat (v3.0): embeddings leven alleen in de matrix /
+        # het .vec bestand; self._doc_rij mapt id -> rij op disk.
+        self._binair = HAS_NUMPY
+        self._generatie = 0
+        self._rijen = 0
+        self._doc_rij: Dict[str, int] = {}
+
+        # Inverted index per metadata veld voor where-filters (lazy per veld)
+        self._meta_index = _MetadataIndex()
+
         # Laad bestaande data met schema validatie
         if self.db_file.exists():
             with open(self.db_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                if isinstance(data, dict) and "documenten" in data:
-                    self.documenten = data["documenten"]
-                    self._statistieken.update(data.get("statistieken", {}))
-                else:
-                    self.documenten = data
-            # Schema validatie: verwijder corrupte entries
-            corrupted = []
-            for doc_id, doc in list(self.documenten.items()):
-                emb = doc.get("embedding", [])
-                if not isinstance(emb, list) or not emb:
-                    corrupted.append(doc_id)
-                    continue
-                if not all(isinstance(v, (int, float)) for v in emb):
-                    corrupted.append(doc_id)
-                    continue
-                if any(math.isnan(v) or math.isinf(v) for v in emb):
-                    corrupted.append(doc_id)
-            for doc_id in corrupted:
-                del self.documenten[doc_id]
-                logger.warning(
-                    "Vector fraud guard: corrupte entry '%s' verwijderd "
-                    "(NaN/Inf/missing embedding)", doc_id,
-                )
+            if isinstance(data, dict) and data.get("formaat") == _BINAIR_FORMAAT:
+                self._laad_binair(data)
+                return
+            corrupted = self._laad_json(data)
             print(f"   [OK] Vector DB geladen ({len(self.documenten)} docs"
                   f"{f', {len(corrupted)} corrupt verwijderd' if corrupted else ''})")
+            self._na_json_laden()
+            if self._binair:
+                self._migreer()
         else:
             print(f"   [OK] Vector DB (nieuw)")
 
+    # =========================================================================
+    # LADEN EN OPSLAAN
+    # =========================================================================
+
+    def _laad_json(self, data: object) -> list:
+        """Laad v2.0 JSON data met schema validatie.
+
+        Returns:
+            Lijst van verwijderde (corrupte) document IDs
+        """
+        if isinstance(data, dict) and "documenten" in data:
+            self.documenten = data["documenten"]
+            self._statistieken.update(data.get("statistieken", {}))
+        else:
+            self.documenten = data
+        # Schema validatie: verwijder corrupte entries
+        corrupted = []
+        for doc_id, doc in list(self.documenten.items()):
+            emb = doc.get("embedding", [])
+            if not isinstance(emb, list) or not emb:
+                corrupted.append(doc_id)
+                continue
+            if not all(isinstance(v, (int, float)) for v in emb):
+                corrupted.append(doc_id)
+                continue
+            if any(math.isnan(v) or math.isinf(v) for v in emb):
+                corrupted.append(doc_id)
+        for doc_id in corrupted:
+            del self.documenten[doc_id]
+            logger.warning(
+                "Vector fraud guard: corrupte entry '%s' verwijderd "
+                "(NaN/Inf/missing embedding)", doc_id,
+            )
+        return corrupted
+
+    def _na_json_laden(self) -> None:
+        """Bouw de matrix uit JSON documenten; in binaire modus verhuizen
+        de embeddings van de dict naar de matrix."""
+        self._herbouw_index()
+        if self._binair:
+            for doc in self.documenten.values():
+                doc.pop("embedding", None)
+
+    def _migreer(self) -> None:
+        """Eenmalige migratie van v2.0 JSON naar het binaire v3.0 formaat."""
+        backup = self.db_file.with_suffix(".json.v2.bak")
+        os.replace(self.db_file, backup)
+        self._compacteer()
+        logger.info(
+            "VectorStore gemigreerd naar v%s: %s (%d docs, origineel: %s)",
+            _BINAIR_VERSIE, self.db_file.name, len(self.documenten), backup.name,
+        )
+
+    def _laad_binair(self, header: dict) -> None:
+        """Laad v3.0: header + document-log; vectoren blijven memory-mapped."""
+        if not HAS_NUMPY:
+            raise ImportError("VectorStore v3 formaat vereist 'numpy'. Installeer met: pip install numpy")
+        self._statistieken.update(header.get("statistieken", {}))
+        self._generatie = header.get("generatie", 1)
+        dim = header.get("dim") or 0
+        rijen = header.get("rijen", 0) if dim else 0
+        vec_pad, docs_pad = _sidecar_paden(self.db_file, self._generatie)
+
+        # Vector bestand moet precies `rijen` rijen bevatten: staart van een
+        # afgebroken append wordt afgekapt, een te kort bestand is corrupt.
+        herstel = False
+        if rijen:
+            rij_bytes = dim * 4
+            grootte = vec_pad.stat().st_size if vec_pad.exists() else 0
+            if grootte < rijen * rij_bytes:
+                logger.warning(
+                    "VectorStore: %s bevat %d van %d rijen — herstel",
+                    vec_pad.name, grootte // rij_bytes, rijen,
+                )
+                rijen = grootte // rij_bytes
+                herstel = True
+            elif grootte > rijen * rij_bytes:
+                os.truncate(vec_pad, rijen * rij_bytes)
+
+        self._rijen = rijen
+        self.documenten, self._doc_rij, log_herstel = _lees_docs_log(docs_pad, rijen)
+        herstel = herstel or log_herstel
+
+        ids = list(self.documenten)
+        if ids:
+            vectoren = np.memmap(vec_pad, dtype=np.float32, mode="c",
+                                 shape=(rijen, dim))
+            posities = [self._doc_rij[d] for d in ids]
+            if posities == list(range(rijen)):
+                self._matrix = vectoren  # geen dode rijen: direct de mmap
+            else:
+                self._matrix = np.array(vectoren[posities])
+            self._ids = ids
+            self._id_pos = {d: i for i, d in enumerate(ids)}
+            self._n = len(ids)
+
+        if herstel:
+            self._compacteer()
+        print(f"   [OK] Vector DB geladen ({len(self.documenten)} docs, "
+              f"binair v{_BINAIR_VERSIE})")
+
+    def _schrijf_header(self) -> None:
+        """Schrijf de (kleine) header atomisch weg."""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "versie": _BINAIR_VERSIE,
+            "formaat": _BINAIR_FORMAAT,
+            "generatie": self._generatie,
+            "dim": int(self._matrix.shape[1]) if self._matrix is not None else None,
+            "rijen": self._rijen,
+            "aantal": len(self.documenten),
+            "statistieken": self._statistieken,
+        }
+        tmp_file = self.db_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(header, f, ensure_ascii=False)
+        tmp_file.replace(self.db_file)
+
+    def _compacteer(self) -> None:
+        """Herschrijf alle levende rijen naar een nieuwe generatie.
+
+        De header-rename is het commit-punt; daarna worden de bestanden
+        van de vorige generatie opgeruimd.
+        """
+        oude_paden = _sidecar_paden(self.db_file, self._generatie)
+        generatie = self._generatie + 1
+        vec_pad, docs_pad = _sidecar_paden(self.db_file, generatie)
+        vec_pad.parent.mkdir(parents=True, exist_ok=True)
+
+        n = self._n if self._matrix is not None else 0
+        with open(vec_pad, "wb") as f:
+            if n:
+                np.ascontiguousarray(self._matrix[:n], dtype=np.float32).tofile(f)
+        with open(docs_pad, "w", encoding="utf-8") as f:
+            for rij, doc_id in enumerate(self._ids[:n]):
+                f.write(self._log_record(doc_id, rij))
+
+        self._generatie = generatie
+        self._rijen = n
+        self._doc_rij = {d: i for i, d in enumerate(self._ids[:n])}
+        self._schrijf_header()
+
+        if n:
+            self._matrix = np.memmap(vec_pad, dtype=np.float32, mode="c",
+                                     shape=(n, self._matrix.shape[1]))
+        for pad in oude_paden:
+            try:
+                pad.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("Oude generatie niet verwijderd (%s): %s", pad.name, e)
+
+    def _log_record(self, doc_id: str, rij: int) -> str:
+        """Serialiseer een add-record voor het document-log."""
+        data = self.documenten[doc_id]
+        return json.dumps({
+            "rij": rij,
+            "id": doc_id,
+            "tekst": data["tekst"],
+            "metadata": data["metadata"],
+            "toegevoegd_op": data.get("toegevoegd_op"),
+        }, ensure_ascii=False) + "\n"
+
+    def _append_binair(self, doc_ids: list) -> None:
+        """Append-only: schrijf alleen de nieuwe rijen + log records."""
+        doc_ids = [d for d in dict.fromkeys(doc_ids) if d in self._id_pos]
+        if doc_ids:
+            vec_pad, docs_pad = _sidecar_paden(self.db_file, self._generatie)
+            if self._rijen and self._generatie:
+                rijen = self._matrix[[self._id_pos[d] for d in doc_ids]]
+            else:
+                # Eerste schrijfactie: start een verse generatie
+                self._compacteer()
+                return
+            with open(vec_pad, "ab") as f:
+                np.ascontiguousarray(rijen, dtype=np.float32).tofile(f)
+            with open(docs_pad, "a", encoding="utf-8") as f:
+                for i, doc_id in enumerate(doc_ids):
+                    f.write(self._log_record(doc_id, self._rijen + i))
+                    self._doc_rij[doc_id] = self._rijen + i
+            self._rijen += len(doc_ids)
+        self._schrijf_header()
+
+    def _log_ops(self, records: list) -> None:
+        """Append del/meta records; compacteer als te veel rijen dood zijn."""
+        _, docs_pad = _sidecar_paden(self.db_file, self._generatie)
+        with open(docs_pad, "a", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        dood = self._rijen - len(self._doc_rij)
+        if dood >= _COMPACT_MIN_DOOD and dood > self._rijen * _COMPACT_RATIO:
+            self._compacteer()
+        else:
+            self._schrijf_header()
+
+    def _bestanden(self) -> List[Path]:
+        """Alle bestanden die bij deze store horen (header + sidecars)."""
+        paden = [self.db_file]
+        if self._binair and self._generatie:
+            paden.extend(_sidecar_paden(self.db_file, self._generatie))
+        return paden
+
+    def document_embedding(self, doc_id: str) -> Optional[List[float]]:
+        """Publieke, lazy embedding van een document; None als het id onbekend is.
+
+        In v2.0 de opgeslagen lijst uit de dict; in v3.0 de rij uit de
+        memory-mapped matrix (L2-genormaliseerd, zoals opgeslagen).
+        """
+        if doc_id not in self.documenten:
+            return None
+        return self._embedding(doc_id)
+
+    def _embedding(self, doc_id: str) -> list:
+        """Embedding van een document (uit de dict of de matrix)."""
+        emb = self.documenten[doc_id].get("embedding")
+        if emb is not None:
+            return emb
+        if doc_id in self._id_pos:
+            return self._matrix[self._id_pos[doc_id]].tolist()
+        return []
+
+    def _dim(self) -> int:
+        """Opgeslagen embedding dimensie (0 als leeg)."""
+        if self._matrix is not None:
+            return int(self._matrix.shape[1])
+        if self.documenten:
+            return len(next(iter(self.documenten.values())).get("embedding", []))
+        return 0
+
+    # =========================================================================
+    # MATRIX INDEX
+    # =========================================================================
+
+    @staticmethod
+    def _normaliseer(emb: list) -> "np.ndarray":
+        """Zet een embedding om naar een L2-genormaliseerde float32 vector."""
+        vec = np.asarray(emb, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0 or not math.isfinite(norm):
+            return np.zeros_like(vec)
+        return vec / norm
+
+    def _herbouw_index(self) -> None:
+        """Bouw de embedding matrix volledig opnieuw op uit self.documenten."""
+        self._meta_index.wis()
+        self._matrix = None
+        self._ids = []
+        self._id_pos = {}
+        self._n = 0
+        if not HAS_NUMPY or not self.documenten:
+            return
+
+        ids = list(self.documenten.keys())
+        dim = len(self.documenten[ids[0]]["embedding"])
+        afwijkend = [d for d in ids if len(self.documenten[d]["embedding"]) != dim]
+        if afwijkend and self._binair:
+            # Binair formaat kent één dimensie: afwijkende entries vallen af
+            for doc_id in afwijkend:
+                del self.documenten[doc_id]
+                logger.warning(
+                    "VectorStore: entry '%s' heeft afwijkende dimensie — "
+                    "verwijderd", doc_id,
+                )
+            ids = list(self.documenten.keys())
+        elif afwijkend:
+            logger.warning(
+                "VectorStore: gemengde embedding dimensies — "
+                "matrix-zoekmotor uitgeschakeld, fallback naar lineaire scan",
+            )
+            return
+
+        capaciteit = max(_MATRIX_MIN_CAPACITEIT, len(ids))
+        matrix = np.zeros((capaciteit, dim), dtype=np.float32)
+        ruw = np.asarray(
+            [self.documenten[d]["embedding"] for d in ids], dtype=np.float32,
+        )
+        norms = np.linalg.norm(ruw, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix[:len(ids)] = ruw / norms
+
+        self._matrix = matrix
+        self._ids = ids
+        self._id_pos = {d: i for i, d in enumerate(ids)}
+        self._n = len(ids)
+
+    def _index_toevoegen(self, doc_id: str, emb: list) -> None:
+        """Voeg (of vervang) één rij in de matrix — amortized O(1)."""
+        if not HAS_NUMPY:
+            return
+        if self._matrix is None:
+            if self._n == 0 and len(self.documenten) <= 1:
+                self._matrix = np.zeros(
+                    (_MATRIX_MIN_CAPACITEIT, len(emb)), dtype=np.float32,
+                )
+            else:
+                return  # index uitgeschakeld (gemengde dimensies)
+        if len(emb) != self._matrix.shape[1]:
+            logger.warning(
+                "VectorStore: embedding '%s' heeft %dd, matrix %dd — "
+                "matrix-zoekmotor uitgeschakeld",
+                doc_id, len(emb), self._matrix.shape[1],
+            )
+            self._matrix = None
+            self._ids = []
+            self._id_pos = {}
+            self._n = 0
+            return
+
+        rij = self._id_pos.get(doc_id)
+        if rij is None:
+            if self._n >= self._matrix.shape[0]:
+                groter = np.zeros(
+                    (self._matrix.shape[0] * 2, self._matrix.shape[1]),
+                    dtype=np.float32,
+                )
+                groter[:self._n] = self._matrix[:self._n]
+                self._matrix = groter
+            rij = self._n
+            self._ids.append(doc_id)
+            self._id_pos[doc_id] = rij
+            self._n += 1
+        self._matrix[rij] = self._normaliseer(emb)
+
+    def _index_verwijderen(self, doc_id: str) -> None:
+        """Verwijder één rij uit de matrix (swap-with-last, O(1))."""
+        rij = self._id_pos.pop(doc_id, None)
+        if rij is None or self._matrix is None:
+            return
+        laatste = self._n - 1
+        if rij != laatste:
+            laatste_id = self._ids[laatste]
+            self._matrix[rij] = self._matrix[laatste]
+            self._ids[rij] = laatste_id
+            self._id_pos[laatste_id] = rij
+        self._ids.pop()
+        self._n = laatste
+
     def _opslaan(self) -> None:
         """Sla database op naar disk (atomic write — crash-safe)."""
+        if self._binair:
+            self._compacteer()
+            return
         self.db_file.parent.mkdir(parents=True, exist_ok=True)
         data = {
             "documenten": self.documenten,
@@ -206,6 +881,7 @@ class VectorStore:
 
         teksten = [d["tekst"] for d in documenten]
         embeddings = self.embedder.embed(teksten)
+        nieuw = []
 
         for doc, emb in zip(documenten, embeddings):
             # Embedding validatie — weiger NaN/Inf/lege vectoren
@@ -215,22 +891,38 @@ class VectorStore:
             if any(not isinstance(v, (int, float)) or math.isnan(v) or math.isinf(v) for v in emb):
                 logger.warning("voeg_toe: NaN/Inf in embedding voor '%s' — overgeslagen", doc.get("id", "?"))
                 continue
-            self.documenten[doc["id"]] = {
+            if self._binair and self._matrix is not None and len(emb) != self._matrix.shape[1]:
+                logger.warning("voeg_toe: dimensie %d != %d voor '%s' — overgeslagen",
+                               len(emb), self._matrix.shape[1], doc.get("id", "?"))
+                continue
+            entry = {
                 "tekst": doc["tekst"],
                 "metadata": doc.get("metadata", {}),
-                "embedding": emb,
                 "toegevoegd_op": datetime.now().isoformat()
             }
+            if not self._binair:
+                entry["embedding"] = emb
+            oud = self.documenten.get(doc["id"])
+            if oud is not None:
+                self._meta_index.verwijder(doc["id"], oud["metadata"])
+            self.documenten[doc["id"]] = entry
+            self._meta_index.voeg_toe(doc["id"], entry["metadata"])
+            self._index_toevoegen(doc["id"], emb)
+            nieuw.append(doc["id"])
 
         self._statistieken["toevoegingen"] += len(documenten)
         self._statistieken["laatste_toevoeging"] = datetime.now().isoformat()
 
-        self._opslaan()
+        if self._binair:
+            self._append_binair(nieuw)
+        else:
+            self._opslaan()
         print(f"   [OK] {len(documenten)} documenten toegevoegd")
 
     def zoek(self, query: str, top_k: int = None,
              filter_fn: Callable[[dict], bool] = None,
-             min_score: float = 0.0) -> list:
+             min_score: float = 0.0,
+             where: dict = None) -> list:
         """
         Zoek relevante documenten met Cosine Similarity.
 
@@ -239,6 +931,10 @@ class VectorStore:
             top_k: Aantal resultaten (default uit config)
             filter_fn: Optionele filter functie voor metadata
             min_score: Minimum similarity score
+            where: Declaratief metadata filter, bijv. {"type": "les"},
+                {"app": {"$in": [...]}}, {"prio": {"$gte": 2}} of
+                {"bron": {"$prefix": "docs/"}}. Via de inverted index
+                worden alleen de matchende rijen gescoord.
 
         Returns:
             Lijst van relevante documenten
@@ -257,8 +953,7 @@ class VectorStore:
         query_emb = self.embedder.embed_query(query)
 
         if self.documenten:
-            eerste = next(iter(self.documenten.values()))
-            opgeslagen_dim = len(eerste.get("embedding", []))
+            opgeslagen_dim = self._dim()
             query_dim = len(query_emb)
             if opgeslagen_dim != query_dim:
                 logger.error(
@@ -268,14 +963,196 @@ class VectorStore:
                 )
                 return []  # Fail loud: geen garbage resultaten
 
+        subset = self._where_ids(where)
+        if subset is not None and not subset:
+            scores = []
+        elif self._matrix is not None and self._n:
+            scores = self._zoek_matrix(query_emb, top_k, filter_fn, min_score, subset)
+        else:
+            scores = self._zoek_lineair(query_emb, top_k, filter_fn, min_score, subset)
+
+        # Update statistieken
+        self._statistieken["queries"] += 1
+        self._statistieken["laatste_query"] = datetime.now().isoformat()
+
+        return scores
+
+    def _where_ids(self, where: Optional[dict]) -> Optional[Dict[str, None]]:
+        """Doc IDs die aan het where-filter voldoen (None = geen filter)."""
+        if not where:
+            return None
+        return self._meta_index.match(where, self.documenten)
+
+    def _subset_rijen(self, subset: Optional[Dict[str, None]]) -> Optional["np.ndarray"]:
+        """Matrix-rijen voor een subset doc IDs, oplopend (None = alle rijen)."""
+        if subset is None:
+            return None
+        rijen = np.fromiter((self._id_pos[d] for d in subset), dtype=np.intp, count=len(subset))
+        rijen.sort()
+        return rijen
+
+    def _zoek_matrix(self, query_emb: list, top_k: int,
+                     filter_fn: Optional[Callable[[dict], bool]],
+                     min_score: float,
+                     subset: Optional[Dict[str, None]] = None) -> list:
+        """Scoor documenten met één matvec en selecteer top-k via argpartition.
+
+        Met een subset (uit het where-filter) wordt alleen die selectie
+        van de matrix gescoord.
+        """
+        q = self._normaliseer(query_emb)
+        rijen = self._subset_rijen(subset)
+        if rijen is None:
+            scores_vec = self._matrix[:self._n] @ q
+        else:
+            scores_vec = self._matrix[rijen] @ q
+        return self._selecteer_top_k(
+            scores_vec, self._filter_masker(filter_fn, rijen), top_k, min_score, rijen,
+        )
+
+    def _filter_masker(self, filter_fn: Optional[Callable[[dict], bool]],
+                       rijen: Optional["np.ndarray"] = None) -> Optional["np.ndarray"]:
+        """Boolean masker over de (subset) matrix-rijen voor filter_fn (None = alles)."""
+        if not filter_fn:
+            return None
+        if rijen is None:
+            ids = self._ids[:self._n]
+        else:
+            ids = [self._ids[int(r)] for r in rijen]
+        return np.fromiter(
+            (bool(filter_fn(self.documenten[d])) for d in ids),
+            dtype=bool, count=len(ids),
+        )
+
+    def _selecteer_top_k(self, scores_vec: "np.ndarray",
+                         masker: Optional["np.ndarray"],
+                         top_k: int, min_score: float,
+                         rijen: Optional["np.ndarray"] = None) -> list:
+        """Top-k selectie via argpartition + tainted guard op één scorevector.
+
+        Als rijen gegeven is hoort scores_vec[j] bij matrix-rij rijen[j].
+        """
+        np.nan_to_num(scores_vec, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+        geldig = scores_vec >= min_score
+        if masker is not None:
+            geldig &= masker
+        kandidaten = np.flatnonzero(geldig)
+        if kandidaten.size == 0:
+            return []
+
+        # Neem tainted scores mee zodat _check_tainted_results ze allemaal ziet
+        cand_scores = scores_vec[kandidaten]
+        n_tainted = int(np.count_nonzero(cand_scores > _TAINTED_THRESHOLD))
+        k = min(top_k + n_tainted, kandidaten.size)
+        if k < kandidaten.size:
+            deel = np.argpartition(-cand_scores, k - 1)[:k]
+        else:
+            deel = np.arange(kandidaten.size)
+        deel = deel[np.argsort(-cand_scores[deel], kind="stable")]
+
         scores = []
+        if rijen is not None:
+            kandidaten = rijen[kandidaten]
+        for j in deel:
+            doc_id = self._ids[int(kandidaten[j])]
+            data = self.documenten[doc_id]
+            scores.append({
+                "id": doc_id,
+                "tekst": data["tekst"],
+                "metadata": data["metadata"],
+                "score": float(cand_scores[j]),
+            })
 
-        for doc_id, data in self.documenten.items():
+        # Anti-poisoning: filter tainted results (>0.99 klonen)
+        return _check_tainted_results(scores)[:top_k]
+
+    def zoek_batch(self, queries: List[str], top_k: int = None,
+                   filter_fn: Callable[[dict], bool] = None,
+                   min_score: float = 0.0,
+                   where: dict = None) -> List[list]:
+        """
+        Zoek voor meerdere queries tegelijk.
+
+        Embedt alle queries in één provider call (per blok van
+        _QUERY_BATCH_GROOTTE) en scoort ze als één matrix-matrix product.
+        Elke query telt als één zoekactie voor de anti-extraction guard;
+        een batch die het resterende budget overschrijdt wordt geweigerd.
+
+        Args:
+            queries: Lijst van zoekqueries
+            top_k: Aantal resultaten per query (default uit config)
+            filter_fn: Optionele filter functie voor metadata
+            min_score: Minimum similarity score
+            where: Declaratief metadata filter (zie zoek())
+
+        Returns:
+            Per query een lijst van relevante documenten (zelfde volgorde)
+        """
+        top_k = top_k or Config.TOP_K
+        resultaten: List[list] = [[] for _ in queries]
+        geldig = [i for i, q in enumerate(queries) if isinstance(q, str) and q.strip()]
+        if not self.documenten or not geldig:
+            return resultaten
+
+        allowed, reason = _vector_rate_check_batch([queries[i] for i in geldig])
+        if not allowed:
+            logger.warning("Vector zoek_batch geblokkeerd: %s", reason)
+            return resultaten
+
+        query_embs = []
+        for start in range(0, len(geldig), _QUERY_BATCH_GROOTTE):
+            blok = [queries[i] for i in geldig[start:start + _QUERY_BATCH_GROOTTE]]
+            query_embs.extend(self.embedder.embed_queries(blok))
+
+        opgeslagen_dim = self._dim()
+        afwijkend = next((e for e in query_embs if len(e) != opgeslagen_dim), None)
+        if afwijkend is not None:
+            logger.error(
+                "DIMENSIE MISMATCH: opgeslagen=%dd, query=%dd. "
+                "Resultaten onbetrouwbaar. Herindexeer met ingest.py --reset",
+                opgeslagen_dim, len(afwijkend),
+            )
+            return resultaten
+
+        subset = self._where_ids(where)
+        if subset is not None and not subset:
+            logger.debug("zoek_batch: where-filter %s matcht geen documenten", where)
+        elif self._matrix is not None and self._n:
+            Q = np.stack([self._normaliseer(e) for e in query_embs], axis=1)
+            rijen = self._subset_rijen(subset)
+            if rijen is None:
+                scores_matrix = self._matrix[:self._n] @ Q
+            else:
+                scores_matrix = self._matrix[rijen] @ Q
+            masker = self._filter_masker(filter_fn, rijen)
+            for kolom, i in enumerate(geldig):
+                resultaten[i] = self._selecteer_top_k(
+                    scores_matrix[:, kolom], masker, top_k, min_score, rijen,
+                )
+        else:
+            for emb, i in zip(query_embs, geldig):
+                resultaten[i] = self._zoek_lineair(emb, top_k, filter_fn, min_score, subset)
+
+        self._statistieken["queries"] += len(geldig)
+        self._statistieken["laatste_query"] = datetime.now().isoformat()
+        return resultaten
+
+    def _zoek_lineair(self, query_emb: list, top_k: int,
+                      filter_fn: Optional[Callable[[dict], bool]],
+                      min_score: float,
+                      subset: Optional[Dict[str, None]] = None) -> list:
+        """Fallback zonder numpy: pure-Python cosine per document."""
+        scores = []
+        ids = self.documenten if subset is None else subset
+
+        for doc_id in ids:
+            data = self.documenten[doc_id]
             # Filter op metadata
             if filter_fn and not filter_fn(data):
                 continue
 
-            score = self._cosine_similarity(query_emb, data["embedding"])
+            score = self._cosine_similarity(query_emb, self._embedding(doc_id))
 
             if score >= min_score:
                 scores.append({
@@ -290,10 +1167,6 @@ class VectorStore:
         # Anti-poisoning: filter tainted results (>0.99 klonen)
         scores = _check_tainted_results(scores)
 
-        # Update statistieken
-        self._statistieken["queries"] += 1
-        self._statistieken["laatste_query"] = datetime.now().isoformat()
-
         return scores[:top_k]
 
     def zoek_op_metadata(self, veld: str, waarde: object, exact: bool = True) -> list:
@@ -308,29 +1181,28 @@ class VectorStore:
         Returns:
             Lijst van matchende documenten
         """
-        resultaten = []
-
-        for doc_id, data in self.documenten.items():
-            meta_waarde = data["metadata"].get(veld)
-
-            if meta_waarde is None:
-                continue
-
-            match = False
-            if exact:
-                match = meta_waarde == waarde
-            else:
-                # String contains check
-                match = str(waarde).lower() in str(meta_waarde).lower()
-
-            if match:
-                resultaten.append({
-                    "id": doc_id,
-                    "tekst": data["tekst"],
-                    "metadata": data["metadata"]
-                })
-
-        return resultaten
+        if exact:
+            ids = self._meta_index.match({veld: {"$eq": waarde}}, self.documenten)
+        else:
+            # String contains check: per unieke waarde i.p.v. per document
+            index = self._meta_index._veld(veld, self.documenten)
+            zoek = str(waarde).lower()
+            ids = {}
+            for sleutel, bucket in index.items():
+                if sleutel is _MetadataIndex._OVERIG:
+                    ids.update((d, None) for d in bucket
+                               if zoek in str(self.documenten[d]["metadata"][veld]).lower())
+                elif zoek in str(sleutel).lower():
+                    ids.update(bucket)
+
+        return [
+            {
+                "id": doc_id,
+                "tekst": self.documenten[doc_id]["tekst"],
+                "metadata": self.documenten[doc_id]["metadata"],
+            }
+            for doc_id in ids
+        ]
 
     def _cosine_similarity(self, vec1: list, vec2: list) -> float:
         """Bereken cosine similarity tussen twee vectoren (NaN/Inf-safe)."""
@@ -355,9 +1227,14 @@ class VectorStore:
             True als verwijderd, False als niet gevonden
         """
         if doc_id in self.documenten:
-            del self.documenten[doc_id]
+            self._meta_index.verwijder(doc_id, self.documenten.pop(doc_id)["metadata"])
+            self._index_verwijderen(doc_id)
             self._statistieken["verwijderingen"] += 1
-            self._opslaan()
+            if self._binair:
+                self._doc_rij.pop(doc_id, None)
+                self._log_ops([{"del": doc_id}])
+            else:
+                self._opslaan()
             return True
         return False
 
@@ -368,21 +1245,27 @@ class VectorStore:
         Returns:
             Aantal verwijderde documenten
         """
-        verwijderd = 0
+        verwijderd = []
         for doc_id in doc_ids:
             if doc_id in self.documenten:
-                del self.documenten[doc_id]
-                verwijderd += 1
-
-        if verwijderd > 0:
-            self._statistieken["verwijderingen"] += verwijderd
-            self._opslaan()
+                self._meta_index.verwijder(doc_id, self.documenten.pop(doc_id)["metadata"])
+                self._index_verwijderen(doc_id)
+                self._doc_rij.pop(doc_id, None)
+                verwijderd.append(doc_id)
+
+        if verwijderd:
+            self._statistieken["verwijderingen"] += len(verwijderd)
+            if self._binair:
+                self._log_ops([{"del": d} for d in verwijderd])
+            else:
+                self._opslaan()
 
-        return verwijderd
+        return len(verwijderd)
 
     def wis(self) -> None:
         """Wis alle documenten."""
         self.documenten = {}
+        self._herbouw_index()
         self._opslaan()
 
     def count(self) -> int:
@@ -417,8 +1300,17 @@ class VectorStore:
             True als succesvol
         """
         if doc_id in self.documenten:
-            self.documenten[doc_id]["metadata"].update(metadata)
-            self._opslaan()
+            meta = self.documenten[doc_id]["metadata"]
+            self._meta_index.verwijder(doc_id, meta)
+            meta.update(metadata)
+            self._meta_index.voeg_toe(doc_id, meta)
+            if self._binair:
+                self._log_ops([{
+                    "meta": doc_id,
+                    "metadata": self.documenten[doc_id]["metadata"],
+                }])
+            else:
+                self._opslaan()
             return True
         return False
 
@@ -441,9 +1333,12 @@ class VectorStore:
         backup_naam = backup_naam or f"vector_db_backup_{timestamp}"
         backup_pad = Config.BACKUP_DIR / f"{backup_naam}.json"
 
-        # Kopieer huidige database
+        # Kopieer huidige database (altijd draagbaar v2.0 JSON met embeddings)
         data = {
-            "documenten": self.documenten,
+            "documenten": {
+                doc_id: {**doc, "embedding": self._embedding(doc_id)}
+                for doc_id, doc in self.documenten.items()
+            },
             "statistieken": self._statistieken,
             "backup_datum": datetime.now().isoformat(),
             "origineel_bestand": str(self.db_file),
@@ -476,6 +1371,7 @@ class VectorStore:
 
             self.documenten = data.get("documenten", {})
             self._statistieken = data.get("statistieken", self._statistieken)
+            self._na_json_laden()
             self._opslaan()
 
             print(f"   [OK] Backup hersteld: {len(self.documenten)} documenten")
@@ -534,8 +1430,7 @@ class VectorStore:
 
         if self.documenten:
             # Embedding dimensies
-            eerste_doc = next(iter(self.documenten.values()))
-            stats["embedding_dimensies"] = len(eerste_doc.get("embedding", []))
+            stats["embedding_dimensies"] = self._dim()
 
             # Tekst statistieken
             tekst_lengtes = [
@@ -551,9 +1446,13 @@ class VectorStore:
                 alle_velden.update(doc.get("metadata", {}).keys())
             stats["metadata_velden"] = list(alle_velden)
 
-            # Database grootte
-            stats["db_grootte_bytes"] = self.db_file.stat().st_size if \
-                self.db_file.exists() else 0
+            # Database grootte (header + sidecars)
+            stats["db_grootte_bytes"] = sum(
+                p.stat().st_size for p in self._bestanden() if p.exists()
+            )
+            stats["opslag_formaat"] = (
+                f"binair v{_BINAIR_VERSIE}" if self._binair else "json v2.0"
+            )
 
         return stats
 
@@ -716,8 +1615,9 @@ class VectorStoreManager:
         """Verwijder een store."""
         if naam in self.stores:
             store = self.stores[naam]
-            if store.db_file.exists():
-                store.db_file.unlink()
+            for pad in store._bestanden():
+                if pad.exists():
+                    pad.unlink()
             del self.stores[naam]
             return True
         return False
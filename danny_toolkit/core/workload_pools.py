@@ -0,0 +1,198 @@
+"""
+WorkloadPools — Begrensde thread pools per workload-klasse.
+
+Procesbrede pools zodat trage opslag de LLM dispatch niet uithongert:
+
+    io       LLM SDK calls en overig blokkerend I/O (loop default executor)
+    cpu      CPU-bound embedding (router, Synapse categorisatie)
+    storage  Chroma/vector queries en SQLite writes
+    bus      NeuralBus subscriber lanes (modus "pool")
+
+Grootte per pool via Config (SWARM_IO_WORKERS, SWARM_CPU_WORKERS,
+SWARM_STORAGE_WORKERS, NEURALBUS_LANE_WORKERS). Elke pool meet
+wachtrijdiepte, actieve taken en wachttijd (submit -> start) en looptijd;
+pool_stats() levert die in het formaat van get_pipeline_metrics().
+
+CPU-embedding draait bewust in threads en niet in een process pool: torch
+en numpy laten de GIL los tijdens de matmuls, en het gedeelde model uit de
+embedding registry kan niet naar een ander proces.
+
+Gebruik:
+    from danny_toolkit.core.workload_pools import STORAGE, get_pool
+
+    docs = await get_pool(STORAGE).draai(collectie.query, query_texts=[q])
+    get_pool(STORAGE).submit(schrijf_naar_sqlite, rij)   # fire-and-forget
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+IO = "io"
+CPU = "cpu"
+STORAGE = "storage"
+BUS = "bus"
+
+# Standaard pool-groottes (Config overschrijft)
+_STANDAARD_WORKERS = {
+    IO: min(max(os.cpu_count() or 4, 4), 16),
+    CPU: min(os.cpu_count() or 2, 4),
+    STORAGE: 4,
+    BUS: 4,
+}
+_CONFIG_SLEUTELS = {
+    IO: "SWARM_IO_WORKERS",
+    CPU: "SWARM_CPU_WORKERS",
+    STORAGE: "SWARM_STORAGE_WORKERS",
+    BUS: "NEURALBUS_LANE_WORKERS",
+}
+
+
+class WorkloadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor met wachtrij- en wachttijdmetrics.
+
+    Kan als loop default executor dienen. shutdown() van een event loop
+    (asyncio.run sluit de default executor af) is een no-op: de pool is
+    procesbreed en wordt door meerdere loops gedeeld. sluit() stopt hem echt.
+    """
+
+    def __init__(self, naam: str, max_workers: int) -> None:
+        """
+        Args:
+            naam: Workload-klasse ("io", "cpu", "storage", ...).
+            max_workers: Maximaal aantal threads.
+        """
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"pool-{naam}")
+        self.naam = naam
+        self.workers = max_workers
+        self._metric_lock = threading.Lock()
+        self._wachtrij = 0
+        self._actief = 0
+        self._voltooid = 0
+        self._fouten = 0
+        self._wacht_ms_totaal = 0.0
+        self._wacht_ms_max = 0.0
+        self._duur_ms_totaal = 0.0
+        self._laatste_fout = ""
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        """Plan fn in; wachttijd en looptijd worden gemeten."""
+        t_in = time.perf_counter()
+        with self._metric_lock:
+            self._wachtrij += 1
+
+        def gemeten() -> Any:
+            t_start = time.perf_counter()
+            wacht_ms = (t_start - t_in) * 1000
+            with self._metric_lock:
+                self._wachtrij -= 1
+                self._actief += 1
+                self._wacht_ms_totaal += wacht_ms
+                if wacht_ms > self._wacht_ms_max:
+                    self._wacht_ms_max = wacht_ms
+            fout = None
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                fout = e
+                raise
+            finally:
+                duur_ms = (time.perf_counter() - t_start) * 1000
+                with self._metric_lock:
+                    self._actief -= 1
+                    self._voltooid += 1
+                    self._duur_ms_totaal += duur_ms
+                    if fout is not None:
+                        self._fouten += 1
+                        self._laatste_fout = str(fout)[:200]
+
+        try:
+            return super().submit(gemeten)
+        except RuntimeError:
+            with self._metric_lock:
+                self._wachtrij -= 1
+            raise
+
+    async def draai(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Any:
+        """Async: draai fn in deze pool (contextvars gaan mee, als to_thread)."""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self, functools.partial(ctx.run, fn, *args, **kwargs),
+        )
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """No-op: een event loop mag een gedeelde pool niet afsluiten."""
+        logger.debug("WorkloadPool %s: shutdown genegeerd (gebruik sluit())", self.naam)
+
+    def sluit(self, wait: bool = True) -> None:
+        """Stop de pool echt (tests, proces-einde)."""
+        super().shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Metrics in het get_pipeline_metrics() formaat + pool-velden."""
+        with self._metric_lock:
+            klaar = max(self._voltooid, 1)
+            gestart = max(self._voltooid + self._actief, 1)
+            return {
+                "calls": self._voltooid,
+                "errors": self._fouten,
+                "avg_ms": round(self._duur_ms_totaal / klaar, 1),
+                "success_rate": round(
+                    (self._voltooid - self._fouten) / klaar * 100, 1,
+                ),
+                "last_error": self._laatste_fout,
+                "workers": self.workers,
+                "queue_depth": self._wachtrij,
+                "active": self._actief,
+                "wait_ms_avg": round(self._wacht_ms_totaal / gestart, 1),
+                "wait_ms_max": round(self._wacht_ms_max, 1),
+            }
+
+
+_pools: Dict[str, WorkloadPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_grootte(naam: str) -> int:
+    """Aantal workers voor een pool: Config, anders de standaard."""
+    standaard = _STANDAARD_WORKERS.get(naam, 4)
+    try:
+        from danny_toolkit.core.config import Config
+        waarde = getattr(Config, _CONFIG_SLEUTELS.get(naam, ""), None)
+    except ImportError:
+        waarde = None
+    try:
+        return max(int(waarde), 1) if waarde else standaard
+    except (TypeError, ValueError):
+        return standaard
+
+
+def get_pool(naam: str) -> WorkloadPool:
+    """Procesbrede pool voor een workload-klasse (aangemaakt bij eerste gebruik)."""
+    pool = _pools.get(naam)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(naam)
+        if pool is None:
+            pool = WorkloadPool(naam, _pool_grootte(naam))
+            _pools[naam] = pool
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics van alle aangemaakte pools, gesleuteld als "pool:<naam>"."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {f"pool:{p.naam}": p.stats() for p in pools}
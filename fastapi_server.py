@@ -1179,9 +1179,26 @@ def _get_swarm_engine(brain: Any = None) -> Any:
     return _swarm_engine_instance
 
 
+# Warm-up rapport van de startup (getoond op /api/v1/health)
+_WARM_STATUS: Dict[str, Any] = {"klaar": False, "duur_ms": 0.0, "stappen": {}}
+
+
+def _warm_swarm_engine() -> None:
+    """Bouw de SwarmEngine en laad router profielen, Synapse, Phantom en model."""
+    t0 = time.time()
+    try:
+        rapport = _get_swarm_engine().warm()
+        _WARM_STATUS["stappen"] = rapport.get("stappen", {})
+    except Exception as e:
+        logger.warning("SwarmEngine warm-up mislukt: %s", e)
+        _WARM_STATUS["fout"] = str(e)[:200]
+    _WARM_STATUS["duur_ms"] = round((time.time() - t0) * 1000, 1)
+    _WARM_STATUS["klaar"] = True
+
+
 @app.on_event("startup")
 async def _startup_event() -> None:
-    """Auto-discover modellen + sweep orphan staging + synaptic decay task."""
+    """Auto-discover modellen, orphan sweep, achtergrondtaken en warm-up."""
     # 1. Model registry
     try:
         from danny_toolkit.brain.model_sync import get_model_registry
@@ -1215,6 +1232,16 @@ async def _startup_event() -> None:
     # 5. Protocol Cerberus — Scorched Earth integriteitsmonitor
     asyncio.create_task(_scorched_earth_loop())
 
+    # 6. Warm-up — engine, router profielen, Synapse, Phantom en embedding
+    #    model laden vóórdat de eerste request binnenkomt
+    try:
+        from danny_toolkit.core.config import Config
+        if getattr(Config, "SWARM_WARM_ON_STARTUP", True):
+            await asyncio.to_thread(_warm_swarm_engine)
+            logger.info("SwarmEngine warm-up: %.0fms", _WARM_STATUS["duur_ms"])
+    except Exception as e:
+        logger.debug("SwarmEngine warm-up overgeslagen: %s", e)
+
 
 async def _synaptic_decay_loop() -> None:
     """Background task: voer synaptic decay uit elke 24 uur."""
@@ -1351,56 +1378,83 @@ async def query(
     )
 
 
-async def _stream_response(message: str, brain: Any) -> StreamingResponse:
-    """SSE streaming via async generator (fix: was sync wrapper)."""
-    try:
-        from swarm_engine import SwarmEngine
-    except ImportError:
-        logger.debug("SwarmEngine niet beschikbaar")
-        raise
+def _sse(data: dict) -> str:
+    """Eén SSE event (niet-serialiseerbare waarden als string)."""
+    return f"data: {json.dumps(data, default=str)}\n\n"
 
-    async def _generate() -> Any:
-        """Async generator die SSE events yield."""
-        engine = SwarmEngine(brain=brain)
-        updates = []
 
-        def callback(msg: str) -> None:
-            """Buffer streaming updates."""
-            updates.append(msg)
+def _payload_dict(p: Any) -> dict:
+    """SwarmPayload → JSON-vriendelijke dict voor SSE."""
+    return {
+        "agent": p.agent,
+        "type": p.type,
+        "display_text": str(p.display_text),
+        "timestamp": p.timestamp,
+        "metadata": p.metadata if isinstance(p.metadata, dict) else {},
+    }
 
-        try:
-            payloads = await engine.run(
-                message, callback
-            )
-        except Exception as e:
-            yield (
-                f"data: {json.dumps({'error': str(e)})}"
-                "\n\n"
-            )
-            return
 
-        for update in updates:
-            yield (
-                f"data: {json.dumps({'update': update})}"
-                "\n\n"
-            )
+async def _stream_response(message: str, brain: Any) -> StreamingResponse:
+    """Echte SSE streaming: updates, agent-resultaten en tokens zodra ze er zijn.
+
+    engine.run draait als task; callbacks zetten events op een asyncio.Queue
+    (thread-safe via call_soon_threadsafe) die de generator direct doorgeeft.
+
+    Events:
+        {"update": str}                 — pipeline status (governor, memex, route, ...)
+        {"agent": {...}}                — voorlopig resultaat van één agent
+        {"token": {"agent", "token", "voorlopig"}}
+                                        — live tekst (één LLM agent gekozen), per
+                                          zin PII-gescrubd via StreamScrubber
+        {"payload": {...}}              — definitieve, gevalideerde payloads
+                                          (leidend boven de gestreamde tekst)
+        {"done": true} / {"error": str}
+    """
+    engine = _get_swarm_engine(brain)
 
-        for p in payloads:
-            payload_data = {
-                "agent": p.agent,
-                "type": p.type,
-                "display_text": str(p.display_text),
-                "timestamp": p.timestamp,
-                "metadata": p.metadata
-                if isinstance(p.metadata, dict)
-                else {},
-            }
-            yield (
-                f"data: {json.dumps({'payload': payload_data})}"
-                "\n\n"
-            )
+    async def _generate() -> Any:
+        """Async generator die SSE events yield terwijl de pipeline loopt."""
+        loop = asyncio.get_running_loop()
+        wachtrij: asyncio.Queue = asyncio.Queue()
 
-        yield "data: {\"done\": true}\n\n"
+        def push(soort: str, data: Any) -> None:
+            """Zet een event op de wachtrij (ook vanuit worker threads)."""
+            loop.call_soon_threadsafe(wachtrij.put_nowait, (soort, data))
+
+        async def _draai() -> None:
+            try:
+                payloads = await engine.run(
+                    message,
+                    lambda msg: push("update", msg),
+                    on_payload=lambda p: push("agent", _payload_dict(p)),
+                    on_token=lambda agent, token: push(
+                        "token", {"agent": agent, "token": token, "voorlopig": True},
+                    ),
+                )
+                push("klaar", payloads)
+            except Exception as e:
+                push("fout", str(e))
+
+        taak = asyncio.create_task(_draai())
+        try:
+            while True:
+                soort, data = await wachtrij.get()
+                if soort == "klaar":
+                    for p in data:
+                        yield _sse({"payload": _payload_dict(p)})
+                    yield _sse({"done": True})
+                    return
+                if soort == "fout":
+                    yield _sse({"error": data})
+                    return
+                if soort == "agent":
+                    yield _sse({"agent": {**data, "voorlopig": True}})
+                else:
+                    yield _sse({soort: data})
+        finally:
+            # Client weg: pipeline niet verder laten lopen
+            if not taak.done():
+                taak.cancel()
 
     return StreamingResponse(
         _generate(),
@@ -1419,13 +1473,14 @@ async def health_pulse(
     """L1 Pulse: <2ms health check voor monitoring/k8s probes.
 
     Zero allocatie, zero DB, zero brain loading.
-    Alleen status + uptime — niets anders.
+    Alleen status, uptime en het (vooraf berekende) warm-up rapport.
     """
     return {
         "status": "online",
         "version": "6.17.0",
         "uptime_s": round(time.time() - _SERVER_START_TIME, 1),
         "pid": os.getpid(),
+        "warm": _WARM_STATUS,
     }
 
 
@@ -4007,40 +4062,32 @@ if HAS_DASHBOARD:
     async def sse_events(_key: str = Depends(verify_ui_key)) -> StreamingResponse:
         """SSE stream — polls NeuralBus elke 2s voor nieuwe events."""
         async def _event_generator() -> Any:
-            """Yield SSE events vanuit NeuralBus history."""
-            last_seen = 0
+            """Yield SSE events vanuit NeuralBus history (cursor op seq)."""
+            cursor = None
             while True:
                 try:
                     from danny_toolkit.core.neural_bus import get_bus
                     bus = get_bus()
-                    all_events = []
-                    for event_type, history in bus._history.items():
-                        for evt in history:
-                            all_events.append(evt)
-                    # Sort by timestamp, newest first
-                    all_events.sort(
-                        key=lambda e: e.timestamp if hasattr(e, "timestamp") else "",
-                        reverse=True,
-                    )
-                    for evt in all_events[:5]:
-                        evt_hash = hash(
-                            (evt.event_type, str(evt.timestamp))
+                    if cursor is None:
+                        # Eerste poll: de laatste 5 events
+                        cursor = max(bus.laatste_seq - 5, 0)
+                    nieuw = bus.get_events(since_seq=cursor, limit=50)
+                    if nieuw:
+                        cursor = nieuw[-1].seq
+                    for evt in nieuw:
+                        data = {
+                            "event_type": evt.event_type,
+                            "bron": evt.bron,
+                            "timestamp": evt.timestamp.strftime("%H:%M:%S")
+                            if hasattr(evt.timestamp, "strftime")
+                            else str(evt.timestamp),
+                            "summary": str(evt.data)[:120],
+                        }
+                        tmpl = _templates.get_template(
+                            "partials/event_feed.html"
                         )
-                        if evt_hash != last_seen:
-                            last_seen = evt_hash
-                            data = {
-                                "event_type": evt.event_type,
-                                "bron": evt.bron,
-                                "timestamp": evt.timestamp.strftime("%H:%M:%S")
-                                if hasattr(evt.timestamp, "strftime")
-                                else str(evt.timestamp),
-                                "summary": str(evt.data)[:120],
-                            }
-                            tmpl = _templates.get_template(
-                                "partials/event_feed.html"
-                            )
-                            html = tmpl.render(event=data)
-                            yield f"data: {html}\n\n"
+                        html = tmpl.render(event=data)
+                        yield f"data: {html}\n\n"
                 except Exception as e:
                     logger.debug("SSE event: %s", e)
                 await asyncio.sleep(2)
@@ -4245,8 +4292,8 @@ async def websocket_events(websocket: WebSocket) -> None:
             "timestamp": datetime.now().strftime("%H:%M:%S"),
         })
 
-        # Event push loop
-        last_seen_ids: set = set()
+        # Event push loop (cursor op NeuralBus seq)
+        cursor = None
         while True:
             try:
                 # Check voor client messages (ping/pong, met korte timeout)
@@ -4263,30 +4310,22 @@ async def websocket_events(websocket: WebSocket) -> None:
                 try:
                     from danny_toolkit.core.neural_bus import get_bus
                     bus = get_bus()
-                    all_events = []
-                    for _event_type, history in bus._history.items():
-                        for evt in history:
-                            all_events.append(evt)
-                    all_events.sort(
-                        key=lambda e: e.timestamp if hasattr(e, "timestamp") else "",
-                        reverse=True,
-                    )
-                    for evt in all_events[:10]:
-                        evt_id = hash((evt.event_type, str(evt.timestamp)))
-                        if evt_id not in last_seen_ids:
-                            last_seen_ids.add(evt_id)
-                            # Hou set beheersbaar
-                            if len(last_seen_ids) > 200:
-                                last_seen_ids = set(list(last_seen_ids)[-100:])
-                            await websocket.send_json({
-                                "type": "event",
-                                "event_type": evt.event_type,
-                                "bron": evt.bron,
-                                "timestamp": evt.timestamp.strftime("%H:%M:%S")
-                                if hasattr(evt.timestamp, "strftime")
-                                else str(evt.timestamp),
-                                "summary": str(evt.data)[:200],
-                            })
+                    if cursor is None:
+                        # Eerste poll: de laatste 10 events
+                        cursor = max(bus.laatste_seq - 10, 0)
+                    nieuw = bus.get_events(since_seq=cursor, limit=100)
+                    if nieuw:
+                        cursor = nieuw[-1].seq
+                    for evt in nieuw:
+                        await websocket.send_json({
+                            "type": "event",
+                            "event_type": evt.event_type,
+                            "bron": evt.bron,
+                            "timestamp": evt.timestamp.strftime("%H:%M:%S")
+                            if hasattr(evt.timestamp, "strftime")
+                            else str(evt.timestamp),
+                            "summary": str(evt.data)[:200],
+                        })
                 except Exception as e:
                     logger.debug("WebSocket event push: %s", e)
 
@@ -495,7 +495,7 @@ def bench_vector_store() -> dict:
             import json as _json
             with open(json_path, "r", encoding="utf-8") as f:
                 data = _json.load(f)
-            json_count = len(data.get("documenten", []))
+            json_count = data.get("aantal", len(data.get("documenten", [])))
             result["json_store_docs"] = json_count
             result["json_store_path"] = str(json_path.name)
     except Exception as e:
@@ -79,6 +79,31 @@ TESTS = [
     {"naam": "Phase 49 HardwareOptRAG", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase49.py"]},
     {"naam": "Phase 50 CPUGPUCoord", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase50.py"]},
     {"naam": "Phase 51 TypeHintHarden", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase51.py"]},
+    {"naam": "Phase 52 VectorMatrix", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase52.py"]},
+    {"naam": "Phase 53 VectorSidecar", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase53.py"]},
+    {"naam": "Phase 54 BatchSearch", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase54.py"]},
+    {"naam": "Phase 55 MetaFilter", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase55.py"]},
+    {"naam": "Phase 56 FaissAppend", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase56.py"]},
+    {"naam": "Phase 57 LazyIndexMeta", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase57.py"]},
+    {"naam": "Phase 58 IndexFamilies", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase58.py"]},
+    {"naam": "Phase 59 ShardFanOut", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase59.py"]},
+    {"naam": "Phase 60 ShardCentroids", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase60.py"]},
+    {"naam": "Phase 61 SemCacheIndex", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase61.py"]},
+    {"naam": "Phase 62 ModelRegistry", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase62.py"]},
+    {"naam": "Phase 63 EmbedMemo", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase63.py"]},
+    {"naam": "Phase 64 RouterMatrix", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase64.py"]},
+    {"naam": "Phase 65 EmbedCacheBlob", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase65.py"]},
+    {"naam": "Phase 66 SharedEmbedCache", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase66.py"]},
+    {"naam": "Phase 67 SSEStream", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase67.py"]},
+    {"naam": "Phase 68 SingleFlight", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase68.py"]},
+    {"naam": "Phase 69 StageGraph", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase69.py"]},
+    {"naam": "Phase 70 ComponentRegistry", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase70.py"]},
+    {"naam": "Phase 71 WorkloadPools", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase71.py"]},
+    {"naam": "Phase 72 NeuralBusLanes", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase72.py"]},
+    {"naam": "Phase 73 SignOnceSealing", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase73.py"]},
+    {"naam": "Phase 74 BusTimeline", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase74.py"]},
+    {"naam": "Phase 75 BusBridge", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase75.py"]},
+    {"naam": "Phase 76 StorageWriter", "cmd": [PYTHON, f"{PROJECT_ROOT}/test_phase76.py"]},
 ]
 
 BREEDTE = 60
@@ -21,7 +21,6 @@ from __future__ import annotations
 
 import atexit
 import asyncio
-import hashlib
 import json
 import logging
 import math
@@ -35,9 +34,12 @@ from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
-# Max workers voor de per-loop thread pool (I/O-bound Groq calls).
+# Max workers voor de I/O pool (Groq calls, loop default executor).
 # CPU-core-aware: min(cpu_count, 16) met floor van 4 voor lichte machines.
+# Embedding en opslag hebben eigen pools (core.workload_pools).
 _SWARM_MAX_WORKERS = min(max(os.cpu_count() or 4, 4), 16)
+import dataclasses
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -145,7 +147,13 @@ def boost_agent(agent_name: str) -> Dict[str, Any]:
 
 
 def get_pipeline_metrics() -> Dict[str, Any]:
-    """Per-agent pipeline metrics (module-level singleton)."""
+    """Per-agent pipeline metrics (module-level singleton).
+
+    Bevat ook de workload pools als "pool:io", "pool:cpu", "pool:storage"
+    (zelfde velden + workers, queue_depth, active, wait_ms_avg/max) en de
+    SQLite write-behind writers als "storage:<bestand>" (calls = flushes,
+    avg_ms/flush_ms_max = flush latency, queue_depth, rows).
+    """
     with _METRICS_LOCK:
         result = {}
         for naam, m in _AGENT_PIPELINE_METRICS.items():
@@ -158,6 +166,8 @@ def get_pipeline_metrics() -> Dict[str, Any]:
                 ),
                 "last_error": m["last_error"],
             }
+        result.update(pool_stats())
+        result.update(writer_stats())
         return result
 
 
@@ -206,6 +216,80 @@ class TaskVerificationError(Exception):
 
 # ── CONFIG ──
 from danny_toolkit.core.config import Config
+from danny_toolkit.core.embedding_memo import (
+    bind_trace, memo_embed, model_sleutel, request_memo,
+)
+from danny_toolkit.core.profile_matrix import (
+    HAS_NUMPY as HAS_PROFIEL_MATRIX, ProfielMatrix, cache_pad,
+)
+from danny_toolkit.core.request_coalescer import (
+    BRON_CACHE, BRON_UITGEVOERD, RequestCoalescer,
+)
+from danny_toolkit.core.stage_graph import StageGraaf
+from danny_toolkit.core.component_registry import ComponentRegistry
+from danny_toolkit.core.workload_pools import (
+    CPU, IO, STORAGE, get_pool, pool_stats,
+)
+from danny_toolkit.core.storage_writer import writer_stats
+
+
+
+def _bouw_componenten() -> ComponentRegistry:
+    """Hot-path componenten van SwarmEngine.run — één import per engine.
+
+    Singletons staan erin als accessor (get_bus, get_sentinel, ...), zodat
+    een gereset singleton gewoon opnieuw opgehaald wordt; LearningSystem en
+    TheCortex als gedeelde instantie.
+    """
+    reg = ComponentRegistry()
+
+    def tracer() -> Any:
+        from danny_toolkit.core.request_tracer import get_request_tracer
+        return get_request_tracer
+
+    def sentinel() -> Any:
+        from danny_toolkit.brain.eternal_sentinel import get_sentinel
+        return get_sentinel
+
+    def bus() -> Any:
+        from danny_toolkit.core.neural_bus import get_bus
+        return get_bus
+
+    def events() -> Any:
+        from danny_toolkit.core.neural_bus import EventTypes
+        return EventTypes
+
+    def learning() -> Any:
+        from danny_toolkit.learning import LearningSystem
+        return LearningSystem()
+
+    def cortex() -> Any:
+        from danny_toolkit.brain.cortex import TheCortex
+        return TheCortex()
+
+    def forge() -> Any:
+        from danny_toolkit.core.forge_loader import scan_and_load_tools
+        return scan_and_load_tools
+
+    def schild() -> Any:
+        from danny_toolkit.brain.hallucination_shield import (
+            get_hallucination_shield,
+        )
+        return get_hallucination_shield
+
+    def sensorium_events() -> Any:
+        from danny_toolkit.daemon.sensorium import EventType
+        return EventType
+
+    for naam, fabriek in (
+        ("tracer", tracer), ("sentinel", sentinel), ("bus", bus),
+        ("events", events), ("learning", learning), ("cortex", cortex),
+        ("forge", forge), ("schild", schild),
+        ("sensorium_events", sensorium_events),
+    ):
+        reg.registreer(naam, fabriek)
+    return reg
+
 
 # ── SANDBOXED TOOLS ──
 try:
@@ -509,6 +593,67 @@ class BrainAgent(Agent):
             },
         )
 
+    @staticmethod
+    def _stream_brein(brain: Any) -> Any:
+        """CentralBrain met genereer_stream (direct of via PrometheusBrain.brain)."""
+        for kandidaat in (brain, getattr(brain, "brain", None)):
+            if kandidaat is not None and hasattr(kandidaat, "genereer_stream"):
+                return kandidaat
+        return None
+
+    def kan_streamen(self, brain: Any) -> bool:
+        """True als deze agent tokens kan streamen.
+
+        Alleen agents met de standaard BrainAgent.process; subclasses
+        met eigen verwerking (CIPHER, VITA, ...) leveren één payload.
+        """
+        return (
+            type(self).process is BrainAgent.process
+            and self._stream_brein(brain) is not None
+        )
+
+    async def process_stream(
+        self, task: str, brain: Any, on_token: Any,
+    ) -> SwarmPayload:
+        """Als process(), maar tokens gaan live naar on_token(token).
+
+        Zelfde rol-context en model-tier als _execute_with_role;
+        het antwoord komt uit CentralBrain.genereer_stream. Tokens gaan
+        per zin door een StreamScrubber (PII-scrub + code-check); de
+        payload bevat de ruwe tekst en doorloopt daarna de volledige
+        validatie (Sentinel, Tribunal, HallucinatieSchild).
+        """
+        central = self._stream_brein(brain)
+        rol_context = getattr(brain, "ROLE_CONTEXT", {})
+        prefix = rol_context.get(self.cosmic_role, "")
+        if prefix:
+            task = f"{prefix}\n{task}"
+        model = getattr(brain, "MODEL_TIER", {}).get(self.cosmic_role)
+        # Schone history per swarm call (zoals _execute_with_brain)
+        central.conversation_history.clear()
+        t0 = time.time()
+        delen = []
+        scrubber = StreamScrubber(
+            on_token, governor=getattr(brain, "governor", None), agent=self.name,
+        )
+        async for token in central.genereer_stream(task, model=model):
+            delen.append(token)
+            scrubber.voeg_toe(token)
+        scrubber.sluit()
+        content = "".join(delen) or f"{self.name}: geen resultaat"
+        return SwarmPayload(
+            agent=self.name,
+            type="text",
+            content=content,
+            display_text=content,
+            metadata={
+                "execution_time": time.time() - t0,
+                "status": "stream",
+                "gestreamd": True,
+                "stream_geblokkeerd": scrubber.geblokkeerd,
+            },
+        )
+
 
 class EchoAgent(Agent):
     """Circuit Breaker — O(1) latency veiligheidsklep.
@@ -630,6 +775,7 @@ class MemexAgent(BrainAgent):
     """
 
     _collection = None  # Lazy ChromaDB connectie
+    _embed_fn = None  # Embedder van _collection (query embeddings)
 
     def _get_collection(self) -> Any:
         """Verbind met ChromaDB (zelfde DB als ingest.py)."""
@@ -670,6 +816,7 @@ class MemexAgent(BrainAgent):
                     embedding_function=embed_fn,
                 )
             )
+            self._embed_fn = embed_fn
             return self._collection
         except Exception as e:
             print(
@@ -686,10 +833,29 @@ class MemexAgent(BrainAgent):
         ".log": 0.20,
     }
 
+    def _query_embedding(self, query: str) -> list | None:
+        """Query embedding via de collectie-embedder, request-gememoiseerd.
+
+        None als er geen embedder is (collection.query embedt dan zelf).
+        """
+        fn = getattr(self, "_embed_fn", None)
+        if fn is None:
+            return None
+        try:
+            return memo_embed(
+                query, lambda q: fn([q])[0], model=model_sleutel(fn),
+            )
+        except Exception as e:
+            logger.debug("Memex query embedding fout: %s", e)
+            return None
+
     @staticmethod
     def _bepaal_query_shards(query: str) -> list[str] | None:
         """Bepaal welke shards relevant zijn op basis van query.
 
+        Cold-start fallback: zodra de ShardRouter centroids heeft
+        (kan_routeren), routeert die zelf op query embedding.
+
         Heuristiek:
         - Code-gerelateerde termen → danny_code
         - Config/data termen → danny_data
@@ -742,7 +908,11 @@ class MemexAgent(BrainAgent):
                     get_shard_router,
                 )
                 router = get_shard_router()
-                shards = self._bepaal_query_shards(query)
+                # Geleerde centroid routing; keyword hints alleen zonder centroids
+                shards = (
+                    None if router.kan_routeren()
+                    else self._bepaal_query_shards(query)
+                )
                 resultaten = router.zoek(
                     query, top_k=5, shards=shards,
                 )
@@ -779,8 +949,10 @@ class MemexAgent(BrainAgent):
         if not collection:
             return [], []
         try:
+            query_emb = self._query_embedding(query)
             results = collection.query(
-                query_texts=[query],
+                **({"query_embeddings": [query_emb]} if query_emb is not None
+                   else {"query_texts": [query]}),
                 n_results=n_results,
                 include=[
                     "documents", "metadatas",
@@ -941,7 +1113,7 @@ class MemexAgent(BrainAgent):
 
         for q in queries[:4]:
             # ChromaDB (primaire bron)
-            docs, metas = await asyncio.to_thread(
+            docs, metas = await get_pool(STORAGE).draai(
                 self._search_chromadb, q
             )
             for doc, meta in zip(docs, metas):
@@ -956,7 +1128,7 @@ class MemexAgent(BrainAgent):
                     sources.add(bron)
 
             # CorticalStack (secundaire bron)
-            cortical_docs = await asyncio.to_thread(
+            cortical_docs = await get_pool(STORAGE).draai(
                 self._search_cortical, q
             )
             for d in cortical_docs:
@@ -1709,6 +1881,66 @@ class SentinelValidator:
         }
 
 
+class StreamScrubber:
+    """Zin-gebufferde SentinelValidator voor live LLM tokens.
+
+    Tokens worden verzameld tot een zinsgrens (., ! of ? gevolgd door
+    witruimte, of een newline) en pas dan, na PII-scrub en code-check,
+    doorgegeven; zo valt een e-mailadres of nummer dat over meerdere
+    tokens loopt niet ongeschoond naar de client. Na een onveilige zin
+    stopt de stream: de definitieve (gevalideerde) payload blijft leidend.
+    """
+
+    MAX_BUFFER = 400
+    _ZINSGRENS = re.compile(r"[.!?](?=\s)|\n")
+
+    def __init__(
+        self, on_token: Any, governor: Any = None, agent: str = "",
+    ) -> None:
+        """Initialiseer met doel-callback en optionele Governor."""
+        self._on_token = on_token
+        self._validator = SentinelValidator(governor=governor)
+        self._agent = agent
+        self._buffer = ""
+        self.geblokkeerd = False
+
+    def voeg_toe(self, token: str) -> None:
+        """Buffer een token; geef complete zinnen gescrubd door."""
+        if self.geblokkeerd:
+            return
+        self._buffer += token
+        grens = None
+        for grens in self._ZINSGRENS.finditer(self._buffer):
+            pass
+        if grens is not None:
+            self._geef_door(grens.end())
+        elif len(self._buffer) > self.MAX_BUFFER:
+            # Geen zinsgrens: knip op de laatste witruimte
+            knip = self._buffer.rfind(" ", 0, self.MAX_BUFFER)
+            self._geef_door(knip + 1 if knip > 0 else len(self._buffer))
+
+    def sluit(self) -> None:
+        """Geef de resterende buffer door (einde van de stream)."""
+        if self._buffer and not self.geblokkeerd:
+            self._geef_door(len(self._buffer))
+
+    def _geef_door(self, tot: int) -> None:
+        """Valideer buffer[:tot] en stuur het geschoonde deel door."""
+        stuk, self._buffer = self._buffer[:tot], self._buffer[tot:]
+        rapport = self._validator.valideer(SwarmPayload(
+            agent=self._agent, type="text", content=stuk, display_text=stuk,
+        ))
+        if not rapport["veilig"]:
+            self.geblokkeerd = True
+            self._buffer = ""
+            logger.warning(
+                "StreamScrubber: stream van %s gestopt (%s)",
+                self._agent, "; ".join(rapport["waarschuwingen"]),
+            )
+            return
+        self._on_token(rapport["geschoond"])
+
+
 # ── ADAPTIVE ROUTER ──
 
 class AdaptiveRouter:
@@ -1725,6 +1957,10 @@ class AdaptiveRouter:
     _MAX_BLOKKEN = 5  # Absoluut max = 500 chars
     _embed_fn = None
     _profiel_embeddings = None
+    # Gestapelde profielmatrix (matvec + gesegmenteerde max)
+    _profiel_matrix = None
+    # Map voor bewaarde profielmatrices (None = Config.DATA_DIR/router_profielen)
+    _profiel_map = None
 
     # Multi-Vector Profielen V6.0
     # Complexe agents (IOLAAX, MEMEX) zijn gesplitst
@@ -1925,7 +2161,7 @@ class AdaptiveRouter:
 
     @classmethod
     def _get_embed_fn(cls) -> Any:
-        """Lazy laden van SentenceTransformer op CPU.
+        """Gedeeld SentenceTransformer model op CPU (model registry).
 
         CPU-only: router embed korte strings, geen GPU nodig.
         Voorkomt CUDA ACCESS_VIOLATION (0xC0000005) op Windows.
@@ -1933,47 +2169,96 @@ class AdaptiveRouter:
         if cls._embed_fn is not None:
             return cls._embed_fn
         try:
-            import io as _io
-            from sentence_transformers import (
-                SentenceTransformer,
-            )
-            _old_out = sys.stdout
-            _old_err = sys.stderr
-            sys.stdout = _io.StringIO()
-            sys.stderr = _io.StringIO()
-            try:
-                model = SentenceTransformer(
-                    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-                    device="cpu",
-                )
-            finally:
-                sys.stdout = _old_out
-                sys.stderr = _old_err
-            cls._embed_fn = model.encode
+            from danny_toolkit.core.embeddings import get_shared_model
+            cls._embed_fn = get_shared_model(device="cpu").encode
             return cls._embed_fn
         except Exception as e:
             logger.debug("SentenceTransformer laden mislukt: %s", e)
             return None
 
+    @classmethod
+    def _profiel_cache_map(cls) -> Any:
+        """Map voor bewaarde profielmatrices (None = niet persisteren)."""
+        if cls._profiel_map is not None:
+            return cls._profiel_map
+        if os.environ.get("DANNY_TEST_MODE") == "1":
+            return None
+        return Config.DATA_DIR / "router_profielen"
+
+    @classmethod
+    def _laad_profiel_matrix(cls, embed: Any) -> ProfielMatrix | None:
+        """Profielmatrix voor `embed`: van disk, anders één batched encode.
+
+        Op disk gesleuteld op modelnaam + hash van AGENT_PROFIELEN; alleen
+        embed functies met een model_name (registry modellen) persisteren.
+        """
+        if not HAS_PROFIEL_MATRIX:
+            return None
+        sleutel = model_sleutel(embed)
+        naam = getattr(getattr(embed, "__self__", embed), "model_name", None)
+        map_ = cls._profiel_cache_map()
+        pad = None
+        if map_ is not None and isinstance(naam, str):
+            pad = cache_pad(map_, naam, cls.AGENT_PROFIELEN)
+            matrix = ProfielMatrix.laad(pad, cls.AGENT_PROFIELEN, sleutel)
+            if matrix is not None:
+                logger.debug("Profielmatrix geladen: %s", pad.name)
+                return matrix
+        matrix = ProfielMatrix.bouw(cls.AGENT_PROFIELEN, embed, sleutel)
+        if pad is not None:
+            matrix.bewaar(pad)
+        return matrix
+
     @classmethod
     def _bereken_profielen(cls) -> dict | None:
         """Embed alle agent sub-profielen (eenmalig).
 
-        Slaat per agent een lijst van vectoren op.
-        route() pakt max(sim) over alle sub-vectoren.
+        Slaat per agent een lijst van vectoren op; met numpy
+        ook de gestapelde _profiel_matrix die route() gebruikt.
         """
         if cls._profiel_embeddings is not None:
             return cls._profiel_embeddings
         embed = cls._get_embed_fn()
         if not embed:
             return None
-        cls._profiel_embeddings = {}
-        for agent, subs in cls.AGENT_PROFIELEN.items():
-            cls._profiel_embeddings[agent] = [
-                embed(tekst) for tekst in subs
-            ]
+        matrix = cls._laad_profiel_matrix(embed)
+        if matrix is not None:
+            cls._profiel_matrix = matrix
+            cls._profiel_embeddings = matrix.als_dict()
+            return cls._profiel_embeddings
+        # Zonder numpy: één batched encode over alle sub-profielen
+        teksten = [
+            tekst for subs in cls.AGENT_PROFIELEN.values() for tekst in subs
+        ]
+        vectoren = iter(embed(teksten))
+        cls._profiel_embeddings = {
+            agent: [next(vectoren) for _ in subs]
+            for agent, subs in cls.AGENT_PROFIELEN.items()
+        }
         return cls._profiel_embeddings
 
+    @classmethod
+    def agent_scores(
+        cls, input_vec: Any, embed: Any,
+    ) -> list[tuple[str, float]]:
+        """(agent, max sim over sub-profielen) in profielvolgorde.
+
+        Eén matrix-vector product + gesegmenteerde max als de
+        profielmatrix bij `embed` hoort; anders de cosine-lus.
+        """
+        profielen = cls._bereken_profielen()
+        if not profielen:
+            return []
+        matrix = cls._profiel_matrix
+        if matrix is not None and matrix.model == model_sleutel(embed):
+            return list(zip(
+                matrix.agenten, matrix.scores(input_vec).tolist(),
+            ))
+        return [
+            (agent, max(cls._cosine_sim(input_vec, sv) for sv in sub_vecs))
+            for agent, sub_vecs in profielen.items()
+        ]
+
     @staticmethod
     def _cosine_sim(vec_a: Any, vec_b: Any) -> float:
         """Cosine similarity tussen twee vectoren."""
@@ -2042,15 +2327,11 @@ class AdaptiveRouter:
                 eind = grens
             user_input = user_input[:eind]
 
-        input_vec = embed(user_input)
+        input_vec = memo_embed(user_input, embed)
 
         scores = []
-        for agent, sub_vecs in profielen.items():
-            # max(sim) over alle sub-profielen
-            best = max(
-                self._cosine_sim(input_vec, sv)
-                for sv in sub_vecs
-            )
+        # max(sim) over alle sub-profielen: matvec + gesegmenteerde max
+        for agent, best in self.agent_scores(input_vec, embed):
             # Apply Synapse bias multiplier
             if synapse_bias and agent in synapse_bias:
                 best *= synapse_bias[agent]
@@ -2243,6 +2524,80 @@ def _fast_track_check(prompt: str) -> SwarmPayload | None:
 
 # ── SWARM ENGINE ──
 
+def _cachebaar_resultaat(payloads: Any) -> bool:
+    """Alleen volwaardige antwoorden mogen in de resultaat-cache."""
+    return bool(payloads) and not any(
+        p.type == "error" or p.agent == "Sentinel" for p in payloads
+    )
+
+
+def _coalesceer(run: Any) -> Any:
+    """Decorator: single-flight + resultaat-cache rond SwarmEngine.run.
+
+    Gelijktijdige identieke queries (genormaliseerd) wachten op de lopende
+    uitvoering en krijgen dezelfde payloads; een recent afgerond antwoord
+    komt uit de cache (SWARM_RESULT_TTL_S) in plaats van een weigering.
+    Gedeelde resultaten worden als kopie teruggegeven, gemarkeerd in metadata.
+
+    Status-updates van de gedeelde run gaan naar de callbacks van álle
+    wachtenden (vanaf het moment dat ze aansluiten). Aanroepen met
+    on_payload/on_token krijgen een eigen run: een gedeelde run kan hun
+    live events niet volledig leveren.
+    """
+    @functools.wraps(run)
+    async def wrapper(
+        self, user_input: str, callback: Any = None,
+        on_payload: Any = None, on_token: Any = None,
+    ) -> List[SwarmPayload]:
+        coalescer = getattr(self, "_coalescer", None)
+        if coalescer is None or on_payload is not None or on_token is not None:
+            return await run(self, user_input, callback, on_payload, on_token)
+        sleutel = RequestCoalescer.sleutel(user_input)
+        alle = getattr(self, "_coalesce_luisteraars", None)
+        if alle is None:
+            alle = self._coalesce_luisteraars = {}
+        if callback:
+            alle.setdefault(sleutel, []).append(callback)
+
+        def fan_out(msg: str) -> None:
+            for cb in list(alle.get(sleutel, ())):
+                try:
+                    cb(msg)
+                except Exception as e:
+                    logger.debug("Coalesce callback fout: %s", e)
+
+        try:
+            payloads, bron = await coalescer.uitvoeren(
+                sleutel,
+                lambda: run(self, user_input, fan_out, None, None),
+                cachebaar=_cachebaar_resultaat,
+            )
+        finally:
+            if callback:
+                luisteraars = alle.get(sleutel, [])
+                if callback in luisteraars:
+                    luisteraars.remove(callback)
+                if not luisteraars:
+                    alle.pop(sleutel, None)
+        if bron == BRON_UITGEVOERD:
+            return payloads
+        if bron == BRON_CACHE:
+            self._swarm_metrics["echo_guard_blocks"] += 1
+            vlag, msg = "result_cache", "\u267b\ufe0f Recent antwoord hergebruikt"
+        else:
+            self._swarm_metrics["coalesced_requests"] = (
+                self._swarm_metrics.get("coalesced_requests", 0) + 1
+            )
+            vlag, msg = "coalesced", "🔗 Gedeeld met lopende identieke query"
+        if callback:
+            callback(msg)
+        return [
+            dataclasses.replace(p, metadata={**p.metadata, vlag: True})
+            for p in payloads
+        ]
+    return wrapper
+
+
 class SwarmEngine:
     """Async orchestrator met multi-intent routing."""
 
@@ -2366,6 +2721,7 @@ class SwarmEngine:
             "fast_track_hits": 0,
             "governor_blocks": 0,
             "echo_guard_blocks": 0,
+            "coalesced_requests": 0,
             "triples_extracted": 0,
             "tribunal_verified": 0,
             "tribunal_warnings": 0,
@@ -2403,8 +2759,15 @@ class SwarmEngine:
         # Semantic Cache (lazy init)
         self._semantic_cache = None
 
-        # Echo Guard — dedup gate (hash, timestamp)
-        self._recent_queries: deque = deque(maxlen=50)
+        # Echo Guard — single-flight + kortlevende resultaat-cache
+        self._coalescer = RequestCoalescer(
+            ttl_s=getattr(Config, "SWARM_RESULT_TTL_S", 60.0),
+        )
+        # Status-callbacks per coalescing sleutel (fan-out naar wachtenden)
+        self._coalesce_luisteraars: Dict[str, list] = {}
+
+        # Hot-path imports/singletons — eenmalig opgelost (zie warm())
+        self._componenten = _bouw_componenten()
 
     def validate_execution(self, active_brain: object) -> None:
         """Valideer dat het commando van de echte Sovereign Core komt.
@@ -2499,6 +2862,39 @@ class SwarmEngine:
 
         return stats
 
+    def warm(self) -> Dict[str, Any]:
+        """Laad alles wat de eerste request anders zelf zou laden.
+
+        Hot-path componenten (tracer, sentinel, bus, learning, ...), het
+        gedeelde embedding model, de router profielmatrix, Synapse en
+        Phantom. Fouten per stap worden gelogd, niet gegooid.
+
+        Returns:
+            {"duur_ms", "stappen": {stap: ms}, "componenten": stats}.
+        """
+        t_start = time.perf_counter()
+        stappen: Dict[str, float] = {}
+        for stap, fn in (
+            ("componenten", self._componenten.warm),
+            ("embedding_model", AdaptiveRouter._get_embed_fn),
+            ("router_profielen", AdaptiveRouter._bereken_profielen),
+            ("synapse", lambda: self.synapse),
+            ("phantom", lambda: self.phantom),
+        ):
+            t0 = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                logger.warning("Warm-up %s mislukt: %s", stap, e)
+            stappen[stap] = round((time.perf_counter() - t0) * 1000, 1)
+        rapport = {
+            "duur_ms": round((time.perf_counter() - t_start) * 1000, 1),
+            "stappen": stappen,
+            "componenten": self._componenten.stats(),
+        }
+        logger.info("SwarmEngine warm in %.0fms", rapport["duur_ms"])
+        return rapport
+
     def _record_response_outcome(self, query: str, results: list) -> None:
         """B-95: Log response quality metrics to CorticalStack (non-blocking).
 
@@ -2830,9 +3226,30 @@ class SwarmEngine:
         except Exception as e:
             logger.debug("ERROR_CLASSIFIED publish fout: %s", e)
 
+    def _meld_voorlopig(self, on_payload: Any, task: Any) -> None:
+        """Geef een afgeronde agent-payload direct door (PII-gescrubde kopie)."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        payload = task.result()
+        try:
+            governor = getattr(self.brain, "governor", None)
+            rapport = SentinelValidator(governor=governor).valideer(payload)
+            if rapport["geschoond"]:
+                payload = dataclasses.replace(
+                    payload, display_text=rapport["geschoond"],
+                )
+            on_payload(payload)
+        except Exception as e:
+            logger.debug("Voorlopige payload melden mislukt: %s", e)
+
     async def _timed_dispatch(self, agent: Agent, agent_input: str,
-                              trace_id: str = "", recovery_depth: int = 0) -> SwarmPayload:
-        """Wrap agent.process() met timing, timeout + error handling + Ouroboros self-heal."""
+                              trace_id: str = "", recovery_depth: int = 0,
+                              on_token: Any = None) -> SwarmPayload:
+        """Wrap agent.process() met timing, timeout + error handling + Ouroboros self-heal.
+
+        Met on_token streamt een BrainAgent zijn antwoord token voor token
+        (process_stream); retries en recovery gebruiken gewoon process().
+        """
         agent_naam = agent.name
         t0 = time.time()
 
@@ -2905,11 +3322,14 @@ class SwarmEngine:
         # Per-agent timeout — adaptief op basis van historische latency
         timeout = self._adaptive_timeout(agent_naam)
 
+        if (on_token is not None and isinstance(agent, BrainAgent)
+                and agent.kan_streamen(self.brain)):
+            verwerking = agent.process_stream(agent_input, self.brain, on_token)
+        else:
+            verwerking = agent.process(agent_input, self.brain)
+
         try:
-            result = await asyncio.wait_for(
-                agent.process(agent_input, self.brain),
-                timeout=timeout,
-            )
+            result = await asyncio.wait_for(verwerking, timeout=timeout)
             elapsed_ms = (time.time() - t0) * 1000
             self._record_agent_metric(agent_naam, elapsed_ms)
             self._record_circuit_success(agent_naam)
@@ -3482,8 +3902,10 @@ class SwarmEngine:
             if not collection:
                 return []
 
+            query_emb = memex._query_embedding(user_input)
             resultaten = collection.query(
-                query_texts=[user_input],
+                **({"query_embeddings": [query_emb]} if query_emb is not None
+                   else {"query_texts": [user_input]}),
                 n_results=max_fragmenten,
             )
 
@@ -4067,8 +4489,8 @@ class SwarmEngine:
         bias = {}
         if self.synapse:
             try:
-                bias = self.synapse.get_routing_bias(
-                    user_input,
+                bias = await get_pool(CPU).draai(
+                    self.synapse.get_routing_bias, user_input,
                 )
                 if bias:
                     self._swarm_metrics[
@@ -4107,7 +4529,8 @@ class SwarmEngine:
 
         # Probeer embedding-based routing
         try:
-            targets = self._router.route(
+            targets = await get_pool(CPU).draai(
+                self._router.route,
                 user_input, synapse_bias=bias,
                 exclude_agents=throttled,
             )
@@ -4156,8 +4579,11 @@ class SwarmEngine:
         )
         return targets or ["ECHO"]
 
+    @_coalesceer
+    @request_memo
     async def run(
         self, user_input: str, callback: Any = None,
+        on_payload: Any = None, on_token: Any = None,
     ) -> List[SwarmPayload]:
         """Neural Hub pipeline met self-tuning.
 
@@ -4173,6 +4599,11 @@ class SwarmEngine:
         Args:
             user_input: Tekst van de gebruiker.
             callback: Functie(str) voor live updates.
+            on_payload: Functie(SwarmPayload) die per agent wordt
+                aangeroepen zodra die klaar is — een voorlopige,
+                PII-gescrubde kopie, vóór Tribunal/SENTINEL/Schild.
+            on_token: Functie(agent, token) voor token-streaming
+                als er precies één streambare BrainAgent gekozen is.
 
         Returns:
             Lijst van SwarmPayloads (1 per agent).
@@ -4191,42 +4622,38 @@ class SwarmEngine:
         # De deur blokkeert voordat het licht aangaat.
         self.validate_execution(self.brain)
 
-        # Beperk thread pool voor deze event loop (hergebruik executor)
+        # Begrensde I/O pool als default executor (LLM dispatch via
+        # to_thread); embedding en opslag draaien in hun eigen pools zodat
+        # een trage vector store de agents niet uithongert
         loop = asyncio.get_running_loop()
-        if not hasattr(self, "_executor"):
-            self._executor = ThreadPoolExecutor(
-                max_workers=_SWARM_MAX_WORKERS,
-                thread_name_prefix="swarm",
-            )
-        loop.set_default_executor(self._executor)
+        loop.set_default_executor(get_pool(IO))
 
         t = self._tuner
 
         # Phase 31: genereer trace_id voor request correlatie
         trace_id = uuid.uuid4().hex[:8]
+        bind_trace(trace_id)  # request-scoped embedding memo
         log(f"\U0001f50d Trace {trace_id}")
 
         # Phase 36: RequestTracer begin
         _tracer = None
-        try:
-            from danny_toolkit.core.config import Config as _Cfg
-            if getattr(_Cfg, "TRACING_ENABLED", True):
-                from danny_toolkit.core.request_tracer import (
-                    get_request_tracer,
-                )
-                _tracer = get_request_tracer()
+        _get_tracer = self._componenten.get("tracer")
+        if _get_tracer is not None and getattr(Config, "TRACING_ENABLED", True):
+            try:
+                _tracer = _get_tracer()
                 _tracer.begin_trace(trace_id)
-        except Exception as e:
-            logger.debug("RequestTracer init: %s", e)
+            except Exception as e:
+                logger.debug("RequestTracer init: %s", e)
+                _tracer = None
 
         # Phase 31: tick circuit breaker cooldowns
         self._tick_circuit_cooldowns()
 
         # Eternal Sentinel: auto-throttle gate
+        _get_sentinel = self._componenten.get("sentinel")
         try:
-            from danny_toolkit.brain.eternal_sentinel import get_sentinel
-            _sentinel = get_sentinel()
-            if _sentinel.is_throttled:
+            _sentinel = _get_sentinel() if _get_sentinel else None
+            if _sentinel is not None and _sentinel.is_throttled:
                 log("\u26a0\ufe0f Sentinel throttle actief — wacht op herstel...")
                 for _wait in range(10):
                     if not _sentinel.is_throttled:
@@ -4244,42 +4671,27 @@ class SwarmEngine:
             logger.debug("Sentinel throttle check: %s", _se)
 
         # Eternal Sentinel: GPU boost + mission start event
-        try:
-            from danny_toolkit.core.neural_bus import get_bus, EventTypes
-            get_bus().publish(EventTypes.MISSION_STARTED, {
-                "trace_id": trace_id,
-                "query_preview": user_input[:80],
-            }, bron="swarm_engine")
-        except Exception as e:
-            logger.debug("Mission start NeuralBus publish: %s", e)
+        _get_bus = self._componenten.get("bus")
+        EventTypes = self._componenten.get("events")
+        if _get_bus is not None and EventTypes is not None:
+            try:
+                _get_bus().publish(EventTypes.MISSION_STARTED, {
+                    "trace_id": trace_id,
+                    "query_preview": user_input[:80],
+                }, bron="swarm_engine")
+            except Exception as e:
+                logger.debug("Mission start NeuralBus publish: %s", e)
 
         # Systemic failure detectie: 3+ agents down → waarschuwing
         self._detect_systemic_failure()
 
-        # 0. Echo Guard — dedup gate (voorkom feedback loops)
-        try:
-            q_hash = hashlib.md5(
-                user_input.strip().lower().encode()
-            ).hexdigest()
-            now = time.time()
-            for prev_hash, prev_ts in self._recent_queries:
-                if prev_hash == q_hash and (now - prev_ts) < 60:
-                    self._swarm_metrics["echo_guard_blocks"] += 1
-                    msg = "Ik heb deze vraag net beantwoord."
-                    return [SwarmPayload(
-                        agent="EchoGuard", type="text",
-                        content=msg, display_text=msg,
-                    )]
-            self._recent_queries.append((q_hash, now))
-        except Exception as e:
-            logger.debug("Echo guard error: %s", e)
-
         # 0.5 Learning Cache — instant response for known-good answers
+        _learning = self._componenten.get("learning")
         try:
-            if not hasattr(self, "_learning_system"):
-                from danny_toolkit.learning import LearningSystem
-                self._learning_system = LearningSystem()
-            cached = self._learning_system.get_cached_response(user_input)
+            cached = (
+                _learning.get_cached_response(user_input)
+                if _learning is not None else None
+            )
             if cached:
                 log("\u26a1 Cache HIT — instant response")
                 self._swarm_metrics["cache_hits"] = self._swarm_metrics.get("cache_hits", 0) + 1
@@ -4298,57 +4710,12 @@ class SwarmEngine:
         )
         _learn_from_input(user_input)
 
-        # 1. Governor Gate (NOOIT skippen)
-        if _tracer:
-            _tracer.begin_span("governor")
-        t0 = time.time()
-        if self.brain:
-            safe, reason = (
-                self.brain._governor_gate(user_input)
-            )
-            if not safe:
-                t.registreer(
-                    "governor",
-                    (time.time() - t0) * 1000,
-                )
-                if _tracer:
-                    _tracer.eind_span("blocked", {"reason": reason})
-                    _tracer.eind_trace()
-                log(
-                    f"\u274c Governor: BLOCKED"
-                    f" \u2014 {reason}"
-                )
-                self._swarm_metrics[
-                    "governor_blocks"
-                ] += 1
-                # Mirror Shield: stuur naar PhantomAgent
-                _phantom = self.agents.get("PHANTOM")
-                if _phantom is not None:
-                    try:
-                        decoy = await _phantom.process(user_input)
-                        log("👻 PhantomAgent: Mirror Shield actief")
-                        return [decoy]
-                    except Exception as e:
-                        logger.debug("PhantomAgent fout: %s", e)
-                # Fallback: kale blokkade
-                blocked = f"BLOCKED: {reason}"
-                return [SwarmPayload(
-                    agent="Governor", type="text",
-                    content=blocked,
-                    display_text=blocked,
-                )]
-            log(
-                "\U0001f6e1\ufe0f Governor:"
-                " Input SAFE \u2713"
-            )
-        t.registreer(
-            "governor",
-            (time.time() - t0) * 1000,
-        )
-        if _tracer:
-            _tracer.eind_span("ok")
-
-        # 2. ECHO Fast-Track (NOOIT skippen)
+        # 1-5. Pre-routing als stage-graaf. Governor, Chronos, Phantom,
+        #      MEMEX, Cortex, Forge en Nexus routing hangen alleen van de
+        #      ruwe input af en lopen gelijktijdig; MEMEX wacht op Phantom
+        #      (pre-warm hit = geen fetch). Agents starten pas na de gate.
+        # 2. ECHO Fast-Track (NOOIT skippen) — puur en direct: bij een hit
+        #    draait alleen nog de governor.
         t0 = time.time()
         fast = _fast_track_check(user_input)
         t.registreer(
@@ -4356,163 +4723,249 @@ class SwarmEngine:
             (time.time() - t0) * 1000,
             hit=fast is not None,
         )
-        if fast:
-            log("\u26a1 [FAST-TRACK] Echo")
-            _log_to_cortical(
-                "swarm", "fast_track",
-                {"agent": "Echo",
-                 "prompt": user_input[:200]},
+
+        # 1. Governor Gate (NOOIT skippen)
+        async def _governor() -> tuple:
+            t0 = time.time()
+            gate = (True, "")
+            if self.brain:
+                gate = await asyncio.to_thread(
+                    self.brain._governor_gate, user_input,
+                )
+            t.registreer(
+                "governor",
+                (time.time() - t0) * 1000,
             )
-            log("\u2705 SWARM COMPLETE (fast-track)")
-            self._swarm_metrics["fast_track_hits"] += 1
-            self._query_count += 1
-            return [fast]
+            return gate
 
         # 3. Chronos enrichment (NOOIT skippen)
-        t0 = time.time()
-        if self.brain:
-            enriched = self.brain._chronos_enrich(
-                user_input
-            )
-            try:
-                prefix = enriched[
-                    :enriched.index("]") + 1
-                ]
-            except ValueError:
-                prefix = enriched[:40]  # no ']' found, truncate
-            log(f"\u23f3 Chronos: {prefix} \u2713")
-        else:
+        async def _chronos() -> str:
+            t0 = time.time()
             enriched = user_input
-        t.registreer(
-            "chronos",
-            (time.time() - t0) * 1000,
-        )
+            if self.brain:
+                enriched = self.brain._chronos_enrich(
+                    user_input
+                )
+            t.registreer(
+                "chronos",
+                (time.time() - t0) * 1000,
+            )
+            return enriched
 
         # 3.5 Phantom: check pre-warmed context
-        phantom_category = None
-        phantom_ctx = []
-        if self.synapse and self.phantom:
+        async def _phantom() -> tuple:
+            if not (self.synapse and self.phantom):
+                return None, []
+            category = None
             try:
-                phantom_category = (
-                    self.synapse.categorize_query(
-                        user_input,
-                    )
-                )
-                phantom_ctx = (
-                    self.phantom.get_pre_warmed(
-                        phantom_category,
-                    )
+                category = await get_pool(CPU).draai(
+                    self.synapse.categorize_query, user_input,
                 )
-                if phantom_ctx:
-                    self._swarm_metrics[
-                        "phantom_hits"
-                    ] += 1
-                    log(
-                        "\U0001f47b Phantom:"
-                        f" {len(phantom_ctx)}"
-                        " pre-warmed fragmenten"
-                    )
+                return category, self.phantom.get_pre_warmed(category) or []
             except Exception as e:
                 logger.warning(
                     "Phantom pre-warm check FAILED: %s", e,
                 )
+                return category, []
 
         # 4. MEMEX Context (tunable)
-        if _tracer:
-            _tracer.begin_span("memex")
-        if phantom_ctx:
-            # Phantom cache hit — skip MEMEX fetch
-            memex_ctx = phantom_ctx
-            log(
-                "\u23ed\ufe0f MEMEX:"
-                " phantom cache hit"
-            )
-        elif not t.mag_skippen("memex"):
+        async def _memex() -> Optional[list]:
+            if (await graaf.resultaat("phantom"))[1]:
+                return []
+            if t.mag_skippen("memex"):
+                return None  # overgeslagen (tuning)
             t0 = time.time()
-            memex_ctx = self._ophalen_memex_context(
-                user_input,
+            memex_ctx = await get_pool(STORAGE).draai(
+                self._ophalen_memex_context, user_input,
             )
             t.registreer(
                 "memex",
                 (time.time() - t0) * 1000,
                 fragmenten=len(memex_ctx),
             )
-            if memex_ctx:
-                log(
-                    f"\U0001f4da MEMEX:"
-                    f" {len(memex_ctx)}"
-                    f" fragmenten geladen"
-                )
-        else:
-            memex_ctx = []
-            log(
-                "\u23ed\ufe0f MEMEX:"
-                " overgeslagen (tuning)"
-            )
-
-        if _tracer:
-            _tracer.eind_span("ok", {"fragmenten": len(memex_ctx)})
+            return memex_ctx
 
         # 4.5 Cortex graph expansion (Phase 38)
-        if _tracer:
-            _tracer.begin_span("cortex_expand")
-        _cortex_added = 0
-        try:
-            if getattr(Config, "CORTEX_ENRICHMENT_ENABLED", True):
+        async def _cortex() -> list:
+            try:
+                if not getattr(Config, "CORTEX_ENRICHMENT_ENABLED", True):
+                    return []
                 if self._cortex is None:
-                    try:
-                        from danny_toolkit.brain.cortex import TheCortex
-                        self._cortex = TheCortex()
-                    except ImportError:
-                        self._cortex = False
+                    self._cortex = self._componenten.get("cortex") or False
                 if self._cortex and self._cortex is not False:
-                    _cx_results = await self._cortex.hybrid_search(
+                    return await self._cortex.hybrid_search(
                         user_input, top_k=3,
-                    )
-                    if _cx_results:
-                        for cr in _cx_results:
-                            _cx_content = cr.get("content", "")
-                            if _cx_content and _cx_content not in memex_ctx:
-                                memex_ctx.append(_cx_content[:300])
-                                _cortex_added += 1
-                        self._swarm_metrics["cortex_enrichments"] += 1
-                        log(
-                            f"\U0001f9e0 Knowledge Graph:"
-                            f" {_cortex_added}"
-                            f" graph-expanded fragmenten"
-                        )
-        except Exception as e:
-            logger.warning("Cortex graph expansion FAILED: %s", e)
-        if _tracer:
-            _tracer.eind_span("ok", {"cortex_fragments": _cortex_added})
+                    ) or []
+            except Exception as e:
+                logger.warning("Cortex graph expansion FAILED: %s", e)
+            return []
 
         # 4.9 Phase 56: Forge Loader — hot-reload dynamische tools
+        async def _forge() -> int:
+            scan_and_load_tools = self._componenten.get("forge")
+            if scan_and_load_tools is None:
+                return 0
+            try:
+                self._forged_tools, self._forged_schemas = (
+                    await get_pool(STORAGE).draai(scan_and_load_tools)
+                )
+                return len(self._forged_tools or {})
+            except Exception as e:
+                logger.debug("Forge loader scan: %s", e)
+                return 0
+
+        # 5. Nexus Route (NOOIT skippen)
+        async def _routing() -> List[str]:
+            t0 = time.time()
+            targets = await self.route(user_input)
+            t.registreer(
+                "route",
+                (time.time() - t0) * 1000,
+            )
+            return targets
+
+        graaf = StageGraaf(tracer=_tracer)
+        graaf.stage(
+            "governor", _governor,
+            verslag=lambda g: ("ok", {}) if g[0] else ("blocked", {"reason": g[1]}),
+        )
+        if fast is None:
+            graaf.stage("chronos", _chronos)
+            graaf.stage("phantom", _phantom)
+            graaf.stage(
+                "memex", _memex, na=("phantom",),
+                verslag=lambda m: (
+                    ("skipped", {}) if m is None
+                    else ("ok", {"fragmenten": len(m)})
+                ),
+            )
+            graaf.stage(
+                "cortex_expand", _cortex,
+                verslag=lambda c: ("ok", {"cortex_fragments": len(c)}),
+            )
+            graaf.stage("forge", _forge)
+            graaf.stage(
+                "routing", _routing,
+                verslag=lambda r: ("ok", {"targets": r}),
+            )
+        graaf.start()
         try:
-            from danny_toolkit.core.forge_loader import scan_and_load_tools
-            self._forged_tools, self._forged_schemas = scan_and_load_tools()
-            if self._forged_tools:
+            safe, reason = await graaf.resultaat("governor")
+            if not safe:
+                await graaf.afsluiten()
+                if _tracer:
+                    _tracer.eind_trace()
+                log(
+                    f"\u274c Governor: BLOCKED"
+                    f" \u2014 {reason}"
+                )
+                self._swarm_metrics[
+                    "governor_blocks"
+                ] += 1
+                # Mirror Shield: stuur naar PhantomAgent
+                _phantom_agent = self.agents.get("PHANTOM")
+                if _phantom_agent is not None:
+                    try:
+                        decoy = await _phantom_agent.process(user_input)
+                        log("👻 PhantomAgent: Mirror Shield actief")
+                        return [decoy]
+                    except Exception as e:
+                        logger.debug("PhantomAgent fout: %s", e)
+                # Fallback: kale blokkade
+                blocked = f"BLOCKED: {reason}"
+                return [SwarmPayload(
+                    agent="Governor", type="text",
+                    content=blocked,
+                    display_text=blocked,
+                )]
+            if self.brain:
+                log(
+                    "\U0001f6e1\ufe0f Governor:"
+                    " Input SAFE \u2713"
+                )
+
+            if fast:
+                log("\u26a1 [FAST-TRACK] Echo")
+                _log_to_cortical(
+                    "swarm", "fast_track",
+                    {"agent": "Echo",
+                     "prompt": user_input[:200]},
+                )
+                log("\u2705 SWARM COMPLETE (fast-track)")
+                self._swarm_metrics["fast_track_hits"] += 1
+                self._query_count += 1
+                return [fast]
+
+            enriched = await graaf.resultaat("chronos")
+            if self.brain:
+                try:
+                    prefix = enriched[
+                        :enriched.index("]") + 1
+                    ]
+                except ValueError:
+                    prefix = enriched[:40]  # no ']' found, truncate
+                log(f"\u23f3 Chronos: {prefix} \u2713")
+
+            phantom_category, phantom_ctx = await graaf.resultaat("phantom")
+            if phantom_ctx:
+                self._swarm_metrics[
+                    "phantom_hits"
+                ] += 1
+                log(
+                    "\U0001f47b Phantom:"
+                    f" {len(phantom_ctx)}"
+                    " pre-warmed fragmenten"
+                )
+                # Phantom cache hit — skip MEMEX fetch
+                memex_ctx = list(phantom_ctx)
+                log(
+                    "\u23ed\ufe0f MEMEX:"
+                    " phantom cache hit"
+                )
+            else:
+                memex_ctx = await graaf.resultaat("memex")
+                if memex_ctx:
+                    log(
+                        f"\U0001f4da MEMEX:"
+                        f" {len(memex_ctx)}"
+                        f" fragmenten geladen"
+                    )
+                elif memex_ctx is None:
+                    memex_ctx = []
+                    log(
+                        "\u23ed\ufe0f MEMEX:"
+                        " overgeslagen (tuning)"
+                    )
+
+            _cx_results = await graaf.resultaat("cortex_expand")
+            if _cx_results:
+                _cortex_added = 0
+                for cr in _cx_results:
+                    _cx_content = cr.get("content", "")
+                    if _cx_content and _cx_content not in memex_ctx:
+                        memex_ctx.append(_cx_content[:300])
+                        _cortex_added += 1
+                self._swarm_metrics["cortex_enrichments"] += 1
+                log(
+                    f"\U0001f9e0 Knowledge Graph:"
+                    f" {_cortex_added}"
+                    f" graph-expanded fragmenten"
+                )
+
+            _forged = await graaf.resultaat("forge")
+            if _forged:
                 log(
-                    f"\u2692\ufe0f Forge: {len(self._forged_tools)}"
+                    f"\u2692\ufe0f Forge: {_forged}"
                     f" tools geladen"
                 )
-        except Exception as e:
-            logger.debug("Forge loader scan: %s", e)
 
-        # 5. Nexus Route (NOOIT skippen)
-        if _tracer:
-            _tracer.begin_span("routing")
-        t0 = time.time()
-        targets = await self.route(user_input)
-        t.registreer(
-            "route",
-            (time.time() - t0) * 1000,
-        )
-        log(
-            f"\U0001f9e0 Nexus \u2192"
-            f" {', '.join(targets)}"
-        )
-        if _tracer:
-            _tracer.eind_span("ok", {"targets": targets})
+            targets = await graaf.resultaat("routing")
+            log(
+                f"\U0001f9e0 Nexus \u2192"
+                f" {', '.join(targets)}"
+            )
+        finally:
+            await graaf.afsluiten()
 
         # 6. Parallel executie via asyncio.gather
         #    MEMEX context voor alle agents behalve
@@ -4535,15 +4988,26 @@ class SwarmEngine:
                     enriched, memex_ctx,
                 )
 
+            # Token-streaming alleen bij één gekozen agent
+            agent_on_token = None
+            if on_token is not None and len(targets) == 1:
+                agent_on_token = functools.partial(on_token, agent.name)
+
             tasks.append(
                 asyncio.create_task(
                     self._timed_dispatch(
                         agent, agent_input,
                         trace_id=trace_id,
+                        on_token=agent_on_token,
                     )
                 )
             )
 
+        if on_payload is not None:
+            for task in tasks:
+                task.add_done_callback(
+                    functools.partial(self._meld_voorlopig, on_payload)
+                )
         results = await asyncio.gather(*tasks)
         t.registreer(
             "execute",
@@ -4585,10 +5049,7 @@ class SwarmEngine:
                 "twin_consultations"
             ] += 1
             try:
-                from danny_toolkit.core.neural_bus import (
-                    get_bus, EventTypes,
-                )
-                get_bus().publish(
+                _get_bus().publish(
                     EventTypes.TWIN_CONSULTATION,
                     {
                         "query": user_input[:200],
@@ -4668,11 +5129,9 @@ class SwarmEngine:
         # 7.5 HallucinatieSchild — finale anti-hallucinatie gate
         if _tracer:
             _tracer.begin_span("schild")
+        _get_schild = self._componenten.get("schild")
         try:
-            from danny_toolkit.brain.hallucination_shield import (
-                get_hallucination_shield,
-            )
-            schild = get_hallucination_shield()
+            schild = _get_schild() if _get_schild is not None else None
             _MEDIA_TYPES = {"metrics", "area_chart", "bar_chart", "code"}
             _BYPASS_CONTENT = {"Brain offline"}
             schild_non_error = [
@@ -4681,7 +5140,7 @@ class SwarmEngine:
                 and r.type not in _MEDIA_TYPES
                 and r.content not in _BYPASS_CONTENT
             ]
-            if schild_non_error:
+            if schild is not None and schild_non_error:
                 # Extract tribunal verdict from metadata
                 _tv = [
                     r.metadata.get("tribunal_verified")
@@ -4804,9 +5263,7 @@ class SwarmEngine:
                 and self.brain.governor._daemon
             ):
                 daemon = self.brain.governor._daemon
-                from danny_toolkit.daemon.sensorium import (
-                    EventType,
-                )
+                EventType = self._componenten.get("sensorium_events")
                 daemon.sensorium.sense_event(
                     EventType.TASK_COMPLETE,
                     source="swarm_engine",
@@ -4825,26 +5282,26 @@ class SwarmEngine:
             )
 
         # Best-effort triple extraction uit tekst resultaten
-        try:
-            from danny_toolkit.brain.cortex import TheCortex
-            cortex = TheCortex()
-            for r in results:
-                txt = str(r.display_text) if r.display_text else ""
-                if len(txt) > 50 and r.type == "text":
-                    triples = await cortex.extract_triples(txt)
-                    for triple in triples:
-                        cortex.add_triple(
-                            triple.subject, triple.predicaat,
-                            triple.object,
-                            triple.confidence, triple.bron,
-                        )
-                        self._swarm_metrics[
-                            "triples_extracted"
-                        ] += 1
-        except Exception as e:
-            logger.debug(
-                "Triple extraction failed: %s", e
-            )
+        cortex = self._componenten.get("cortex")
+        if cortex is not None:
+            try:
+                for r in results:
+                    txt = str(r.display_text) if r.display_text else ""
+                    if len(txt) > 50 and r.type == "text":
+                        triples = await cortex.extract_triples(txt)
+                        for triple in triples:
+                            cortex.add_triple(
+                                triple.subject, triple.predicaat,
+                                triple.object,
+                                triple.confidence, triple.bron,
+                            )
+                            self._swarm_metrics[
+                                "triples_extracted"
+                            ] += 1
+            except Exception as e:
+                logger.debug(
+                    "Triple extraction failed: %s", e
+                )
 
         # Synapse: record interaction trace + outcome reinforcement
         if self.synapse:
@@ -4916,8 +5373,7 @@ class SwarmEngine:
 
         # Eternal Sentinel: GPU idle + mission end event
         try:
-            from danny_toolkit.core.neural_bus import get_bus, EventTypes
-            get_bus().publish(EventTypes.REQUEST_TRACE_COMPLETE, {
+            _get_bus().publish(EventTypes.REQUEST_TRACE_COMPLETE, {
                 "trace_id": trace_id,
                 "agents": [r.agent for r in results] if results else [],
             }, bron="swarm_engine")
@@ -4928,17 +5384,15 @@ class SwarmEngine:
         self._record_response_outcome(user_input, results)
 
         # Learning System: log interaction for self-improvement
-        try:
-            from danny_toolkit.learning import LearningSystem
-            if not hasattr(self, "_learning_system"):
-                self._learning_system = LearningSystem()
-            ai_output = str(results[0].display_text or results[0].content)[:500] if results else ""
-            self._learning_system.log_chat(user_input, ai_output, context={
-                "agents": [r.agent for r in results],
-                "trace_id": trace_id,
-            })
-        except Exception as e:
-            logger.debug("Learning system log failed: %s", e)
+        if _learning is not None:
+            try:
+                ai_output = str(results[0].display_text or results[0].content)[:500] if results else ""
+                _learning.log_chat(user_input, ai_output, context={
+                    "agents": [r.agent for r in results],
+                    "trace_id": trace_id,
+                })
+            except Exception as e:
+                logger.debug("Learning system log failed: %s", e)
 
         log("\u2705 SWARM COMPLETE")
         self._query_count += 1
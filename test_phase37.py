@@ -158,6 +158,7 @@ def test_5_tracker_stale_actief() -> None:
     # Maak fragmenten aan
     tracker.registreer_creatie(["recent_1"], "danny_code")
     tracker.registreer_creatie(["old_1"], "danny_code")
+    tracker.flush()  # write-behind
 
     # Manipuleer last_accessed voor old_1 naar 30 dagen geleden
     try:
@@ -375,6 +376,7 @@ def test_10_oudste_vernietigen() -> None:
 
     # Registreer fragmenten met verschillende created_at
     tracker.registreer_creatie(["oud_chunk"], "danny_code")
+    tracker.flush()  # write-behind
 
     # Manipuleer created_at
     try:
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test Phase 52: VectorStore Matrix Search Engine
+================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. VectorStore houdt een genormaliseerde float32 matrix + id-array bij
+  B. zoek() via matvec geeft dezelfde top-k als de lineaire fallback
+  C. verwijder / verwijder_meerdere / wis houden de matrix in sync
+  D. Herladen vanaf disk bouwt de matrix opnieuw op
+  E. filter_fn, min_score en tainted-guard werken op het matrix-pad
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \
+        python test_phase52.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+WOORDEN = (
+    "alpha beta gamma delta epsilon zeta eta theta "
+    "iota kappa lambda mu nu xi omicron pi"
+).split()
+
+
+def _docs(n: int, start: int = 0) -> list:
+    """Deterministische test documenten."""
+    docs = []
+    for i in range(start, start + n):
+        rng = random.Random(i)
+        tekst = " ".join(rng.choice(WOORDEN) for _ in range(8)) + f" doc{i}"
+        docs.append({"id": f"d{i}", "tekst": tekst, "metadata": {"n": i}})
+    return docs
+
+
+class TestPhase52(unittest.TestCase):
+    """Phase 52: VectorStore Matrix Search Engine."""
+
+    def setUp(self) -> None:
+        """Maak een verse store met rate-limit guard uitgeschakeld."""
+        import danny_toolkit.core.vector_store as vs
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.vs = vs
+        self._oude_limits = (vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmp.name) / "vector_db.json"
+        self.embedder = HashEmbeddings(64)
+        self.store = vs.VectorStore(self.embedder, db_file=self.db_file)
+
+    def tearDown(self) -> None:
+        """Herstel module-globals."""
+        self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN = self._oude_limits
+        self.tmp.cleanup()
+
+    def _lineair(self, query: str, top_k: int) -> list:
+        """Brute-force referentie: pure-Python cosine over alle documenten."""
+        q = self.embedder.embed_query(query)
+        scores = []
+        for doc_id, doc in self.store.documenten.items():
+            emb = self.embedder.embed([doc["tekst"]])[0]
+            scores.append({"id": doc_id, "score": self.store._cosine_similarity(q, emb)})
+        scores.sort(key=lambda x: x["score"], reverse=True)
+        return scores[:top_k]
+
+    # --- A. Matrix structuur ---
+
+    def test_01_matrix_built_on_add(self) -> None:
+        """voeg_toe vult een genormaliseerde float32 matrix."""
+        if not self.vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        import numpy as np
+        self.store.voeg_toe(_docs(100))
+        c(self.store._matrix is not None, "matrix aanwezig")
+        c(self.store._matrix.dtype == np.float32, "dtype float32")
+        c(self.store._n == 100, "100 rijen in gebruik")
+        norms = np.linalg.norm(self.store._matrix[:self.store._n], axis=1)
+        c(bool(np.allclose(norms, 1.0, atol=1e-5)), "rijen genormaliseerd")
+        c(self.store._ids[self.store._id_pos["d42"]] == "d42", "id-positie consistent")
+
+    # --- B. Resultaat-pariteit ---
+
+    def test_02_matrix_matches_linear(self) -> None:
+        """Matrix-zoekopdracht geeft dezelfde top-k als lineaire scan."""
+        self.store.voeg_toe(_docs(200))
+        for query in ["alpha beta gamma", "kappa lambda mu nu"]:
+            snel = self.store.zoek(query, top_k=5)
+            traag = self._lineair(query, top_k=5)
+            c([d["id"] for d in snel] == [d["id"] for d in traag], f"zelfde ids: {query}")
+            c(all(abs(a["score"] - b["score"]) < 1e-5 for a, b in zip(snel, traag)),
+              f"zelfde scores: {query}")
+
+    def test_03_scores_are_python_floats(self) -> None:
+        """Scores zijn plain float (JSON-serialiseerbaar)."""
+        self.store.voeg_toe(_docs(20))
+        res = self.store.zoek("alpha beta", top_k=3)
+        c(len(res) == 3, "3 resultaten")
+        c(all(type(r["score"]) is float for r in res), "float type")
+
+    # --- C. Sync bij verwijderen ---
+
+    def test_04_delete_keeps_matrix_in_sync(self) -> None:
+        """verwijder en verwijder_meerdere passen matrix aan (swap-remove)."""
+        if not self.vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.store.voeg_toe(_docs(50))
+        self.store.verwijder("d3")
+        self.store.verwijder_meerdere(["d10", "d49", "bestaat_niet"])
+        c(self.store._n == 47, "47 rijen over")
+        c(set(self.store._ids) == set(self.store.documenten), "ids == dict keys")
+        c(all(self.store._ids[p] == d for d, p in self.store._id_pos.items()),
+          "id_pos consistent na swap")
+        ids = [r["id"] for r in self.store.zoek("alpha beta gamma", top_k=47)]
+        c("d3" not in ids and "d10" not in ids, "verwijderde docs niet gevonden")
+
+    def test_05_wis_resets_matrix(self) -> None:
+        """wis() maakt matrix leeg; opnieuw toevoegen werkt."""
+        if not self.vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.store.voeg_toe(_docs(10))
+        self.store.wis()
+        c(self.store._n == 0, "matrix leeg")
+        c(self.store.zoek("alpha") == [], "geen resultaten")
+        self.store.voeg_toe(_docs(5, start=100))
+        c(self.store._n == 5, "5 rijen na hertoevoegen")
+
+    # --- D. Herladen ---
+
+    def test_06_reload_rebuilds_matrix(self) -> None:
+        """Nieuwe instantie op hetzelfde bestand bouwt matrix op."""
+        if not self.vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.store.voeg_toe(_docs(80))
+        herladen = self.vs.VectorStore(self.embedder, db_file=self.db_file)
+        c(herladen._n == len(herladen.documenten) == 80, "80 rijen na herladen")
+        a = [d["id"] for d in self.store.zoek("theta iota", top_k=5)]
+        b = [d["id"] for d in herladen.zoek("theta iota", top_k=5)]
+        c(a == b, "zelfde resultaten na herladen")
+
+    # --- E. Filters en guards ---
+
+    def test_07_filter_and_min_score(self) -> None:
+        """filter_fn en min_score op matrix-pad."""
+        self.store.voeg_toe(_docs(100))
+        even = lambda d: d["metadata"]["n"] % 2 == 0
+        res = self.store.zoek("alpha beta", top_k=10, filter_fn=even)
+        c(len(res) == 10, "10 gefilterde resultaten")
+        c(all(r["metadata"]["n"] % 2 == 0 for r in res), "alleen even docs")
+        res = self.store.zoek("alpha beta", top_k=100, min_score=0.5)
+        c(all(r["score"] >= 0.5 for r in res), "min_score gerespecteerd")
+        c(res == sorted(res, key=lambda r: -r["score"]), "aflopend gesorteerd")
+
+    def test_08_tainted_guard_on_matrix_path(self) -> None:
+        """>= 3 klonen boven 0.99 worden weggefilterd."""
+        kloon = "omega sovereign kloon tekst"
+        docs = [{"id": f"k{i}", "tekst": kloon, "metadata": {}} for i in range(4)]
+        self.store.voeg_toe(docs + _docs(20))
+        res = self.store.zoek(kloon, top_k=5)
+        c(all(not r["id"].startswith("k") for r in res), "klonen verwijderd")
+        c(len(res) > 0, "overige resultaten blijven")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 52: VectorStore Matrix Search Engine")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
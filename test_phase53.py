@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test Phase 53: VectorStore Binary Sidecar Format
+=================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. Nieuwe stores schrijven header + .vec + .docs.jsonl (v3.0)
+  B. voeg_toe schrijft append-only (alleen nieuwe rijen)
+  C. Herladen: vectoren memory-mapped, verwijderingen/metadata afgespeeld
+  D. Eenmalige migratie van v2.0 JSON met .v2.bak backup
+  E. Crash-herstel (afgebroken staart) + compactie bij dode rijen
+  F. Backup blijft draagbaar v2.0 JSON; laad_documenten leest beide
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \
+        python test_phase53.py
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+WOORDEN = (
+    "alpha beta gamma delta epsilon zeta eta theta "
+    "iota kappa lambda mu nu xi omicron pi"
+).split()
+
+
+def _docs(n: int, start: int = 0) -> list:
+    """Deterministische test documenten."""
+    docs = []
+    for i in range(start, start + n):
+        rng = random.Random(i)
+        tekst = " ".join(rng.choice(WOORDEN) for _ in range(8)) + f" doc{i}"
+        docs.append({"id": f"d{i}", "tekst": tekst, "metadata": {"n": i}})
+    return docs
+
+
+class TestPhase53(unittest.TestCase):
+    """Phase 53: VectorStore Binary Sidecar Format."""
+
+    def setUp(self) -> None:
+        """Maak een tijdelijke store directory."""
+        import danny_toolkit.core.vector_store as vs
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        if not vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.vs = vs
+        self._oude_limits = (vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db_file = self.dir / "vector_db.json"
+        self.embedder = HashEmbeddings(32)
+
+    def tearDown(self) -> None:
+        """Herstel module-globals."""
+        self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN = self._oude_limits
+        self.tmp.cleanup()
+
+    def _store(self):
+        """Open (of heropen) de store."""
+        return self.vs.VectorStore(self.embedder, db_file=self.db_file)
+
+    def _header(self) -> dict:
+        """Lees de header."""
+        with open(self.db_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    # --- A. Layout ---
+
+    def test_01_new_store_writes_sidecars(self) -> None:
+        """Eerste voeg_toe schrijft header + sidecars."""
+        store = self._store()
+        store.voeg_toe(_docs(10))
+        header = self._header()
+        c(header["versie"] == "3.0", "versie 3.0")
+        c(header["formaat"] == "binair", "formaat binair")
+        c(header["rijen"] == 10 and header["dim"] == 32, "rijen + dim")
+        vec_pad, docs_pad = self.vs._sidecar_paden(self.db_file, header["generatie"])
+        c(vec_pad.stat().st_size == 10 * 32 * 4, "raw float32 rijen")
+        c("embedding" not in store.documenten["d0"], "geen embedding in dict")
+        emb = store.document_embedding("d0")
+        c(isinstance(emb, list) and len(emb) == 32, "document_embedding accessor")
+        c(store.document_embedding("bestaat_niet") is None, "onbekend id -> None")
+
+    # --- B. Append-only ---
+
+    def test_02_append_only_writes(self) -> None:
+        """Tweede batch groeit de sidecars zonder nieuwe generatie."""
+        store = self._store()
+        store.voeg_toe(_docs(10))
+        gen = self._header()["generatie"]
+        vec_pad, docs_pad = self.vs._sidecar_paden(self.db_file, gen)
+        regels_voor = docs_pad.read_text(encoding="utf-8").count("\n")
+        store.voeg_toe(_docs(5, start=10))
+        c(self._header()["generatie"] == gen, "zelfde generatie")
+        c(vec_pad.stat().st_size == 15 * 32 * 4, "5 rijen toegevoegd")
+        c(docs_pad.read_text(encoding="utf-8").count("\n") == regels_voor + 5,
+          "5 log regels toegevoegd")
+
+    # --- C. Herladen ---
+
+    def test_03_reload_replays_log(self) -> None:
+        """Verwijderingen en metadata updates overleven herladen."""
+        store = self._store()
+        store.voeg_toe(_docs(20))
+        store.verwijder("d4")
+        store.update_metadata("d5", {"tag": "x"})
+        herladen = self._store()
+        c(herladen.count() == 19, "19 docs")
+        c("d4" not in herladen.documenten, "d4 verwijderd")
+        c(herladen.get("d5")["metadata"]["tag"] == "x", "metadata update")
+        a = [r["id"] for r in store.zoek("alpha beta gamma", top_k=5)]
+        b = [r["id"] for r in herladen.zoek("alpha beta gamma", top_k=5)]
+        c(a == b, "zelfde zoekresultaten")
+
+    def test_04_clean_reload_uses_mmap(self) -> None:
+        """Zonder dode rijen is de matrix direct de memory-map."""
+        import numpy as np
+        self._store().voeg_toe(_docs(12))
+        herladen = self._store()
+        c(isinstance(herladen._matrix, np.memmap), "matrix is memmap")
+        herladen.voeg_toe(_docs(1, start=50))
+        c(herladen.count() == 13, "append na mmap-load werkt")
+
+    # --- D. Migratie ---
+
+    def test_05_migrates_v2_json(self) -> None:
+        """v2.0 JSON wordt eenmalig gemigreerd."""
+        docs = {
+            d["id"]: {
+                "tekst": d["tekst"], "metadata": d["metadata"],
+                "embedding": self.embedder.embed([d["tekst"]])[0],
+                "toegevoegd_op": "2025-01-01T00:00:00",
+            }
+            for d in _docs(8)
+        }
+        docs["kapot"] = {"tekst": "x", "metadata": {}, "embedding": []}
+        with open(self.db_file, "w", encoding="utf-8") as f:
+            json.dump({"documenten": docs, "statistieken": {}, "versie": "2.0"}, f)
+        store = self._store()
+        c(store.count() == 8, "8 geldige docs (corrupte weg)")
+        c(self._header()["formaat"] == "binair", "header is v3")
+        c(self.db_file.with_suffix(".json.v2.bak").exists(), "v2 backup bewaard")
+        c(self._store().count() == 8, "herladen na migratie")
+
+    # --- E. Herstel + compactie ---
+
+    def test_06_recovers_truncated_tail(self) -> None:
+        """Afgebroken append (staart zonder header) wordt genegeerd."""
+        store = self._store()
+        store.voeg_toe(_docs(6))
+        vec_pad, docs_pad = self.vs._sidecar_paden(self.db_file, store._generatie)
+        with open(vec_pad, "ab") as f:
+            f.write(b"\0" * 32 * 4)
+        with open(docs_pad, "a", encoding="utf-8") as f:
+            f.write('{"rij": 6, "id": "wees", "tekst": "t", "metadata": {}}\n{"afgebr')
+        herladen = self._store()
+        c(herladen.count() == 6, "6 docs na herstel")
+        c("wees" not in herladen.documenten, "verweesd record genegeerd")
+        c(herladen._generatie == store._generatie + 1, "herstel compacteert")
+
+    def test_07_compaction_on_dead_rows(self) -> None:
+        """Veel verwijderingen triggeren compactie naar nieuwe generatie."""
+        store = self._store()
+        for start in range(0, 600, 100):
+            store.voeg_toe(_docs(100, start=start))
+        gen = store._generatie
+        store.verwijder_meerdere([f"d{i}" for i in range(400)])
+        c(store._generatie == gen + 1, "nieuwe generatie")
+        c(store._rijen == 200, "alleen levende rijen")
+        oud_vec, _ = self.vs._sidecar_paden(self.db_file, gen)
+        c(not oud_vec.exists(), "oude generatie opgeruimd")
+        c(self._store().count() == 200, "herladen na compactie")
+
+    # --- F. Backup + externe lezers ---
+
+    def test_08_backup_and_reader(self) -> None:
+        """Backup bevat embeddings; laad_documenten leest v3."""
+        from danny_toolkit.core.config import Config
+        store = self._store()
+        store.voeg_toe(_docs(5))
+        docs = self.vs.laad_documenten(self.db_file)
+        c(len(docs) == 5 and len(docs["d1"]["embedding"]) == 32, "laad_documenten v3")
+        oud_backup_dir = Config.BACKUP_DIR
+        Config.BACKUP_DIR = self.dir / "backups"
+        try:
+            pad = store.maak_backup("fase53")
+            with open(pad, encoding="utf-8") as f:
+                data = json.load(f)
+            c(len(data["documenten"]["d2"]["embedding"]) == 32, "backup met embeddings")
+            store.wis()
+            c(store.count() == 0, "gewist")
+            c(store.herstel_backup(pad), "herstel ok")
+            c(self._store().count() == 5, "hersteld en persistent")
+        finally:
+            Config.BACKUP_DIR = oud_backup_dir
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 53: VectorStore Binary Sidecar Format")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test Phase 54: Batched Multi-Query Search
+==========================================
+8 tests · 20+ checks
+
+Valideert:
+  A. EmbeddingProvider.embed_queries + CachedEmbeddingProvider batching
+  B. VectorStore.zoek_batch == zoek per query, één embed call
+  C. Lege queries en filter_fn in zoek_batch
+  D. IndexStore.search_batch == search per query (één FAISS call)
+  E. ProductionRAG.batch_vraag gebruikt zoek_batch
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \
+        python test_phase54.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import sys
+import tempfile
+from unittest.mock import MagicMock
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+WOORDEN = (
+    "alpha beta gamma delta epsilon zeta eta theta "
+    "iota kappa lambda mu nu xi omicron pi"
+).split()
+
+
+def _docs(n: int, start: int = 0) -> list:
+    """Deterministische test documenten."""
+    docs = []
+    for i in range(start, start + n):
+        rng = random.Random(i)
+        tekst = " ".join(rng.choice(WOORDEN) for _ in range(8)) + f" doc{i}"
+        docs.append({"id": f"d{i}", "tekst": tekst, "metadata": {"n": i}})
+    return docs
+
+
+class _TellendeEmbedder:
+    """Wrapper die provider calls telt."""
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.dimensies = inner.dimensies
+        self.naam = inner.naam
+        self.calls = 0
+
+    def embed(self, teksten: list) -> list:
+        self.calls += 1
+        return self.inner.embed(teksten)
+
+    def embed_query(self, query: str) -> list:
+        self.calls += 1
+        return self.inner.embed_query(query)
+
+    def embed_queries(self, queries: list) -> list:
+        self.calls += 1
+        return self.inner.embed_queries(queries)
+
+
+class TestPhase54(unittest.TestCase):
+    """Phase 54: Batched Multi-Query Search."""
+
+    def setUp(self) -> None:
+        """Store met rate-limit guard uitgeschakeld."""
+        import danny_toolkit.core.vector_store as vs
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.vs = vs
+        self._oude_limits = (vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.embedder = _TellendeEmbedder(HashEmbeddings(64))
+        self.store = vs.VectorStore(self.embedder, db_file=Path(self.tmp.name) / "db.json")
+        for start in range(0, 300, 100):
+            self.store.voeg_toe(_docs(100, start=start))
+
+    def tearDown(self) -> None:
+        """Herstel module-globals."""
+        self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN = self._oude_limits
+        self.tmp.cleanup()
+
+    # --- A. Provider batching ---
+
+    def test_01_embed_queries_default(self) -> None:
+        """Basis embed_queries == embed_query per query."""
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        emb = HashEmbeddings(32)
+        batch = emb.embed_queries(["alpha beta", "gamma delta"])
+        c(len(batch) == 2, "2 vectoren")
+        c(batch[1] == emb.embed_query("gamma delta"), "zelfde als embed_query")
+
+    def test_02_cached_provider_batches_misses(self) -> None:
+        """CachedEmbeddingProvider stuurt alleen missers in één call."""
+        from danny_toolkit.core.embeddings import (
+            CachedEmbeddingProvider, EmbeddingCache, HashEmbeddings,
+        )
+        inner = _TellendeEmbedder(HashEmbeddings(32))
+        cache = EmbeddingCache(cache_bestand=Path(self.tmp.name) / "cache.json")
+        cached = CachedEmbeddingProvider(inner, cache=cache)
+        cached.embed_query("alpha beta")
+        inner.calls = 0
+        res = cached.embed_queries(["alpha beta", "gamma delta", "eta theta"])
+        c(len(res) == 3 and all(res), "3 vectoren")
+        c(inner.calls == 1, "één provider call voor 2 missers")
+
+    # --- B. zoek_batch pariteit ---
+
+    def test_03_zoek_batch_matches_zoek(self) -> None:
+        """zoek_batch geeft per query dezelfde resultaten als zoek."""
+        queries = ["alpha beta gamma", "kappa lambda", "omicron pi xi"]
+        self.embedder.calls = 0
+        batch = self.store.zoek_batch(queries, top_k=5)
+        c(self.embedder.calls == 1, "één embed call")
+        c(len(batch) == 3, "3 resultaatlijsten")
+        for q, res in zip(queries, batch):
+            los = self.store.zoek(q + " ", top_k=5)
+            c([r["id"] for r in res] == [r["id"] for r in los], f"zelfde top-5: {q}")
+
+    def test_04_zoek_batch_counts_queries(self) -> None:
+        """Statistieken tellen elke query in de batch."""
+        voor = self.store.statistieken()["queries_uitgevoerd"]
+        self.store.zoek_batch(["alpha", "beta", "gamma"], top_k=2)
+        c(self.store.statistieken()["queries_uitgevoerd"] == voor + 3, "+3 queries")
+
+    # --- C. Randgevallen ---
+
+    def test_05_empty_queries_and_filter(self) -> None:
+        """Lege queries geven [] op hun positie; filter_fn geldt voor alle."""
+        even = lambda d: d["metadata"]["n"] % 2 == 0
+        res = self.store.zoek_batch(["alpha beta", "", "   ", "mu nu"], top_k=4, filter_fn=even)
+        c(res[1] == [] and res[2] == [], "lege queries -> []")
+        c(len(res[0]) == 4 and len(res[3]) == 4, "geldige queries gevuld")
+        c(all(r["metadata"]["n"] % 2 == 0 for lst in res for r in lst), "filter toegepast")
+
+    # --- D. IndexStore ---
+
+    def test_06_index_search_batch(self) -> None:
+        """IndexStore.search_batch == search per rij."""
+        try:
+            import numpy as np
+            from danny_toolkit.core.index_store import IndexStore
+            IndexStore(store_dir=Path(self.tmp.name) / "idx0")
+        except ImportError:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        rng = np.random.default_rng(54)
+        vecs = rng.standard_normal((300, 16)).astype("float32")
+        meta = [{"text": f"chunk {i}", "source": "s", "chunk": i} for i in range(300)]
+        store = IndexStore(store_dir=Path(self.tmp.name) / "idx")
+        store.build(vecs, meta)
+        queries = vecs[[3, 70, 150]]
+        batch = store.search_batch(queries, k=4)
+        c(len(batch) == 3, "3 resultaatlijsten")
+        for q in range(3):
+            los = store.search(queries[q:q + 1], k=4)
+            c([r["chunk"] for r in batch[q]] == [r["chunk"] for r in los], f"zelfde hits q{q}")
+        c(batch[0][0]["chunk"] == 3, "exacte match eerst")
+
+    def test_07_index_search_accepts_1d(self) -> None:
+        """search() accepteert ook een 1-D query vector."""
+        try:
+            import numpy as np
+            from danny_toolkit.core.index_store import IndexStore
+            store = IndexStore(store_dir=Path(self.tmp.name) / "idx1")
+        except ImportError:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        vecs = np.eye(8, dtype="float32")
+        store.build(vecs, [{"text": f"t{i}", "source": "s", "chunk": i} for i in range(8)])
+        c(store.search(vecs[5], k=1)[0]["chunk"] == 5, "1-D query werkt")
+
+    # --- E. ProductionRAG ---
+
+    def test_08_production_rag_batch_uses_zoek_batch(self) -> None:
+        """batch_vraag haalt alle contexten op in één zoek_batch call."""
+        from danny_toolkit.ai.production_rag import ProductionRAG
+        rag = ProductionRAG.__new__(ProductionRAG)
+        rag.vector_store = MagicMock()
+        rag.vector_store.zoek_batch.return_value = [[], []]
+        rag._expand_query = lambda q: q
+        rag._beantwoord = MagicMock(return_value="ok")
+        res = rag.batch_vraag(["vraag een", "vraag twee"])
+        c(rag.vector_store.zoek_batch.call_count == 1, "één zoek_batch call")
+        c(not rag.vector_store.zoek.called, "geen losse zoek calls")
+        c([r["antwoord"] for r in res] == ["ok", "ok"], "2 antwoorden")
+
+    def test_09_zoek_batch_kost_slot_per_query(self) -> None:
+        """Anti-extraction guard rekent één slot per query in een batch."""
+        vs = self.vs
+        vs._VECTOR_SEARCH_LIMIT = 5
+        with vs._vector_search_lock:
+            vs._vector_search_log.clear()
+            vs._recent_queries.clear()
+        ok, _ = vs._vector_rate_check_batch(["q1", "q2", "q3"])
+        c(ok and len(vs._vector_search_log) == 3, "3 slots verbruikt")
+        ok, reden = vs._vector_rate_check_batch(["q4", "q5", "q6"])
+        c(not ok and "rate limit" in reden, "batch boven resterend budget geweigerd")
+        c(len(vs._vector_search_log) == 3, "geweigerde batch registreert niets")
+        res = self.store.zoek_batch(["q7", "q8", "q9"], top_k=2)
+        c(res == [[], [], []], "zoek_batch geblokkeerd")
+        with vs._vector_search_lock:
+            vs._vector_search_log.clear()
+            vs._recent_queries.clear()
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 54: Batched Multi-Query Search")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
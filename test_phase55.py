@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test Phase 55: VectorStore Metadata Pre-Filtering
+==================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. where-filters (gelijkheid, $in, bereik, $prefix) geven dezelfde
+     resultaten als een equivalente filter_fn
+  B. Alleen de matchende subset van de matrix wordt gescoord
+  C. Inverted index blijft in sync bij voeg_toe / verwijder /
+     update_metadata / herladen
+  D. zoek_op_metadata en zoek_batch gebruiken dezelfde index
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase55.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+WOORDEN = (
+    "alpha beta gamma delta epsilon zeta eta theta "
+    "iota kappa lambda mu nu xi omicron pi"
+).split()
+APPS = ["notities", "agenda", "fitness", "code"]
+
+
+def _docs(n: int, start: int = 0) -> list:
+    """Deterministische test documenten met gevarieerde metadata."""
+    docs = []
+    for i in range(start, start + n):
+        rng = random.Random(i)
+        tekst = " ".join(rng.choice(WOORDEN) for _ in range(8)) + f" doc{i}"
+        docs.append({"id": f"d{i}", "tekst": tekst, "metadata": {
+            "n": i,
+            "app": APPS[i % len(APPS)],
+            "bron": f"{'docs' if i % 3 == 0 else 'src'}/bestand{i}.md",
+            "tags": ["x", str(i % 2)],
+        }})
+    return docs
+
+
+class TestPhase55(unittest.TestCase):
+    """Phase 55: VectorStore Metadata Pre-Filtering."""
+
+    def setUp(self) -> None:
+        """Maak een verse store met rate-limit guard uitgeschakeld."""
+        import danny_toolkit.core.vector_store as vs
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.vs = vs
+        self._oude_limits = (vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmp.name) / "vector_db.json"
+        self.embedder = HashEmbeddings(64)
+        self.store = vs.VectorStore(self.embedder, db_file=self.db_file)
+        for start in range(0, 200, 100):
+            self.store.voeg_toe(_docs(100, start))
+
+    def tearDown(self) -> None:
+        """Herstel module-globals."""
+        self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN = self._oude_limits
+        self.tmp.cleanup()
+
+    def _pariteit(self, where: dict, filter_fn, label: str) -> None:
+        """where en filter_fn geven identieke resultaten."""
+        a = self.store.zoek("alpha beta gamma", top_k=10, where=where)
+        b = self.store.zoek("alpha beta gamma", top_k=10, filter_fn=filter_fn)
+        c([r["id"] for r in a] == [r["id"] for r in b], f"pariteit {label}")
+        c(all(abs(x["score"] - y["score"]) < 1e-6 for x, y in zip(a, b)), f"scores {label}")
+
+    # --- A. Operatoren ---
+
+    def test_01_equality_and_in(self) -> None:
+        """Gelijkheid en $in."""
+        self._pariteit({"app": "agenda"}, lambda d: d["metadata"]["app"] == "agenda", "eq")
+        self._pariteit({"app": {"$in": ["code", "fitness"]}},
+                       lambda d: d["metadata"]["app"] in ("code", "fitness"), "$in")
+
+    def test_02_range_and_prefix(self) -> None:
+        """Bereik, prefix en AND over meerdere velden."""
+        self._pariteit({"n": {"$gte": 50, "$lt": 120}},
+                       lambda d: 50 <= d["metadata"]["n"] < 120, "bereik")
+        self._pariteit({"bron": {"$prefix": "docs/"}},
+                       lambda d: d["metadata"]["bron"].startswith("docs/"), "prefix")
+        self._pariteit({"app": "code", "n": {"$gt": 100}},
+                       lambda d: d["metadata"]["app"] == "code" and d["metadata"]["n"] > 100,
+                       "AND")
+
+    def test_03_empty_and_unknown(self) -> None:
+        """Geen match geeft [] ; onbekende operator faalt luid."""
+        c(self.store.zoek("alpha", where={"app": "bestaat_niet"}) == [], "geen match")
+        c(self.store.zoek("alpha", where={"ontbrekend_veld": 1}) == [], "onbekend veld")
+        with self.assertRaises(ValueError):
+            self.store.zoek("alpha", where={"n": {"$regex": ".*"}})
+        c(True, "ValueError op onbekende operator")
+
+    # --- B. Subset scoring ---
+
+    def test_04_only_subset_scored(self) -> None:
+        """Matrix-pad scoort alleen de rijen uit de index."""
+        if not self.vs.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        gezien = []
+        origineel = self.store._selecteer_top_k
+
+        def spion(scores_vec, *args, **kwargs):
+            gezien.append(len(scores_vec))
+            return origineel(scores_vec, *args, **kwargs)
+
+        self.store._selecteer_top_k = spion
+        self.store.zoek("alpha beta", top_k=5, where={"app": "notities"})
+        c(gezien == [50], f"50 van 200 rijen gescoord ({gezien})")
+
+    # --- C. Sync ---
+
+    def test_05_index_follows_mutations(self) -> None:
+        """voeg_toe (replace), verwijder en update_metadata."""
+        c(len(self.store.zoek_op_metadata("app", "agenda")) == 50, "50 agenda docs")
+        self.store.verwijder("d1")
+        self.store.verwijder_meerdere(["d5", "d9"])
+        c(len(self.store.zoek_op_metadata("app", "agenda")) == 47, "47 na verwijderen")
+        self.store.update_metadata("d13", {"app": "code"})
+        c(len(self.store.zoek_op_metadata("app", "agenda")) == 46, "46 na update")
+        c("d13" in {r["id"] for r in self.store.zoek_op_metadata("app", "code")}, "d13 nu code")
+        vervanger = _docs(1, start=17)[0]
+        vervanger["metadata"]["app"] = "fitness"
+        self.store.voeg_toe([vervanger])
+        c(len(self.store.zoek_op_metadata("app", "agenda")) == 45, "45 na vervangen d17")
+        res = self.store.zoek("alpha beta", top_k=200, where={"app": "agenda"})
+        c(all(r["metadata"]["app"] == "agenda" for r in res), "zoek volgt index")
+
+    def test_06_reload_and_wis(self) -> None:
+        """Index werkt na herladen; wis leegt hem."""
+        herladen = self.vs.VectorStore(self.embedder, db_file=self.db_file)
+        a = [r["id"] for r in self.store.zoek("kappa", top_k=5, where={"n": {"$lte": 30}})]
+        b = [r["id"] for r in herladen.zoek("kappa", top_k=5, where={"n": {"$lte": 30}})]
+        c(a == b and len(a) == 5, "zelfde resultaten na herladen")
+        self.store.wis()
+        c(self.store.zoek_op_metadata("app", "agenda") == [], "leeg na wis")
+
+    # --- D. zoek_op_metadata / zoek_batch ---
+
+    def test_07_zoek_op_metadata(self) -> None:
+        """Exact, contains en niet-hashbare waarden."""
+        res = self.store.zoek_op_metadata("app", "fitness")
+        c([r["id"] for r in res][:3] == ["d2", "d6", "d10"], "invoegvolgorde behouden")
+        c(len(self.store.zoek_op_metadata("bron", "DOCS/", exact=False)) == 67, "contains")
+        c(len(self.store.zoek_op_metadata("tags", ["x", "1"])) == 100, "lijst waarde exact")
+        c(len(self.store.zoek_op_metadata("tags", "'1'", exact=False)) == 100, "lijst contains")
+
+    def test_08_zoek_batch_where(self) -> None:
+        """zoek_batch met where == per-query zoek met where."""
+        queries = ["alpha beta", "kappa lambda", "omicron pi"]
+        where = {"app": {"$in": ["agenda"]}, "n": {"$gte": 40}}
+        batch = self.store.zoek_batch(queries, top_k=4, where=where)
+        los = [self.store.zoek(q, top_k=4, where=where) for q in queries]
+        c([[r["id"] for r in b] for b in batch] == [[r["id"] for r in l] for l in los],
+          "batch == los")
+        c(all(r["metadata"]["app"] == "agenda" and r["metadata"]["n"] >= 40
+              for b in batch for r in b), "filter gerespecteerd")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 55: VectorStore Metadata Pre-Filtering")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
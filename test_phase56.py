@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test Phase 56: Incrementele FAISS Append
+=========================================
+9 tests · 35+ checks
+
+Valideert:
+  A. IndexStore.append voegt toe aan de getrainde index (geen rebuild)
+  B. vectors.npy krijgt alleen de nieuwe rijen (header in-place)
+  C. Retrain volgt pas bij groei / scheefheid / Flat -> IVF overgang
+  D. Achtergrond retrain verliest geen tussentijdse appends
+  E. faiss.index lui en atomisch geschreven, herstel uit vectors.npy
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase56.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+DIM = 16
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _data(n: int, start: int = 0):
+    """Deterministische vectoren + metadata."""
+    import numpy as np
+    rng = np.random.default_rng(start)
+    vecs = rng.standard_normal((n, DIM)).astype("float32")
+    meta = [{"text": f"chunk {i}", "source": f"doc{i % 7}.md", "chunk": i}
+            for i in range(start, start + n)]
+    return vecs, meta
+
+
+def _wacht(voorwaarde, timeout: float = 5.0) -> bool:
+    """Poll tot voorwaarde() waar is of de timeout verloopt."""
+    import time
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if voorwaarde():
+            return True
+        time.sleep(0.01)
+    return voorwaarde()
+
+
+class TestPhase56(unittest.TestCase):
+    """Phase 56: Incrementele FAISS Append."""
+
+    def setUp(self) -> None:
+        """Tijdelijke store directory; skip zonder faiss."""
+        try:
+            from danny_toolkit.core import index_store
+        except ImportError:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        if not index_store._HAS_FAISS:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        import numpy as np
+        self.np = np
+        self.mod = index_store
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / "idx"
+
+    def tearDown(self) -> None:
+        """Ruim tijdelijke bestanden op."""
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        """Nieuwe IndexStore op de test directory."""
+        return self.mod.IndexStore(store_dir=self.dir, **kwargs)
+
+    def _tel_builds(self, store) -> list:
+        """Tel aanroepen van _create_index op een store instantie."""
+        teller = []
+        origineel = store._create_index
+
+        def spion(vectors):
+            teller.append(len(vectors))
+            return origineel(vectors)
+
+        store._create_index = spion
+        return teller
+
+    # --- A. Geen rebuild ---
+
+    def test_01_append_adds_to_trained_index(self) -> None:
+        """IVF index blijft hetzelfde object; alleen add()."""
+        store = self._store()
+        store.build(*_data(1000))
+        index = store.index
+        builds = self._tel_builds(store)
+        store.append(*_data(200, start=1000))
+        c(store.index is index, "zelfde index object")
+        c(builds == [], "geen _create_index")
+        c(store.index.ntotal == 1200, "1200 vectoren")
+        c(len(store.metadata) == 1200, "1200 metadata")
+
+    def test_02_appended_vectors_searchable(self) -> None:
+        """Nieuwe vector wordt exact teruggevonden."""
+        store = self._store()
+        store.build(*_data(1000))
+        vecs, meta = _data(50, start=5000)
+        store.append(vecs, meta)
+        res = store.search(vecs[7], k=1)
+        c(res[0]["text"] == "chunk 5007", "exacte match")
+        c(res[0]["distance"] < 1e-4, "afstand ~0")
+
+    def test_03_dedup(self) -> None:
+        """Duplicaten (bestaand en binnen batch) worden geskipt."""
+        store = self._store()
+        store.build(*_data(300))
+        vecs, meta = _data(10, start=295)
+        dubbel_v = self.np.vstack([vecs, vecs[:1]])
+        dubbel_m = meta + [dict(meta[0])]
+        store.append(dubbel_v, dubbel_m)
+        c(store.index.ntotal == 305, "5 nieuw, 6 geskipt")
+        c(store.verify()["ok"], "verify ok")
+
+    # --- B. vectors.npy ---
+
+    def test_04_vectors_file_appended_in_place(self) -> None:
+        """Alleen de nieuwe rijen worden geschreven."""
+        store = self._store()
+        oud_v, oud_m = _data(400)
+        store.build(oud_v, oud_m)
+        grootte = store.vectors_path.stat().st_size
+        nieuw_v, nieuw_m = _data(30, start=400)
+        store.append(nieuw_v, nieuw_m)
+        c(store.vectors_path.stat().st_size == grootte + nieuw_v.nbytes, "groei = nieuwe bytes")
+        geladen = self.np.load(store.vectors_path)
+        c(geladen.shape == (430, DIM), "shape bijgewerkt")
+        c(bool(self.np.array_equal(geladen, self.np.vstack([oud_v, nieuw_v]))), "inhoud klopt")
+
+    def test_05_vectors_file_fallback(self) -> None:
+        """Afwijkend bestand (float64) valt terug op volledige rewrite."""
+        store = self._store()
+        oud_v, oud_m = _data(300)
+        store.build(oud_v, oud_m)
+        self.np.save(store.vectors_path, oud_v.astype("float64"))
+        store.append(*_data(5, start=300))
+        geladen = self.np.load(store.vectors_path)
+        c(geladen.dtype == self.np.float32, "float32 na rewrite")
+        c(geladen.shape == (305, DIM), "305 rijen")
+
+    # --- C. Retrain drempels ---
+
+    def test_06_thresholds(self) -> None:
+        """Groei, scheefheid en Flat -> IVF."""
+        store = self._store(background_retrain=False)
+        store.build(*_data(100))
+        c(not store.needs_retrain(), "Flat 100: geen retrain")
+        store.append(*_data(200, start=100))
+        c(hasattr(store.index, "nlist"), "Flat -> IVF na 300")
+        c(store._trained_on == 300, "trained_on bijgewerkt")
+
+        builds = self._tel_builds(store)
+        store.append(*_data(200, start=300))
+        c(builds == [], "500 < 2x300: geen retrain")
+        store.append(*_data(150, start=500))
+        c(builds == [650], "650 >= 2x300: retrain")
+
+        store.retrain_imbalance = 0.5
+        c(store.needs_retrain(), "imbalance drempel")
+
+    # --- D. Achtergrond ---
+
+    def test_07_background_retrain_keeps_appends(self) -> None:
+        """Appends tijdens een achtergrond retrain komen in de nieuwe index."""
+        store = self._store()
+        store.build(*_data(1000))
+        oude_index = store.index
+        store.retrain(background=True)
+        store.append(*_data(100, start=1000))
+        c(store.wait_for_retrain(timeout=30), "retrain klaar")
+        c(store.index is not oude_index, "index geswapt")
+        c(store.index.ntotal == 1100, "tussentijdse append behouden")
+        c(store._trained_on == 1000, "trained_on = trainingssnapshot")
+        vecs, _ = _data(100, start=1000)
+        c(store.search(vecs[3], k=1)[0]["text"] == "chunk 1003", "nieuwe vector vindbaar")
+
+    def test_08_reload_state(self) -> None:
+        """trained_on en stats overleven herladen."""
+        store = self._store()
+        store.build(*_data(1000))
+        store.append(*_data(100, start=1000))
+        herladen = self._store()
+        stats = herladen.stats()
+        c(stats["total_chunks"] == 1100, "1100 chunks")
+        c(stats["trained_on"] == 1000, "trained_on persistent")
+        c(stats["imbalance"] >= 1.0, "imbalance gerapporteerd")
+        c(herladen.verify()["ok"], "verify ok na herladen")
+
+    def test_09_lazy_index_persist(self) -> None:
+        """Append schrijft faiss.index niet; herladen herstelt uit vectors.npy."""
+        store = self._store()
+        store.persist_debounce = 60
+        store.build(*_data(1000))
+        voor = store.index_path.stat()
+        vecs, meta = _data(50, start=1000)
+        store.append(vecs, meta)
+        na = store.index_path.stat()
+        c((na.st_mtime_ns, na.st_size) == (voor.st_mtime_ns, voor.st_size),
+          "append raakt faiss.index niet")
+        c(store._index_dirty and store._persist_timer is not None, "dirty + debounce gepland")
+
+        # "Crash": een nieuwe instantie leest de achterlopende index
+        herladen = self._store()
+        herladen.persist_debounce = 60
+        c(herladen.search(vecs[4], k=1)[0]["text"] == "chunk 1004", "hersteld uit vectors.npy")
+        c(herladen.index.ntotal == 1050 and herladen._index_dirty, "1050 + dirty")
+        herladen.close()
+        c(self.mod.faiss.read_index(str(store.index_path)).ntotal == 1050, "close schrijft")
+        c(not store.index_path.with_suffix(".index.tmp").exists(), "geen tmp achtergebleven")
+
+        store.close()
+        c(store._persist_timer is None and not store._index_dirty, "close stopt timer")
+        store.persist_debounce = 0.05
+        store.append(*_data(10, start=2000))
+        c(_wacht(lambda: not store._index_dirty), "debounce schrijft")
+        c(self.mod.faiss.read_index(str(store.index_path)).ntotal == 1060, "1060 op disk")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 56: Incrementele FAISS Append")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
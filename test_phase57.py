@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test Phase 57: IndexStore Lazy Metadata + Memory-Mapped Vectors
+================================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. Schema v2: kleine header + chunks.jsonl met offset/hash kolommen
+  B. Search materialiseert alleen de k hit-records
+  C. Index laadt één keer en herlaadt alleen bij een nieuwe disk-generatie
+  D. Migratie van schema v1, herstel na afgebroken append, upgrade()
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase57.py
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+DIM = 16
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _data(n: int, start: int = 0):
+    """Deterministische vectoren + metadata."""
+    import numpy as np
+    rng = np.random.default_rng(start)
+    vecs = rng.standard_normal((n, DIM)).astype("float32")
+    meta = [{"text": f"chunk {i} — ünïcode", "source": f"doc{i % 7}.md", "chunk": i}
+            for i in range(start, start + n)]
+    return vecs, meta
+
+
+class TestPhase57(unittest.TestCase):
+    """Phase 57: IndexStore Lazy Metadata + Memory-Mapped Vectors."""
+
+    def setUp(self) -> None:
+        """Tijdelijke store directory; skip zonder faiss."""
+        try:
+            from danny_toolkit.core import index_store
+        except ImportError:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        if not index_store._HAS_FAISS:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        import numpy as np
+        self.np = np
+        self.mod = index_store
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / "idx"
+
+    def tearDown(self) -> None:
+        """Ruim tijdelijke bestanden op."""
+        self.tmp.cleanup()
+
+    def _store(self):
+        """Nieuwe IndexStore op de test directory."""
+        return self.mod.IndexStore(store_dir=self.dir)
+
+    # --- A. Layout ---
+
+    def test_01_v2_layout(self) -> None:
+        """Header bevat geen chunks; kolommen naast recordbestand."""
+        store = self._store()
+        store.build(*_data(300))
+        with open(store.meta_path, encoding="utf-8") as f:
+            header = json.load(f)
+        c(header["schema_version"] == self.mod.SCHEMA_VERSION == 2, "schema v2")
+        c("chunks" not in header and header["count"] == 300, "kleine header")
+        c(store.chunks_path.exists() and store.offsets_path.exists()
+          and store.hashes_path.exists(), "chunk bestanden")
+        c(isinstance(store.metadata, self.mod._ChunkView), "lazy view")
+        c(store.metadata[299]["text"] == "chunk 299 — ünïcode", "record via offset")
+        c(store.metadata[-1] == store.metadata[299], "negatieve index")
+
+    # --- B. Alleen hits ---
+
+    def test_02_search_reads_only_hits(self) -> None:
+        """Een search leest precies k records."""
+        store = self._store()
+        vecs, _ = _data(1000)
+        store.build(vecs, _data(1000)[1])
+        herladen = self._store()
+        gelezen = []
+        origineel = self.mod._ChunkView.__getitem__
+
+        def spion(view, i):
+            gelezen.append(i)
+            return origineel(view, i)
+
+        self.mod._ChunkView.__getitem__ = spion
+        try:
+            res = herladen.search(vecs[42], k=5)
+        finally:
+            self.mod._ChunkView.__getitem__ = origineel
+        c(res[0]["chunk"] == 42, "juiste hit")
+        c(len(gelezen) == 5, f"5 records gelezen ({len(gelezen)})")
+
+    def test_03_hashes_from_column(self) -> None:
+        """Dedup gebruikt de hash-kolom, niet de records."""
+        store = self._store()
+        _, meta = _data(300)
+        store.build(_data(300)[0], meta)
+        c(store.metadata.hashes() == {m["hash"] for m in meta}, "hash kolom compleet")
+        store.append(*_data(10, start=295))
+        c(len(store.metadata) == 305, "5 nieuw")
+        c(store.metadata.consistent(), "kolommen consistent na append")
+
+    # --- C. Laden ---
+
+    def test_04_load_once(self) -> None:
+        """faiss.read_index één keer voor meerdere searches."""
+        store = self._store()
+        vecs, meta = _data(300)
+        store.build(vecs, meta)
+        herladen = self._store()
+        teller = []
+        origineel = self.mod.faiss.read_index
+
+        def spion(*args, **kwargs):
+            teller.append(1)
+            return origineel(*args, **kwargs)
+
+        self.mod.faiss.read_index = spion
+        try:
+            for i in range(5):
+                herladen.search(vecs[i], k=3)
+        finally:
+            self.mod.faiss.read_index = origineel
+        c(len(teller) == 1, "één keer geladen")
+
+    def test_05_reload_on_new_generation(self) -> None:
+        """Append door een andere instantie wordt opgepikt."""
+        lezer = self._store()
+        schrijver = self._store()
+        schrijver.build(*_data(300))
+        lezer.search(_data(1)[0][0], k=1)
+        nieuw_v, nieuw_m = _data(3, start=9000)
+        schrijver.append(nieuw_v, nieuw_m)
+        res = lezer.search(nieuw_v[1], k=1)
+        c(res[0]["chunk"] == 9001, "nieuwe chunk zichtbaar na generatie-wissel")
+        c(lezer._disk_generation == schrijver._disk_generation, "generatie gesynchroniseerd")
+
+    # --- D. Migratie / herstel ---
+
+    def test_06_migrate_v1(self) -> None:
+        """Schema v1 metadata.json wordt bij laden gemigreerd."""
+        vecs, meta = _data(300)
+        self.dir.mkdir(parents=True)
+        index = self.mod.faiss.IndexFlatL2(DIM)
+        index.add(vecs)
+        self.mod.faiss.write_index(index, str(self.dir / "faiss.index"))
+        self.np.save(self.dir / "vectors.npy", vecs)
+        for m in meta:
+            m["hash"] = self.mod.IndexStore._hash(m["text"])
+        with open(self.dir / "metadata.json", "w", encoding="utf-8") as f:
+            json.dump({"schema_version": 1, "chunks": meta}, f)
+        store = self._store()
+        res = store.search(vecs[7], k=1)
+        c(res[0]["chunk"] == 7, "search na migratie")
+        with open(store.meta_path, encoding="utf-8") as f:
+            c(json.load(f)["schema_version"] == 2, "header v2 op disk")
+        c(store.verify()["ok"], "verify ok")
+
+    def test_07_recover_torn_append(self) -> None:
+        """Records voorbij de header-count worden bij de volgende append opgeruimd."""
+        store = self._store()
+        store.build(*_data(300))
+        with open(store.chunks_path, "ab") as f:
+            f.write(b'{"text": "half geschreven')
+        herladen = self._store()
+        herladen.append(*_data(2, start=500))
+        c(len(herladen.metadata) == 302, "302 chunks")
+        c(herladen.metadata.consistent(), "kolommen weer consistent")
+        c(herladen.metadata[301]["chunk"] == 501, "nieuw record leesbaar")
+        c(herladen.verify()["ok"], "verify ok")
+
+    def test_08_upgrade_with_view(self) -> None:
+        """upgrade() werkt op de lazy view (dedup + lege chunks)."""
+        store = self._store()
+        vecs, meta = _data(300)
+        meta[10]["text"] = meta[11]["text"]
+        meta[20]["text"] = "   "
+        store.build(vecs, meta)
+        res = store.upgrade()
+        c(res["duplicates_removed"] == 1 and res["empty_removed"] == 1, "1 dup + 1 leeg")
+        c(len(store.metadata) == 298, "298 chunks")
+        c(store.verify()["ok"], "verify ok na upgrade")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 57: IndexStore Lazy Metadata + Memory-Mapped Vectors")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
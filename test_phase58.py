@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test Phase 58: IndexStore Index Families + Recall Benchmark
+============================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. index_type kiest IVF-PQ / IVF-SQ8 / HNSW / Flat via index_factory
+  B. index_type en operating point zijn per store persistent
+  C. nprobe / efSearch worden vóór elke search toegepast
+  D. benchmark(): recall@k vs. latency sweep tegen exacte baseline
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase58.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+DIM = 16
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _data(n: int, start: int = 0):
+    """Geclusterde vectoren (realistischer dan uniform) + metadata."""
+    import numpy as np
+    rng = np.random.default_rng(start)
+    centra = rng.standard_normal((20, DIM)).astype("float32") * 4
+    vecs = (centra[rng.integers(0, 20, n)]
+            + rng.standard_normal((n, DIM)).astype("float32"))
+    meta = [{"text": f"chunk {i}", "source": f"doc{i % 7}.md", "chunk": i}
+            for i in range(start, start + n)]
+    return vecs.astype("float32"), meta
+
+
+class TestPhase58(unittest.TestCase):
+    """Phase 58: IndexStore Index Families + Recall Benchmark."""
+
+    def setUp(self) -> None:
+        """Tijdelijke store directory; skip zonder faiss."""
+        try:
+            from danny_toolkit.core import index_store
+        except ImportError:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        if not index_store._HAS_FAISS:
+            self.skipTest("numpy/faiss niet beschikbaar")
+        self.mod = index_store
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Ruim tijdelijke bestanden op."""
+        self.tmp.cleanup()
+
+    def _store(self, naam: str = "idx", **kwargs):
+        """IndexStore in een eigen subdirectory."""
+        return self.mod.IndexStore(store_dir=Path(self.tmp.name) / naam, **kwargs)
+
+    # --- A. Families ---
+
+    def test_01_families(self) -> None:
+        """Elke familie bouwt het juiste FAISS type en vindt exacte hits."""
+        faiss = self.mod.faiss
+        verwacht = {
+            "flat": faiss.IndexFlat,
+            "ivf_flat": faiss.IndexIVFFlat,
+            "ivf_pq": faiss.IndexIVFPQ,
+            "ivf_sq8": faiss.IndexIVFScalarQuantizer,
+            "hnsw": faiss.IndexHNSWFlat,
+        }
+        vecs, meta = _data(1000)
+        for index_type, klasse in verwacht.items():
+            store = self._store(index_type, index_type=index_type, nprobe=64)
+            store.build(vecs, [dict(m) for m in meta])
+            c(isinstance(store.index, klasse), f"{index_type} -> {klasse.__name__}")
+            if index_type != "ivf_pq":  # PQ is lossy
+                c(store.search(vecs[5], k=1)[0]["chunk"] == 5, f"{index_type} exacte hit")
+
+    def test_02_unknown_type(self) -> None:
+        """Onbekend index_type faalt direct."""
+        with self.assertRaises(ValueError):
+            self._store(index_type="lsh")
+        c(True, "ValueError")
+
+    def test_03_small_stays_flat(self) -> None:
+        """Onder de IVF drempel blijft elke familie Flat; HNSW retraint niet."""
+        store = self._store(index_type="hnsw", background_retrain=False)
+        store.build(*_data(100))
+        c(isinstance(store.index, self.mod.faiss.IndexFlat), "100 vectoren: Flat")
+        store.append(*_data(300, start=100))
+        c(isinstance(store.index, self.mod.faiss.IndexHNSWFlat), "groei -> HNSW")
+        c(not store.needs_retrain(), "HNSW: geen retrain nodig")
+
+    # --- B. Persistentie ---
+
+    def test_04_type_persisted_per_store(self) -> None:
+        """Herladen zonder argumenten gebruikt het type uit de header."""
+        store = self._store(index_type="ivf_sq8")
+        store.build(*_data(600))
+        herladen = self._store()
+        herladen.search(_data(1)[0][0], k=1)
+        c(herladen.index_type == "ivf_sq8", "index_type uit header")
+        herladen.retrain()
+        c(isinstance(herladen.index, self.mod.faiss.IndexIVFScalarQuantizer),
+          "retrain behoudt familie")
+        c(herladen.stats()["configured_type"] == "ivf_sq8", "stats configured_type")
+
+    # --- C. Operating point ---
+
+    def test_05_operating_point_applied(self) -> None:
+        """nprobe / efSearch worden toegepast en persistent opgeslagen."""
+        ivf = self._store("ivf", index_type="ivf_flat")
+        ivf.build(*_data(1000))
+        ivf.set_operating_point(nprobe=7)
+        ivf.search(_data(1)[0][0], k=1)
+        c(self.mod.faiss.extract_index_ivf(ivf.index).nprobe == 7, "nprobe toegepast")
+        c(self._store("ivf").stats()["nprobe"] == 7, "nprobe persistent")
+
+        hnsw = self._store("hnsw", index_type="hnsw")
+        hnsw.build(*_data(1000))
+        hnsw.set_operating_point(ef_search=33)
+        hnsw.search(_data(1)[0][0], k=1)
+        c(hnsw.index.hnsw.efSearch == 33, "efSearch toegepast")
+
+    def test_06_nprobe_clipped(self) -> None:
+        """nprobe groter dan nlist wordt begrensd."""
+        store = self._store(index_type="ivf_flat", nprobe=10 ** 6)
+        store.build(*_data(1000))
+        store.search(_data(1)[0][0], k=1)
+        ivf = self.mod.faiss.extract_index_ivf(store.index)
+        c(ivf.nprobe == ivf.nlist, "nprobe == nlist")
+
+    # --- D. Benchmark ---
+
+    def test_07_benchmark_ivf(self) -> None:
+        """Recall stijgt met nprobe; aanbevolen punt haalt target."""
+        store = self._store(index_type="ivf_flat")
+        store.build(*_data(2000))
+        res = store.benchmark(k=5, n_queries=50, target_recall=0.9)
+        recalls = [p["recall"] for p in res["sweep"]]
+        c(res["sweep"][0]["param"] == "nprobe", "sweep over nprobe")
+        c(all(0.0 <= r <= 1.0 for r in recalls), "recall in [0,1]")
+        c(recalls[-1] >= recalls[0], "recall stijgt met nprobe")
+        c(recalls[-1] >= 0.99, "hoogste nprobe ~exact")
+        beste = res["recommended"]["nprobe"]
+        punt = next(p for p in res["sweep"] if p["value"] == beste)
+        c(punt["recall"] >= 0.9, "recommended haalt target")
+        c(res["baseline_ms"] > 0, "baseline gemeten")
+
+    def test_08_benchmark_hnsw_and_flat(self) -> None:
+        """HNSW sweep over efSearch; Flat heeft recall 1.0."""
+        hnsw = self._store("hnsw", index_type="hnsw")
+        hnsw.build(*_data(1000))
+        res = hnsw.benchmark(k=5, n_queries=30)
+        c(res["sweep"][0]["param"] == "ef_search", "sweep over efSearch")
+        c(set(res["recommended"]) == {"ef_search"}, "recommended ef_search")
+        hnsw.set_operating_point(**res["recommended"])
+        c(hnsw.ef_search == res["recommended"]["ef_search"], "operating point gezet")
+
+        flat = self._store("flat", index_type="flat")
+        flat.build(*_data(500))
+        res = flat.benchmark(k=5, n_queries=20)
+        c(res["sweep"][0]["recall"] == 1.0, "flat recall 1.0")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 58: IndexStore Index Families + Recall Benchmark")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
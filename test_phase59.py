@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test Phase 59: ShardRouter Parallel Fan-Out
+============================================
+8 tests · 25+ checks
+
+Valideert:
+  A. Query wordt één keer ge-embed; shards krijgen query_embeddings
+  B. Shards worden parallel doorzocht op een bounded pool
+  C. Shards voorbij de deadline vallen af (en tellen als timeout)
+  D. Heap-merge op distance + per-shard latency in statistieken()
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase59.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _NepEmbed:
+    """Chroma-stijl embedding functie die aanroepen telt."""
+
+    def __init__(self) -> None:
+        self.aanroepen = 0
+
+    def embed_query(self, query=None, *, input=None) -> list:
+        self.aanroepen += 1
+        return [[0.1, 0.2, 0.3] for _ in (input or [query])]
+
+    def __call__(self, input):
+        return self.embed_query(input=input)
+
+
+class _NepCollectie:
+    """Chroma-stijl collectie met instelbare vertraging en distances."""
+
+    def __init__(self, naam: str, distances: list, vertraging: float = 0.0) -> None:
+        self.naam = naam
+        self.distances = distances
+        self.vertraging = vertraging
+        self.queries = []
+        self.threads = set()
+
+    def count(self) -> int:
+        return len(self.distances)
+
+    def query(self, query_embeddings=None, query_texts=None, n_results=5, include=None):
+        self.queries.append({"emb": query_embeddings, "texts": query_texts})
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.vertraging)
+        docs = [f"{self.naam} doc {i}" for i in range(len(self.distances))][:n_results]
+        metas = [{"id": f"{self.naam}-{i}",
+                  "_omega_hash": hashlib.sha256(d.encode()).hexdigest()[:16]}
+                 for i, d in enumerate(docs)]
+        return {"documents": [docs], "metadatas": [metas],
+                "distances": [self.distances[:n_results]]}
+
+
+class TestPhase59(unittest.TestCase):
+    """Phase 59: ShardRouter Parallel Fan-Out."""
+
+    def setUp(self) -> None:
+        """Router met nep-collecties; SHARD_ENABLED aan, guards uit."""
+        from danny_toolkit.core import shard_router as sr
+        from danny_toolkit.core import vector_store as vs
+        from danny_toolkit.core.config import Config
+        self.sr, self.vs, self.Config = sr, vs, Config
+        self._oud = (Config.SHARD_ENABLED, Config.SHARD_DEADLINE_S,
+                     vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        Config.SHARD_ENABLED = True
+        Config.SHARD_DEADLINE_S = 2.0
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.router = sr.ShardRouter()
+        self.embed = _NepEmbed()
+        self.router._embed_fn = self.embed
+        self.colls = {
+            sr.SHARD_CODE: _NepCollectie("code", [0.10, 0.40, 0.70], 0.2),
+            sr.SHARD_DOCS: _NepCollectie("docs", [0.05, 0.30, 0.90], 0.2),
+            sr.SHARD_DATA: _NepCollectie("data", [0.20, 0.25, 0.60], 0.2),
+        }
+        self.router._collections.update(self.colls)
+
+    def tearDown(self) -> None:
+        """Herstel Config en guards."""
+        (self.Config.SHARD_ENABLED, self.Config.SHARD_DEADLINE_S,
+         self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN) = self._oud
+        if self.router._pool is not None:
+            self.router._pool.shutdown(wait=True)
+
+    # --- A. Eén embedding ---
+
+    def test_01_single_embedding(self) -> None:
+        """Eén embed_query aanroep voor drie shards."""
+        self.router.zoek("wat is de swarm engine", top_k=3)
+        c(self.embed.aanroepen == 1, "één embedding")
+        c(all(len(col.queries) == 1 for col in self.colls.values()), "elke shard één query")
+        c(all(col.queries[0]["emb"] == [[0.1, 0.2, 0.3]] for col in self.colls.values()),
+          "query_embeddings doorgegeven")
+        c(all(col.queries[0]["texts"] is None for col in self.colls.values()),
+          "geen query_texts")
+
+    def test_02_fallback_without_embed_fn(self) -> None:
+        """Zonder embed functie embedden de shards zelf (query_texts)."""
+        self.router._embed_fn = None
+        self.router.zoek("fallback query", top_k=2)
+        c(all(col.queries[0]["texts"] == ["fallback query"] for col in self.colls.values()),
+          "query_texts fallback")
+
+    # --- B. Parallel ---
+
+    def test_03_parallel(self) -> None:
+        """Drie shards van 0.2s samen ruim onder 0.6s, op pool threads."""
+        start = time.perf_counter()
+        self.router.zoek("parallel query", top_k=3)
+        duur = time.perf_counter() - start
+        c(duur < 0.45, f"parallel ({duur:.2f}s)")
+        threads = set().union(*(col.threads for col in self.colls.values()))
+        c(all(t.startswith("shard") for t in threads), "pool threads")
+        c(self.router._pool._max_workers == self.Config.SHARD_MAX_WORKERS, "bounded pool")
+
+    def test_04_single_shard_inline(self) -> None:
+        """Eén shard draait inline, zonder pool."""
+        self.router.zoek("inline query", top_k=2, shards=[self.sr.SHARD_DOCS])
+        c(self.router._pool is None, "geen pool aangemaakt")
+        c(len(self.colls[self.sr.SHARD_DOCS].queries) == 1, "docs shard bevraagd")
+
+    # --- C. Deadline ---
+
+    def test_05_deadline(self) -> None:
+        """Trage shard valt af; rest komt op tijd terug."""
+        self.Config.SHARD_DEADLINE_S = 0.5
+        self.colls[self.sr.SHARD_DATA].vertraging = 1.5
+        start = time.perf_counter()
+        res = self.router.zoek("deadline query", top_k=9)
+        duur = time.perf_counter() - start
+        c(duur < 1.2, f"niet gewacht op trage shard ({duur:.2f}s)")
+        c(res and all(r["shard"] != self.sr.SHARD_DATA for r in res), "trage shard genegeerd")
+        stats = {s.naam: s for s in self.router.statistieken()}
+        c(stats[self.sr.SHARD_DATA].timeouts == 1, "timeout geteld")
+
+    # --- D. Merge + statistieken ---
+
+    def test_06_heap_merge(self) -> None:
+        """Globale top-k op distance over alle shards."""
+        res = self.router.zoek("merge query", top_k=4)
+        c([r["distance"] for r in res] == [0.05, 0.10, 0.20, 0.25], "top-4 op distance")
+        c([r["shard"] for r in res][:2] == [self.sr.SHARD_DOCS, self.sr.SHARD_CODE],
+          "shard labels")
+
+    def test_07_min_score_and_guards(self) -> None:
+        """min_score (max distance) en hash guard blijven actief."""
+        res = self.router.zoek("min score query", top_k=9, min_score=0.3)
+        c(all(r["distance"] <= 0.3 for r in res), "min_score gerespecteerd")
+        c(len(res) == 5, "5 resultaten <= 0.3")
+
+    def test_08_latency_stats(self) -> None:
+        """statistieken() rapporteert latency per shard."""
+        for i in range(3):
+            self.router.zoek(f"stats query {i}", top_k=2)
+        stats = {s.naam: s for s in self.router.statistieken()}
+        code = stats[self.sr.SHARD_CODE]
+        c(code.queries == 3, "3 queries")
+        c(code.aantal_chunks == 3, "aantal_chunks")
+        c(code.gem_latency_ms >= 150, f"gem latency ({code.gem_latency_ms}ms)")
+        c(code.p95_latency_ms >= code.gem_latency_ms * 0.9, "p95 >= ~gem")
+        c(code.fouten == 0 and code.timeouts == 0, "geen fouten/timeouts")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 59: ShardRouter Parallel Fan-Out")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
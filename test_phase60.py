@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test Phase 60: ShardRouter Geleerde Routing (Centroids)
+========================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. ingest embedt één keer en werkt per shard centroids incrementeel bij
+  B. kies_shards kiest shards binnen de similarity marge van de beste
+  C. zoek(shards=None) routeert; routing_recall meet verlies t.o.v. fan-out
+  D. Centroids persisteren op disk en zijn herberekenbaar uit collecties
+  E. MemexAgent gebruikt centroid routing, keyword hints alleen als fallback
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase60.py
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+VOCAB = {
+    ".py": "def class import return lambda yield async await self init".split(),
+    ".md": "hoofdstuk handleiding uitleg lezer inleiding voorbeeld tutorial sectie".split(),
+    ".json": "sleutel waarde veld schema array object timeout poort host".split(),
+}
+
+
+def _docs(n: int, start: int = 0) -> list:
+    """Deterministische documenten met per extensie een eigen vocabulaire."""
+    docs = []
+    for i in range(start, start + n):
+        ext = list(VOCAB)[i % 3]
+        rng = random.Random(i)
+        tekst = " ".join(rng.choice(VOCAB[ext]) for _ in range(10))
+        docs.append({"id": f"d{i}", "tekst": tekst,
+                     "metadata": {"id": f"d{i}", "extensie": ext}})
+    return docs
+
+
+class _NepEmbed:
+    """Chroma-stijl embedding functie op basis van HashEmbeddings."""
+
+    def __init__(self) -> None:
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.hash = HashEmbeddings(64)
+        self.documenten = 0
+
+    def embed_query(self, query=None, *, input=None) -> list:
+        return self.hash.embed(input or [query])
+
+    def __call__(self, input):
+        self.documenten += len(input)
+        return self.hash.embed(input)
+
+
+class _NepCollectie:
+    """Chroma-stijl collectie: upsert met embeddings, cosine query."""
+
+    def __init__(self) -> None:
+        self.rijen = {}
+        self.queries = 0
+        self.upserts_zonder_emb = 0
+
+    def count(self) -> int:
+        return len(self.rijen)
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        if embeddings is None:
+            self.upserts_zonder_emb += 1
+            return
+        for i, d, m, e in zip(ids, documents, metadatas, embeddings):
+            self.rijen[i] = (d, m, e)
+
+    def get(self, limit=None, include=None):
+        rijen = list(self.rijen.values())[:limit]
+        return {"ids": list(self.rijen)[:limit], "embeddings": [r[2] for r in rijen]}
+
+    def query(self, query_embeddings=None, query_texts=None, n_results=5, include=None):
+        import numpy as np
+        self.queries += 1
+        q = np.asarray(query_embeddings[0])
+        q = q / (np.linalg.norm(q) or 1.0)
+        scored = []
+        for d, m, e in self.rijen.values():
+            v = np.asarray(e)
+            scored.append((float(1.0 - q @ (v / (np.linalg.norm(v) or 1.0))), d, m))
+        scored.sort(key=lambda x: x[0])
+        top = scored[:n_results]
+        return {"documents": [[t[1] for t in top]], "metadatas": [[t[2] for t in top]],
+                "distances": [[max(0.0, t[0]) for t in top]]}
+
+
+class TestPhase60(unittest.TestCase):
+    """Phase 60: ShardRouter Geleerde Routing."""
+
+    def setUp(self) -> None:
+        """Router met nep-collecties, tijdelijke centroid file, guards uit."""
+        from danny_toolkit.core import shard_router as sr
+        from danny_toolkit.core import vector_store as vs
+        from danny_toolkit.core.config import Config
+        if not sr.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.sr, self.vs, self.Config = sr, vs, Config
+        self._oud = (Config.SHARD_ENABLED, Config.SHARD_CENTROIDS,
+                     Config.SHARD_ROUTE_MARGIN,
+                     vs._VECTOR_SEARCH_LIMIT, vs._DUPLICATE_COOLDOWN)
+        Config.SHARD_ENABLED = True
+        Config.SHARD_CENTROIDS = 4
+        Config.SHARD_ROUTE_MARGIN = 0.05
+        vs._VECTOR_SEARCH_LIMIT = 10 ** 9
+        vs._DUPLICATE_COOLDOWN = 0.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pad = Path(self.tmp.name) / "shard_centroids.json"
+        self.embed = _NepEmbed()
+        self.colls = {s: _NepCollectie() for s in sr.ALL_SHARDS}
+        self.router = self._router()
+
+    def _router(self):
+        """Nieuwe router op dezelfde collecties en centroid file."""
+        router = self.sr.ShardRouter()
+        router._centroid_pad = self.pad
+        router._embed_fn = self.embed
+        router._collections.update(self.colls)
+        return router
+
+    def tearDown(self) -> None:
+        """Herstel Config en guards."""
+        (self.Config.SHARD_ENABLED, self.Config.SHARD_CENTROIDS,
+         self.Config.SHARD_ROUTE_MARGIN,
+         self.vs._VECTOR_SEARCH_LIMIT, self.vs._DUPLICATE_COOLDOWN) = self._oud
+        if hasattr(self, "router") and self.router._pool is not None:
+            self.router._pool.shutdown(wait=True)
+        if hasattr(self, "tmp"):
+            self.tmp.cleanup()
+
+    def _emb(self, tekst: str) -> list:
+        return self.embed.embed_query(input=[tekst])[0]
+
+    # --- A. Ingest ---
+
+    def test_01_ingest_builds_centroids(self) -> None:
+        """ingest embedt één keer per document en vult de centroids."""
+        res = self.router.ingest(_docs(60))
+        c(sum(res.values()) == 60, "60 chunks ingested")
+        c(self.embed.documenten == 60, "één embedding per document")
+        c(all(col.upserts_zonder_emb == 0 for col in self.colls.values()),
+          "upsert met embeddings")
+        for shard in self.sr.ALL_SHARDS:
+            st = self.router._centroids[shard]
+            c(len(st["c"]) == 4, f"{shard}: 4 centroids")
+            c(int(st["n"].sum()) == 20, f"{shard}: 20 toegewezen")
+
+    def test_02_incremental_update(self) -> None:
+        """Tweede ingest schuift centroids, aantal blijft begrensd."""
+        self.router.ingest(_docs(30))
+        voor = self.router._centroids[self.sr.SHARD_CODE]["c"].copy()
+        self.router.ingest(_docs(30, start=30))
+        st = self.router._centroids[self.sr.SHARD_CODE]
+        c(len(st["c"]) == 4, "begrensd op SHARD_CENTROIDS")
+        c(int(st["n"].sum()) == 20, "aantallen opgeteld")
+        c(not (st["c"] == voor).all(), "centroids verschoven")
+
+    # --- B. Shard keuze ---
+
+    def test_03_kies_shards(self) -> None:
+        """Code query → code shard; ruime marge → alle; geen centroids → None."""
+        c(self.router.kies_shards(self._emb("def class import")) is None,
+          "geen centroids: None")
+        self.router.ingest(_docs(60))
+        c(self.router.kies_shards(None) is None, "geen embedding: None")
+        gekozen = self.router.kies_shards(self._emb("def class import return self"))
+        c(gekozen == [self.sr.SHARD_CODE], f"code shard ({gekozen})")
+        gekozen = self.router.kies_shards(self._emb("sleutel waarde schema poort"))
+        c(gekozen == [self.sr.SHARD_DATA], f"data shard ({gekozen})")
+        c(self.router.kies_shards(self._emb("def class"), marge=2.0) == self.sr.ALL_SHARDS,
+          "ruime marge: alle shards")
+
+    # --- C. Zoeken + recall ---
+
+    def test_04_zoek_routes(self) -> None:
+        """zoek(shards=None) bevraagt alleen de gekozen shard."""
+        self.router.ingest(_docs(60))
+        res = self.router.zoek("handleiding uitleg tutorial", top_k=3)
+        c(len(res) == 3, "3 resultaten")
+        c(all(r["shard"] == self.sr.SHARD_DOCS for r in res), "docs shard")
+        c(self.colls[self.sr.SHARD_DOCS].queries == 1, "docs bevraagd")
+        c(self.colls[self.sr.SHARD_CODE].queries == 0, "code overgeslagen")
+        self.router.zoek("handleiding", top_k=3, shards=self.sr.ALL_SHARDS)
+        c(self.colls[self.sr.SHARD_CODE].queries == 1, "expliciete shards: fan-out")
+
+    def test_05_routing_recall(self) -> None:
+        """Pruning verliest geen hits t.o.v. volledige fan-out."""
+        self.router.ingest(_docs(90))
+        queries = [" ".join(random.Random(i).sample(VOCAB[ext], 4))
+                   for i, ext in enumerate(list(VOCAB) * 5)]
+        rapport = self.router.routing_recall(queries, top_k=5)
+        c(rapport["queries"] == 15, "15 queries")
+        c(rapport["recall"] == 1.0, f"recall 1.0 ({rapport['recall']})")
+        c(rapport["gemiste_queries"] == [], "geen gemiste queries")
+        c(rapport["gem_shards"] < 2.0, f"shards gepruned ({rapport['gem_shards']})")
+        # Verkeerde routing wordt gedetecteerd
+        self.router.kies_shards = lambda emb, marge=None: [self.sr.SHARD_DATA]
+        slecht = self.router.routing_recall(queries[:3], top_k=5)
+        c(slecht["recall"] < 1.0 and slecht["gemiste_queries"], "verlies gemeten")
+
+    # --- D. Persistentie ---
+
+    def test_06_persisted(self) -> None:
+        """Nieuwe router laadt centroids van disk en routeert hetzelfde."""
+        self.router.ingest(_docs(60))
+        c(self.pad.exists(), "centroid file geschreven")
+        herladen = self._router()
+        q = self._emb("async await lambda yield")
+        c(herladen.kies_shards(q) == self.router.kies_shards(q), "zelfde routing")
+        c(herladen.kan_routeren(), "kan_routeren na herladen")
+
+    def test_07_herbereken(self) -> None:
+        """herbereken_centroids bouwt centroids uit bestaande collecties."""
+        self.router.ingest(_docs(60))
+        self.pad.unlink()
+        nieuw = self._router()
+        c(not nieuw.kan_routeren(), "geen centroids zonder file")
+        res = nieuw.herbereken_centroids()
+        c(res == {s: 20 for s in self.sr.ALL_SHARDS}, f"20 per shard ({res})")
+        c(nieuw.kies_shards(self._emb("def class import")) == [self.sr.SHARD_CODE],
+          "routing na herberekening")
+        c(self.pad.exists(), "opnieuw opgeslagen")
+
+    # --- E. MemexAgent integratie ---
+
+    def test_08_memex_wiring(self) -> None:
+        """_search_chromadb raadpleegt kan_routeren; hints blijven als fallback."""
+        from swarm_engine import MemexAgent
+        bron = inspect.getsource(MemexAgent._search_chromadb)
+        c("kan_routeren" in bron, "kan_routeren in _search_chromadb")
+        c("_bepaal_query_shards" in bron, "keyword fallback aanwezig")
+        self.router._embed_fn = None
+        c(not self.router.kan_routeren(), "zonder embed functie geen routing")
+
+    def test_09_een_embedder_per_router(self) -> None:
+        """ingest onthoudt de embedder en weigert een afwijkende."""
+        router = self._router()
+        router._embed_fn = None
+        router.ingest(_docs(10), embed_fn=self.embed)
+        c(router._embed_fn is self.embed, "eerste embed_fn onthouden voor queries")
+        router.ingest(_docs(10, start=10), embed_fn=self.embed)
+        try:
+            router.ingest(_docs(5, start=20), embed_fn=_NepEmbed())
+            c(False, "afwijkende embed_fn geweigerd")
+        except ValueError:
+            c(True, "afwijkende embed_fn geweigerd")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 60: ShardRouter Geleerde Routing")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Test Phase 61: SemanticCache In-Memory Vector Index
+====================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. store() vult een per-agent genormaliseerde float32 index
+  B. lookup doorzoekt álle levende entries (niet alleen de nieuwste 50)
+  C. TTL wordt in een side-array bijgehouden; evict_expired compacteert
+  D. Index wordt bij startup herbouwd uit SQLite (duurzame opslag)
+  E. FIFO eviction, clear() en externe deletes houden de index in sync
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase61.py
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+AGENT = "Memex"
+ANTWOORD = "Een voldoende lang gecacht antwoord voor de test."
+
+WOORDEN = (
+    "appel boom cirkel dolfijn emmer fiets gitaar haven inkt jas kaars lamp "
+    "molen nacht oester pen quiz raket sleutel tafel uil vlag wolk xylofoon "
+    "yoghurt zeil anker brug draak eiland fontein graan hamer ijzer"
+).split()
+
+
+def _vraag(i: int) -> str:
+    """Deterministische, onderling verschillende query per index."""
+    import random
+    return " ".join(random.Random(i).sample(WOORDEN, 6))
+
+
+class _NepProvider:
+    """Embedding provider op basis van HashEmbeddings."""
+
+    def __init__(self) -> None:
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.hash = HashEmbeddings(64)
+
+    def embed_query(self, query: str) -> list:
+        return self.hash.embed_query(query)
+
+
+class TestPhase61(unittest.TestCase):
+    """Phase 61: SemanticCache In-Memory Vector Index."""
+
+    def setUp(self) -> None:
+        """Verse cache op tijdelijke DB met nep-provider."""
+        from danny_toolkit.core import semantic_cache as sc
+        if not sc.HAS_NUMPY:
+            self.skipTest("numpy niet beschikbaar")
+        self.sc = sc
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self.tmp.name) / "semantic_cache.db"
+        self.provider = _NepProvider()
+        self.cache = self._cache()
+
+    def _cache(self):
+        """Nieuwe SemanticCache op dezelfde DB."""
+        cache = self.sc.SemanticCache(db_path=self.db)
+        cache._embed_provider = self.provider
+        cache._embed_init_tried = True
+        return cache
+
+    def tearDown(self) -> None:
+        if hasattr(self, "tmp"):
+            self.tmp.cleanup()
+
+    def _vul(self, n: int, cache=None) -> None:
+        for i in range(n):
+            (cache or self.cache).store(AGENT, _vraag(i),
+                                        f"{ANTWOORD} #{i}", payload_meta={"i": i})
+        (cache or self.cache).flush()  # store() is write-behind
+
+    def _sql(self, query: str, args=()) -> list:
+        conn = sqlite3.connect(str(self.db))
+        try:
+            return conn.execute(query, args).fetchall()
+        finally:
+            conn.close()
+
+    # --- A. Index opbouw ---
+
+    def test_01_store_fills_index(self) -> None:
+        """store() voegt genormaliseerde rijen toe aan de agent index."""
+        import numpy as np
+        self._vul(10)
+        idx = self.cache._indexen[AGENT]
+        c(idx.n == 10, "10 rijen")
+        c(idx._matrix.dtype == np.float32, "float32")
+        c(bool(np.allclose(np.linalg.norm(idx._matrix[:idx.n], axis=1), 1.0, atol=1e-5)),
+          "genormaliseerd")
+        ids = {r[0] for r in self._sql("SELECT id FROM cache_entries")}
+        c(set(idx._ids[:idx.n].tolist()) == ids, "row ids == SQLite ids")
+        c(self.cache.stats()["index_entries"] == 10, "stats index_entries")
+
+    # --- B. Zoeken ---
+
+    def test_02_old_entries_hit(self) -> None:
+        """Entries ouder dan de nieuwste 50 zijn vindbaar."""
+        self._vul(120)
+        hit = self.cache.lookup(AGENT, _vraag(3))
+        c(hit is not None, "hit op entry #3 van 120")
+        c(hit["content"] == f"{ANTWOORD} #3", "juiste response")
+        c(hit["metadata"] == {"i": 3}, "metadata behouden")
+        c(hit["type"] == "text", "payload type")
+
+    def test_03_miss_and_hit_counter(self) -> None:
+        """Miss onder drempel; hit verhoogt de SQLite teller."""
+        self._vul(5)
+        c(self.cache.lookup(AGENT, "volstrekt ongerelateerde zin xyz") is None, "miss")
+        c(self.cache.lookup("Onbekend", _vraag(1)) is None,
+          "onbekende agent")
+        self.cache.lookup(AGENT, _vraag(1))
+        self.cache.lookup(AGENT, _vraag(1))
+        self.cache.flush()  # hit-teller is write-behind
+        hits = self._sql("SELECT SUM(hits) FROM cache_entries")[0][0]
+        c(hits == 2, f"2 hits in SQLite ({hits})")
+        st = self.cache.stats()
+        c(st["session_hits"] == 2 and st["session_misses"] == 1, "sessie tellers")
+
+    # --- C. TTL ---
+
+    def test_04_ttl_and_evict(self) -> None:
+        """Verlopen rijen worden gemaskeerd en door evict_expired verwijderd."""
+        self._vul(6)
+        idx = self.cache._indexen[AGENT]
+        idx._verloopt[:3] = 0.0  # eerste drie verlopen in de index
+        conn = sqlite3.connect(str(self.db))
+        conn.execute("UPDATE cache_entries SET created = 0 WHERE id IN "
+                     "(SELECT id FROM cache_entries ORDER BY id LIMIT 3)")
+        conn.commit()
+        conn.close()
+        c(self.cache.lookup(AGENT, _vraag(0)) is None,
+          "verlopen entry geen hit")
+        c(self.cache.lookup(AGENT, _vraag(4)) is not None,
+          "levende entry hit")
+        self.cache.evict_expired()
+        self.cache.flush()
+        c(idx.n == 3, "index gecompacteerd")
+        c(len(self._sql("SELECT id FROM cache_entries")) == 3, "SQLite opgeschoond")
+        c(len(idx._payloads) == idx.n, "payloads in sync")
+
+    # --- D. Herbouw bij startup ---
+
+    def test_05_rebuild_on_startup(self) -> None:
+        """Nieuwe instantie herbouwt de index, zonder verlopen rijen."""
+        self._vul(20)
+        conn = sqlite3.connect(str(self.db))
+        conn.execute("UPDATE cache_entries SET created = 0 WHERE id = "
+                     "(SELECT MIN(id) FROM cache_entries)")
+        conn.commit()
+        conn.close()
+        nieuw = self._cache()
+        c(nieuw._indexen[AGENT].n == 19, "19 levende rijen herbouwd")
+        hit = nieuw.lookup(AGENT, _vraag(12))
+        c(hit is not None and hit["metadata"] == {"i": 12}, "hit na herbouw")
+
+    # --- E. Sync ---
+
+    def test_06_fifo_eviction_sync(self) -> None:
+        """FIFO eviction verwijdert dezelfde rijen uit index en SQLite."""
+        self.cache._MAX_ENTRIES_PER_AGENT = 10
+        self._vul(15)
+        idx = self.cache._indexen[AGENT]
+        ids = {r[0] for r in self._sql("SELECT id FROM cache_entries")}
+        c(idx.n == 10 and len(ids) == 10, "10 rijen over")
+        c(set(idx._ids[:idx.n].tolist()) == ids, "index == SQLite")
+        c(self.cache.lookup(AGENT, _vraag(0)) is None,
+          "oudste entry weg")
+
+    def test_07_clear_and_external_delete(self) -> None:
+        """clear() leegt de index; extern verwijderde rij wordt miss."""
+        self._vul(5)
+        conn = sqlite3.connect(str(self.db))
+        conn.execute("DELETE FROM cache_entries WHERE query_text = ?", (_vraag(2),))
+        conn.commit()
+        conn.close()
+        c(self.cache.lookup(AGENT, _vraag(2)) is None,
+          "extern verwijderd: miss")
+        c(self.cache._indexen[AGENT].n == 4, "rij uit index gehaald")
+        self.cache.clear(AGENT)
+        c(AGENT not in self.cache._indexen, "index gewist")
+        c(self.cache.lookup(AGENT, _vraag(1)) is None,
+          "geen hit na clear")
+
+    def test_08_provider_import_fixed(self) -> None:
+        """Embedding provider import staat in _get_embed_provider."""
+        bron = inspect.getsource(self.sc.SemanticCache._get_embed_provider)
+        c("VoyageEmbeddings" in bron and "import" in bron, "provider geïmporteerd")
+        bron = inspect.getsource(self.sc.SemanticCache._vector_lookup)
+        c("LIMIT 50" not in bron, "geen LIMIT 50 meer")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 61: SemanticCache In-Memory Vector Index")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
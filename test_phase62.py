@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test Phase 62: Gedeelde Embedding Model Registry
+=================================================
+8 tests · 25+ checks
+
+Valideert:
+  A. get_shared_model laadt één instantie per (model, device), ook concurrent
+  B. Batched encode: str → vector, lijst → matrix, optioneel genormaliseerd
+  C. LocalEmbeddings / LocalChromaEmbedding delen het geladen model
+  D. AdaptiveRouter en TheSynapse delen het CPU model; profielen in één batch
+  E. release_shared_model + force_flush; geen eigen SentenceTransformer loads meer
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase62.py
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _NepST:
+    """SentenceTransformer stand-in: hash-embeddings, telt encode aanroepen."""
+
+    geladen = 0
+
+    def __init__(self, model_name: str, device: str) -> None:
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        time.sleep(0.05)  # trage load: maakt races zichtbaar
+        type(self).geladen += 1
+        self.hash = HashEmbeddings(32)
+        self.encodes = []
+        self.tokenizer = object()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 32
+
+    def __getitem__(self, i):
+        return types.SimpleNamespace(auto_model=types.SimpleNamespace(eval=lambda: None))
+
+    def encode(self, teksten, batch_size=32, normalize_embeddings=False,
+               show_progress_bar=False):
+        import numpy as np
+        self.encodes.append(teksten)
+        enkel = isinstance(teksten, str)
+        m = np.asarray(self.hash.embed([teksten] if enkel else list(teksten)),
+                       dtype=np.float32) * 3.0
+        if normalize_embeddings:
+            m = m / np.linalg.norm(m, axis=1, keepdims=True)
+        return m[0] if enkel else m
+
+
+class TestPhase62(unittest.TestCase):
+    """Phase 62: Gedeelde Embedding Model Registry."""
+
+    def setUp(self) -> None:
+        """Lege registry; loader vervangen door _NepST."""
+        from danny_toolkit.core import embeddings as emb
+        import numpy  # noqa: F401  (encode retourneert numpy arrays)
+        self.emb = emb
+        self._oude_laad = emb.SharedEmbeddingModel.__dict__["_laad"]
+        emb.SharedEmbeddingModel._laad = staticmethod(lambda naam, device: _NepST(naam, device))
+        emb._model_registry.clear()
+        _NepST.geladen = 0
+        from swarm_engine import AdaptiveRouter
+        self.Router = AdaptiveRouter
+        self._router_staat = (AdaptiveRouter._embed_fn, AdaptiveRouter._profiel_embeddings)
+        AdaptiveRouter._embed_fn = None
+        AdaptiveRouter._profiel_embeddings = None
+
+    def tearDown(self) -> None:
+        """Herstel loader, registry en router class-state."""
+        self.emb.SharedEmbeddingModel._laad = self._oude_laad
+        self.emb._model_registry.clear()
+        self.Router._embed_fn, self.Router._profiel_embeddings = self._router_staat
+
+    # --- A. Registry ---
+
+    def test_01_one_instance_per_key(self) -> None:
+        """Zelfde (model, device) → zelfde instantie; ander device → nieuwe."""
+        a = self.emb.get_shared_model(device="cpu")
+        b = self.emb.get_shared_model(self.emb.DEFAULT_ST_MODEL, "cpu")
+        c(a is b, "zelfde instantie")
+        c(_NepST.geladen == 1, "één keer geladen")
+        d = self.emb.get_shared_model(device="cuda")
+        c(d is not a and _NepST.geladen == 2, "ander device: eigen instantie")
+        c(a.dimensies == 32 and a.device == "cpu", "dimensies + device")
+
+    def test_02_concurrent_single_load(self) -> None:
+        """Acht threads tegelijk → één load."""
+        resultaten = []
+        threads = [threading.Thread(
+            target=lambda: resultaten.append(self.emb.get_shared_model("m/x", "cpu")),
+        ) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        c(_NepST.geladen == 1, "één load onder concurrency")
+        c(len({id(r) for r in resultaten}) == 1, "iedereen dezelfde instantie")
+
+    # --- B. encode ---
+
+    def test_03_batched_encode(self) -> None:
+        """encode: str → 1d, lijst → 2d; normalize; tellers."""
+        import numpy as np
+        m = self.emb.get_shared_model(device="cpu")
+        v = m.encode("een zin")
+        c(v.shape == (32,), "1d vector")
+        mat = m.encode(["a b", "c d", "e f"], normalize=True)
+        c(mat.shape == (3, 32), "2d matrix")
+        c(bool(np.allclose(np.linalg.norm(mat, axis=1), 1.0, atol=1e-5)), "genormaliseerd")
+        st = m.stats()
+        c(st["aanroepen"] == 2 and st["teksten"] == 4, "aanroepen/teksten tellers")
+
+    # --- C. Lokale providers ---
+
+    def test_04_local_providers_share(self) -> None:
+        """LocalEmbeddings en LocalChromaEmbedding delen één model."""
+        from danny_toolkit.core.config import Config
+        le = self.emb.LocalEmbeddings()
+        lc = self.emb.LocalChromaEmbedding()
+        lc._ensure_model()
+        c(le._shared is lc._model, "zelfde gedeelde instantie")
+        c(_NepST.geladen == 1, "één load voor beide")
+        c(le._shared.model_name == Config.LOCAL_EMBEDDING_MODEL, "LOCAL_EMBEDDING_MODEL")
+        c(len(le.embed_query("test")) == 32, "embed_query werkt")
+        c(len(lc(["x", "y"])) == 2, "chroma __call__ werkt")
+
+    # --- D. Router + Synapse ---
+
+    def test_05_router_and_synapse_share(self) -> None:
+        """AdaptiveRouter en TheSynapse gebruiken hetzelfde CPU model."""
+        from danny_toolkit.brain.synapse import TheSynapse
+        r = self.Router._get_embed_fn()
+        s = TheSynapse._get_embed_fn(types.SimpleNamespace(_embed_fn=None))
+        c(r is not None and s is not None, "embed functies geladen")
+        c(r.__self__ is s.__self__, "zelfde model object")
+        c(r.__self__.device == "cpu", "router op CPU")
+        c(_NepST.geladen == 1, "één load voor router + synapse")
+
+    def test_06_profiles_single_batch(self) -> None:
+        """_bereken_profielen embedt alle sub-profielen in één batch."""
+        profielen = self.Router._bereken_profielen()
+        model = self.emb.get_shared_model(device="cpu")
+        c(model.aanroepen == 1, f"één encode aanroep ({model.aanroepen})")
+        c(set(profielen) == set(self.Router.AGENT_PROFIELEN), "alle agents")
+        c(all(len(profielen[a]) == len(subs)
+              for a, subs in self.Router.AGENT_PROFIELEN.items()), "vector per sub-profiel")
+        from danny_toolkit.brain.synapse import TheSynapse
+        nep = types.SimpleNamespace(_embed_fn=None, _profiel_embeddings=None)
+        nep._get_embed_fn = lambda: TheSynapse._get_embed_fn(nep)
+        c(TheSynapse._get_profiel_embeddings(nep) is profielen, "synapse hergebruikt profielen")
+
+    # --- E. Release + bronscan ---
+
+    def test_07_release(self) -> None:
+        """release_shared_model verwijdert; volgende get laadt opnieuw."""
+        a = self.emb.get_shared_model(device="cpu")
+        c(len(self.emb.shared_model_stats()) == 1, "stats: één model")
+        c(self.emb.release_shared_model(device="cpu"), "release True")
+        c(not self.emb.release_shared_model(device="cpu"), "tweede release False")
+        b = self.emb.get_shared_model(device="cpu")
+        c(a is not b and _NepST.geladen == 2, "opnieuw geladen")
+
+    def test_08_no_private_loads(self) -> None:
+        """Geen eigen SentenceTransformer/AutoModel loads meer op de call sites."""
+        bronnen = {
+            "swarm_engine.py": (PROJECT_ROOT / "swarm_engine.py").read_text(encoding="utf-8"),
+            "synapse.py": (PROJECT_ROOT / "danny_toolkit/brain/synapse.py").read_text(encoding="utf-8"),
+        }
+        for naam, bron in bronnen.items():
+            c("SentenceTransformer(" not in bron, f"{naam}: geen eigen load")
+        torch_bron = inspect.getsource(self.emb.TorchGPUEmbeddings.__init__)
+        c("get_shared_model" in torch_bron and "from_pretrained" not in torch_bron,
+          "TorchGPUEmbeddings via registry")
+        c("release_shared_model" in inspect.getsource(self.emb.force_flush_embeddings),
+          "force_flush geeft registry vrij")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 62: Gedeelde Embedding Model Registry")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Test Phase 63: Request-Scoped Embedding Memo
+=============================================
+8 tests · 25+ checks
+
+Valideert:
+  A. memo_embed embedt elke (model, genormaliseerde tekst) één keer per request
+  B. request_memo koppelt los na return/exception; tasks + to_thread erven de memo
+  C. Single-flight: parallelle misses op dezelfde sleutel embedden één keer
+  D. RequestTracer spans krijgen de hit/miss delta van hun fase
+  E. Router, Synapse, SemanticCache en ShardRouter delen de memo binnen run()
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase63.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _Teller:
+    """Embed functie die aanroepen telt (optioneel traag)."""
+
+    def __init__(self, vertraging: float = 0.0) -> None:
+        self.teksten = []
+        self.vertraging = vertraging
+        self._lock = threading.Lock()
+
+    def __call__(self, tekst: str) -> list:
+        time.sleep(self.vertraging)
+        with self._lock:
+            self.teksten.append(tekst)
+        return [float(len(tekst)), 1.0]
+
+
+class TestPhase63(unittest.TestCase):
+    """Phase 63: Request-Scoped Embedding Memo."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import embedding_memo as em
+        self.em = em
+
+    def _in_request(self, coro_fn):
+        """Draai coro_fn binnen een request_memo scope; geeft (resultaat, memo)."""
+        em = self.em
+
+        @em.request_memo
+        async def _run():
+            return await coro_fn(), em.huidige_memo()
+        return asyncio.run(_run())
+
+    # --- A. Memo basis ---
+
+    def test_01_no_memo_outside_request(self) -> None:
+        """Zonder actieve memo wordt elke aanroep direct ge-embed."""
+        f = _Teller()
+        self.em.memo_embed("hallo", f)
+        self.em.memo_embed("hallo", f)
+        c(len(f.teksten) == 2, "twee berekeningen")
+        c(self.em.huidige_memo() is None, "geen memo buiten request")
+
+    def test_02_dedup_within_request(self) -> None:
+        """Zelfde genormaliseerde tekst → één embed; ander model → eigen entry."""
+        f, g = _Teller(), _Teller()
+
+        async def body():
+            a = self.em.memo_embed("Wat is  RAG?", f)
+            b = self.em.memo_embed("  Wat is RAG? ", f)
+            self.em.memo_embed("Wat is RAG?", g)
+            self.em.memo_embed("iets anders", f)
+            return a, b
+        (a, b), memo = self._in_request(body)
+        c(a is b, "zelfde object terug")
+        c(len(f.teksten) == 2, f"f: 2 berekeningen ({len(f.teksten)})")
+        c(len(g.teksten) == 1, "ander model apart")
+        st = memo.stats()
+        c(st["hits"] == 1 and st["misses"] == 3, f"tellers ({st})")
+
+    # --- B. Scope ---
+
+    def test_03_scope_reset(self) -> None:
+        """Memo wordt losgekoppeld na return en na exception; nesting hergebruikt."""
+        em = self.em
+        gezien = []
+
+        @em.request_memo
+        async def binnen():
+            gezien.append(em.huidige_memo())
+
+        @em.request_memo
+        async def buiten():
+            gezien.append(em.huidige_memo())
+            await binnen()
+
+        asyncio.run(buiten())
+        c(gezien[0] is not None and gezien[0] is gezien[1], "geneste aanroep deelt memo")
+
+        @em.request_memo
+        async def faalt():
+            raise ValueError("boom")
+
+        async def main():
+            with self.assertRaises(ValueError):
+                await faalt()
+            return em.huidige_memo()
+        c(asyncio.run(main()) is None, "los na exception")
+
+    def test_04_tasks_and_threads_inherit(self) -> None:
+        """asyncio tasks en to_thread zien dezelfde memo."""
+        f = _Teller()
+
+        async def body():
+            t1 = asyncio.create_task(asyncio.to_thread(self.em.memo_embed, "x y", f))
+            t2 = asyncio.create_task(asyncio.to_thread(self.em.memo_embed, "x y", f))
+            await asyncio.gather(t1, t2)
+            return self.em.memo_embed("x y", f)
+        _, memo = self._in_request(body)
+        c(len(f.teksten) == 1, "één berekening over threads")
+        c(memo.hits == 2 and memo.misses == 1, "2 hits, 1 miss")
+
+    # --- C. Single-flight + fouten ---
+
+    def test_05_single_flight_and_errors(self) -> None:
+        """Parallelle misses wachten op één berekening; fouten niet gememoiseerd."""
+        traag = _Teller(vertraging=0.2)
+
+        async def body():
+            await asyncio.gather(*[
+                asyncio.to_thread(self.em.memo_embed, "parallel", traag) for _ in range(6)
+            ])
+        self._in_request(body)
+        c(len(traag.teksten) == 1, f"single-flight ({len(traag.teksten)})")
+
+        pogingen = []
+
+        def wankel(tekst):
+            pogingen.append(tekst)
+            if len(pogingen) == 1:
+                raise RuntimeError("tijdelijk")
+            return [1.0]
+
+        async def body2():
+            with self.assertRaises(RuntimeError):
+                self.em.memo_embed("wankel", wankel)
+            return self.em.memo_embed("wankel", wankel)
+        res, _ = self._in_request(body2)
+        c(res == [1.0] and len(pogingen) == 2, "retry na fout")
+
+    # --- D. Tracer ---
+
+    def test_06_tracer_span_counters(self) -> None:
+        """Spans bevatten de embed_memo delta van hun eigen fase."""
+        from danny_toolkit.core.request_tracer import RequestTracer
+        tracer = RequestTracer()
+        f = _Teller()
+
+        async def body():
+            self.em.bind_trace("abcd1234")
+            trace = tracer.begin_trace("abcd1234")
+            tracer.begin_span("routing")
+            self.em.memo_embed("q", f)
+            self.em.memo_embed("q", f)
+            tracer.eind_span("ok")
+            tracer.begin_span("memex")
+            self.em.memo_embed("q", f)
+            tracer.eind_span("ok")
+            tracer.begin_span("leeg")
+            tracer.eind_span("ok")
+            return trace
+        trace, memo = self._in_request(body)
+        spans = {s.fase: s for s in trace.spans}
+        c(spans["routing"].details.get("embed_memo") == {"hits": 1, "misses": 1}, "routing delta")
+        c(spans["memex"].details.get("embed_memo") == {"hits": 1, "misses": 0}, "memex delta")
+        c("embed_memo" not in spans["leeg"].details, "geen lege teller")
+        c(memo.trace_id == "abcd1234", "trace_id gekoppeld")
+        c("memo_start" not in spans["routing"].to_dict(), "niet in to_dict")
+
+    # --- E. Pipeline integratie ---
+
+    def test_07_router_synapse_share(self) -> None:
+        """AdaptiveRouter.route + TheSynapse.categorize_query: één encode."""
+        from danny_toolkit.core import embeddings as emb
+        from danny_toolkit.brain.synapse import TheSynapse
+        from swarm_engine import AdaptiveRouter
+        import numpy as np
+
+        class _Model:
+            model_name, device = "nep/mpnet", "cpu"
+
+            def __init__(self):
+                self.teksten = []
+
+            def encode(self, teksten, **kw):
+                enkel = isinstance(teksten, str)
+                lijst = [teksten] if enkel else list(teksten)
+                self.teksten.extend(lijst)
+                m = np.asarray(emb.HashEmbeddings(32).embed(lijst), dtype=np.float32)
+                return m[0] if enkel else m
+
+        model = _Model()
+        oud = (AdaptiveRouter._embed_fn, AdaptiveRouter._profiel_embeddings)
+        try:
+            AdaptiveRouter._embed_fn = model.encode
+            AdaptiveRouter._profiel_embeddings = None
+            AdaptiveRouter._bereken_profielen()
+            model.teksten.clear()
+            tmp = tempfile.TemporaryDirectory()
+            syn = TheSynapse(db_path=str(Path(tmp.name) / "syn.db"))
+            syn._embed_fn = model.encode
+            vraag = "schrijf een python functie die een lijst sorteert"
+
+            async def body():
+                AdaptiveRouter().route(vraag)
+                syn.categorize_query(vraag)
+                syn.categorize_query(vraag)
+            _, memo = self._in_request(body)
+            c(model.teksten.count(vraag) == 1, f"input één keer ge-embed ({len(model.teksten)})")
+            c(memo.hits == 2, f"2 memo hits ({memo.hits})")
+            from danny_toolkit.core.storage_writer import sluit_writer
+            syn.flush()
+            sluit_writer(syn._db_path)
+            tmp.cleanup()
+        finally:
+            AdaptiveRouter._embed_fn, AdaptiveRouter._profiel_embeddings = oud
+
+    def test_08_wiring(self) -> None:
+        """run() heeft request_memo; Memex, ShardRouter en SemanticCache gebruiken memo_embed."""
+        import swarm_engine as se
+        from danny_toolkit.core import semantic_cache, shard_router
+        c(getattr(se.SwarmEngine.run, "__wrapped__", None) is not None, "run gedecoreerd")
+        c("bind_trace(trace_id)" in inspect.getsource(se.SwarmEngine.run), "bind_trace in run")
+        c("_query_embedding" in inspect.getsource(se.SwarmEngine._ophalen_memex_context),
+          "memex context via memo")
+        c("memo_embed" in inspect.getsource(shard_router.ShardRouter._embed_query),
+          "ShardRouter via memo")
+        # SemanticCache: lookup + store in één request → één provider aanroep
+        f = _Teller()
+        prov = types.SimpleNamespace(embed_query=f)
+        tmp = tempfile.TemporaryDirectory()
+        cache = semantic_cache.SemanticCache(db_path=Path(tmp.name) / "sc.db")
+        cache._embed_provider, cache._embed_init_tried = prov, True
+
+        async def body():
+            cache.lookup("Memex", "wat is de hoofdstad")
+            cache.store("Memex", "wat is de hoofdstad", "Amsterdam is de hoofdstad van NL.")
+        self._in_request(body)
+        c(len(f.teksten) == 1, f"SemanticCache lookup+store: één embed ({len(f.teksten)})")
+        from danny_toolkit.core.storage_writer import sluit_writer
+        c(cache.flush(), "store gecommit")
+        sluit_writer(cache._db_path)
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 63: Request-Scoped Embedding Memo")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test Phase 64: Matrix-Form AdaptiveRouter
+==========================================
+8 tests · 25+ checks
+
+Valideert:
+  A. ProfielMatrix: genormaliseerde rijen, één segment per agent
+  B. Matvec + gesegmenteerde max == de oude cosine-lus (scores en route)
+  C. Persistentie: koude router laadt de matrix van disk zonder encode
+  D. Nieuwe sleutel bij andere profielteksten of ander model; kapot bestand → herbouw
+  E. TheSynapse.categorize_query gebruikt dezelfde matrix
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase64.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+VRAGEN = [
+    "schrijf een python functie die een lijst sorteert",
+    "wat is de bitcoin prijs vandaag",
+    "hoe slaap ik beter en verbeter ik mijn hartslag",
+    "zoek documentatie over de swarm engine architectuur",
+    "debug deze stacktrace in mijn javascript code",
+]
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _Model:
+    """Registry-achtig model (model_name + device) dat encode-teksten telt."""
+
+    def __init__(self, naam: str = "nep/mpnet", dim: int = 64) -> None:
+        from danny_toolkit.core.embeddings import HashEmbeddings
+        self.model_name, self.device = naam, "cpu"
+        self._hash = HashEmbeddings(dim)
+        self.batches = 0
+
+    def encode(self, teksten, **kw):
+        import numpy as np
+        enkel = isinstance(teksten, str)
+        lijst = [teksten] if enkel else list(teksten)
+        if not enkel:
+            self.batches += 1
+        m = np.asarray(self._hash.embed(lijst), dtype=np.float32)
+        return m[0] if enkel else m
+
+
+class TestPhase64(unittest.TestCase):
+    """Phase 64: Matrix-Form AdaptiveRouter."""
+
+    def setUp(self) -> None:
+        """Router class-state isoleren; profielmap in een tmp directory."""
+        from swarm_engine import AdaptiveRouter
+        self.R = AdaptiveRouter
+        self._oud = (AdaptiveRouter._embed_fn, AdaptiveRouter._profiel_embeddings,
+                     AdaptiveRouter._profiel_matrix, AdaptiveRouter._profiel_map,
+                     AdaptiveRouter.AGENT_PROFIELEN)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = _Model()
+        AdaptiveRouter._embed_fn = self.model.encode
+        AdaptiveRouter._profiel_embeddings = None
+        AdaptiveRouter._profiel_matrix = None
+        AdaptiveRouter._profiel_map = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        """Herstel router class-state."""
+        (self.R._embed_fn, self.R._profiel_embeddings, self.R._profiel_matrix,
+         self.R._profiel_map, self.R.AGENT_PROFIELEN) = self._oud
+        self.tmp.cleanup()
+
+    def _koud(self) -> None:
+        """Simuleer een nieuw proces: in-memory profielen weg."""
+        self.R._profiel_embeddings = None
+        self.R._profiel_matrix = None
+
+    def _lus_scores(self, vec) -> dict:
+        """Referentie: de oude per-agent cosine-lus op ruwe embeddings."""
+        ruw = self.model.encode([t for subs in self.R.AGENT_PROFIELEN.values() for t in subs])
+        it = iter(ruw)
+        return {
+            agent: max(self.R._cosine_sim(vec, next(it)) for _ in subs)
+            for agent, subs in self.R.AGENT_PROFIELEN.items()
+        }
+
+    # --- A. Structuur ---
+
+    def test_01_matrix_layout(self) -> None:
+        """Eén rij per sub-profiel, norm 1, segment-start per agent."""
+        import numpy as np
+        profielen = self.R._bereken_profielen()
+        m = self.R._profiel_matrix
+        subs = [len(s) for s in self.R.AGENT_PROFIELEN.values()]
+        c(m is not None and m.matrix.dtype == np.float32, "float32 matrix")
+        c(m.matrix.shape == (sum(subs), 64), f"shape {m.matrix.shape}")
+        c(np.allclose(np.linalg.norm(m.matrix, axis=1), 1.0, atol=1e-5), "rijen genormaliseerd")
+        c(m.starts.tolist() == [sum(subs[:i]) for i in range(len(subs))], "segment starts")
+        c(m.agenten == list(self.R.AGENT_PROFIELEN), "agent volgorde")
+        c(all(len(profielen[a]) == len(s) for a, s in self.R.AGENT_PROFIELEN.items()),
+          "_bereken_profielen dict blijft compatibel")
+        c(self.model.batches == 1, "één batched encode")
+
+    # --- B. Pariteit ---
+
+    def test_02_scores_parity(self) -> None:
+        """Matvec + reduceat geeft dezelfde max-sim per agent als de lus."""
+        self.R._bereken_profielen()
+        for vraag in VRAGEN:
+            vec = self.model.encode(vraag)
+            matrix = dict(self.R.agent_scores(vec, self.model.encode))
+            lus = self._lus_scores(vec)
+            c(matrix.keys() == lus.keys()
+              and all(abs(matrix[a] - lus[a]) < 1e-5 for a in lus),
+              f"pariteit: {vraag[:30]}")
+
+    def test_03_route_parity(self) -> None:
+        """route() met matrix == route() via de cosine-lus fallback (ook met bias)."""
+        router = self.R()
+        bias = {"CIPHER": 1.4, "IOLAAX": 0.8}
+        met = [router.route(v, synapse_bias=bias) for v in VRAGEN]
+        self.R._profiel_matrix = None  # forceer de lus
+        zonder = [router.route(v, synapse_bias=bias) for v in VRAGEN]
+        c(met == zonder, f"zelfde targets ({met})")
+        # Andere embed functie dan de matrix: veilig terug naar de lus
+        self.R._bereken_profielen()
+        ander = _Model()
+        scores = self.R.agent_scores(ander.encode(VRAGEN[0]), ander.encode)
+        c(len(scores) == len(self.R.AGENT_PROFIELEN), "fallback bij ander model")
+
+    # --- C. Persistentie ---
+
+    def test_04_cold_load_from_disk(self) -> None:
+        """Tweede (koude) router laadt de matrix van disk: geen encode."""
+        import numpy as np
+        self.R._bereken_profielen()
+        eerste = self.R._profiel_matrix.matrix.copy()
+        bestanden = list(Path(self.tmp.name).glob("*.npz"))
+        c(len(bestanden) == 1, f"één matrixbestand ({[b.name for b in bestanden]})")
+        c(bestanden[0].name.startswith("nep_mpnet_"), "bestandsnaam bevat model")
+        self._koud()
+        self.model.batches = 0
+        self.R._bereken_profielen()
+        c(self.model.batches == 0, "koude start zonder encode")
+        c(np.array_equal(self.R._profiel_matrix.matrix, eerste), "identieke matrix")
+        c(self.R().route(VRAGEN[1]) != [], "route werkt na disk load")
+
+    def test_05_test_mode_no_disk(self) -> None:
+        """Zonder expliciete map schrijft DANNY_TEST_MODE niets naar DATA_DIR."""
+        self.R._profiel_map = None
+        c(self.R._profiel_cache_map() is None, "geen cache map in test mode")
+        self.R._bereken_profielen()
+        c(self.R._profiel_matrix is not None, "matrix wel in memory")
+
+    # --- D. Sleutels ---
+
+    def test_06_profile_change_rebuilds(self) -> None:
+        """Gewijzigde profielteksten → nieuwe hash → herberekening."""
+        self.R._bereken_profielen()
+        profielen = dict(self.R.AGENT_PROFIELEN)
+        profielen["CIPHER"] = list(profielen["CIPHER"]) + ["blockchain ledger wallet"]
+        self.R.AGENT_PROFIELEN = profielen
+        self._koud()
+        self.model.batches = 0
+        self.R._bereken_profielen()
+        c(self.model.batches == 1, "opnieuw ge-embed")
+        c(len(self.R._profiel_embeddings["CIPHER"]) == len(profielen["CIPHER"]),
+          "nieuw sub-profiel opgenomen")
+        c(len(list(Path(self.tmp.name).glob("*.npz"))) == 2, "tweede bestand")
+
+    def test_07_model_change_and_corrupt(self) -> None:
+        """Ander model → eigen bestand; kapot bestand → stil herbouwen."""
+        self.R._bereken_profielen()
+        ander = _Model("nep/minilm", dim=32)
+        self.R._embed_fn = ander.encode
+        self._koud()
+        self.R._bereken_profielen()
+        c(ander.batches == 1, "ander model embedt zelf")
+        c(self.R._profiel_matrix.dim == 32, "dimensie van het nieuwe model")
+        for pad in Path(self.tmp.name).glob("nep_minilm_*.npz"):
+            pad.write_bytes(b"geen npz")
+        self._koud()
+        self.R._bereken_profielen()
+        c(ander.batches == 2, "kapot bestand → herbouw")
+        self._koud()
+        self.R._bereken_profielen()
+        c(ander.batches == 2, "herschreven bestand weer bruikbaar")
+
+    # --- E. Synapse ---
+
+    def test_08_synapse_shares_matrix(self) -> None:
+        """categorize_query gebruikt de router-matrix en matcht de lus."""
+        from danny_toolkit.brain.synapse import TheSynapse
+        self.R._bereken_profielen()
+        self.model.batches = 0
+        syn = TheSynapse(db_path=str(Path(self.tmp.name) / "syn.db"))
+        syn._embed_fn = self.model.encode
+        for vraag in VRAGEN:
+            lus = sorted(self._lus_scores(self.model.encode(vraag)).items(),
+                         key=lambda x: x[1], reverse=True)
+            verwacht = "+".join(sorted(a for a, _ in lus[:2]))
+            c(syn.categorize_query(vraag) == verwacht, f"categorie: {vraag[:30]}")
+        c(syn._profiel_matrix is self.R._profiel_matrix, "zelfde matrix object")
+        c(self.model.batches == len(VRAGEN), "geen extra profiel-encode")
+        syn._conn.close()
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 64: Matrix-Form AdaptiveRouter")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test Phase 65: Binary EmbeddingCache
+=====================================
+8 tests · 25+ checks
+
+Valideert:
+  A. Vectoren als float32/float16 BLOBs in SQLite (geen JSON dump)
+  B. Flush schrijft alleen nieuwe entries; evictie is per entry (LRU)
+  C. Herladen, legacy JSON migratie en achtergrond-compactie
+  D. Read-only delen tussen "processen" (tweede instantie op hetzelfde bestand)
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase65.py
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+DIM = 64
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _vec(i: int) -> list:
+    """Deterministische testvector."""
+    return [((i * 31 + j * 7) % 97) / 97.0 for j in range(DIM)]
+
+
+class _Teller:
+    """Telt SQL statements via de sqlite trace callback."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.inserts = 0
+        conn.set_trace_callback(self._trace)
+
+    def _trace(self, sql: str) -> None:
+        if sql.lstrip().upper().startswith("INSERT OR REPLACE INTO EMBEDDINGS"):
+            self.inserts += 1
+
+
+class TestPhase65(unittest.TestCase):
+    """Phase 65: Binary EmbeddingCache."""
+
+    def setUp(self) -> None:
+        """Tijdelijke cache map."""
+        from danny_toolkit.core import embeddings as emb
+        self.emb = emb
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pad = Path(self.tmp.name) / "cache.db"
+        self._open = []
+
+    def tearDown(self) -> None:
+        """Sluit caches en ruim op."""
+        for cache in self._open:
+            cache.sluit()
+        self.tmp.cleanup()
+
+    def _cache(self, **kw):
+        cache = self.emb.EmbeddingCache(cache_bestand=kw.pop("pad", self.pad), **kw)
+        self._open.append(cache)
+        return cache
+
+    # --- A. Binair formaat ---
+
+    def test_01_float32_blobs(self) -> None:
+        """Vectoren staan als float32 BLOB (4 bytes/dim) op disk."""
+        cache = self._cache()
+        cache.set("alpha", "hash", _vec(1))
+        cache.opslaan()
+        rij = sqlite3.connect(self.pad).execute(
+            "SELECT dim, length(vector), typeof(vector) FROM embeddings").fetchone()
+        c(rij == (DIM, DIM * 4, "blob"), f"float32 blob ({rij})")
+        terug = cache.get("alpha", "hash")
+        c(isinstance(terug, list) and len(terug) == DIM, "get geeft lijst")
+        c(all(abs(a - b) < 1e-6 for a, b in zip(terug, _vec(1))), "float32 precisie")
+
+    def test_02_float16(self) -> None:
+        """dtype float16 halveert de BLOB; herladen decodeert op lengte."""
+        cache = self._cache(dtype="float16")
+        cache.set("beta", "hash", _vec(2))
+        cache.opslaan()
+        lengte = sqlite3.connect(self.pad).execute(
+            "SELECT length(vector) FROM embeddings").fetchone()[0]
+        c(lengte == DIM * 2, f"float16 blob ({lengte} bytes)")
+        herladen = self._cache()
+        terug = herladen.get("beta", "hash")
+        c(terug is not None and all(abs(a - b) < 1e-3 for a, b in zip(terug, _vec(2))),
+          "float16 terug binnen tolerantie")
+        with self.assertRaises(ValueError):
+            self._cache(pad=Path(self.tmp.name) / "x.db", dtype="float64")
+        c(True, "onbekend dtype geweigerd")
+
+    # --- B. Incrementeel + evictie ---
+
+    def test_03_flush_only_new_entries(self) -> None:
+        """Elke flush schrijft alleen de entries sinds de vorige flush."""
+        cache = self._cache()
+        teller = _Teller(cache._conn)
+        for i in range(cache._SAVE_INTERVAL):
+            cache.set(f"tekst {i}", "hash", _vec(i))
+        c(teller.inserts == cache._SAVE_INTERVAL, f"eerste flush: {teller.inserts} inserts")
+        teller.inserts = 0
+        for i in range(cache._SAVE_INTERVAL, cache._SAVE_INTERVAL + 10):
+            cache.set(f"tekst {i}", "hash", _vec(i))
+        c(teller.inserts == 0, "nog niet geflusht")
+        c(cache.statistieken()["onopgeslagen"] == 10, "10 onopgeslagen")
+        cache.opslaan()
+        c(teller.inserts == 10, f"alleen 10 nieuwe weggeschreven ({teller.inserts})")
+
+    def test_04_lru_single_eviction(self) -> None:
+        """Vol: precies de minst recent gebruikte entry verdwijnt, ook van disk."""
+        cache = self._cache(max_grootte=5)
+        for i in range(5):
+            cache.set(f"t{i}", "hash", _vec(i))
+        cache.opslaan()
+        cache.get("t0", "hash")  # t0 wordt recent
+        cache.set("t5", "hash", _vec(5))
+        c(len(cache.cache) == 5, "grootte blijft max")
+        c(cache.get("t0", "hash") is not None, "recent gebruikte t0 blijft")
+        c(cache.get("t1", "hash") is None, "LRU t1 ge-evict")
+        cache.opslaan()
+        sleutels = {r[0] for r in sqlite3.connect(self.pad).execute(
+            "SELECT sleutel FROM embeddings")}
+        c(cache._hash_tekst("t1", "hash") not in sleutels, "t1 ook van disk")
+        c(len(sleutels) == 5, f"5 rijen op disk ({len(sleutels)})")
+
+    # --- C. Herladen, migratie, compactie ---
+
+    def test_05_reload_keeps_lru_and_stats(self) -> None:
+        """Nieuwe instantie laadt entries en tellers."""
+        cache = self._cache()
+        for i in range(3):
+            cache.set(f"r{i}", "hash", _vec(i))
+        cache.get("r1", "hash")
+        cache.get("bestaat niet", "hash")
+        cache.sluit()
+        self._open.remove(cache)
+        herladen = self._cache()
+        c(len(herladen.cache) == 3, "3 entries herladen")
+        c(herladen.hits == 1 and herladen.misses == 1, "tellers herladen")
+        c(list(herladen.cache)[-1] == herladen._hash_tekst("r1", "hash"),
+          "LRU volgorde hersteld")
+
+    def test_06_legacy_json_migration(self) -> None:
+        """Een bestaand embedding_cache.json wordt eenmalig ingelezen."""
+        legacy = Path(self.tmp.name) / "oud.json"
+        sleutel = self.emb.EmbeddingCache.__new__(self.emb.EmbeddingCache)._hash_tekst("oud", "hash")
+        legacy.write_text(json.dumps({"cache": {sleutel: _vec(7)}, "hits": 4, "misses": 2}),
+                          encoding="utf-8")
+        cache = self._cache(pad=legacy)
+        c(cache.cache_bestand.suffix == ".db", "database naast json")
+        c(cache.get("oud", "hash") is not None, "legacy entry beschikbaar")
+        c(cache.hits == 5, f"legacy tellers ({cache.hits})")
+        c(legacy.exists(), "json niet verwijderd")
+
+    def test_07_background_compaction(self) -> None:
+        """Compactie trimt rijen van andere schrijvers tot max_grootte."""
+        cache = self._cache(max_grootte=10)
+        for i in range(10):
+            cache.set(f"c{i}", "hash", _vec(i))
+        cache.opslaan()
+        ander = self._cache(max_grootte=30)
+        for i in range(20):
+            ander.set(f"x{i}", "hash", _vec(i))
+        ander.opslaan()
+        db = sqlite3.connect(self.pad)
+        c(db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 30, "30 rijen")
+        cache.compacteer(wacht=True)
+        c(db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 10, "getrimd tot 10")
+        c(cache._compactie_thread.name == "embedding-cache-compactie", "eigen thread")
+
+    # --- D. Delen tussen processen ---
+
+    def test_08_shared_read_only(self) -> None:
+        """Read-only lezer ziet entries van de schrijver via point lookup."""
+        schrijver = self._cache()
+        lezer = self._cache(alleen_lezen=True)
+        schrijver.set("gedeeld", "hash", _vec(9))
+        c(lezer.get("gedeeld", "hash") is None, "nog niet geflusht")
+        schrijver.opslaan()
+        c(lezer.get("gedeeld", "hash") is not None, "na flush zichtbaar")
+        lezer.set("lokaal", "hash", _vec(3))
+        lezer.opslaan()
+        c(schrijver.get("lokaal", "hash") is None, "lezer schrijft niet")
+        c(lezer.get("lokaal", "hash") is not None, "lezer cachet in memory")
+        wees = self._cache(pad=Path(self.tmp.name) / "bestaat_niet.db", alleen_lezen=True)
+        c(wees.get("x", "hash") is None and wees._conn is None, "read-only zonder bestand")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 65: Binary EmbeddingCache")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test Phase 66: Cross-Process Embedding Cache
+=============================================
+7 tests · 20+ checks
+
+Valideert:
+  A. Een embedding berekend in een ander proces wordt hier hergebruikt
+  B. Sleutel = provider + dimensie + tekst-hash (geen cross-dim hits)
+  C. Write-through per batch in gedeelde modus; privé modus blijft lokaal
+  D. get_embedding_cache(): één procesbrede instantie, EMBEDDING_CACHE_PATH
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase66.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+
+# Script voor het "andere proces": embed via de procesbrede cache
+_KIND_SCRIPT = """
+import sys
+from danny_toolkit.core.embeddings import CachedEmbeddingProvider, HashEmbeddings
+prov = CachedEmbeddingProvider(HashEmbeddings(32))
+prov.embed(sys.argv[1:])
+print(prov.cache.cache_bestand)
+"""
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _Tellend:
+    """Provider wrapper die ge-embedde teksten telt."""
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.naam, self.dimensies = inner.naam, inner.dimensies
+        self.teksten = []
+
+    def embed(self, teksten: list) -> list:
+        self.teksten.extend(teksten)
+        return self.inner.embed(teksten)
+
+    def embed_query(self, query: str) -> list:
+        self.teksten.append(query)
+        return self.inner.embed_query(query)
+
+    def embed_queries(self, queries: list) -> list:
+        self.teksten.extend(queries)
+        return self.inner.embed_queries(queries)
+
+
+class TestPhase66(unittest.TestCase):
+    """Phase 66: Cross-Process Embedding Cache."""
+
+    def setUp(self) -> None:
+        """Tijdelijk cachebestand; Config-vlaggen bewaren."""
+        from danny_toolkit.core import embeddings as emb
+        from danny_toolkit.core.config import Config
+        self.emb, self.Config = emb, Config
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pad = Path(self.tmp.name) / "gedeeld.db"
+        self._oud = (Config.EMBEDDING_CACHE_SHARED, Config.EMBEDDING_CACHE_PATH,
+                     emb._gedeelde_cache)
+        self._open = []
+
+    def tearDown(self) -> None:
+        """Sluit caches en herstel Config."""
+        for cache in self._open:
+            cache.sluit()
+        (self.Config.EMBEDDING_CACHE_SHARED, self.Config.EMBEDDING_CACHE_PATH,
+         self.emb._gedeelde_cache) = self._oud
+        self.tmp.cleanup()
+
+    def _provider(self, dim: int = 32, **kw):
+        cache = self.emb.EmbeddingCache(cache_bestand=self.pad, **kw)
+        self._open.append(cache)
+        inner = _Tellend(self.emb.HashEmbeddings(dim))
+        return self.emb.CachedEmbeddingProvider(inner, cache=cache), inner
+
+    # --- A. Echt tweede proces ---
+
+    def test_01_reuse_from_other_process(self) -> None:
+        """Tekst ge-embed in een subprocess: hier geen provider call."""
+        env = dict(os.environ, EMBEDDING_CACHE_PATH=str(self.pad),
+                   EMBEDDING_CACHE_SHARED="1", PYTHONPATH=str(PROJECT_ROOT))
+        uit = subprocess.run(
+            [sys.executable, "-c", _KIND_SCRIPT, "gedeelde tekst", "nog een tekst"],
+            env=env, capture_output=True, text=True, timeout=120, cwd=str(PROJECT_ROOT),
+        )
+        c(uit.returncode == 0, f"subprocess ok ({uit.stderr[-200:]})")
+        c(uit.stdout.strip().endswith("gedeeld.db"), "kind gebruikte EMBEDDING_CACHE_PATH")
+        prov, inner = self._provider()
+        res = prov.embed(["gedeelde tekst", "nog een tekst", "nieuwe tekst"])
+        c(inner.teksten == ["nieuwe tekst"], f"alleen nieuwe tekst ge-embed ({inner.teksten})")
+        c(res[0] == [float(x) for x in res[0]] and len(res[0]) == 32, "vector uit gedeelde cache")
+
+    # --- B. Sleutel ---
+
+    def test_02_key_includes_dimension(self) -> None:
+        """Zelfde provider naam, andere dimensie: geen hit."""
+        prov32, _ = self._provider(32)
+        prov32.embed(["dimensie tekst"])
+        prov64, inner64 = self._provider(64)
+        res = prov64.embed(["dimensie tekst"])
+        c(inner64.teksten == ["dimensie tekst"], "64d embedt zelf")
+        c(len(res[0]) == 64, "juiste dimensie")
+
+    def test_03_default_key_compatible(self) -> None:
+        """Zonder dim blijft de sleutel provider:EMBEDDING_DIM:tekst."""
+        cache = self.emb.EmbeddingCache.__new__(self.emb.EmbeddingCache)
+        verwacht = hashlib.sha256(
+            f"voyage:{self.Config.EMBEDDING_DIM}:x".encode()).hexdigest()
+        c(cache._hash_tekst("x", "voyage") == verwacht, "legacy sleutel")
+        c(cache._hash_tekst("x", "voyage", self.Config.EMBEDDING_DIM) == verwacht,
+          "expliciete default dim == legacy")
+
+    # --- C. Write-through vs privé ---
+
+    def test_04_write_through_per_batch(self) -> None:
+        """Gedeelde modus: na één embed() direct zichtbaar voor een ander proces."""
+        a, _ = self._provider(gedeeld=True)
+        b, inner_b = self._provider(gedeeld=True)
+        a.embed_query("direct zichtbaar")
+        c(a.cache.statistieken()["onopgeslagen"] == 0, "geen pending entries")
+        b.embed_query("direct zichtbaar")
+        c(inner_b.teksten == [], "b hergebruikt a's embedding")
+        a.embed_queries(["q1", "q2"])
+        b.embed_queries(["q1", "q2", "q3"])
+        c(inner_b.teksten == ["q3"], f"batch: alleen q3 ({inner_b.teksten})")
+
+    def test_05_private_mode(self) -> None:
+        """Privé modus: periodieke flush, geen lookups in het bestand."""
+        a, _ = self._provider(gedeeld=False)
+        b, inner_b = self._provider(gedeeld=False)
+        a.embed(["prive tekst"])
+        c(a.cache.statistieken()["onopgeslagen"] == 1, "pending tot periodieke flush")
+        a.cache.opslaan()
+        b.embed(["prive tekst"])
+        c(inner_b.teksten == ["prive tekst"], "privé cache kijkt niet in het bestand")
+        c(a.cache.gedeeld is False and b.cache.statistieken()["gedeeld"] is False,
+          "vlag in statistieken")
+
+    # --- D. Procesbrede instantie ---
+
+    def test_06_process_wide_singleton(self) -> None:
+        """CachedEmbeddingProviders zonder cache delen één instantie."""
+        self.Config.EMBEDDING_CACHE_PATH = str(self.pad)
+        self.emb._gedeelde_cache = None
+        p1 = self.emb.CachedEmbeddingProvider(self.emb.HashEmbeddings(32))
+        p2 = self.emb.CachedEmbeddingProvider(self.emb.HashEmbeddings(32))
+        self._open.append(p1.cache)
+        c(p1.cache is p2.cache is self.emb.get_embedding_cache(), "één instantie")
+        c(p1.cache.cache_bestand == self.pad, "EMBEDDING_CACHE_PATH gerespecteerd")
+
+    def test_07_config_default(self) -> None:
+        """EMBEDDING_CACHE_SHARED bepaalt de default modus."""
+        self.Config.EMBEDDING_CACHE_SHARED = False
+        prov, _ = self._provider()
+        c(prov.cache.gedeeld is False, "uit via Config")
+        self.Config.EMBEDDING_CACHE_SHARED = True
+        prov, _ = self._provider()
+        c(prov.cache.gedeeld is True, "aan via Config")
+        prov, _ = self._provider(alleen_lezen=True)
+        c(prov.cache.gedeeld is True, "read-only is altijd gedeeld")
+
+    def test_08_shared_eviction_keeps_file_rows(self) -> None:
+        """Gedeeld: LRU-evictie in geheugen verwijdert niets uit het bestand."""
+        a, _ = self._provider(gedeeld=True, max_grootte=2)
+        a.cache._COMPACT_FRACTIE = 10  # geen automatische compactie
+        a.embed(["e1", "e2", "e3"])
+        c(len(a.cache.cache) == 2, "geheugen-LRU begrensd")
+        a.cache.opslaan()
+        rijen = a.cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        c(rijen == 3, f"alle 3 rijen in het gedeelde bestand ({rijen})")
+        b, inner_b = self._provider(gedeeld=True)
+        b.embed(["e1"])
+        c(inner_b.teksten == [], "ge-evicte entry bruikbaar voor ander proces")
+        a.cache.compacteer(wacht=True)
+        rijen = a.cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        c(rijen == 2, f"compacteer trimt tot max_grootte ({rijen})")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 66: Cross-Process Embedding Cache")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test Phase 67: Incremental SSE Streaming
+=========================================
+8 tests · 25+ checks
+
+Valideert:
+  A. BrainAgent.process_stream: tokens live via on_token, zelfde rol-context/model
+  B. Alleen standaard BrainAgents streamen; subclasses met eigen process niet
+  C. _timed_dispatch kiest process_stream bij on_token; anders process()
+  D. Voorlopige payloads en live tokens PII-gescrubd, origineel onaangetast
+  E. run() en /api/v1/query stream zijn bedraad (queue, singleton engine)
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase67.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import types
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _NepCentral:
+    """CentralBrain-achtig: genereer_stream yieldt tokens met kleine pauzes."""
+
+    def __init__(self, tokens: list) -> None:
+        self.tokens = tokens
+        self.conversation_history = [{"role": "user", "content": "oud"}]
+        self.aanroepen = []
+
+    async def genereer_stream(self, user_input: str, model: str = None):
+        self.aanroepen.append((user_input, model))
+        for tok in self.tokens:
+            await asyncio.sleep(0.01)
+            yield tok
+
+
+class _NepPrometheus:
+    """PrometheusBrain-achtig: ROLE_CONTEXT/MODEL_TIER + .brain (CentralBrain)."""
+
+    def __init__(self, role, tokens: list) -> None:
+        self.ROLE_CONTEXT = {role: "Je bent Oracle."}
+        self.MODEL_TIER = {role: "nep-model"}
+        self.brain = _NepCentral(tokens)
+        self.governor = types.SimpleNamespace(
+            scrub_pii=lambda t: t.replace("jan@example.com", "[EMAIL]"),
+        )
+
+    def _execute_with_role(self, role, task):
+        return "niet gestreamd", 0.01, "ok"
+
+
+class _GeenCache:
+    """SemanticCache stand-in: altijd miss, niets opslaan."""
+
+    def lookup(self, agent, query):
+        return None
+
+    def store(self, *a, **kw):
+        return None
+
+
+class TestPhase67(unittest.TestCase):
+    """Phase 67: Incremental SSE Streaming."""
+
+    def setUp(self) -> None:
+        """Oracle BrainAgent met nep-brein."""
+        import swarm_engine as se
+        from danny_toolkit.brain.trinity_omega import CosmicRole
+        self.se = se
+        self.rol = CosmicRole.ORACLE
+        self.brain = _NepPrometheus(self.rol, ["Het ", "antwoord ", "is ", "42."])
+        self.agent = se.BrainAgent("Oracle", "Reasoning", self.rol)
+
+    def _engine(self):
+        engine = self.se.SwarmEngine(brain=self.brain)
+        engine._semantic_cache = _GeenCache()
+        return engine
+
+    # --- A. process_stream ---
+
+    def test_01_process_stream_tokens(self) -> None:
+        """Tokens gaan één voor één naar on_token; payload bevat het geheel."""
+        ontvangen = []
+        payload = asyncio.run(
+            self.agent.process_stream("wat is het antwoord", self.brain, ontvangen.append))
+        c(ontvangen == ["Het antwoord is 42."], f"tokens per zin ({ontvangen})")
+        c(payload.content == "Het antwoord is 42.", "payload = samengevoegde tokens")
+        c(payload.metadata.get("gestreamd") is True, "metadata gestreamd")
+        invoer, model = self.brain.brain.aanroepen[0]
+        c(invoer.startswith("Je bent Oracle.\n") and model == "nep-model",
+          "rol-context + model tier")
+        c(self.brain.brain.conversation_history == [], "schone history")
+
+    def test_02_only_plain_brain_agents(self) -> None:
+        """Subclasses met eigen process() en breinen zonder stream: geen streaming."""
+        c(self.agent.kan_streamen(self.brain), "Oracle kan streamen")
+        cipher = self.se.CipherAgent("Cipher", "Crypto", self.rol)
+        c(not cipher.kan_streamen(self.brain), "CIPHER niet")
+        zonder = types.SimpleNamespace(_execute_with_role=self.brain._execute_with_role)
+        c(not self.agent.kan_streamen(zonder), "brein zonder genereer_stream niet")
+        c(self.agent._stream_brein(self.brain.brain) is self.brain.brain,
+          "CentralBrain direct ook herkend")
+
+    # --- C. _timed_dispatch ---
+
+    def test_03_dispatch_streams_with_on_token(self) -> None:
+        """Met on_token → process_stream; zonder → process()."""
+        engine = self._engine()
+        tokens = []
+        res = asyncio.run(engine._timed_dispatch(
+            self.agent, "vraag", trace_id="t1", on_token=tokens.append))
+        c("".join(tokens) == res.content == "Het antwoord is 42.", "gestreamd")
+        c(res.trace_id == "t1", "trace_id gepropageerd")
+        res2 = asyncio.run(engine._timed_dispatch(self.agent, "vraag", trace_id="t2"))
+        c(res2.content == "niet gestreamd", "zonder on_token: process()")
+
+    def test_04_tokens_arrive_before_completion(self) -> None:
+        """Het eerste token komt binnen terwijl de agent nog loopt."""
+        engine = self._engine()
+        momenten = []
+
+        async def body():
+            taak = asyncio.create_task(engine._timed_dispatch(
+                self.agent, "vraag", on_token=lambda t: momenten.append(taak.done())))
+            return await taak
+        asyncio.run(body())
+        c(momenten and not any(momenten), "tokens vóór afronding van de taak")
+
+    # --- D. Voorlopige payloads ---
+
+    def test_05_provisional_payload_scrubbed(self) -> None:
+        """_meld_voorlopig: gescrubde kopie, origineel ongewijzigd."""
+        engine = self._engine()
+        gemeld = []
+
+        async def body():
+            payload = self.se.SwarmPayload(
+                agent="Oracle", type="text", content="x",
+                display_text="mail jan@example.com")
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_result(payload)
+            engine._meld_voorlopig(gemeld.append, fut)
+            return payload
+        origineel = asyncio.run(body())
+        c(len(gemeld) == 1 and gemeld[0].display_text == "mail [EMAIL]", "PII gescrubd")
+        c(origineel.display_text == "mail jan@example.com", "origineel onaangetast")
+
+        async def fout():
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_exception(RuntimeError("agent kapot"))
+            engine._meld_voorlopig(gemeld.append, fut)
+            fut.exception()
+        asyncio.run(fout())
+        c(len(gemeld) == 1, "mislukte taak niet gemeld")
+
+    def test_08_stream_tokens_scrubbed(self) -> None:
+        """Live tokens: PII over tokengrenzen gescrubd, onveilige code stopt de stream."""
+        self.brain.brain.tokens = ["Mail ", "jan@", "example.com", " gerust. ", "Tot ", "ziens."]
+        ontvangen = []
+        payload = asyncio.run(
+            self.agent.process_stream("vraag", self.brain, ontvangen.append))
+        c(ontvangen == ["Mail [EMAIL] gerust.", " Tot ziens."], f"per zin gescrubd ({ontvangen})")
+        c("jan@example.com" in payload.content, "payload ruw (volledige validatie volgt)")
+
+        self.brain.brain.tokens = ["Eerst veilig. ", "Dan os.system(", "'x'). ", "Rest."]
+        ontvangen = []
+        payload = asyncio.run(
+            self.agent.process_stream("vraag", self.brain, ontvangen.append))
+        c(ontvangen == ["Eerst veilig."], f"stream gestopt na onveilige zin ({ontvangen})")
+        c(payload.metadata.get("stream_geblokkeerd") is True, "metadata stream_geblokkeerd")
+
+    # --- E. Bedrading ---
+
+    def test_06_run_wiring(self) -> None:
+        """run() meldt payloads per taak en streamt tokens alleen bij één target."""
+        bron = inspect.getsource(self.se.SwarmEngine.run)
+        sig = inspect.signature(self.se.SwarmEngine.run)
+        c("on_payload" in sig.parameters and "on_token" in sig.parameters, "signatuur")
+        c("add_done_callback" in bron and "_meld_voorlopig" in bron, "per-agent melding")
+        c("len(targets) == 1" in bron, "tokens alleen bij één agent")
+
+    def test_07_server_stream_wiring(self) -> None:
+        """_stream_response: singleton engine + asyncio.Queue, geen buffer-en-wacht."""
+        bron = (PROJECT_ROOT / "fastapi_server.py").read_text(encoding="utf-8")
+        start = bron.index("async def _stream_response")
+        blok = bron[start:bron.index("\n@app.", start)]
+        c("_get_swarm_engine(brain)" in blok, "singleton engine")
+        c("SwarmEngine(brain=brain)" not in blok, "geen engine per stream")
+        c("asyncio.Queue" in blok and "call_soon_threadsafe" in blok, "queue, thread-safe")
+        c("on_payload=" in blok and "on_token=" in blok, "agent + token events")
+        c("taak.cancel()" in blok, "pipeline stopt bij disconnect")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 67: Incremental SSE Streaming")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
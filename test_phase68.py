@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Test Phase 68: Single-Flight Request Coalescing
+================================================
+9 tests · 30+ checks
+
+Valideert:
+  A. RequestCoalescer: gelijktijdige identieke sleutels → één uitvoering
+  B. Resultaat-cache met TTL; fouten en error payloads worden niet gecachet
+  C. Eigenaar haakt af: uitvoering loopt door voor wachtenden, anders gestopt
+  D. SwarmEngine.run: gedeelde payloads (kopie + metadata) i.p.v. weigering
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase68.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import unittest
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _Werk:
+    """Telt uitvoeringen; elke uitvoering duurt even."""
+
+    def __init__(self, resultaat="antwoord", duur: float = 0.05) -> None:
+        self.resultaat = resultaat
+        self.duur = duur
+        self.aantal = 0
+        self.afgebroken = 0
+
+    async def __call__(self):
+        self.aantal += 1
+        try:
+            await asyncio.sleep(self.duur)
+        except asyncio.CancelledError:
+            self.afgebroken += 1
+            raise
+        if isinstance(self.resultaat, Exception):
+            raise self.resultaat
+        return self.resultaat
+
+
+class TestPhase68(unittest.TestCase):
+    """Phase 68: Single-Flight Request Coalescing."""
+
+    def setUp(self) -> None:
+        """Verse coalescer."""
+        from danny_toolkit.core.request_coalescer import RequestCoalescer
+        self.RC = RequestCoalescer
+        self.co = RequestCoalescer(ttl_s=60)
+
+    # --- A. Single-flight ---
+
+    def test_01_concurrent_identical_run_once(self) -> None:
+        """Vijf gelijktijdige aanvragen → één uitvoering, zelfde resultaat."""
+        werk = _Werk()
+        sleutel = self.RC.sleutel("Wat is  de prijs?")
+
+        async def body():
+            return await asyncio.gather(*[self.co.uitvoeren(sleutel, werk) for _ in range(5)])
+        res = asyncio.run(body())
+        c(werk.aantal == 1, f"één uitvoering ({werk.aantal})")
+        c(all(r == "antwoord" for r, _ in res), "iedereen hetzelfde resultaat")
+        bronnen = sorted(b for _, b in res)
+        c(bronnen == ["gecoalesceerd"] * 4 + ["uitgevoerd"], f"bronnen ({bronnen})")
+        c(self.co.stats()["in_vlucht"] == 0, "vlucht afgemeld")
+
+    def test_02_key_normalisation(self) -> None:
+        """Hoofdletters en whitespace maken geen verschil; inhoud wel."""
+        c(self.RC.sleutel("  Hallo   Wereld ") == self.RC.sleutel("hallo wereld"), "genormaliseerd")
+        c(self.RC.sleutel("hallo wereld") != self.RC.sleutel("hallo wereld!"), "inhoud telt")
+        c(self.RC.sleutel("caf\u00e9") == self.RC.sleutel("cafe\u0301"), "unicode NFC")
+
+    # --- B. Resultaat-cache ---
+
+    def test_03_ttl_cache_and_expiry(self) -> None:
+        """Binnen TTL uit de cache; daarna opnieuw uitvoeren."""
+        werk = _Werk(duur=0)
+        asyncio.run(self.co.uitvoeren("k", werk))
+        _, bron = asyncio.run(self.co.uitvoeren("k", werk))
+        c(bron == "cache" and werk.aantal == 1, "tweede keer uit cache")
+        self.co._resultaten["k"] = (self.co._resultaten["k"][0] - 61, "antwoord")
+        _, bron = asyncio.run(self.co.uitvoeren("k", werk))
+        c(bron == "uitgevoerd" and werk.aantal == 2, "verlopen → opnieuw")
+        uit = self.RC(ttl_s=0)
+        asyncio.run(uit.uitvoeren("k", werk))
+        _, bron = asyncio.run(uit.uitvoeren("k", werk))
+        c(bron == "uitgevoerd" and uit.stats()["gecacht"] == 0, "ttl 0 = geen cache")
+
+    def test_04_errors_not_cached(self) -> None:
+        """Exceptions gaan naar alle wachtenden en worden niet gecachet."""
+        werk = _Werk(RuntimeError("kapot"))
+
+        async def body():
+            return await asyncio.gather(
+                *[self.co.uitvoeren("f", werk) for _ in range(3)], return_exceptions=True)
+        res = asyncio.run(body())
+        c(all(isinstance(r, RuntimeError) for r in res), "fout bij iedereen")
+        c(werk.aantal == 1 and self.co.stats()["gecacht"] == 0, "één poging, niets gecachet")
+        werk2 = _Werk(["error"], duur=0)
+        asyncio.run(self.co.uitvoeren("e", werk2, cachebaar=lambda r: r != ["error"]))
+        asyncio.run(self.co.uitvoeren("e", werk2, cachebaar=lambda r: r != ["error"]))
+        c(werk2.aantal == 2, "niet-cachebaar resultaat opnieuw uitgevoerd")
+
+    # --- C. Afhaken ---
+
+    def test_05_owner_cancel_keeps_waiters(self) -> None:
+        """Eigenaar geannuleerd: de wachtende krijgt toch het resultaat."""
+        werk = _Werk(duur=0.1)
+
+        async def body():
+            eigenaar = asyncio.create_task(self.co.uitvoeren("x", werk))
+            await asyncio.sleep(0.01)
+            wachter = asyncio.create_task(self.co.uitvoeren("x", werk))
+            await asyncio.sleep(0.01)
+            eigenaar.cancel()
+            return await wachter, eigenaar
+        (res, bron), eigenaar = asyncio.run(body())
+        c(eigenaar.cancelled(), "eigenaar geannuleerd")
+        c(res == "antwoord" and bron == "gecoalesceerd", "wachter bediend")
+        c(werk.afgebroken == 0 and werk.aantal == 1, "uitvoering liep door")
+
+    def test_06_abandoned_flight_cancelled(self) -> None:
+        """Niemand wacht meer: uitvoering stopt en de sleutel is weer vrij."""
+        werk = _Werk(duur=1.0)
+
+        async def body():
+            taak = asyncio.create_task(self.co.uitvoeren("y", werk))
+            await asyncio.sleep(0.01)
+            taak.cancel()
+            await asyncio.sleep(0.01)
+            werk.duur = 0
+            return await self.co.uitvoeren("y", werk)
+        res, bron = asyncio.run(body())
+        c(werk.afgebroken == 1, "verlaten uitvoering geannuleerd")
+        c(bron == "uitgevoerd" and werk.aantal == 2, "nieuwe aanvraag voert opnieuw uit")
+
+    # --- D. SwarmEngine ---
+
+    def test_07_engine_shares_payloads(self) -> None:
+        """run(): duplicaten delen de pipeline; herhaling uit de cache, geen weigering."""
+        import swarm_engine as se
+        engine = se.SwarmEngine.__new__(se.SwarmEngine)
+        engine._coalescer = self.RC(ttl_s=60)
+        engine._swarm_metrics = {"echo_guard_blocks": 0, "coalesced_requests": 0}
+        pipeline = _Werk([se.SwarmPayload(agent="Oracle", type="text",
+                                          content="42", display_text="42")])
+
+        async def nep_run(self_, user_input, callback=None, on_payload=None, on_token=None):
+            return await pipeline()
+        berichten = []
+        run = se._coalesceer(nep_run)
+
+        async def body():
+            return await asyncio.gather(
+                run(engine, "Wat is het antwoord?"),
+                run(engine, "wat is het  antwoord?", berichten.append))
+        a, b = asyncio.run(body())
+        d = asyncio.run(run(engine, "WAT is het antwoord?"))
+        c(pipeline.aantal == 1, f"pipeline één keer ({pipeline.aantal})")
+        c(a[0].content == b[0].content == d[0].content == "42", "zelfde antwoord")
+        c(b[0] is not a[0] and b[0].metadata.get("coalesced") is True, "kopie + coalesced vlag")
+        c(d[0].metadata.get("result_cache") is True, "cache vlag")
+        c("coalesced" not in a[0].metadata, "origineel onaangetast")
+        c(engine._swarm_metrics["coalesced_requests"] == 1
+          and engine._swarm_metrics["echo_guard_blocks"] == 1, "metrics")
+        c(len(berichten) == 1, "callback meldt het delen")
+
+    def test_08_wiring(self) -> None:
+        """De weigering is weg; run is omwikkeld en error payloads niet cachebaar."""
+        import swarm_engine as se
+        bron = inspect.getsource(se)
+        c("net beantwoord" not in bron and "_recent_queries" not in bron, "geen echo weigering")
+        c("@_coalesceer" in bron, "run is omwikkeld")
+        fout = se.SwarmPayload(agent="X", type="error", content="kapot")
+        goed = se.SwarmPayload(agent="X", type="text", content="ok")
+        c(se._cachebaar_resultaat([goed]) and not se._cachebaar_resultaat([goed, fout]),
+          "error payloads niet gecachet")
+        c(not se._cachebaar_resultaat([]), "leeg resultaat niet gecachet")
+
+    def test_09_callbacks_fan_out(self) -> None:
+        """Status-updates gaan naar alle wachtenden; streaming krijgt een eigen run."""
+        import swarm_engine as se
+        engine = se.SwarmEngine.__new__(se.SwarmEngine)
+        engine._coalescer = self.RC(ttl_s=0)
+        engine._swarm_metrics = {"echo_guard_blocks": 0, "coalesced_requests": 0}
+        pipeline = _Werk([se.SwarmPayload(agent="Oracle", type="text",
+                                          content="42", display_text="42")])
+
+        async def nep_run(self_, user_input, callback=None, on_payload=None, on_token=None):
+            await asyncio.sleep(0.02)
+            if callback:
+                callback("route: Oracle")
+            return await pipeline()
+        run = se._coalesceer(nep_run)
+        eerste, tweede = [], []
+
+        async def body():
+            return await asyncio.gather(
+                run(engine, "vraag", eerste.append),
+                run(engine, "vraag", tweede.append))
+        asyncio.run(body())
+        c(pipeline.aantal == 1, "één gedeelde run")
+        c("route: Oracle" in eerste and "route: Oracle" in tweede, "beide callbacks gevoed")
+        c(engine._coalesce_luisteraars == {}, "luisteraars opgeruimd")
+
+        tokens = []
+
+        async def stream():
+            return await asyncio.gather(
+                run(engine, "vraag", eerste.append),
+                run(engine, "vraag", on_token=lambda a, t: tokens.append(t)))
+        asyncio.run(stream())
+        c(pipeline.aantal == 3, "streaming aanroep niet gecoalesceerd")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 68: Single-Flight Request Coalescing")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test Phase 70: Warm Component Registry
+=======================================
+7 tests · 30+ checks
+
+Valideert:
+  A. ComponentRegistry: eenmalig oplossen, fouten onthouden, thread-safe
+  B. warm(): alleen open componenten, timings + stats
+  C. SwarmEngine.run: hot-path componenten één keer per engine, geen imports
+  D. SwarmEngine.warm() + fastapi startup/health bedrading
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase70.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class _Teller:
+    """Fabriek die telt hoe vaak hij draait."""
+
+    def __init__(self, waarde=None, fout: Exception = None, duur: float = 0.0) -> None:
+        self.waarde = waarde
+        self.fout = fout
+        self.duur = duur
+        self.aanroepen = 0
+
+    def __call__(self):
+        self.aanroepen += 1
+        if self.duur:
+            time.sleep(self.duur)
+        if self.fout is not None:
+            raise self.fout
+        return self.waarde
+
+
+class _Agent:
+    """Agent die alleen telt hoe vaak hij draait."""
+
+    def __init__(self) -> None:
+        self.name = "Nep"
+        self.aanroepen = 0
+
+    async def process(self, task, brain=None):
+        import swarm_engine as se
+        self.aanroepen += 1
+        return se.SwarmPayload(agent="Nep", type="text", content="klaar",
+                               display_text="klaar")
+
+
+class TestPhase70(unittest.TestCase):
+    """Phase 70: Warm Component Registry."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core.component_registry import ComponentRegistry
+        self.Reg = ComponentRegistry
+
+    # --- A. Registry ---
+
+    def test_01_resolves_once(self) -> None:
+        """Fabriek draait één keer; daarna de gecachte waarde."""
+        reg = self.Reg()
+        fabriek = _Teller(waarde=print)
+        reg.registreer("print", fabriek)
+        c(reg.stats()["opgelost"] == [], "lazy: nog niets opgelost")
+        c(reg.get("print") is print and reg.get("print") is print, "waarde")
+        c(fabriek.aanroepen == 1, f"één keer ({fabriek.aanroepen})")
+        c(reg.get("bestaat_niet") is None, "onbekend -> None")
+        reg.vergeet("print")
+        reg.get("print")
+        c(fabriek.aanroepen == 2, "vergeet lost opnieuw op")
+
+    def test_02_failure_remembered(self) -> None:
+        """Mislukte import: None, fout in stats, niet elke get opnieuw proberen."""
+        reg = self.Reg()
+        fabriek = _Teller(fout=ImportError("geen module"))
+        reg.registreer("stuk", fabriek)
+        c(reg.get("stuk") is None and reg.get("stuk") is None, "None")
+        c(fabriek.aanroepen == 1, "fout gecachet")
+        c("geen module" in reg.stats()["fouten"]["stuk"], "fout in stats")
+        reg.registreer("stuk", _Teller(waarde=1))
+        c(reg.get("stuk") == 1 and "stuk" not in reg.stats()["fouten"],
+          "herregistratie wist fout")
+
+    def test_03_thread_safe(self) -> None:
+        """Acht threads tegelijk: de trage fabriek draait één keer."""
+        reg = self.Reg()
+        fabriek = _Teller(waarde=object(), duur=0.05)
+        reg.registreer("traag", fabriek)
+        gezien = []
+        threads = [threading.Thread(target=lambda: gezien.append(reg.get("traag")))
+                   for _ in range(8)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        c(fabriek.aanroepen == 1, f"één keer ({fabriek.aanroepen})")
+        c(len(gezien) == 8 and all(g is fabriek.waarde for g in gezien), "zelfde waarde")
+
+    # --- B. warm() ---
+
+    def test_04_warm(self) -> None:
+        """warm() lost alleen open componenten op en rapporteert timings."""
+        reg = self.Reg()
+        a, b = _Teller(waarde=1, duur=0.02), _Teller(waarde=2)
+        reg.registreer("a", a)
+        reg.registreer("b", b)
+        reg.get("b")
+        timings = reg.warm()
+        c(set(timings) == {"a"}, f"alleen open ({set(timings)})")
+        c(timings["a"] >= 15, f"laadtijd gemeten ({timings['a']}ms)")
+        c(reg.warm() == {}, "tweede warm doet niets")
+        c(a.aanroepen == 1 and b.aanroepen == 1, "geen dubbel werk")
+        c(sorted(reg.stats()["opgelost"]) == ["a", "b"], "stats")
+
+    # --- C. SwarmEngine hot path ---
+
+    def _engine(self):
+        import swarm_engine as se
+        engine = se.SwarmEngine()
+        engine._coalescer = None
+        engine._synapse_instance = None
+        engine._phantom_instance = None
+        engine._cortex = False
+        agent = _Agent()
+        engine.agents = {"NEP": agent}
+        engine._ophalen_memex_context = lambda tekst: []
+
+        async def route(tekst):
+            return ["NEP"]
+        engine.route = route
+        return engine, agent
+
+    def test_05_run_resolves_components_once(self) -> None:
+        """Twee runs: elke hot-path fabriek draait hooguit één keer."""
+        engine, agent = self._engine()
+        reg = self.Reg()
+        tellers = {}
+
+        class _Learning:
+            def get_cached_response(self, tekst):
+                return None
+
+            def log_chat(self, *a, **kw):
+                tellers.setdefault("log_chat", 0)
+                tellers["log_chat"] = tellers["log_chat"] + 1
+
+        echt = engine._componenten
+        for naam in ("tracer", "sentinel", "bus", "events", "forge", "schild",
+                     "sensorium_events"):
+            tellers[naam] = _Teller(waarde=echt.get(naam))
+            reg.registreer(naam, tellers[naam])
+        tellers["learning"] = _Teller(waarde=_Learning())
+        reg.registreer("learning", tellers["learning"])
+        tellers["cortex"] = _Teller(waarde=None)
+        reg.registreer("cortex", tellers["cortex"])
+        engine._componenten = reg
+
+        for vraag in ("vertel iets over de swarm", "leg de pipeline uit"):
+            res = asyncio.run(engine.run(vraag))
+            c(res and res[0].content == "klaar", f"run ok: {vraag[:12]}")
+        c(agent.aanroepen == 2, "agent twee keer")
+        dubbel = {n: t.aanroepen for n, t in tellers.items()
+                  if isinstance(t, _Teller) and t.aanroepen > 1}
+        c(not dubbel, f"geen herhaalde lookups {dubbel}")
+        c(tellers["learning"].aanroepen == 1 and tellers["log_chat"] == 2,
+          "één LearningSystem, twee log_chat")
+
+    def test_06_run_has_no_per_request_imports(self) -> None:
+        """run() importeert geen Config/tracer/sentinel/bus/LearningSystem meer."""
+        import swarm_engine as se
+        bron = inspect.getsource(se.SwarmEngine.run)
+        for verboden in ("from danny_toolkit.core.config import",
+                         "from danny_toolkit.core.request_tracer import",
+                         "from danny_toolkit.brain.eternal_sentinel import",
+                         "from danny_toolkit.core.neural_bus import",
+                         "from danny_toolkit.learning import",
+                         "from danny_toolkit.brain.cortex import"):
+            c(verboden not in bron, f"geen '{verboden.split()[1]}'")
+        c('self._componenten.get("tracer")' in bron, "tracer via registry")
+
+    # --- D. warm() + server ---
+
+    def test_07_engine_warm_and_server_wiring(self) -> None:
+        """SwarmEngine.warm() rapport; startup warmt, /health toont het."""
+        engine, _ = self._engine()
+        rapport = engine.warm()
+        c({"componenten", "embedding_model", "router_profielen", "synapse",
+           "phantom"} == set(rapport["stappen"]), f"stappen {set(rapport['stappen'])}")
+        c(rapport["duur_ms"] >= 0 and "tracer" in rapport["componenten"]["opgelost"],
+          "componenten opgelost")
+        c(engine._componenten.warm() == {}, "na warm() niets meer open")
+
+        bron = (PROJECT_ROOT / "fastapi_server.py").read_text(encoding="utf-8")
+        start = bron.index("async def _startup_event")
+        blok = bron[start:bron.index("\nasync def ", start + 10)]
+        c("_warm_swarm_engine" in blok and "SWARM_WARM_ON_STARTUP" in blok,
+          "startup warm stap")
+        start = bron.index("async def health_pulse")
+        blok = bron[start:bron.index("\n@app.", start)]
+        c('"warm": _WARM_STATUS' in blok, "warm-up op /api/v1/health")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 70: Warm Component Registry")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test Phase 71: Workload Pools
+==============================
+7 tests · 25+ checks
+
+Valideert:
+  A. WorkloadPool: calls/errors/avg, wachtrijdiepte en wachttijd
+  B. draai(): contextvars mee, exceptions door; loop-shutdown is een no-op
+  C. Isolatie: een verzadigde storage pool vertraagt de io pool niet
+  D. get_pool / Config groottes / get_pipeline_metrics + SwarmEngine bedrading
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase71.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+_VAR = contextvars.ContextVar("phase71", default="leeg")
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _kapot():
+    raise ValueError("kapot")
+
+
+class TestPhase71(unittest.TestCase):
+    """Phase 71: Workload Pools."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import workload_pools as wp
+        self.wp = wp
+        self.pools = []
+
+    def tearDown(self) -> None:
+        for pool in self.pools:
+            pool.sluit(wait=False)
+
+    def _pool(self, naam: str, workers: int):
+        pool = self.wp.WorkloadPool(naam, workers)
+        self.pools.append(pool)
+        return pool
+
+    # --- A. Metrics ---
+
+    def test_01_call_metrics(self) -> None:
+        """calls, errors, avg_ms, success_rate, last_error."""
+        pool = self._pool("t1", 2)
+        c(pool.submit(lambda: 42).result() == 42, "resultaat")
+        pool.submit(time.sleep, 0.05).result()
+        with self.assertRaises(ValueError):
+            pool.submit(_kapot).result()
+        s = pool.stats()
+        c(s["calls"] == 3 and s["errors"] == 1, f"calls/errors {s['calls']}/{s['errors']}")
+        c(s["avg_ms"] >= 15, f"avg_ms ({s['avg_ms']})")
+        c(abs(s["success_rate"] - 66.7) < 0.1, "success_rate")
+        c(s["last_error"] == "kapot", "last_error")
+        c(s["workers"] == 2 and s["active"] == 0 and s["queue_depth"] == 0, "rust")
+
+    def test_02_queue_depth_and_wait(self) -> None:
+        """Eén worker bezet: tweede taak staat in de wachtrij en wacht gemeten."""
+        pool = self._pool("t2", 1)
+        los = threading.Event()
+        eerste = pool.submit(los.wait, 5)
+        tweede = pool.submit(lambda: "tweede")
+        time.sleep(0.1)
+        s = pool.stats()
+        c(s["active"] == 1 and s["queue_depth"] == 1, f"actief/wachtrij {s['active']}/{s['queue_depth']}")
+        los.set()
+        eerste.result()
+        c(tweede.result() == "tweede", "tweede draait na vrijgave")
+        s = pool.stats()
+        c(s["queue_depth"] == 0, "wachtrij leeg")
+        c(s["wait_ms_max"] >= 90, f"wachttijd gemeten ({s['wait_ms_max']}ms)")
+
+    # --- B. draai() + shutdown ---
+
+    def test_03_draai_context_and_errors(self) -> None:
+        """draai() neemt contextvars mee en geeft exceptions door."""
+        pool = self._pool("t3", 2)
+
+        async def body():
+            _VAR.set("request-1")
+            waarde = await pool.draai(_VAR.get)
+            with self.assertRaises(ValueError):
+                await pool.draai(_kapot)
+            return waarde, await pool.draai(lambda a, b=0: a + b, 1, b=2)
+        waarde, som = asyncio.run(body())
+        c(waarde == "request-1", "contextvar in worker thread")
+        c(som == 3, "args + kwargs")
+
+    def test_04_loop_shutdown_is_noop(self) -> None:
+        """Als default executor: twee asyncio.run() na elkaar; sluit() stopt echt."""
+        pool = self._pool("t4", 2)
+
+        async def body():
+            asyncio.get_running_loop().set_default_executor(pool)
+            return await asyncio.to_thread(lambda: threading.current_thread().name)
+        namen = [asyncio.run(body()), asyncio.run(body())]
+        c(all(n.startswith("pool-t4") for n in namen), f"draait in pool ({namen})")
+        pool.sluit()
+        with self.assertRaises(RuntimeError):
+            pool.submit(lambda: 1)
+        c(pool.stats()["queue_depth"] == 0, "geweigerde submit niet in wachtrij")
+
+    # --- C. Isolatie ---
+
+    def test_05_slow_storage_does_not_starve_io(self) -> None:
+        """Storage vol met trage queries; io taak start toch direct."""
+        storage = self._pool("opslag", 2)
+        io = self._pool("llm", 2)
+
+        async def body():
+            traag = [storage.draai(time.sleep, 0.4) for _ in range(6)]
+            taken = [asyncio.ensure_future(t) for t in traag]
+            await asyncio.sleep(0.05)
+            t0 = time.perf_counter()
+            await io.draai(time.sleep, 0.01)
+            io_ms = (time.perf_counter() - t0) * 1000
+            wachtrij = storage.stats()["queue_depth"]
+            await asyncio.gather(*taken)
+            return io_ms, wachtrij
+        io_ms, wachtrij = asyncio.run(body())
+        c(wachtrij >= 3, f"storage wachtrij ({wachtrij})")
+        c(io_ms < 150, f"io niet uitgehongerd ({io_ms:.0f}ms)")
+        c(io.stats()["wait_ms_max"] < 50, "io wachttijd laag")
+        c(storage.stats()["wait_ms_max"] >= 300, "storage wachttijd zichtbaar")
+
+    # --- D. Registry + bedrading ---
+
+    def test_06_get_pool_and_metrics(self) -> None:
+        """get_pool singleton, Config groottes, pools in get_pipeline_metrics."""
+        from danny_toolkit.core.config import Config
+        wp = self.wp
+        c(wp.get_pool(wp.STORAGE) is wp.get_pool(wp.STORAGE), "singleton")
+        oud = Config.SWARM_CPU_WORKERS
+        Config.SWARM_CPU_WORKERS = 3
+        try:
+            c(wp._pool_grootte(wp.CPU) == 3, "Config grootte")
+        finally:
+            Config.SWARM_CPU_WORKERS = oud
+        Config.SWARM_CPU_WORKERS = 0
+        try:
+            c(wp._pool_grootte(wp.CPU) == wp._STANDAARD_WORKERS[wp.CPU], "0 = automatisch")
+        finally:
+            Config.SWARM_CPU_WORKERS = oud
+        wp.get_pool(wp.STORAGE).submit(lambda: None).result()
+        import swarm_engine as se
+        metrics = se.get_pipeline_metrics()
+        c("pool:storage" in metrics, "pool in get_pipeline_metrics")
+        velden = {"calls", "errors", "avg_ms", "success_rate", "last_error",
+                  "queue_depth", "wait_ms_avg", "wait_ms_max", "workers"}
+        c(velden <= set(metrics["pool:storage"]), "agent-compatibele velden + pool velden")
+
+    def test_07_swarm_wiring(self) -> None:
+        """run(): io pool als default; MEMEX/Chroma via storage, embedding via cpu."""
+        import swarm_engine as se
+        run = inspect.getsource(se.SwarmEngine.run)
+        c("set_default_executor(get_pool(IO))" in run, "io pool default executor")
+        c("ThreadPoolExecutor(" not in run, "geen per-engine executor meer")
+        c("get_pool(STORAGE).draai(\n                self._ophalen_memex_context" in run,
+          "MEMEX via storage")
+        c("get_pool(CPU).draai(\n                    self.synapse.categorize_query" in run,
+          "Synapse categorisatie via cpu")
+        route = inspect.getsource(se.SwarmEngine.route)
+        c("get_pool(CPU).draai(\n                self._router.route" in route, "router via cpu")
+        memex = inspect.getsource(se.MemexAgent)
+        c(memex.count("get_pool(STORAGE).draai(") >= 2, "MemexAgent zoekt via storage")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 71: Workload Pools")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
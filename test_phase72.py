@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test Phase 72: NeuralBus Dispatch Lanes
+========================================
+7 tests · 30+ checks
+
+Valideert:
+  A. Inline (default): oud gedrag, synchroon, fouten geteld
+  B. Pool/async lanes: trage subscriber blokkeert de publisher niet,
+     volgorde binnen een lane blijft behouden
+  C. Wachtrij beleid: drop_oudste, drop_nieuwste, blokkeer (backpressure)
+  D. statistieken(): lanes met backlog/latency counters; bedrading
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase72.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+TYPE = "phase72_test"
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class TestPhase72(unittest.TestCase):
+    """Phase 72: NeuralBus Dispatch Lanes."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import neural_bus as nb
+        self.nb = nb
+        self.bus = nb.NeuralBus()
+
+    def tearDown(self) -> None:
+        self.bus.flush(timeout=5)
+        self.bus.reset()
+
+    def _lane(self, callback):
+        return next(l for l in self.bus.statistieken()["lanes"]
+                    if l["subscriber"] == callback.__qualname__)
+
+    # --- A. Inline ---
+
+    def test_01_inline_default(self) -> None:
+        """Default modus: callback draait synchroon op de publisher thread."""
+        threads = []
+
+        def handler(event):
+            threads.append(threading.current_thread().name)
+
+        def kapot(event):
+            raise ValueError("kapot")
+
+        self.bus.subscribe(TYPE, handler)
+        self.bus.subscribe(TYPE, kapot)
+        self.bus.publish(TYPE, {"n": 1}, bron="test")
+        c(threads == [threading.current_thread().name], "synchroon, zelfde thread")
+        stats = self.bus.statistieken()
+        c(stats["events_afgeleverd"] == 1 and stats["fouten"] == 1, "afgeleverd/fouten")
+        c(stats["subscribers"] == 2, "subscribers blijft een int")
+        lane = self._lane(handler)
+        c(lane["modus"] == "inline" and lane["afgeleverd"] == 1, "inline lane counters")
+        c(self._lane(kapot)["fouten"] == 1, "fout per subscriber")
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(TYPE, handler, modus="raket")
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(TYPE, handler, beleid="gooi_weg")
+
+    def test_02_unsubscribe_and_raw_list(self) -> None:
+        """unsubscribe stopt de lane; direct uit _subscribers halen werkt ook."""
+        gezien = []
+
+        def handler(event):
+            gezien.append(event.data["n"])
+
+        self.bus.subscribe(TYPE, handler, modus="pool")
+        self.bus.publish(TYPE, {"n": 1})
+        c(self.bus.flush(timeout=2), "flush")
+        self.bus.unsubscribe(TYPE, handler)
+        self.bus.publish(TYPE, {"n": 2})
+        self.bus.flush(timeout=2)
+        c(gezien == [1], f"na unsubscribe niets meer ({gezien})")
+        self.bus.subscribe(TYPE, handler)
+        self.bus._subscribers[TYPE].remove(handler)
+        self.bus.publish(TYPE, {"n": 3})
+        c(gezien == [1], "lijst blijft leidend")
+
+    # --- B. Pool / async ---
+
+    def test_03_pool_lane_does_not_block(self) -> None:
+        """Trage pool subscriber: publish keert direct terug, volgorde blijft."""
+        gezien = []
+
+        def traag(event):
+            time.sleep(0.05)
+            gezien.append(event.data["n"])
+
+        self.bus.subscribe(TYPE, traag, modus="pool")
+        t0 = time.perf_counter()
+        for n in range(10):
+            self.bus.publish(TYPE, {"n": n})
+        publish_ms = (time.perf_counter() - t0) * 1000
+        c(publish_ms < 100, f"publisher niet geblokkeerd ({publish_ms:.0f}ms)")
+        c(self._lane(traag)["backlog"] > 0, "backlog zichtbaar")
+        c(self.bus.flush(timeout=5), "flush")
+        c(gezien == list(range(10)), f"volgorde behouden ({gezien})")
+        lane = self._lane(traag)
+        c(lane["afgeleverd"] == 10 and lane["backlog"] == 0, "alles afgeleverd")
+        c(lane["latency_ms_max"] >= 400, f"latency incl. wachttijd ({lane['latency_ms_max']}ms)")
+
+    def test_04_async_lane(self) -> None:
+        """Async lane: coroutines draaien op de vaste achtergrond-loop."""
+        gezien = []
+
+        async def handler(event):
+            await asyncio.sleep(0.01)
+            gezien.append((event.data["n"], threading.current_thread().name))
+
+        self.bus.subscribe(TYPE, handler, modus="async")
+        t0 = time.perf_counter()
+        for n in range(5):
+            self.bus.publish(TYPE, {"n": n})
+        c((time.perf_counter() - t0) * 1000 < 40, "publisher wacht niet")
+        c(self.bus.flush(timeout=3), "flush")
+        c([n for n, _ in gezien] == list(range(5)), "volgorde behouden")
+        c(all(naam == "neuralbus-async" for _, naam in gezien), "achtergrond-loop")
+        c(self._lane(handler)["afgeleverd"] == 5, "afgeleverd")
+
+    # --- C. Beleid ---
+
+    def _bezette_lane(self, beleid: str, **kw):
+        """Lane (max 3) waarvan de eerste aflevering blijft hangen."""
+        los = threading.Event()
+        gezien = []
+
+        def handler(event):
+            los.wait(5)
+            gezien.append(event.data["n"])
+
+        self.bus.subscribe(TYPE, handler, modus="pool", max_wachtrij=3,
+                           beleid=beleid, **kw)
+        self.bus.publish(TYPE, {"n": 0})
+        deadline = time.time() + 2
+        while self._lane(handler)["backlog"] and time.time() < deadline:
+            time.sleep(0.005)  # n=0 is opgepakt en hangt
+        return handler, los, gezien
+
+    def test_05_drop_policies(self) -> None:
+        """drop_oudste houdt de nieuwste, drop_nieuwste de oudste events."""
+        handler, los, gezien = self._bezette_lane("drop_oudste")
+        for n in range(1, 7):
+            self.bus.publish(TYPE, {"n": n})
+        c(self._lane(handler)["backlog"] == 3, "backlog begrensd")
+        los.set()
+        self.bus.flush(timeout=3)
+        c(gezien == [0, 4, 5, 6], f"drop_oudste ({gezien})")
+        c(self._lane(handler)["gedropt"] == 3, "gedropt geteld")
+        self.bus.reset()
+
+        handler, los, gezien = self._bezette_lane("drop_nieuwste")
+        for n in range(1, 7):
+            self.bus.publish(TYPE, {"n": n})
+        los.set()
+        self.bus.flush(timeout=3)
+        c(gezien == [0, 1, 2, 3], f"drop_nieuwste ({gezien})")
+        stats = self.bus.statistieken()
+        c(stats["lane_gedropt"] == 3, "lane_gedropt totaal")
+
+    def test_06_blocking_backpressure(self) -> None:
+        """blokkeer: publisher wacht op ruimte, niets gaat verloren."""
+        handler, los, gezien = self._bezette_lane("blokkeer")
+        for n in range(1, 4):
+            self.bus.publish(TYPE, {"n": n})
+        threading.Timer(0.2, los.set).start()
+        t0 = time.perf_counter()
+        self.bus.publish(TYPE, {"n": 4})
+        wacht_ms = (time.perf_counter() - t0) * 1000
+        c(wacht_ms >= 150, f"publisher kreeg backpressure ({wacht_ms:.0f}ms)")
+        self.bus.flush(timeout=3)
+        c(gezien == [0, 1, 2, 3, 4], f"niets verloren ({gezien})")
+        c(self._lane(handler)["gedropt"] == 0, "niets gedropt")
+        c(self._lane(handler)["max_backlog"] == 3, "max_backlog")
+
+    # --- D. Bedrading ---
+
+    def test_07_wiring(self) -> None:
+        """Persistentie via lane, bus pool, trage subscribers op pool lanes."""
+        from danny_toolkit.core import workload_pools as wp
+        c(wp.BUS in wp._CONFIG_SLEUTELS, "bus pool")
+        publish = inspect.getsource(self.nb.NeuralBus.publish)
+        verspreid = inspect.getsource(self.nb.NeuralBus._verspreid)
+        c("store_event" not in publish and "_persist_lane.plaats" in verspreid,
+          "persistentie niet inline")
+        sentinel = (PROJECT_ROOT / "danny_toolkit/brain/eternal_sentinel.py"
+                    ).read_text(encoding="utf-8")
+        c(sentinel.count('modus="pool"') >= 2, "sentinel GPU handlers op pool lane")
+        zintuig = (PROJECT_ROOT / "danny_toolkit/brain/zesde_zintuig.py"
+                   ).read_text(encoding="utf-8")
+        c('bus.subscribe("*", self._on_bus_event, modus="pool")' in zintuig,
+          "UI subscriber op pool lane")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 72: NeuralBus Dispatch Lanes")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test Phase 73: Sign-Once Event Sealing
+=======================================
+7 tests · 30+ checks
+
+Valideert:
+  A. Canonieke bytes één keer berekend en op het event bewaard
+  B. Fast path: eigen events zonder tweede json.dumps/HMAC, TTL + nonce blijven
+  C. Externe events: uit_zegel() + verify over de meegestuurde bytes
+  D. verify_batch(): één ledger lock, per-item uitslag; ontvang_batch() op de bus
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase73.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+CHECK = 0
+TYPE = "phase73_test"
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class TestPhase73(unittest.TestCase):
+    """Phase 73: Sign-Once Event Sealing."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import neural_bus as nb
+        self.nb = nb
+        self._oude_key = nb.OmegaSeal._key
+        nb.OmegaSeal._key = hashlib.sha256(b"phase73").digest()
+        self.bus = nb.NeuralBus()
+
+    def tearDown(self) -> None:
+        self.bus.reset()
+        self.nb.OmegaSeal._key = self._oude_key
+
+    def _ander_proces(self, data: dict):
+        """Event zoals een ander proces met dezelfde key het signde."""
+        event = self.nb.BusEvent(TYPE, data, bron="extern")
+        return event.zegel()
+
+    # --- A. Sign-once ---
+
+    def test_01_canonical_cached(self) -> None:
+        """Canonieke bytes bij creatie gecachet en gelijk aan een herberekening."""
+        event = self.nb.BusEvent(TYPE, {"temp": 12, "stad": "Amsterdam"}, bron="test")
+        c(bool(event.omega_seal), "gesigned")
+        c(isinstance(event._canonical, bytes) and event._canonical, "bytes bewaard")
+        opnieuw = self.nb.OmegaSeal.canoniek(
+            {"event_type": TYPE, "data": event.data, "bron": "test"},
+            event._aegis_ts, event._aegis_nonce,
+        )
+        c(event.canonical == opnieuw, "identiek aan herberekening")
+        velden = json.loads(event.canonical)
+        c(velden["_aegis_nonce"] == event._aegis_nonce, "nonce in de bytes")
+        seal, ts, nonce = self.nb.OmegaSeal.sign_payload({"a": 1})
+        c(len(seal) == 64 and ts > 0 and len(nonce) == 16, "sign_payload API ongewijzigd")
+
+    def test_02_publish_serialises_once(self) -> None:
+        """publish(): één json.dumps (bij het signen), geen tweede voor verify."""
+        gezien = []
+        self.bus.subscribe(TYPE, gezien.append)
+        echt = json.dumps
+        with mock.patch.object(self.nb.json, "dumps", side_effect=echt) as dumps:
+            self.bus.publish(TYPE, {"n": 1}, bron="test")
+        c(dumps.call_count == 1, f"json.dumps aanroepen ({dumps.call_count})")
+        c(len(gezien) == 1, "afgeleverd")
+        stats = self.bus.statistieken()
+        c(stats["seals_verified"] == 1 and stats["seals_rejected"] == 0,
+          "self-check geteld")
+        c(stats["aegis"]["trusted_seals"] >= 1, "fast path zichtbaar in aegis stats")
+
+    # --- B. Fast path ---
+
+    def test_03_fast_path_keeps_ttl_and_nonce(self) -> None:
+        """Fast path slaat de HMAC over, maar TTL en nonce ledger gelden nog."""
+        event = self.nb.BusEvent(TYPE, {"n": 1}, bron="test")
+        c(event.is_lokaal(), "lokaal gesigned")
+        with mock.patch.object(self.nb.hmac, "new") as hm:
+            c(event.verify_seal(consume_nonce=False), "self-check")
+            c(event.verify_seal(consume_nonce=True), "eerste ontvanger")
+            c(not event.verify_seal(consume_nonce=True), "nonce hergebruik geweigerd")
+        c(hm.call_count == 0, "geen HMAC op de fast path")
+        event._aegis_ts -= 10
+        c(not event.verify_seal(consume_nonce=False), "verlopen TTL geweigerd")
+
+    def test_04_key_rotation_disables_fast_path(self) -> None:
+        """Nieuwe key: oud event is niet meer lokaal en faalt de echte HMAC."""
+        event = self.nb.BusEvent(TYPE, {"n": 1}, bron="test")
+        self.nb.OmegaSeal._key = hashlib.sha256(b"andere key").digest()
+        c(not event.is_lokaal(), "niet meer vertrouwd")
+        c(not event.verify_seal(consume_nonce=False), "HMAC met nieuwe key faalt")
+
+    # --- C. Externe events ---
+
+    def test_05_external_event(self) -> None:
+        """uit_zegel(): velden uit de gesignde bytes, verify over die bytes."""
+        canonical, seal = self._ander_proces({"n": 7})
+        event = self.nb.BusEvent.uit_zegel(canonical, seal)
+        c(not event.is_lokaal(), "extern, geen fast path")
+        c(event.data == {"n": 7} and event.bron == "extern", "velden uit bytes")
+        c(event.verify_seal(consume_nonce=False), "geldig")
+        vervalst = canonical.replace(b'"n": 7', b'"n": 8')
+        c(not self.nb.BusEvent.uit_zegel(vervalst, seal).verify_seal(False),
+          "gewijzigde bytes geweigerd")
+        with self.assertRaises(ValueError):
+            self.nb.BusEvent.uit_zegel(b"geen json", seal)
+
+    # --- D. Batch ---
+
+    def test_06_verify_batch(self) -> None:
+        """Per-item uitslag; duplicaat-nonce binnen de batch geweigerd."""
+        OmegaSeal = self.nb.OmegaSeal
+        goed = [self._ander_proces({"n": n}) for n in range(5)]
+        items = []
+        for canonical, seal in goed:
+            v = json.loads(canonical)
+            items.append((canonical, seal, v["_aegis_ts"], v["_aegis_nonce"]))
+        slecht = (items[1][0], "0" * 64, items[1][2], "nonce-slecht")
+        verlopen_bytes, verlopen_seal = goed[2]
+        verlopen = (verlopen_bytes, verlopen_seal, items[2][2] - 10, "nonce-oud")
+        batch = items + [slecht, verlopen, items[0]]
+        voor = OmegaSeal.get_aegis_stats()
+        uitslag = OmegaSeal.verify_batch(batch, consume_nonce=True)
+        c(uitslag[:5] == [True] * 5, "geldige items")
+        c(uitslag[5:] == [False, False, False], f"hmac/ttl/duplicaat ({uitslag[5:]})")
+        na = OmegaSeal.get_aegis_stats()
+        c(na["batch_verifies"] == voor["batch_verifies"] + 1, "één batch geteld")
+        c(na["valid_seals"] - voor["valid_seals"] == 5, "valid_seals")
+        c(na["nonce_rejections"] - voor["nonce_rejections"] == 1, "nonce duplicaat")
+        c(na["ttl_rejections"] - voor["ttl_rejections"] == 1, "ttl")
+        with mock.patch.object(OmegaSeal, "_load_key") as lk:
+            lk.return_value = OmegaSeal._key
+            OmegaSeal.verify_batch(items, consume_nonce=False)
+        c(lk.call_count == 1, "één key load per batch")
+
+    def test_07_bus_receives_batch(self) -> None:
+        """ontvang_batch(): alleen geldige events bereiken de subscribers."""
+        gezien = []
+        self.bus.subscribe(TYPE, lambda e: gezien.append(e.data["n"]))
+        zegels = [self._ander_proces({"n": n}) for n in range(3)]
+        zegels.append((zegels[0][0], "f" * 64))
+        zegels.append((b"{kapot", "f" * 64))
+        c(self.bus.ontvang_batch(zegels) == 3, "drie geaccepteerd")
+        c(gezien == [0, 1, 2], f"volgorde, alleen geldige ({gezien})")
+        stats = self.bus.statistieken()
+        c(stats["seals_verified"] == 3 and stats["seals_rejected"] == 2,
+          "bus counters")
+        c(len(self.bus.get_history(TYPE)) == 3, "history bijgewerkt")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 73: Sign-Once Event Sealing")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
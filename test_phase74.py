@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test Phase 74: NeuralBus Timeline & Cursor Reads
+=================================================
+7 tests · 30+ checks
+
+Valideert:
+  A. Volgnummers: aaneengesloten seq, globale tijdlijn begrensd
+  B. recente_events / get_context_stream: nieuwste N over types, zonder sort
+  C. get_events(since_seq): incrementeel pollen, gat na overflow, reset
+  D. get_history / get_context compatibel; fastapi pollers via cursor
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase74.py
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+class TestPhase74(unittest.TestCase):
+    """Phase 74: NeuralBus Timeline & Cursor Reads."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core.neural_bus import NeuralBus
+        self.bus = NeuralBus()
+
+    def tearDown(self) -> None:
+        self.bus.reset()
+
+    def _vul(self, aantal: int, types=("a", "b", "c")) -> None:
+        for n in range(aantal):
+            self.bus.publish(types[n % len(types)], {"n": n}, bron="test")
+
+    # --- A. Volgnummers ---
+
+    def test_01_sequence_numbers(self) -> None:
+        """Elk event krijgt een oplopend seq; tijdlijn houdt alle types."""
+        self._vul(9)
+        tijdlijn = list(self.bus._tijdlijn)
+        c([e.seq for e in tijdlijn] == list(range(1, 10)), "aaneengesloten seq")
+        c([e.data["n"] for e in tijdlijn] == list(range(9)), "publicatievolgorde")
+        c(self.bus.laatste_seq == 9, "laatste_seq")
+        c(self.bus._history["b"][0] is tijdlijn[1], "index-ring deelt het event")
+        stats = self.bus.statistieken()
+        c(stats["laatste_seq"] == 9 and stats["events_in_tijdlijn"] == 9, "stats")
+
+    def test_02_timeline_bounded(self) -> None:
+        """Tijdlijn is een ring: oudste events vallen eraf, seq loopt door."""
+        self.bus._tijdlijn = type(self.bus._tijdlijn)(maxlen=10)
+        self._vul(25)
+        c(len(self.bus._tijdlijn) == 10, "begrensd")
+        c(self.bus._tijdlijn[0].seq == 16, "oudste bewaarde seq")
+
+    # --- B. Over types heen ---
+
+    def test_03_recent_across_types(self) -> None:
+        """Nieuwste N over alle types, of een subset via merge op seq."""
+        self._vul(30)
+        alle = self.bus.recente_events(5)
+        c([e.data["n"] for e in alle] == [29, 28, 27, 26, 25], "nieuwste eerst")
+        subset = self.bus.recente_events(4, event_types=["a", "c"])
+        c([e.data["n"] for e in subset] == [29, 27, 26, 24], f"merge a+c ({[e.data['n'] for e in subset]})")
+        c(self.bus.recente_events(3, event_types=["bestaat_niet"]) == [], "onbekend type")
+        c(self.bus.recente_events(0) == [], "count 0")
+
+    def test_04_context_stream_no_sort(self) -> None:
+        """get_context_stream: chronologisch, laatste N, zonder sorted/sort."""
+        self._vul(12)
+        with mock.patch("builtins.sorted", side_effect=AssertionError("sort")):
+            tekst = self.bus.get_context_stream(count=3)
+        regels = tekst.splitlines()
+        c(regels[0] == "[REAL-TIME SYSTEM STATE]" and len(regels) == 4, "kop + 3 regels")
+        c(regels[1].endswith("n=9") and regels[3].endswith("n=11"), "oud -> nieuw")
+        bron = inspect.getsource(type(self.bus).get_context_stream)
+        c(".sort(" not in bron, "geen sort in get_context_stream")
+        c(self.bus.get_context_stream(event_types=["leeg"]) == "", "leeg")
+
+    # --- C. Cursor ---
+
+    def test_05_cursor_reads(self) -> None:
+        """Pollen met since_seq levert precies de nieuwe events, één keer."""
+        self._vul(4)
+        eerste = self.bus.get_events(since_seq=0)
+        c([e.seq for e in eerste] == [1, 2, 3, 4], "vanaf het begin")
+        cursor = eerste[-1].seq
+        c(self.bus.get_events(since_seq=cursor) == [], "niets nieuw")
+        self._vul(3, types=("d",))
+        nieuw = self.bus.get_events(since_seq=cursor)
+        c([e.seq for e in nieuw] == [5, 6, 7], "alleen nieuwe")
+        c(len(self.bus.get_events(since_seq=0, limit=2)) == 2, "limit")
+        gefilterd = self.bus.get_events(since_seq=0, event_types=["a"])
+        c([e.event_type for e in gefilterd] == ["a", "a"], "typefilter")
+
+    def test_06_cursor_gap_and_reset(self) -> None:
+        """Cursor ouder dan de ring: gat zichtbaar; na reset opnieuw vanaf 0."""
+        self.bus._tijdlijn = type(self.bus._tijdlijn)(maxlen=5)
+        self._vul(12)
+        res = self.bus.get_events(since_seq=2)
+        c(res[0].seq == 8 and res[0].seq > 2 + 1, "gat zichtbaar")
+        c(len(res) == 5, "hele ring")
+        self.bus.reset()
+        self._vul(2)
+        c([e.seq for e in self.bus.get_events(since_seq=12)] == [1, 2],
+          "cursor van vóór reset")
+
+    # --- D. Compatibiliteit + bedrading ---
+
+    def test_07_compat_and_wiring(self) -> None:
+        """get_history/get_context ongewijzigd; fastapi pollt met een cursor."""
+        self._vul(6, types=("x",))
+        hist = self.bus.get_history("x", count=3)
+        c([e.data["n"] for e in hist] == [5, 4, 3], "get_history nieuwste eerst")
+        self.bus.publish("x", {"n": 6}, bron="ander")
+        c(len(self.bus.get_history("x", bron="ander")) == 1, "bron filter")
+        ctx = self.bus.get_context(count=2)
+        c(list(ctx) == ["x"] and [d["data"]["n"] for d in ctx["x"]] == [6, 5],
+          "get_context")
+        bron = (PROJECT_ROOT / "fastapi_server.py").read_text(encoding="utf-8")
+        c(bron.count("bus.get_events(since_seq=cursor") == 2, "SSE + WebSocket via cursor")
+        c("bus._history.items()" not in bron, "geen volledige history scan")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 74: NeuralBus Timeline & Cursor Reads")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
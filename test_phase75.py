@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test Phase 75: NeuralBus Bridge
+================================
+9 tests · 40+ checks
+
+Valideert:
+  A. Hub/peer: events gaan beide kanten op, geen echo, herkomst gezet
+  B. Relay via de hub, frames gebundeld, volgorde behouden
+  C. OmegaSeal: zegels blijven geldig, vervalste/herhaalde frames afgewezen,
+     zonder key geen bridge
+  D. Failover, per-peer lag metrics, echt tweede proces, bedrading
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase75.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+TYPE = "phase75_test"
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _wacht(voorwaarde, timeout: float = 5.0) -> bool:
+    """Poll tot voorwaarde() waar is of de timeout verloopt."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if voorwaarde():
+            return True
+        time.sleep(0.01)
+    return voorwaarde()
+
+
+def _vrije_poort() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestPhase75(unittest.TestCase):
+    """Phase 75: NeuralBus Bridge."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import bus_bridge as bb
+        from danny_toolkit.core import neural_bus as nb
+        self.bb = bb
+        self.nb = nb
+        self._tmp = tempfile.TemporaryDirectory()
+        if hasattr(socket, "AF_UNIX"):
+            self.adres = os.path.join(self._tmp.name, "bus.sock")
+        else:
+            self.adres = f"127.0.0.1:{_vrije_poort()}"
+        self.bridges = []
+        # De bridge vereist een armed OmegaSeal
+        self._oude_key = nb.OmegaSeal._key
+        nb.OmegaSeal._key = hashlib.sha256(b"phase75").digest()
+
+    def tearDown(self) -> None:
+        for bridge in self.bridges:
+            bridge.stop()
+        self.nb.OmegaSeal._key = self._oude_key
+        self._tmp.cleanup()
+
+    def _proces(self, naam: str, adres: str = None):
+        """Bus + bridge alsof het een apart proces is."""
+        bus = self.nb.NeuralBus()
+        bridge = self.bb.BusBridge(bus, adres=adres or self.adres, naam=naam)
+        bridge.start()
+        self.bridges.append(bridge)
+        return bus, bridge
+
+    def _verbonden(self, hub, aantal: int) -> bool:
+        return _wacht(lambda: len(hub.stats()["verbonden"]) >= aantal)
+
+    # --- A. Hub / peer ---
+
+    def test_01_both_directions_no_echo(self) -> None:
+        """Hub <-> peer; ontvangen events gaan niet terug de bridge op."""
+        bus_h, hub = self._proces("hub")
+        bus_p, peer = self._proces("peer")
+        c(hub.rol == "hub" and peer.rol == "peer", "rollen")
+        c(self._verbonden(hub, 1), "peer verbonden")
+        gezien_h, gezien_p = [], []
+        bus_h.subscribe(TYPE, gezien_h.append)
+        bus_p.subscribe(TYPE, gezien_p.append)
+        bus_p.publish(TYPE, {"n": 1}, bron="peer_app")
+        c(_wacht(lambda: len(gezien_h) == 1), "peer -> hub")
+        c(gezien_h[0].herkomst == "peer" and gezien_h[0].bron == "peer_app",
+          "herkomst + bron")
+        bus_h.publish(TYPE, {"n": 2}, bron="hub_app")
+        c(_wacht(lambda: len(gezien_p) == 2), "hub -> peer")
+        time.sleep(0.1)
+        c(len(gezien_h) == 2 and len(gezien_p) == 2, "geen echo")
+        c(gezien_p[1].data == {"n": 2}, "payload intact")
+
+    # --- B. Relay + batching ---
+
+    def test_02_relay_and_batching(self) -> None:
+        """Peer A -> hub -> peer B; 500 events in weinig frames, op volgorde."""
+        bus_h, hub = self._proces("hub")
+        bus_a, a = self._proces("a")
+        bus_b, b = self._proces("b")
+        c(self._verbonden(hub, 2), "twee peers")
+        gezien = []
+        bus_b.subscribe(TYPE, lambda e: gezien.append(e.data["n"]))
+        for n in range(500):
+            bus_a.publish(TYPE, {"n": n}, bron="a")
+        c(_wacht(lambda: len(gezien) == 500), f"relay compleet ({len(gezien)})")
+        c(gezien == list(range(500)), "volgorde behouden")
+        c(a.stats()["frames_verzonden"] <= 50,
+          f"gebundeld ({a.stats()['frames_verzonden']} frames)")
+        c(b.stats()["peers"]["a"]["events"] == 500, "peer metrics op bron-naam")
+        c(len(bus_h.get_history(TYPE, count=1000)) == 100, "hub ontving ook")
+
+    # --- C. OmegaSeal ---
+
+    def test_03_seals_preserved(self) -> None:
+        """Zegels kloppen na transport, geverifieerd per batch; replay geweigerd."""
+        bus_h, hub = self._proces("hub")
+        bus_p, _ = self._proces("peer")
+        self._verbonden(hub, 1)
+        gezien, geverifieerd = [], []
+        bus_h.subscribe(TYPE, gezien.append)
+        bus_h.subscribe(TYPE, self.nb.verified_callback(geverifieerd.append))
+        voor = self.nb.OmegaSeal.get_aegis_stats()["batch_verifies"]
+        for n in range(3):
+            bus_p.publish(TYPE, {"n": n}, bron="peer")
+        c(_wacht(lambda: len(gezien) == 3), "aangekomen")
+        c(_wacht(lambda: len(geverifieerd) == 3),
+          f"@verified_callback accepteert bridged events ({len(geverifieerd)})")
+        c(all(e.omega_seal and not e.is_lokaal() for e in gezien), "extern zegel")
+        c(all(e.verify_seal(consume_nonce=False) for e in gezien), "zegel geldig")
+        c(self.nb.OmegaSeal.get_aegis_stats()["batch_verifies"] > voor,
+          "verify_batch gebruikt")
+        herhaald = [(e.canonical, e.omega_seal) for e in gezien]
+        c(bus_h.ontvang_batch(herhaald, herkomst="replay") == 0, "replay geweigerd")
+        c(len(gezien) == 3 and len(geverifieerd) == 3, "replay niet afgeleverd")
+
+    def test_04_forged_frame_rejected(self) -> None:
+        """Frame met vervalst zegel: niet afgeleverd, afgewezen geteld."""
+        bus_h, hub = self._proces("hub")
+        gezien = []
+        bus_h.subscribe(TYPE, gezien.append)
+        echt = self.nb.BusEvent(TYPE, {"n": 1}, bron="x").canonical
+        vals = echt.replace(b'"n": 1', b'"n": 666')
+        sock = hub._nieuwe_socket()
+        sock.connect(hub._sock_adres())
+        sock.sendall(self.bb._frame({"t": "hallo", "naam": "indringer", "pid": 0}))
+        sock.sendall(self.bb._frame({
+            "t": "events", "van": "indringer", "ts": time.time(),
+            "events": [[vals.decode(), "0" * 64]],
+        }))
+        c(_wacht(lambda: "indringer" in hub.stats()["peers"]), "frame verwerkt")
+        s = hub.stats()["peers"]["indringer"]
+        c(s["afgewezen"] == 1 and s["events"] == 0, "afgewezen")
+        c(gezien == [], "niet afgeleverd")
+        sock.close()
+
+    def test_05_unarmed_refused(self) -> None:
+        """Zonder key: bridge start niet en ongesigneerde batches worden geweigerd."""
+        self.nb.OmegaSeal._key = None
+        with mock.patch.dict(os.environ, {"OMEGA_BUS_SIGNING_KEY": ""}):
+            bus = self.nb.NeuralBus()
+            bridge = self.bb.BusBridge(bus, adres=self.adres, naam="onbeveiligd")
+            self.bridges.append(bridge)
+            c(bridge.start() == "uit", "bridge weigert te starten")
+            c(bus._bridge is None, "niet aan de bus gekoppeld")
+            c(not os.path.exists(self.adres) or self.bb._is_tcp(self.adres),
+              "adres niet gebonden")
+            gezien = []
+            bus.subscribe(TYPE, gezien.append)
+            event = self.nb.BusEvent(TYPE, {"n": 1}, bron="x")
+            c(bus.ontvang_batch([(event.canonical, "")], herkomst="indringer") == 0,
+              "ongesigneerd event geweigerd")
+            c(gezien == [], "niet afgeleverd")
+
+    # --- D. Failover, metrics, proces, bedrading ---
+
+    def test_06_failover(self) -> None:
+        """Hub stopt: een peer neemt het adres over, een nieuw proces verbindt."""
+        _, hub = self._proces("hub")
+        bus_p, peer = self._proces("peer")
+        self._verbonden(hub, 1)
+        hub.stop()
+        c(_wacht(lambda: peer.rol == "hub", timeout=8), "peer is hub geworden")
+        bus_n, nieuw = self._proces("nieuw")
+        c(nieuw.rol == "peer", "nieuw proces verbindt")
+        gezien = []
+        bus_p.subscribe(TYPE, gezien.append)
+        c(self._verbonden(peer, 1), "verbonden met nieuwe hub")
+        bus_n.publish(TYPE, {"n": 1})
+        c(_wacht(lambda: len(gezien) == 1), "events lopen weer")
+
+    def test_07_lag_metrics(self) -> None:
+        """Per-peer lag en de bridge in NeuralBus.statistieken()."""
+        bus_h, hub = self._proces("hub")
+        bus_p, peer = self._proces("peer")
+        self._verbonden(hub, 1)
+        for n in range(20):
+            bus_p.publish(TYPE, {"n": n})
+        c(_wacht(lambda: hub.stats()["peers"].get("peer", {}).get("events") == 20),
+          "events geteld")
+        s = hub.stats()["peers"]["peer"]
+        c(s["frames"] >= 1 and s["bytes"] > 0, "frames + bytes")
+        c(0 <= s["lag_ms_gem"] <= s["lag_ms_max"] < 2000, f"lag ({s['lag_ms_gem']}ms)")
+        c(s["sinds_laatste_s"] < 5, "sinds_laatste_s")
+        stats = bus_h.statistieken()["bridge"]
+        c(stats["rol"] == "hub" and stats["verbonden"] == ["peer"], "in statistieken()")
+        c(bus_p.statistieken()["bridge"]["events_verzonden"] == 20, "verzonden")
+
+    def test_08_real_second_process(self) -> None:
+        """Echt tweede Python-proces publiceert via de bridge."""
+        adres = f"127.0.0.1:{_vrije_poort()}"
+        bus_h, hub = self._proces("hub", adres=adres)
+        gezien = []
+        bus_h.subscribe(TYPE, lambda e: gezien.append((e.data["n"], e.herkomst)))
+        script = (
+            "import hashlib, time\n"
+            "from danny_toolkit.core.neural_bus import NeuralBus, OmegaSeal\n"
+            "from danny_toolkit.core.bus_bridge import BusBridge\n"
+            "OmegaSeal._key = hashlib.sha256(b'phase75').digest()\n"
+            "bus = NeuralBus()\n"
+            f"b = BusBridge(bus, adres={adres!r}, naam='kind')\n"
+            "assert b.start() == 'peer'\n"
+            f"for n in range(10): bus.publish({TYPE!r}, {{'n': n}}, bron='kind')\n"
+            "time.sleep(0.5)\n"
+            "b.stop()\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", script], cwd=str(PROJECT_ROOT),
+                              capture_output=True, text=True, timeout=60)
+        c(proc.returncode == 0, f"kindproces ok {proc.stderr[-300:]}")
+        c(_wacht(lambda: len(gezien) == 10), f"10 events ontvangen ({len(gezien)})")
+        c(all(h == "kind" for _, h in gezien), "herkomst = kindproces")
+        c(_wacht(lambda: hub.stats()["verbonden"] == []), "afgemeld")
+
+    def test_09_wiring(self) -> None:
+        """Config schakelaar; get_bus() start de bridge als die aan staat."""
+        from danny_toolkit.core.config import Config
+        c(Config.NEURALBUS_BRIDGE is False, "default uit")
+        c(hasattr(Config, "NEURALBUS_BRIDGE_ADRES"), "adres instelbaar")
+        bron = inspect.getsource(self.nb.get_bus)
+        c("NEURALBUS_BRIDGE" in bron and "start_bridge(_bus_instance)" in bron,
+          "get_bus start de bridge")
+        c(self.bb._is_tcp("127.0.0.1:47654") and not self.bb._is_tcp("/tmp/bus.sock"),
+          "adres herkenning")
+        frame = self.bb._frame({"t": "hallo"})
+        c(json.loads(frame[4:]) == {"t": "hallo"}, "frame formaat")
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 75: NeuralBus Bridge")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Test Phase 76: Write-Behind StorageWriter
+==========================================
+10 tests · 55+ checks
+
+Valideert:
+  A. Aanroeper wacht niet; batch op grootte, op interval of via flush()
+  B. executemany per SQL-groep, foute rij isoleert, taak() ziet eigen writes,
+     na_commit één keer na de commit
+  C. Register per bestand, ":memory:" synchroon, backpressure, sluit/lifecycle,
+     herstel na mislukt verbinden
+  D. Bedrading: Waakhuis, Synapse, Phantom, SemanticCache, AccessTracker
+
+Gebruik:
+    CUDA_VISIBLE_DEVICES=-1 DANNY_TEST_MODE=1 ANONYMIZED_TELEMETRY=False \\
+        python test_phase76.py
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault("DANNY_TEST_MODE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+# Windows UTF-8
+if os.name == "nt":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+PROJECT_ROOT = Path(__file__).parent
+CHECK = 0
+INSERT = "INSERT INTO t (n) VALUES (?)"
+
+
+def c(ok: bool, label: str = "") -> None:
+    """Assert a check and print its result."""
+    global CHECK
+    CHECK += 1
+    tag = f" ({label})" if label else ""
+    status = "OK" if ok else "FAIL"
+    print(f"  check {CHECK}: {status}{tag}")
+    assert ok, f"Check {CHECK} failed{tag}"
+
+
+def _wacht(voorwaarde, timeout: float = 5.0) -> bool:
+    """Poll tot voorwaarde() waar is of de timeout verloopt."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if voorwaarde():
+            return True
+        time.sleep(0.01)
+    return voorwaarde()
+
+
+class TestPhase76(unittest.TestCase):
+    """Phase 76: Write-Behind StorageWriter."""
+
+    def setUp(self) -> None:
+        from danny_toolkit.core import storage_writer as sw
+        self.sw = sw
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self._tmp.name, "sw.db")
+        conn = sqlite3.connect(self.db)
+        conn.execute("CREATE TABLE t (n INTEGER UNIQUE)")
+        conn.commit()
+        conn.close()
+        self.writers = []
+
+    def tearDown(self) -> None:
+        for writer in self.writers:
+            writer.sluit()
+        self._tmp.cleanup()
+
+    def _writer(self, **kw):
+        writer = self.sw.StorageWriter(self.db, **kw)
+        self.writers.append(writer)
+        return writer
+
+    def _rijen(self) -> list:
+        conn = sqlite3.connect(self.db)
+        try:
+            return [r[0] for r in conn.execute("SELECT n FROM t ORDER BY rowid")]
+        finally:
+            conn.close()
+
+    # --- A. Batching ---
+
+    def test_01_enqueue_does_not_block(self) -> None:
+        """500 rijen: aanroeper keert direct terug, weinig transacties."""
+        writer = self._writer(batch_grootte=200, interval_s=60)
+        t0 = time.perf_counter()
+        for n in range(500):
+            writer.schrijf(INSERT, (n,))
+        enqueue_ms = (time.perf_counter() - t0) * 1000
+        c(enqueue_ms < 200, f"enqueue snel ({enqueue_ms:.0f}ms)")
+        c(_wacht(lambda: writer.stats()["rows"] == 400), "twee volle batches zonder flush")
+        c(writer.stats()["queue_depth"] == 100, "rest wacht op het interval")
+        c(writer.flush(timeout=5), "flush")
+        c(self._rijen() == list(range(500)), "alles op volgorde")
+        s = writer.stats()
+        c(s["calls"] == 3 and s["rows"] == 500, f"3 transacties ({s['calls']})")
+        c(s["rows_per_flush"] > 150 and s["max_queue_depth"] >= 100, "batch metrics")
+
+    def test_02_interval_trigger(self) -> None:
+        """Eén rij wordt binnen het interval geschreven, zonder flush()."""
+        writer = self._writer(batch_grootte=1000, interval_s=0.05)
+        writer.schrijf(INSERT, (1,))
+        c(_wacht(lambda: self._rijen() == [1], timeout=2), "op tijd geschreven")
+        s = writer.stats()
+        c(s["wait_ms_max"] >= 40, f"wachttijd ~interval ({s['wait_ms_max']}ms)")
+        c(s["avg_ms"] >= 0 and s["flush_ms_max"] >= s["avg_ms"], "flush latency")
+        c(writer.flush(timeout=0.1), "flush zonder openstaand werk")
+
+    # --- B. Uitvoering ---
+
+    def test_03_bad_row_isolated(self) -> None:
+        """Constraint-fout: alleen die rij valt weg, fout geteld."""
+        writer = self._writer(interval_s=60)
+        writer.schrijf_veel(INSERT, [(1,), (2,), (1,), (3,)])
+        writer.flush(timeout=5)
+        c(self._rijen() == [1, 2, 3], f"goede rijen behouden ({self._rijen()})")
+        s = writer.stats()
+        c(s["errors"] == 1 and "UNIQUE" in s["last_error"], "fout geteld")
+        c(s["rows"] == 3 and s["success_rate"] == 75.0, "success_rate")
+
+    def test_04_task_read_modify_write(self) -> None:
+        """taak() draait op de writer-thread en ziet eerdere writes in de batch."""
+        writer = self._writer(interval_s=60)
+        gezien = []
+
+        def taak(conn):
+            gezien.append(threading.current_thread().name)
+            som = conn.execute("SELECT SUM(n) FROM t").fetchone()[0]
+            conn.execute(INSERT, (som * 10,))
+
+        writer.schrijf_veel(INSERT, [(1,), (2,)])
+        writer.taak(taak)
+        writer.schrijf(INSERT, (4,))
+        writer.flush(timeout=5)
+        c(self._rijen() == [1, 2, 30, 4], f"volgorde + eigen writes ({self._rijen()})")
+        c(gezien == ["storage-writer-sw.db"], "writer-thread")
+        c(writer.stats()["calls"] == 1, "één transactie")
+
+    # --- C. Register, memory, backpressure, shutdown ---
+
+    def test_05_registry_and_memory(self) -> None:
+        """Eén writer per bestand; ":memory:" schrijft synchroon."""
+        w1 = self.sw.get_writer(self.db)
+        w2 = self.sw.get_writer(os.path.join(self._tmp.name, ".", "sw.db"))
+        c(w1 is w2, "zelfde writer per bestand")
+        c("storage:sw.db" in self.sw.writer_stats(), "writer_stats sleutel")
+        w1.schrijf(INSERT, (7,))
+        c(self.sw.flush_alle(timeout=5) and self._rijen() == [7], "flush_alle")
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.addCleanup(conn.close)
+        conn.execute("CREATE TABLE t (n INTEGER UNIQUE)")
+        mem = self.sw.writer_voor(":memory:", verbinding=conn)
+        c(mem.synchroon and mem is not self.sw.writer_voor(":memory:", conn),
+          "private synchrone writer")
+        mem.schrijf(INSERT, (1,))
+        c(conn.execute("SELECT n FROM t").fetchall() == [(1,)], "direct zichtbaar")
+        c(mem.stats()["calls"] == 1 and mem._thread is None, "geen thread")
+        with self.assertRaises(ValueError):
+            self.sw.writer_voor(":memory:")
+
+    def test_06_backpressure_and_close(self) -> None:
+        """Volle wachtrij: aanroeper wacht; sluit() schrijft de rest weg."""
+        writer = self._writer(max_wachtrij=3, batch_grootte=1, interval_s=60)
+        los = threading.Event()
+        writer.taak(lambda conn: los.wait(5))
+        _wacht(lambda: writer.stats()["queue_depth"] == 0)
+        for n in range(3):
+            writer.schrijf(INSERT, (n,))
+        threading.Timer(0.2, los.set).start()
+        t0 = time.perf_counter()
+        writer.schrijf(INSERT, (3,))
+        wacht_ms = (time.perf_counter() - t0) * 1000
+        c(wacht_ms >= 150, f"backpressure ({wacht_ms:.0f}ms)")
+        c(writer.stats()["backpressure"] == 1, "geteld")
+        writer.schrijf(INSERT, (4,))
+        writer.sluit()
+        c(self._rijen() == [0, 1, 2, 3, 4], "sluit() flusht")
+        c(not writer._thread.is_alive(), "thread gestopt")
+        with self.assertRaises(RuntimeError):
+            writer.schrijf(INSERT, (5,))
+
+    def test_07_shutdown_hooks(self) -> None:
+        """flush_alle als pre-shutdown hook van de LifecycleManager."""
+        from danny_toolkit.omega_sovereign_core.lifecycle import get_lifecycle_manager
+        self.sw.get_writer(self.db)
+        hooks = get_lifecycle_manager()._pre_shutdown_hooks
+        c(self.sw.flush_alle in hooks, "lifecycle hook")
+        c(hooks.count(self.sw.flush_alle) == 1, "eenmalig geregistreerd")
+        from danny_toolkit.core.config import Config
+        c(Config.STORAGE_WRITER_BATCH > 0 and Config.STORAGE_WRITER_INTERVAL_MS > 0,
+          "Config knoppen")
+        bron = (PROJECT_ROOT / "swarm_engine.py").read_text(encoding="utf-8")
+        c("result.update(writer_stats())" in bron, "in get_pipeline_metrics")
+
+    # --- D. Bedrading ---
+
+    def test_08_components(self) -> None:
+        """De vijf componenten schrijven via de writer, niet met commit per rij."""
+        from danny_toolkit.brain.phantom import ThePhantom
+        from danny_toolkit.brain.synapse import TheSynapse
+        from danny_toolkit.brain.waakhuis import WaakhuisMonitor
+        from danny_toolkit.core.self_pruning import AccessTracker
+        from danny_toolkit.core.semantic_cache import SemanticCache
+
+        # Waakhuis
+        wm = WaakhuisMonitor(db_path=os.path.join(self._tmp.name, "wh.db"))
+        for _ in range(20):
+            wm.registreer_dispatch("Agent", 12.5)
+        c(wm._writer is self.sw.get_writer(wm._db_path), "waakhuis gedeelde writer")
+        c(wm.flush(), "waakhuis flush")
+        n = wm._conn.execute("SELECT COUNT(*) FROM waakhuis_metrics").fetchone()[0]
+        c(n == 20 and wm._writer.stats()["calls"] <= 2, f"waakhuis gebundeld ({n})")
+        wm.close()
+
+        # Synapse + Phantom delen het bestand en dus de writer
+        pad = os.path.join(self._tmp.name, "cortical.db")
+        syn = TheSynapse(db_path=pad)
+        ph = ThePhantom(db_path=pad)
+        c(syn._writer is ph._writer, "synapse + phantom: één writer")
+        syn.categorize_query = lambda q: "A+B"
+        syn.record_interaction("eerste", ["A", "B"])
+        syn.record_interaction("tweede", ["A"])
+        syn.flush()
+        trace = syn._conn.execute(
+            "SELECT resolved FROM interaction_trace ORDER BY id").fetchall()
+        c(trace == [(1,), (0,)], f"vorige trace geresolved ({trace})")
+        paden = syn._conn.execute(
+            "SELECT COUNT(*) FROM synaptic_pathways WHERE query_category='A+B'"
+        ).fetchone()[0]
+        c(paden == 2, "plasticity op de writer-verbinding")
+        ph._conn.execute("INSERT INTO phantom_predictions (predicted_category, confidence) "
+                         "VALUES ('A+B', 0.5), ('C+D', 0.4)")
+        ph._conn.commit()
+        ph.resolve_predictions("A+B")
+        acc = ph.get_accuracy()
+        c(acc["total_predictions"] == 2 and acc["hits"] == 1, "phantom resolve via writer")
+        ph.close()
+        syn._conn.close()
+
+        # SemanticCache (hash pad) + AccessTracker
+        sc = SemanticCache(db_path=Path(self._tmp.name) / "sc.db")
+        sc._embed_provider, sc._embed_init_tried = None, True
+        sc.store("Memex", "wat is de hoofdstad", "Amsterdam is de hoofdstad van NL.")
+        hit = sc.lookup("Memex", "wat is de hoofdstad")
+        c(hit is not None and hit["content"].startswith("Amsterdam"), "cache: lookup ziet store")
+        at = AccessTracker(db_path=os.path.join(self._tmp.name, "sp.db"))
+        at.registreer_creatie(["a", "b"], "docs")
+        at.registreer_toegang(["a"], "docs")
+        c(at.totaal_gevolgd() == 2, "tracker: lezen flusht")
+
+        for mod, naam in [(WaakhuisMonitor, "registreer_dispatch"),
+                          (ThePhantom, "resolve_predictions"),
+                          (SemanticCache, "store"),
+                          (AccessTracker, "registreer_toegang")]:
+            c("commit()" not in inspect.getsource(getattr(mod, naam)),
+              f"{mod.__name__}.{naam} zonder commit")
+        c("_safe_commit" not in inspect.getsource(TheSynapse.record_interaction),
+          "TheSynapse.record_interaction zonder commit")
+
+    def test_09_na_commit_and_lock_order(self) -> None:
+        """na_commit één keer na de commit; SemanticCache doet geen I/O onder _lock."""
+        writer = self._writer(interval_s=60)
+        pogingen, callbacks = [], []
+
+        def taak(conn):
+            pogingen.append(1)
+            conn.execute(INSERT, (10,))
+            return len(pogingen)
+
+        writer.schrijf(INSERT, (1,))
+        writer.taak(taak, na_commit=callbacks.append)
+        writer.schrijf(INSERT, (1,))  # constraint-fout: batch valt terug op per item
+        c(writer.flush(timeout=5), "geflusht")
+        c(len(pogingen) == 2, f"taak opnieuw gedraaid ({len(pogingen)})")
+        c(callbacks == [2], f"na_commit één keer, resultaat van de commit ({callbacks})")
+        c(self._rijen() == [1, 10], "rijen")
+
+        w = self.sw.get_writer(self.db)
+        w.schrijf(INSERT, (11,))
+        self.sw.sluit_writer(self.db)
+        c(self._rijen()[-1] == 11 and not w._thread.is_alive(), "sluit_writer flusht + stopt")
+        c(self.sw.get_writer(self.db) is not w, "uit het register")
+        self.sw.sluit_writer(self.db)
+
+        from danny_toolkit.core.semantic_cache import SemanticCache
+        sc = SemanticCache(db_path=Path(self._tmp.name) / "sc9.db")
+        sc._embed_provider, sc._embed_init_tried = None, True
+        echte_conn = sc._get_conn
+
+        def bewaakte_conn():
+            c(not sc._lock.locked(), "SQLite I/O buiten _lock")
+            return echte_conn()
+        sc._get_conn = bewaakte_conn
+        sc.store("Memex", "wat is de hoofdstad", "Amsterdam is de hoofdstad van NL.")
+        c(sc.lookup("Memex", "wat is de hoofdstad") is not None, "hit")
+        c(sc.lookup("Memex", "wat is de hoofdstad") is not None, "tweede hit")
+        c(sc.flush(), "hit-tellers via de writer")
+        c(sc.stats()["total_hits"] == 2, f"hits = hits + 1 ({sc.stats()['total_hits']})")
+        sc.clear()
+        c(sc.stats()["total_entries"] == 0, "clear via de writer")
+        self.sw.sluit_writer(sc._db_path)
+
+    def test_10_connect_failure_recovers(self) -> None:
+        """Mislukt verbinden sluit de writer niet; de wachtrij blijft staan."""
+        writer = self._writer(interval_s=0)
+        echte_verbind, mislukt = writer._verbind, []
+
+        def verbind():
+            if len(mislukt) < 2:
+                mislukt.append(1)
+                raise sqlite3.OperationalError("database is locked")
+            return echte_verbind()
+        writer._verbind = verbind
+        oud = self.sw._VERBIND_POGINGEN
+        self.sw._VERBIND_POGINGEN = 2
+        try:
+            with self.assertLogs(self.sw.logger, level="ERROR"):
+                writer.schrijf(INSERT, (1,))
+                c(_wacht(lambda: writer._thread is None), "thread weg na mislukte ronde")
+            c(not writer._stop, "niet gesloten")
+            c(not writer.flush(timeout=1), "flush meldt niet geschreven")
+            writer.schrijf(INSERT, (2,))
+            c(writer.flush(timeout=5), "nieuwe thread verbindt")
+            c(self._rijen() == [1, 2], f"geen rijen verloren ({self._rijen()})")
+            c(writer.stats()["errors"] == 2, "verbindfouten geteld")
+        finally:
+            self.sw._VERBIND_POGINGEN = oud
+
+
+if __name__ == "__main__":
+    print(f"\n{'='*60}")
+    print("TEST PHASE 76: Write-Behind StorageWriter")
+    print(f"{'='*60}\n")
+    unittest.main(verbosity=2, exit=True)
@@ -498,6 +498,7 @@ def test_prediction_accuracy() -> None:
     phantom._conn.commit()
 
     phantom.resolve_predictions("IOLAAX+MEMEX")
+    phantom.flush()  # write-behind
 
     row = phantom._conn.execute(
         "SELECT hit, actual_category FROM phantom_predictions "
@@ -517,6 +518,7 @@ def test_prediction_accuracy() -> None:
     )
     phantom._conn.commit()
     phantom.resolve_predictions("VITA+NAVIGATOR")
+    phantom.flush()  # write-behind
 
     row = phantom._conn.execute(
         "SELECT hit FROM phantom_predictions "